@@ -0,0 +1,588 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Gcore API used by the benchmarks.
+
+Serves in-memory CDN, DNS, SSL, storage and load balancer endpoints with
+``limit``/``offset`` pagination, multipart uploads, ranged downloads, purge
+tasks that finish after a delay, simulated per-request latency and optional
+throttling with ``429`` responses. Point the CLI or the clients at it with
+``GCORE_BASE_URL``::
+
+    python benchmarks/mock_api.py --port 8080 --latency 0.01 --rate-limit 200
+    GCORE_BASE_URL=http://127.0.0.1:8080 GCORE_API_TOKEN=x gcore cdn list
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import re
+import socket
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+DEFAULT_PURGE_DURATION = 0.2
+
+Reply = Tuple[int, Any, Dict[str, str]]
+
+
+class MockState:
+    """In-memory entities served by :class:`MockGcoreAPI`."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.resources: Dict[int, Dict] = {}
+        self.purges: Dict[str, float] = {}
+        self.zones: Dict[int, Dict] = {}
+        self.records: Dict[int, Dict[int, Dict]] = {}
+        self.certificates: Dict[int, Dict] = {}
+        self.buckets: Dict[str, Dict] = {}
+        self.objects: Dict[str, Dict[str, bytes]] = {}
+        self.uploads: Dict[str, Dict[int, bytes]] = {}
+        self.loadbalancers: Dict[int, Dict] = {}
+        self.pools: Dict[int, Dict] = {}
+        self.members: Dict[int, Dict[int, Dict]] = {}
+
+    def next_id(self) -> int:
+        with self.lock:
+            return next(self._ids)
+
+    def add_resources(self, count: int) -> List[int]:
+        """Seed ``count`` CDN resources."""
+        ids = []
+        for _ in range(count):
+            resource_id = self.next_id()
+            self.resources[resource_id] = {
+                "id": resource_id,
+                "cname": f"cdn{resource_id}.example.com",
+                "origin": f"origin{resource_id}.example.com",
+                "status": "active",
+                "active": True,
+                "ssl": True,
+            }
+            ids.append(resource_id)
+        return ids
+
+    def add_zone(self, name: str, records: int = 0) -> int:
+        """Seed a DNS zone with ``records`` A records."""
+        zone_id = self.next_id()
+        self.zones[zone_id] = {"id": zone_id, "name": name, "status": "active"}
+        self.records[zone_id] = {}
+        for i in range(records):
+            record_id = self.next_id()
+            self.records[zone_id][record_id] = {
+                "id": record_id,
+                "name": f"host{i}",
+                "type": "A",
+                "content": [f"192.0.{i // 256 % 256}.{i % 256}"],
+                "ttl": 300,
+            }
+        return zone_id
+
+    def add_bucket(self, name: str, objects: int = 0) -> None:
+        """Seed a bucket with ``objects`` small objects."""
+        self.buckets[name] = {"name": name, "location": "eu-north-1"}
+        self.objects.setdefault(name, {})
+        for i in range(objects):
+            self.objects[name][f"data/{i:08d}.bin"] = b"x" * 16
+
+    def put_object(self, bucket: str, key: str, data: bytes) -> None:
+        self.buckets.setdefault(bucket, {"name": bucket, "location": "eu-north-1"})
+        self.objects.setdefault(bucket, {})[key] = data
+
+
+def _object_meta(key: str, data: bytes) -> Dict[str, Any]:
+    return {
+        "name": key,
+        "size": len(data),
+        "etag": hashlib.md5(data).hexdigest(),
+        "last_modified": "2024-01-01T00:00:00Z",
+    }
+
+
+def _paginate(items: List[Dict], query: Dict[str, str]) -> List[Dict]:
+    if "limit" not in query:
+        return items
+    offset = int(query.get("offset", 0))
+    return items[offset : offset + int(query["limit"])]
+
+
+def _byte_range(data: bytes, header: str, headers: Dict[str, str]) -> Reply:
+    match = re.fullmatch(r"bytes=(\d+)-(\d*)", header.strip())
+    if not match:
+        return 200, data, headers
+    start = int(match.group(1))
+    end = min(int(match.group(2) or len(data) - 1), len(data) - 1)
+    if start > end:
+        return 416, None, {"Content-Range": f"bytes */{len(data)}"}
+    content_range = f"bytes {start}-{end}/{len(data)}"
+    return (
+        206,
+        memoryview(data)[start : end + 1],
+        {**headers, "Content-Range": content_range},
+    )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "MockGcoreAPI"
+
+    def setup(self) -> None:
+        super().setup()
+        # Replies are written in two parts; without this, Nagle's algorithm
+        # and delayed ACKs add ~40 ms to every keep-alive request.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_HEAD(self) -> None:
+        self._dispatch("HEAD")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_PUT(self) -> None:
+        self._dispatch("PUT")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks: List[bytes] = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if not size:
+                    self.rfile.readline()
+                    return b"".join(chunks)
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _dispatch(self, method: str) -> None:
+        body = self._read_body()
+        api = self.server
+        if api.latency:
+            time.sleep(api.latency)
+        retry_after = api.throttle()
+        if retry_after is not None:
+            self._reply(429, {"error": "Too many requests"}, retry_after)
+            return
+
+        split = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(split.query).items()}
+        path = unquote(split.path)
+        for route_method, pattern, handler in api.routes:
+            if route_method != method:
+                continue
+            match = pattern.fullmatch(path)
+            if match:
+                payload = json.loads(body) if body and handler.json_body else body
+                status, content, headers = handler(api, *match.groups(), query, payload)
+                ranges = self.headers.get("Range")
+                if ranges and status == 200 and isinstance(content, bytes):
+                    status, content, headers = _byte_range(content, ranges, headers)
+                self._reply(status, content, headers=headers, head=method == "HEAD")
+                return
+        self._reply(404, {"error": f"No route for {method} {path}"})
+
+    def _reply(
+        self,
+        status: int,
+        content: Any,
+        retry_after: Optional[float] = None,
+        headers: Optional[Dict[str, str]] = None,
+        head: bool = False,
+    ) -> None:
+        if isinstance(content, (bytes, memoryview)):
+            data = content
+            content_type = "application/octet-stream"
+        else:
+            data = b"" if content is None else json.dumps(content).encode()
+            content_type = "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        if retry_after is not None:
+            self.send_header("Retry-After", f"{retry_after:.3f}")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if not head and data:
+            self.wfile.write(data)
+
+
+def route(method: str, pattern: str, json_body: bool = True) -> Callable:
+    def decorate(handler: Callable) -> Callable:
+        handler.route = (method, re.compile(pattern))  # type: ignore[attr-defined]
+        handler.json_body = json_body  # type: ignore[attr-defined]
+        return handler
+
+    return decorate
+
+
+class MockGcoreAPI(ThreadingHTTPServer):
+    """Threaded HTTP server imitating the Gcore API endpoints the clients use."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int] = ("127.0.0.1", 0),
+        latency: float = 0.0,
+        rate_limit: Optional[float] = None,
+        purge_duration: float = DEFAULT_PURGE_DURATION,
+        state: Optional[MockState] = None,
+    ):
+        """Initialize the mock API.
+
+        Args:
+            address: Host and port to listen on; port 0 picks a free one.
+            latency: Seconds added to every request.
+            rate_limit: Requests per second served before answering ``429``
+                with a ``Retry-After``; ``None`` for no limit.
+            purge_duration: Seconds until a purge task completes.
+            state: Entities to serve. Starts empty if not provided.
+        """
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.purge_duration = purge_duration
+        self.state = state or MockState()
+        self.requests = 0
+        self.throttled = 0
+        self._tat = 0.0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.routes = [
+            (*getattr(attr, "route"), attr)
+            for attr in (getattr(type(self), name) for name in dir(type(self)))
+            if hasattr(attr, "route")
+        ]
+        # Longest patterns first, so upload routes win over plain objects.
+        self.routes.sort(key=lambda entry: -len(entry[1].pattern))
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockGcoreAPI":
+        self._thread = threading.Thread(
+            target=self.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "MockGcoreAPI":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def throttle(self) -> Optional[float]:
+        """Count a request; return its ``Retry-After`` if over the rate limit."""
+        with self._lock:
+            self.requests += 1
+            if not self.rate_limit:
+                return None
+            interval = 1.0 / self.rate_limit
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            if tat - now > interval:
+                self.throttled += 1
+                return tat - now - interval
+            self._tat = tat + interval
+            return None
+
+    # CDN
+
+    @route("GET", r"/cdn/v1/resources")
+    def list_resources(self, query: Dict, body: Any) -> Reply:
+        return 200, _paginate(list(self.state.resources.values()), query), {}
+
+    @route("POST", r"/cdn/v1/resources")
+    def create_resource(self, query: Dict, body: Dict) -> Reply:
+        resource_id = self.state.next_id()
+        resource = {"id": resource_id, "status": "active", "active": True, **body}
+        self.state.resources[resource_id] = resource
+        return 201, resource, {}
+
+    @route("GET", r"/cdn/v1/resources/(\d+)")
+    def get_resource(self, resource_id: str, query: Dict, body: Any) -> Reply:
+        resource = self.state.resources.get(int(resource_id))
+        return (200, resource, {}) if resource else (404, {"error": "Not found"}, {})
+
+    @route("POST", r"/cdn/v1/resources/(\d+)/purge")
+    def purge(self, resource_id: str, query: Dict, body: Dict) -> Reply:
+        task_id = uuid.uuid4().hex
+        self.state.purges[task_id] = time.monotonic() + self.purge_duration
+        return 201, {"task_id": task_id}, {}
+
+    @route("GET", r"/cdn/v1/resources/(\d+)/purge/(\w+)")
+    def purge_status(
+        self, resource_id: str, task_id: str, query: Dict, body: Any
+    ) -> Reply:
+        done_at = self.state.purges.get(task_id)
+        if done_at is None:
+            return 404, {"error": "Unknown task"}, {}
+        remaining = done_at - time.monotonic()
+        if remaining <= 0:
+            return 200, {"status": "completed", "progress": 100}, {}
+        progress = int(100 * (1 - remaining / max(self.purge_duration, 1e-9)))
+        return 200, {"status": "in_progress", "progress": progress}, {}
+
+    # DNS
+
+    @route("GET", r"/dns/v2/zones")
+    def list_zones(self, query: Dict, body: Any) -> Reply:
+        return 200, _paginate(list(self.state.zones.values()), query), {}
+
+    @route("POST", r"/dns/v2/zones")
+    def create_zone(self, query: Dict, body: Dict) -> Reply:
+        zone_id = self.state.add_zone(body["name"])
+        return 201, self.state.zones[zone_id], {}
+
+    @route("GET", r"/dns/v2/zones/(\d+)")
+    def get_zone(self, zone_id: str, query: Dict, body: Any) -> Reply:
+        zone = self.state.zones.get(int(zone_id))
+        return (200, zone, {}) if zone else (404, {"error": "Not found"}, {})
+
+    @route("GET", r"/dns/v2/zones/(\d+)/records")
+    def list_records(self, zone_id: str, query: Dict, body: Any) -> Reply:
+        records = list(self.state.records.get(int(zone_id), {}).values())
+        return 200, _paginate(records, query), {}
+
+    @route("POST", r"/dns/v2/zones/(\d+)/records")
+    def create_record(self, zone_id: str, query: Dict, body: Dict) -> Reply:
+        record_id = self.state.next_id()
+        record = {"id": record_id, **body}
+        self.state.records.setdefault(int(zone_id), {})[record_id] = record
+        return 201, record, {}
+
+    @route("PUT", r"/dns/v2/zones/(\d+)/records/(\d+)")
+    def update_record(
+        self, zone_id: str, record_id: str, query: Dict, body: Dict
+    ) -> Reply:
+        record = self.state.records.get(int(zone_id), {}).get(int(record_id))
+        if record is None:
+            return 404, {"error": "Not found"}, {}
+        record.update(body)
+        return 200, record, {}
+
+    @route("DELETE", r"/dns/v2/zones/(\d+)/records/(\d+)")
+    def delete_record(
+        self, zone_id: str, record_id: str, query: Dict, body: Any
+    ) -> Reply:
+        self.state.records.get(int(zone_id), {}).pop(int(record_id), None)
+        return 204, None, {}
+
+    # SSL
+
+    @route("GET", r"/ssl/v1/certificates")
+    def list_certificates(self, query: Dict, body: Any) -> Reply:
+        return 200, _paginate(list(self.state.certificates.values()), query), {}
+
+    @route("GET", r"/ssl/v1/certificates/(\d+)")
+    def get_certificate(self, cert_id: str, query: Dict, body: Any) -> Reply:
+        certificate = self.state.certificates.get(int(cert_id))
+        if certificate is None:
+            return 404, {"error": "Not found"}, {}
+        return 200, certificate, {}
+
+    @route("POST", r"/ssl/v1/certificates/request")
+    def request_certificate(self, query: Dict, body: Dict) -> Reply:
+        cert_id = self.state.next_id()
+        certificate = {
+            "id": cert_id,
+            "name": body["domains"][0],
+            "domains": body["domains"],
+            "status": "pending_validation",
+        }
+        self.state.certificates[cert_id] = certificate
+        return 201, certificate, {}
+
+    # Storage
+
+    @route("GET", r"/storage/v1/buckets")
+    def list_buckets(self, query: Dict, body: Any) -> Reply:
+        return 200, _paginate(list(self.state.buckets.values()), query), {}
+
+    @route("POST", r"/storage/v1/buckets")
+    def create_bucket(self, query: Dict, body: Dict) -> Reply:
+        self.state.add_bucket(body["name"])
+        return 201, self.state.buckets[body["name"]], {}
+
+    @route("GET", r"/storage/v1/buckets/([^/]+)/objects")
+    def list_objects(self, bucket: str, query: Dict, body: Any) -> Reply:
+        prefix = query.get("prefix", "")
+        objects = [
+            _object_meta(key, data)
+            for key, data in self.state.objects.get(bucket, {}).items()
+            if key.startswith(prefix)
+        ]
+        return 200, {"objects": _paginate(objects, query)}, {}
+
+    @route("POST", r"/storage/v1/buckets/([^/]+)/objects/(.+)/uploads")
+    def initiate_upload(self, bucket: str, key: str, query: Dict, body: Any) -> Reply:
+        upload_id = uuid.uuid4().hex
+        self.state.uploads[upload_id] = {}
+        return 201, {"upload_id": upload_id}, {}
+
+    @route(
+        "PUT",
+        r"/storage/v1/buckets/([^/]+)/objects/(.+)/uploads/(\w+)/parts/(\d+)",
+        json_body=False,
+    )
+    def upload_part(
+        self,
+        bucket: str,
+        key: str,
+        upload_id: str,
+        number: str,
+        query: Dict,
+        body: bytes,
+    ) -> Reply:
+        parts = self.state.uploads.get(upload_id)
+        if parts is None:
+            return 404, {"error": "Unknown upload"}, {}
+        parts[int(number)] = body
+        etag = hashlib.md5(body).hexdigest()
+        return 200, {"etag": etag}, {"ETag": f'"{etag}"'}
+
+    @route("POST", r"/storage/v1/buckets/([^/]+)/objects/(.+)/uploads/(\w+)/complete")
+    def complete_upload(
+        self, bucket: str, key: str, upload_id: str, query: Dict, body: Dict
+    ) -> Reply:
+        parts = self.state.uploads.pop(upload_id, None)
+        if parts is None:
+            return 404, {"error": "Unknown upload"}, {}
+        data = b"".join(parts[number] for number in sorted(parts))
+        self.state.put_object(bucket, key, data)
+        return 200, _object_meta(key, data), {}
+
+    @route("DELETE", r"/storage/v1/buckets/([^/]+)/objects/(.+)/uploads/(\w+)")
+    def abort_upload(
+        self, bucket: str, key: str, upload_id: str, query: Dict, body: Any
+    ) -> Reply:
+        self.state.uploads.pop(upload_id, None)
+        return 204, None, {}
+
+    @route("PUT", r"/storage/v1/buckets/([^/]+)/objects/(.+)", json_body=False)
+    def put_object(self, bucket: str, key: str, query: Dict, body: bytes) -> Reply:
+        self.state.put_object(bucket, key, body)
+        return 200, _object_meta(key, body), {}
+
+    @route("HEAD", r"/storage/v1/buckets/([^/]+)/objects/(.+)")
+    def head_object(self, bucket: str, key: str, query: Dict, body: Any) -> Reply:
+        data = self.state.objects.get(bucket, {}).get(key)
+        if data is None:
+            return 404, None, {}
+        return 200, data, {"ETag": f'"{hashlib.md5(data).hexdigest()}"'}
+
+    @route("GET", r"/storage/v1/buckets/([^/]+)/objects/(.+)")
+    def get_object(self, bucket: str, key: str, query: Dict, body: Any) -> Reply:
+        data = self.state.objects.get(bucket, {}).get(key)
+        if data is None:
+            return 404, {"error": "Not found"}, {}
+        return 200, data, {}
+
+    @route("DELETE", r"/storage/v1/buckets/([^/]+)/objects/(.+)")
+    def delete_object(self, bucket: str, key: str, query: Dict, body: Any) -> Reply:
+        self.state.objects.get(bucket, {}).pop(key, None)
+        return 204, None, {}
+
+    # Load balancers
+
+    @route("GET", r"/loadbalancer/v1/loadbalancers")
+    def list_loadbalancers(self, query: Dict, body: Any) -> Reply:
+        return 200, _paginate(list(self.state.loadbalancers.values()), query), {}
+
+    @route("POST", r"/loadbalancer/v1/loadbalancers")
+    def create_loadbalancer(self, query: Dict, body: Dict) -> Reply:
+        lb_id = self.state.next_id()
+        loadbalancer = {"id": lb_id, "status": "active", **body}
+        self.state.loadbalancers[lb_id] = loadbalancer
+        return 201, loadbalancer, {}
+
+    @route("GET", r"/loadbalancer/v1/loadbalancers/(\d+)")
+    def get_loadbalancer(self, lb_id: str, query: Dict, body: Any) -> Reply:
+        loadbalancer = self.state.loadbalancers.get(int(lb_id))
+        if loadbalancer is None:
+            return 404, {"error": "Not found"}, {}
+        return 200, loadbalancer, {}
+
+    @route("POST", r"/loadbalancer/v1/loadbalancers/(\d+)/listeners")
+    def create_listener(self, lb_id: str, query: Dict, body: Dict) -> Reply:
+        return 201, {"id": self.state.next_id(), "status": "active", **body}, {}
+
+    @route("POST", r"/loadbalancer/v1/loadbalancers/(\d+)/pools")
+    def create_pool(self, lb_id: str, query: Dict, body: Dict) -> Reply:
+        pool_id = self.state.next_id()
+        pool = {"id": pool_id, "status": "active", **body}
+        self.state.pools[pool_id] = pool
+        self.state.members[pool_id] = {}
+        return 201, pool, {}
+
+    @route("POST", r"/loadbalancer/v1/loadbalancers/(\d+)/pools/(\d+)/members")
+    def add_member(self, lb_id: str, pool_id: str, query: Dict, body: Dict) -> Reply:
+        member_id = self.state.next_id()
+        member = {"id": member_id, "status": "active", **body}
+        self.state.members.setdefault(int(pool_id), {})[member_id] = member
+        return 201, member, {}
+
+    @route("GET", r"/loadbalancer/v1/loadbalancers/(\d+)/pools/(\d+)/members")
+    def list_members(self, lb_id: str, pool_id: str, query: Dict, body: Any) -> Reply:
+        members = list(self.state.members.get(int(pool_id), {}).values())
+        return 200, _paginate(members, query), {}
+
+    @route("DELETE", r"/loadbalancer/v1/loadbalancers/(\d+)/pools/(\d+)/members/(\d+)")
+    def remove_member(
+        self, lb_id: str, pool_id: str, member_id: str, query: Dict, body: Any
+    ) -> Reply:
+        if self.state.members.get(int(pool_id), {}).pop(int(member_id), None) is None:
+            return 404, {"error": "Not found"}, {}
+        return 204, None, {}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=None)
+    parser.add_argument("--resources", type=int, default=10)
+    parser.add_argument("--records", type=int, default=1000)
+    args = parser.parse_args()
+
+    api = MockGcoreAPI(
+        (args.host, args.port), latency=args.latency, rate_limit=args.rate_limit
+    )
+    api.state.add_resources(args.resources)
+    zone_id = api.state.add_zone("example.com", records=args.records)
+    print(f"Serving mock Gcore API on {api.url} (zone {zone_id})", flush=True)
+    try:
+        api.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        api.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""Benchmark suite for the Gcore API clients against a local mock API.
+
+Runs each benchmark against ``benchmarks/mock_api.py`` and prints the results
+as JSON, so runs can be stored and compared to track regressions::
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --only list --only dns_create --latency 0.02
+    python benchmarks/run.py --baseline results.json --tolerance 0.2
+
+With ``--baseline``, the exit status is 1 if any benchmark's throughput fell
+by more than ``--tolerance`` compared with the baseline run.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mock_api import MockGcoreAPI
+from startup import time_command
+
+from gcore_api.auth import GcoreAuth
+from gcore_api.batch import run_batch
+from gcore_api.cdn import CDNClient
+from gcore_api.dns import DNSClient
+from gcore_api.instrumentation import Instrumentation, Metrics
+from gcore_api.inventory import Inventory
+from gcore_api.loadbalancer import LoadBalancerClient
+from gcore_api.purge import PurgeWaiter
+from gcore_api.storage import StorageClient
+from gcore_api.transport import Transport
+
+DEFAULT_LATENCY = 0.005
+DEFAULT_TOLERANCE = 0.2
+DEFAULT_CLI_RUNS = 5
+
+Result = Dict[str, Any]
+
+
+def result(
+    name: str,
+    seconds: float,
+    ops: int,
+    unit: str,
+    metrics: Optional[Metrics] = None,
+    latencies: Optional[List[float]] = None,
+    **extra: Any,
+) -> Result:
+    """One benchmark result; ``ops_per_second`` is the tracked throughput."""
+    entry: Result = {
+        "name": name,
+        "seconds": round(seconds, 4),
+        "ops": ops,
+        "unit": unit,
+        "ops_per_second": round(ops / seconds, 2) if seconds else None,
+    }
+    if latencies:
+        ordered = sorted(latencies)
+        entry["p50_ms"] = round(statistics.median(ordered) * 1000, 2)
+        entry["p95_ms"] = round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 2)
+    if metrics is not None:
+        snapshot = metrics.snapshot()
+        entry["requests"] = sum(
+            value
+            for key, value in snapshot["counters"].items()
+            if key[0] == "responses"
+        )
+        entry["connection_reuse"] = snapshot["connection_reuse"]
+    entry.update(extra)
+    return entry
+
+
+class Context:
+    """Mock API and a fresh instrumented auth per benchmark."""
+
+    def __init__(self, api: MockGcoreAPI, scale: float, workdir: str):
+        self.api = api
+        self.scale = scale
+        self.workdir = workdir
+
+    def size(self, count: int) -> int:
+        return max(1, int(count * self.scale))
+
+    def auth(self, pool_maxsize: int = 32) -> Tuple[GcoreAuth, Metrics]:
+        metrics = Metrics()
+        transport = Transport(
+            pool_maxsize=pool_maxsize,
+            base_url=self.api.url,
+            cache=None,
+            rate_limiter=None,
+            instrumentation=Instrumentation(metrics=metrics),
+        )
+        return GcoreAuth("benchmark", transport=transport), metrics
+
+
+def bench_list(ctx: Context) -> List[Result]:
+    """List a large DNS zone at once, page by page and streamed."""
+    count = ctx.size(50_000)
+    zone_id = ctx.api.state.add_zone("list.example.com", records=count)
+    results = []
+    for name, call in (
+        ("list.records", lambda client: client.list_records(zone_id)),
+        ("list.records_typed", lambda client: client.list_records(zone_id, True)),
+        (
+            "list.iter_records",
+            lambda client: list(client.iter_records(zone_id, page_size=1000)),
+        ),
+        ("list.stream_records", lambda client: list(client.stream_records(zone_id))),
+    ):
+        auth, metrics = ctx.auth()
+        client = DNSClient(auth)
+        started = time.perf_counter()
+        items = call(client)
+        elapsed = time.perf_counter() - started
+        assert len(items) == count, f"{name} returned {len(items)} of {count}"
+        results.append(result(name, elapsed, count, "records", metrics))
+    return results
+
+
+def bench_dns_create(ctx: Context) -> List[Result]:
+    """Create many DNS records concurrently through the batch runner."""
+    count = ctx.size(2_000)
+    zone_id = ctx.api.state.add_zone("bulk.example.com")
+    operations = (
+        {
+            "op": "dns.create_record",
+            "args": {
+                "zone_id": zone_id,
+                "name": f"host{i}",
+                "type": "A",
+                "content": "192.0.2.1",
+            },
+        }
+        for i in range(count)
+    )
+    auth, metrics = ctx.auth()
+    started = time.perf_counter()
+    outcomes = list(run_batch(auth, operations, max_workers=16))
+    elapsed = time.perf_counter() - started
+    failed = sum(not outcome["ok"] for outcome in outcomes)
+    latencies = [outcome["elapsed"] for outcome in outcomes if outcome["ok"]]
+    return [
+        result(
+            "dns_create.batch",
+            elapsed,
+            count,
+            "records",
+            metrics,
+            latencies,
+            failed=failed,
+        )
+    ]
+
+
+def bench_transfer(ctx: Context) -> List[Result]:
+    """Multipart upload and ranged download throughput."""
+    size = ctx.size(64 * 1024 * 1024)
+    part_size = max(1024 * 1024, size // 8)
+    source = os.path.join(ctx.workdir, "upload.bin")
+    target = os.path.join(ctx.workdir, "download.bin")
+    with open(source, "wb") as f:
+        f.write(os.urandom(size))
+
+    results = []
+    auth, metrics = ctx.auth()
+    client = StorageClient(auth)
+    started = time.perf_counter()
+    client.upload_object("bench", "big.bin", source, part_size=part_size)
+    elapsed = time.perf_counter() - started
+    results.append(result("transfer.multipart_upload", elapsed, size, "bytes", metrics))
+
+    auth, metrics = ctx.auth()
+    client = StorageClient(auth)
+    started = time.perf_counter()
+    client.download_object("bench", "big.bin", target, segment_size=part_size)
+    elapsed = time.perf_counter() - started
+    if os.path.getsize(target) != size:
+        raise AssertionError("Downloaded file size differs from the upload")
+    results.append(result("transfer.ranged_download", elapsed, size, "bytes", metrics))
+    return results
+
+
+def bench_purge(ctx: Context) -> List[Result]:
+    """Fan out a large purge and wait for every task to finish."""
+    count = ctx.size(20_000)
+    resource_id = ctx.api.state.add_resources(1)[0]
+    urls = [f"https://cdn.example.com/assets/{i % 97}/file{i}.js" for i in range(count)]
+    auth, metrics = ctx.auth()
+    client = CDNClient(auth)
+    started = time.perf_counter()
+    batch = client.batch_purge(
+        resource_id, urls, wildcard_threshold=0, max_workers=8, rate=None
+    )
+    submitted = time.perf_counter() - started
+    PurgeWaiter(client, batch.tasks, initial_interval=0.05, max_interval=0.5).wait()
+    elapsed = time.perf_counter() - started
+    return [
+        result(
+            "purge.fan_out",
+            elapsed,
+            count,
+            "urls",
+            metrics,
+            tasks=len(batch.task_ids),
+            failed=len(batch.failed),
+            submit_seconds=round(submitted, 4),
+        )
+    ]
+
+
+def bench_members(ctx: Context) -> List[Result]:
+    """Register a pool's worth of members at once, then scale the pool down."""
+    count = ctx.size(300)
+    auth, metrics = ctx.auth()
+    client = LoadBalancerClient(auth)
+    pool_id = client.create_pool(1, 1, "HTTP")["id"]
+    members = [(f"10.0.{i // 250}.{i % 250 + 1}", 8080) for i in range(count)]
+    started = time.perf_counter()
+    added = client.add_members(1, pool_id, members)
+    elapsed = time.perf_counter() - started
+    results = [
+        result(
+            "members.add", elapsed, count, "members", metrics, failed=len(added.failed)
+        )
+    ]
+
+    auth, metrics = ctx.auth()
+    client = LoadBalancerClient(auth)
+    keep = members[: count // 2]
+    started = time.perf_counter()
+    scaled = client.set_members(1, pool_id, keep)
+    elapsed = time.perf_counter() - started
+    changes = count - len(keep)
+    results.append(
+        result(
+            "members.scale_down",
+            elapsed,
+            changes,
+            "members",
+            metrics,
+            failed=len(scaled.failed),
+        )
+    )
+    return results
+
+
+def bench_topology(ctx: Context) -> List[Result]:
+    """Provision a load balancer with several listeners, pools and members."""
+    listeners = 4
+    members = max(1, ctx.size(25))
+    spec = {
+        "name": "bench",
+        "region": "ed-1",
+        "listeners": [
+            {
+                "protocol": "HTTP",
+                "port": 8000 + i,
+                "pools": [
+                    {"members": [(f"10.{i}.0.{j + 1}", 8080) for j in range(members)]}
+                ],
+            }
+            for i in range(listeners)
+        ],
+    }
+    calls = 1 + listeners * (2 + members)
+    auth, metrics = ctx.auth()
+    client = LoadBalancerClient(auth)
+    started = time.perf_counter()
+    provisioned = client.provision_topology(spec, max_workers=16)
+    elapsed = time.perf_counter() - started
+    return [
+        result(
+            "topology.provision",
+            elapsed,
+            calls,
+            "calls",
+            metrics,
+            failed=len(provisioned.failed) + len(provisioned.skipped),
+        )
+    ]
+
+
+def bench_inventory(ctx: Context) -> List[Result]:
+    """Sync the local inventory, resync it unchanged and query it offline."""
+    zones = 20
+    for i in range(zones):
+        ctx.api.state.add_zone(f"zone{i}.example.com", records=ctx.size(2_000))
+    ctx.api.state.add_resources(ctx.size(1_000))
+    for i in range(4):
+        ctx.api.state.add_bucket(f"bucket{i}", objects=ctx.size(5_000))
+
+    results = []
+    with Inventory(os.path.join(ctx.workdir, "inventory.db")) as store:
+        for name in ("inventory.sync", "inventory.resync"):
+            auth, metrics = ctx.auth()
+            report = store.sync(auth)
+            listings = report.fetched + report.unchanged
+            results.append(
+                result(
+                    name,
+                    report.elapsed,
+                    listings,
+                    "listings",
+                    metrics,
+                    fetched=report.fetched,
+                    failed=len(report.failed),
+                )
+            )
+
+        queries = 1_000
+        latencies = []
+        started = time.perf_counter()
+        for i in range(queries):
+            query_started = time.perf_counter()
+            store.records_by_content(f"192.0.{i // 256 % 256}.{i % 256}")
+            store.resources_by_origin(f"origin{i}.example.com")
+            latencies.append(time.perf_counter() - query_started)
+        elapsed = time.perf_counter() - started
+        results.append(
+            result("inventory.query", elapsed, queries, "queries", latencies=latencies)
+        )
+    return results
+
+
+def bench_cli(ctx: Context, runs: int = DEFAULT_CLI_RUNS) -> List[Result]:
+    """Cold start of the CLI in fresh interpreters."""
+    ctx.api.state.add_resources(10)
+    env = {
+        **os.environ,
+        "GCORE_API_TOKEN": "benchmark",
+        "GCORE_BASE_URL": ctx.api.url,
+    }
+    results = []
+    for name, argv in (("cli.help", ["--help"]), ("cli.cdn_list", ["cdn", "list"])):
+        timings = time_command(argv, env, runs)
+        results.append(result(name, sum(timings), runs, "runs", latencies=timings))
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[[Context], List[Result]]] = {
+    "list": bench_list,
+    "dns_create": bench_dns_create,
+    "transfer": bench_transfer,
+    "purge": bench_purge,
+    "members": bench_members,
+    "topology": bench_topology,
+    "inventory": bench_inventory,
+    "cli": bench_cli,
+}
+
+
+def compare(
+    results: List[Result], baseline: List[Result], tolerance: float
+) -> List[str]:
+    """Names of results whose throughput regressed beyond ``tolerance``."""
+    previous = {entry["name"]: entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        before = previous.get(entry["name"])
+        if not before or not before.get("ops_per_second"):
+            continue
+        ratio = (entry["ops_per_second"] or 0) / before["ops_per_second"]
+        entry["baseline_ratio"] = round(ratio, 3)
+        if ratio < 1 - tolerance:
+            regressions.append(entry["name"])
+    return regressions
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(
+    names: List[str],
+    scale: float = 1.0,
+    latency: float = DEFAULT_LATENCY,
+    rate_limit: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Run the named benchmarks, each against a fresh mock API."""
+    results: List[Result] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in names:
+            with MockGcoreAPI(latency=latency, rate_limit=rate_limit) as api:
+                entries = BENCHMARKS[name](Context(api, scale, workdir))
+            for entry in entries:
+                entry["throttled"] = api.throttled
+            results.extend(entries)
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"scale": scale, "latency": latency, "rate_limit": rate_limit},
+        "results": results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=sorted(BENCHMARKS),
+        help="Run only this benchmark; may be repeated.",
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="Multiplier for workload sizes."
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=DEFAULT_LATENCY,
+        help="Seconds the mock API adds to every request.",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        help="Requests per second the mock API serves before answering 429.",
+    )
+    parser.add_argument("--output", help="Also write the JSON report to this file.")
+    parser.add_argument("--baseline", help="JSON report to compare against.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    report = run_suite(
+        args.only or list(BENCHMARKS),
+        scale=args.scale,
+        latency=args.latency,
+        rate_limit=args.rate_limit,
+    )
+    regressions: List[str] = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(report["results"], baseline, args.tolerance)
+        report["regressions"] = regressions
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Cold-start benchmark for the ``gcore`` CLI.
+
+Runs ``gcore --help`` and ``gcore cdn list`` in fresh interpreters, the latter
+against the local mock API, and fails if the median wall time of either exceeds
+its budget::
+
+    python benchmarks/startup.py --runs 20 --help-budget 0.15 --list-budget 0.4
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from mock_api import MockGcoreAPI
+
+DEFAULT_RUNS = 10
+DEFAULT_HELP_BUDGET = 0.15
+DEFAULT_LIST_BUDGET = 0.4
+
+
+def time_command(args: List[str], env: Dict[str, str], runs: int) -> List[float]:
+    """Wall times of ``runs`` cold invocations of the CLI with ``args``.
+
+    Runs ``python -m gcore_api``, the same entry point as the ``gcore``
+    script, so the daemon check every invocation makes is included.
+    """
+    command = [sys.executable, "-m", "gcore_api", *args]
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--help-budget", type=float, default=DEFAULT_HELP_BUDGET)
+    parser.add_argument("--list-budget", type=float, default=DEFAULT_LIST_BUDGET)
+    args = parser.parse_args()
+
+    api = MockGcoreAPI().start()
+    env = {**os.environ, "GCORE_API_TOKEN": "benchmark", "GCORE_BASE_URL": api.url}
+    # Measure cold starts, not commands forwarded to a running daemon.
+    env.pop("GCORE_DAEMON", None)
+
+    cases: List[Tuple[str, List[str], float]] = [
+        ("gcore --help", ["--help"], args.help_budget),
+        ("gcore cdn list", ["cdn", "list"], args.list_budget),
+    ]
+    over_budget = False
+    try:
+        for name, argv, budget in cases:
+            timings = time_command(argv, env, args.runs)
+            median = statistics.median(timings)
+            status = "ok" if median <= budget else "OVER BUDGET"
+            over_budget |= median > budget
+            print(
+                f"{name:<16} median {median * 1000:7.1f} ms  "
+                f"min {min(timings) * 1000:7.1f} ms  "
+                f"budget {budget * 1000:.0f} ms  {status}"
+            )
+    finally:
+        api.stop()
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
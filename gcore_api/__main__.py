@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+import sys
+
+from .daemon import forward
+
+
+def run() -> None:
+    """Entry point of ``gcore``: forward to the daemon or run locally."""
+    exit_code = forward(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+    from .cli import main
+
+    main(prog_name="gcore")
+
+
+if __name__ == "__main__":
+    run()
@@ -4,23 +4,50 @@ from typing import Dict, Optional
 
 import requests
 
+from .transport import AsyncTransport, Transport
+
 
 class GcoreAuth:
     """Handle authentication for Gcore API."""
 
     BASE_URL = "https://api.gcore.com"
 
-    def __init__(self, api_token: Optional[str] = None):
+    def __init__(
+        self,
+        api_token: Optional[str] = None,
+        transport: Optional[Transport] = None,
+        async_transport: Optional[AsyncTransport] = None,
+    ):
         """Initialize auth handler.
 
         Args:
             api_token: Permanent API token. If not provided, will try to get from environment.
+            transport: HTTP transport shared by clients using this auth. A pooled
+                default transport is created on first use if not provided.
+            async_transport: Async HTTP transport shared by async clients using
+                this auth. Created on first use if not provided.
         """
         self.api_token = api_token or os.environ.get("GCORE_API_TOKEN")
         if not self.api_token:
             raise ValueError(
                 "API token must be provided or set in GCORE_API_TOKEN environment variable"
             )
+        self._transport = transport
+        self._async_transport = async_transport
+
+    @property
+    def transport(self) -> Transport:
+        """Get the HTTP transport shared by all clients using this auth."""
+        if self._transport is None:
+            self._transport = Transport()
+        return self._transport
+
+    @property
+    def async_transport(self) -> AsyncTransport:
+        """Get the async HTTP transport shared by all async clients."""
+        if self._async_transport is None:
+            self._async_transport = AsyncTransport()
+        return self._async_transport
 
     def get_headers(self) -> Dict[str, str]:
         """Get headers for API requests."""
@@ -32,7 +59,7 @@ class GcoreAuth:
     def validate_token(self) -> bool:
         """Validate the API token by making a test request."""
         try:
-            response = requests.get(
+            response = self.transport.get(
                 f"{self.BASE_URL}/iam/v1/auth/jwt/verify", headers=self.get_headers()
             )
             if response.status_code == 401:
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+import dataclasses
+import importlib
+import json
+import queue
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .models import Model
+from .ratelimit import DEFAULT_SERVICE
+
+if TYPE_CHECKING:
+    from .auth import GcoreAuth
+
+DEFAULT_BATCH_WORKERS = 8
+
+# Services operations can address, by the prefix used in ``op``.
+SERVICES: Dict[str, str] = {
+    "cdn": "gcore_api.cdn:CDNClient",
+    "dns": "gcore_api.dns:DNSClient",
+    "loadbalancer": "gcore_api.loadbalancer:LoadBalancerClient",
+    "ssl": "gcore_api.ssl:SSLClient",
+    "storage": "gcore_api.storage:StorageClient",
+}
+
+
+# Lazy listing methods; batch results are whole values, so use ``list_*``.
+UNSUPPORTED_PREFIXES = ("_", "iter_", "stream_")
+
+
+class BatchError(ValueError):
+    """An operation that cannot be run, e.g. malformed or unknown."""
+
+
+def _jsonable(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, Model):
+        return value.to_dict()
+    if isinstance(value, (list, Iterator)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    return value
+
+
+class _Clients:
+    """Lazily built clients sharing one auth and pooled transport."""
+
+    def __init__(self, auth: "GcoreAuth"):
+        self.auth = auth
+        self._clients: Dict[str, Any] = {}
+
+    def method(self, op: str) -> Tuple[str, Any]:
+        service, _, name = op.partition(".")
+        if service not in SERVICES:
+            raise BatchError(f"Unknown service {service!r} in op {op!r}")
+        if not name or name.startswith(UNSUPPORTED_PREFIXES):
+            raise BatchError(f"Unsupported op {op!r}")
+        if service not in self._clients:
+            module_name, _, class_name = SERVICES[service].partition(":")
+            client_class = getattr(importlib.import_module(module_name), class_name)
+            self._clients[service] = client_class(self.auth)
+        method = getattr(self._clients[service], name, None)
+        if not callable(method):
+            raise BatchError(f"Unknown op {op!r}")
+        return service, method
+
+
+def _parse(operation: Union[str, Mapping]) -> Dict:
+    if isinstance(operation, str):
+        try:
+            operation = json.loads(operation)
+        except ValueError as e:
+            raise BatchError(f"Invalid JSON: {e}")
+    if not isinstance(operation, Mapping) or not isinstance(operation.get("op"), str):
+        raise BatchError('Operation must be an object with an "op" name')
+    args = operation.get("args", {})
+    if not isinstance(args, (Mapping, list)):
+        raise BatchError('"args" must be an object or a list')
+    return dict(operation)
+
+
+def _call(method: Any, args: Union[Mapping, list]) -> Tuple[Any, float]:
+    started = time.monotonic()
+    result = method(*args) if isinstance(args, list) else method(**args)
+    return _jsonable(result), time.monotonic() - started
+
+
+def run_batch(
+    auth: "GcoreAuth",
+    operations: Iterable[Union[str, Mapping]],
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+    service_limits: Optional[Mapping[str, int]] = None,
+) -> Iterator[Dict]:
+    """Run a stream of client operations concurrently.
+
+    Each operation names a client method as ``<service>.<method>`` and gives
+    its arguments as an object of keyword arguments or a list of positional
+    ones, with an optional ``id`` echoed in its result::
+
+        {"id": 1, "op": "dns.create_record",
+         "args": {"zone_id": 7, "name": "www", "type": "A", "content": "192.0.2.1"}}
+
+    Operations are consumed lazily and at most ``max_workers`` are in flight,
+    so arbitrarily long streams run in constant memory. Results are yielded in
+    completion order; a failed operation yields an error result and does not
+    stop the others.
+
+    Args:
+        auth: Auth shared by all clients, and with it the pooled transport.
+        operations: Operations as JSON strings (e.g. lines of a JSON Lines
+            file) or mappings.
+        max_workers: Maximum number of operations in flight.
+        service_limits: Maximum concurrent operations per service, e.g.
+            ``{"cdn": 2}``. A ``*`` key limits every other service;
+            without one, services without a limit may use every worker.
+
+    Yields:
+        Results with the operation's 1-based ``index``, ``id`` and ``op``,
+        ``ok``, and either ``result`` and ``elapsed`` or ``error``.
+    """
+    limits = dict(service_limits or {})
+    default_limit = limits.pop(DEFAULT_SERVICE, max_workers)
+    clients = _Clients(auth)
+    results: "queue.Queue[Dict]" = queue.Queue()
+    executors: Dict[str, ThreadPoolExecutor] = {}
+    in_flight = 0
+
+    def on_done(base: Dict, future: "Future[Tuple[Any, float]]") -> None:
+        try:
+            result, elapsed = future.result()
+        except Exception as e:
+            results.put({**base, "ok": False, "error": str(e) or type(e).__name__})
+        else:
+            results.put({**base, "ok": True, "result": result, "elapsed": elapsed})
+
+    try:
+        for index, raw in enumerate(operations, 1):
+            while in_flight >= max_workers:
+                yield results.get()
+                in_flight -= 1
+            while True:
+                try:
+                    ready = results.get_nowait()
+                except queue.Empty:
+                    break
+                in_flight -= 1
+                yield ready
+
+            base: Dict[str, Any] = {"index": index}
+            try:
+                operation = _parse(raw)
+                base.update(id=operation.get("id"), op=operation["op"])
+                service, method = clients.method(operation["op"])
+            except BatchError as e:
+                yield {**base, "ok": False, "error": str(e)}
+                continue
+
+            if service not in executors:
+                workers = min(max_workers, int(limits.get(service, default_limit)))
+                executors[service] = ThreadPoolExecutor(
+                    max_workers=max(1, workers), thread_name_prefix=f"batch-{service}"
+                )
+            future = executors[service].submit(_call, method, operation.get("args", {}))
+            future.add_done_callback(partial(on_done, base))
+            in_flight += 1
+
+        while in_flight:
+            yield results.get()
+            in_flight -= 1
+    finally:
+        for executor in executors.values():
+            executor.shutdown(wait=True, cancel_futures=True)
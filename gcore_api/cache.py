@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Union
+from urllib.parse import quote, urlencode, urlsplit
+
+from .logger import logger
+from .ratelimit import DEFAULT_SERVICE, parse_service_map
+
+CACHE_ENV = "GCORE_CACHE"
+CACHE_TTL_ENV = "GCORE_CACHE_TTL"
+DEFAULT_CACHE_TTL = 60.0
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+# Methods that may change what a GET returns and so invalidate cached entries.
+UNSAFE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+# Request headers of status endpoints that are polled until they change.
+NO_CACHE = {"Cache-Control": "no-cache"}
+
+# Entry files are prefixed with a character ``quote`` always escapes, so they
+# can never collide with the directory of a URL path segment.
+_ENTRY_PREFIX = "="
+# Headers describing the raw transfer rather than the decoded body we store.
+_TRANSFER_HEADERS = frozenset(
+    {"content-encoding", "content-length", "transfer-encoding"}
+)
+
+
+def _split_path(url: str) -> List[str]:
+    parts = urlsplit(url)
+    return [parts.netloc] + [s for s in parts.path.split("/") if s]
+
+
+def _is_related(path: List[str], other: List[str]) -> bool:
+    """Whether one path is an ancestor of, or equal to, the other."""
+    common = min(len(path), len(other))
+    return path[:common] == other[:common]
+
+
+def bypasses_cache(headers: Optional[Mapping[str, str]]) -> bool:
+    """Whether a request sent ``Cache-Control: no-cache``.
+
+    Such requests are never answered from a fresh entry, though a cached
+    entry may still be revalidated with a conditional request.
+    """
+    return any(
+        name.lower() == "cache-control" and "no-cache" in value.lower()
+        for name, value in (headers or {}).items()
+    )
+
+
+@dataclass
+class CacheEntry:
+    """A cached ``200`` response to a GET request."""
+
+    url: str
+    status: int
+    headers: Dict[str, str]
+    content: bytes
+    expires: float
+    path: List[str] = field(default_factory=list)
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        lowered = {k.lower(): v for k, v in self.headers.items()}
+        if "etag" in lowered:
+            headers["If-None-Match"] = lowered["etag"]
+        if "last-modified" in lowered:
+            headers["If-Modified-Since"] = lowered["last-modified"]
+        return headers
+
+
+class ResponseCache:
+    """Cache of GET responses shared by the transports.
+
+    Entries live in a size-capped in-memory LRU and, optionally, in an on-disk
+    store so repeated CLI invocations share them. Each entry is fresh for the
+    TTL of its endpoint; stale entries carrying an ``ETag`` or
+    ``Last-Modified`` are revalidated with a conditional request instead of
+    being fetched again. Requests sent with ``Cache-Control: no-cache``, such
+    as status polls, always reach the server. Any unsafe request invalidates
+    cached entries on its URL, its ancestors (e.g. the list it belongs to)
+    and its descendants.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Mapping[str, float]] = None,
+        default_ttl: float = DEFAULT_CACHE_TTL,
+        max_size: int = DEFAULT_CACHE_SIZE,
+        directory: Optional[Union[str, Path]] = None,
+    ):
+        """Initialize response cache.
+
+        Args:
+            ttls: Seconds entries stay fresh, by endpoint. Keys are a service
+                name or a longer path prefix, e.g. ``cdn`` or
+                ``dns/v2/zones``; the longest match wins and ``*`` applies to
+                every other endpoint. A TTL of ``0`` disables caching.
+            default_ttl: TTL of endpoints matching no key.
+            max_size: Maximum total body size kept in memory, in bytes.
+            directory: Directory of the on-disk store. Memory only if not set.
+        """
+        self.ttls = dict(ttls or {})
+        self.default_ttl = self.ttls.pop(DEFAULT_SERVICE, default_ttl)
+        self.max_size = max_size
+        self.directory = Path(directory) if directory else None
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._counters: Counter = Counter()
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """Build a cache from ``GCORE_CACHE``, if set.
+
+        ``GCORE_CACHE=memory`` caches within the process and
+        ``GCORE_CACHE=disk`` also persists entries under the config directory
+        (``~/.config/gcore/cache``). ``GCORE_CACHE_TTL`` sets TTLs in the
+        ``service=seconds`` format of ``GCORE_RATE_LIMIT``, e.g.
+        ``ssl=600,dns=300,*=30``.
+        """
+        mode = os.environ.get(CACHE_ENV, "").lower()
+        if mode in ("", "0", "off", "false", "no"):
+            return None
+        ttl_spec = os.environ.get(CACHE_TTL_ENV)
+        ttls = parse_service_map(ttl_spec) if ttl_spec else None
+        directory = None
+        if mode == "disk":
+            from .config import Config
+
+            directory = Config().config_dir / "cache"
+        return cls(ttls, directory=directory)
+
+    @property
+    def metrics(self) -> Dict[str, int]:
+        """Snapshot of cache counters.
+
+        Keys are ``hits``, ``misses``, ``revalidated`` (stale entries
+        confirmed by a ``304``), ``stores`` and ``invalidations``.
+        """
+        with self._lock:
+            return dict(self._counters)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] += 1
+
+    def ttl_for(self, url: str) -> float:
+        """TTL of the endpoint ``url`` belongs to."""
+        segments = urlsplit(url).path.strip("/").split("/")
+        for end in range(len(segments), 0, -1):
+            ttl = self.ttls.get("/".join(segments[:end]))
+            if ttl is not None:
+                return ttl
+        return self.default_ttl
+
+    def key(
+        self,
+        url: str,
+        params: Any = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> str:
+        """Cache key of a GET request.
+
+        Includes the query and the ``Authorization`` header, so different
+        tokens never share entries.
+        """
+        if isinstance(params, Mapping):
+            params = sorted(params.items())
+        query = urlencode(params or [], doseq=True)
+        auth = (headers or {}).get("Authorization", "")
+        material = f"{url}\n{query}\n{auth}".encode()
+        return hashlib.sha256(material).hexdigest()
+
+    def _entry_dir(self, path: List[str]) -> Path:
+        assert self.directory is not None
+        safe = [quote(s, safe="").replace(".", "%2E") for s in path]
+        return self.directory.joinpath(*safe)
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        size = len(entry.content)
+        if size > self.max_size:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old.content)
+            self._entries[key] = entry
+            self._size += size
+            while self._size > self.max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.content)
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._size -= len(entry.content)
+
+    def _read(self, path: Path) -> Optional[CacheEntry]:
+        try:
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                content = f.read()
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(
+            url=meta["url"],
+            status=meta["status"],
+            headers=meta["headers"],
+            content=content,
+            expires=meta["expires"],
+            path=_split_path(meta["url"]),
+        )
+
+    def _write(self, key: str, entry: CacheEntry) -> None:
+        directory = self._entry_dir(entry.path)
+        meta = {
+            "url": entry.url,
+            "status": entry.status,
+            "headers": entry.headers,
+            "expires": entry.expires,
+        }
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(json.dumps(meta).encode() + b"\n")
+                f.write(entry.content)
+            os.replace(tmp, directory / f"{_ENTRY_PREFIX}{key}")
+        except OSError as e:
+            logger.debug(f"Could not write cache entry for {entry.url}: {e}")
+
+    def get(self, key: str, url: str, no_cache: bool = False) -> Optional[CacheEntry]:
+        """Look up the entry for a request, fresh or stale.
+
+        Stale entries without validators are dropped and not returned. With
+        ``no_cache``, only entries that can be revalidated are returned and
+        none counts as a hit.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None and self.directory is not None:
+            entry = self._read(
+                self._entry_dir(_split_path(url)) / f"{_ENTRY_PREFIX}{key}"
+            )
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is None:
+            self._count("misses")
+            return None
+        if no_cache and not entry.validators:
+            self._count("misses")
+            return None
+        if entry.fresh and not no_cache:
+            self._count("hits")
+        elif not entry.validators:
+            self._forget(key)
+            self._count("misses")
+            return None
+        return entry
+
+    def store(
+        self,
+        key: str,
+        url: str,
+        status: int,
+        headers: Mapping[str, str],
+        content: bytes,
+    ) -> Optional[CacheEntry]:
+        """Cache a GET response, if it is cacheable.
+
+        Only ``200`` responses to endpoints with a positive TTL are cached,
+        and never ones marked ``Cache-Control: no-store``.
+        """
+        ttl = self.ttl_for(url)
+        cache_control = headers.get("Cache-Control", "")
+        if status != 200 or ttl <= 0 or "no-store" in cache_control.lower():
+            return None
+        entry = CacheEntry(
+            url=url,
+            status=status,
+            headers={
+                k: v for k, v in headers.items() if k.lower() not in _TRANSFER_HEADERS
+            },
+            content=content,
+            expires=time.time() + ttl,
+            path=_split_path(url),
+        )
+        self._remember(key, entry)
+        if self.directory is not None:
+            self._write(key, entry)
+        self._count("stores")
+        return entry
+
+    def revalidated(
+        self, key: str, entry: CacheEntry, headers: Mapping[str, str]
+    ) -> CacheEntry:
+        """Refresh a stale entry after the server answered ``304``."""
+        updated = dict(entry.headers)
+        for name in ("ETag", "Last-Modified"):
+            if name in headers:
+                updated[name] = headers[name]
+        entry = CacheEntry(
+            url=entry.url,
+            status=entry.status,
+            headers=updated,
+            content=entry.content,
+            expires=time.time() + self.ttl_for(entry.url),
+            path=entry.path,
+        )
+        self._remember(key, entry)
+        if self.directory is not None:
+            self._write(key, entry)
+        self._count("revalidated")
+        return entry
+
+    def invalidate(self, url: str) -> None:
+        """Drop entries affected by a change to ``url``.
+
+        Removes entries for ``url`` itself, its ancestors such as the
+        collection listing it, and its descendants.
+        """
+        path = _split_path(url)
+        with self._lock:
+            stale = [k for k, e in self._entries.items() if _is_related(path, e.path)]
+            for key in stale:
+                self._size -= len(self._entries.pop(key).content)
+        if self.directory is not None:
+            shutil.rmtree(self._entry_dir(path), ignore_errors=True)
+            for end in range(1, len(path)):
+                directory = self._entry_dir(path[:end])
+                try:
+                    names = os.listdir(directory)
+                except OSError:
+                    continue
+                for name in names:
+                    if name.startswith(_ENTRY_PREFIX):
+                        try:
+                            os.unlink(directory / name)
+                        except OSError:
+                            pass
+        self._count("invalidations")
+
+    def clear(self) -> None:
+        """Drop every entry, including the on-disk store."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
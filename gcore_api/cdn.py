@@ -1,8 +1,19 @@
-from typing import Dict, List
-
-import requests
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 
 from .auth import GcoreAuth
+from .cache import NO_CACHE
+from .jsonstream import stream_items
+from .models import CDNResource
+from .pagination import DEFAULT_PAGE_SIZE, iter_items
+from .purge import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_PURGE_RATE,
+    DEFAULT_PURGE_WORKERS,
+    DEFAULT_WILDCARD_THRESHOLD,
+    PurgeBatch,
+    batch_purge,
+)
+from .transport import AsyncTransport, Transport
 
 
 class CDNClient:
@@ -10,20 +21,39 @@ class CDNClient:
 
     BASE_URL = "https://api.gcore.com/cdn/v1"
 
-    def __init__(self, auth: GcoreAuth):
+    def __init__(self, auth: GcoreAuth, transport: Optional[Transport] = None):
         self.auth = auth
+        self.transport = transport or auth.transport
 
-    def list_resources(self) -> List[Dict]:
-        """List all CDN resources."""
-        response = requests.get(
+    def list_resources(
+        self, typed: bool = False
+    ) -> Union[List[Dict], List[CDNResource]]:
+        """List all CDN resources, as ``CDNResource`` models if ``typed``."""
+        response = self.transport.get(
             f"{self.BASE_URL}/resources", headers=self.auth.get_headers()
         )
         response.raise_for_status()
-        return response.json()
+        items = response.json()
+        return CDNResource.from_json_list(items) if typed else items
+
+    def iter_resources(self, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Dict]:
+        """Lazily iterate over all CDN resources, page by page."""
+        return iter_items(
+            self.transport,
+            f"{self.BASE_URL}/resources",
+            self.auth.get_headers,
+            page_size=page_size,
+        )
+
+    def stream_resources(self) -> Iterator[Dict]:
+        """Stream all CDN resources, parsing the response incrementally."""
+        return stream_items(
+            self.transport, f"{self.BASE_URL}/resources", self.auth.get_headers
+        )
 
     def get_resource(self, resource_id: int) -> Dict:
         """Get details of a specific CDN resource."""
-        response = requests.get(
+        response = self.transport.get(
             f"{self.BASE_URL}/resources/{resource_id}", headers=self.auth.get_headers()
         )
         response.raise_for_status()
@@ -37,7 +67,7 @@ class CDNClient:
         if cname:
             data["cname"] = cname
 
-        response = requests.post(
+        response = self.transport.post(
             f"{self.BASE_URL}/resources", headers=self.auth.get_headers(), json=data
         )
         response.raise_for_status()
@@ -46,7 +76,18 @@ class CDNClient:
     def purge_url(self, resource_id: int, urls: List[str]) -> Dict:
         """Purge specific URLs from CDN cache."""
         data = {"urls": urls}
-        response = requests.post(
+        response = self.transport.post(
+            f"{self.BASE_URL}/resources/{resource_id}/purge",
+            headers=self.auth.get_headers(),
+            json=data,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def purge_paths(self, resource_id: int, paths: List[str]) -> Dict:
+        """Purge cached content matching path patterns, e.g. ``/images/*``."""
+        data = {"paths": paths}
+        response = self.transport.post(
             f"{self.BASE_URL}/resources/{resource_id}/purge",
             headers=self.auth.get_headers(),
             json=data,
@@ -54,9 +95,32 @@ class CDNClient:
         response.raise_for_status()
         return response.json()
 
+    def batch_purge(
+        self,
+        resource_id: int,
+        urls: Iterable[str],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        wildcard_threshold: int = DEFAULT_WILDCARD_THRESHOLD,
+        max_workers: int = DEFAULT_PURGE_WORKERS,
+        rate: Optional[float] = DEFAULT_PURGE_RATE,
+    ) -> PurgeBatch:
+        """Purge any number of URLs with de-duplication, wildcards and chunking.
+
+        See :func:`gcore_api.purge.batch_purge`.
+        """
+        return batch_purge(
+            self,
+            resource_id,
+            urls,
+            chunk_size=chunk_size,
+            wildcard_threshold=wildcard_threshold,
+            max_workers=max_workers,
+            rate=rate,
+        )
+
     def purge_all(self, resource_id: int) -> Dict:
         """Purge all cached content for a resource."""
-        response = requests.post(
+        response = self.transport.post(
             f"{self.BASE_URL}/resources/{resource_id}/purge/all",
             headers=self.auth.get_headers(),
         )
@@ -65,9 +129,92 @@ class CDNClient:
 
     def get_purge_status(self, resource_id: int, task_id: str) -> Dict:
         """Get the status of a purge task."""
-        response = requests.get(
+        response = self.transport.get(
             f"{self.BASE_URL}/resources/{resource_id}/purge/{task_id}",
+            headers={**self.auth.get_headers(), **NO_CACHE},
+        )
+        response.raise_for_status()
+        return response.json()
+
+
+class AsyncCDNClient:
+    """Asyncio client for Gcore CDN API operations."""
+
+    BASE_URL = CDNClient.BASE_URL
+
+    def __init__(self, auth: GcoreAuth, transport: Optional[AsyncTransport] = None):
+        self.auth = auth
+        self.transport = transport or auth.async_transport
+
+    async def list_resources(
+        self, typed: bool = False
+    ) -> Union[List[Dict], List[CDNResource]]:
+        """List all CDN resources, as ``CDNResource`` models if ``typed``."""
+        response = await self.transport.get(
+            f"{self.BASE_URL}/resources", headers=self.auth.get_headers()
+        )
+        response.raise_for_status()
+        items = response.json()
+        return CDNResource.from_json_list(items) if typed else items
+
+    async def get_resource(self, resource_id: int) -> Dict:
+        """Get details of a specific CDN resource."""
+        response = await self.transport.get(
+            f"{self.BASE_URL}/resources/{resource_id}", headers=self.auth.get_headers()
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def create_resource(
+        self, origin: str, cname: Optional[str] = None, ssl: bool = True
+    ) -> Dict:
+        """Create a new CDN resource."""
+        data = {"origin": origin, "ssl": ssl}
+        if cname:
+            data["cname"] = cname
+
+        response = await self.transport.post(
+            f"{self.BASE_URL}/resources", headers=self.auth.get_headers(), json=data
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def purge_url(self, resource_id: int, urls: List[str]) -> Dict:
+        """Purge specific URLs from CDN cache."""
+        data = {"urls": urls}
+        response = await self.transport.post(
+            f"{self.BASE_URL}/resources/{resource_id}/purge",
             headers=self.auth.get_headers(),
+            json=data,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def purge_paths(self, resource_id: int, paths: List[str]) -> Dict:
+        """Purge cached content matching path patterns, e.g. ``/images/*``."""
+        data = {"paths": paths}
+        response = await self.transport.post(
+            f"{self.BASE_URL}/resources/{resource_id}/purge",
+            headers=self.auth.get_headers(),
+            json=data,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def purge_all(self, resource_id: int) -> Dict:
+        """Purge all cached content for a resource."""
+        response = await self.transport.post(
+            f"{self.BASE_URL}/resources/{resource_id}/purge/all",
+            headers=self.auth.get_headers(),
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def get_purge_status(self, resource_id: int, task_id: str) -> Dict:
+        """Get the status of a purge task."""
+        response = await self.transport.get(
+            f"{self.BASE_URL}/resources/{resource_id}/purge/{task_id}",
+            headers={**self.auth.get_headers(), **NO_CACHE},
         )
         response.raise_for_status()
         return response.json()
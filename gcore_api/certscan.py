@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+import base64
+import binascii
+import bisect
+import hashlib
+import json
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .logger import logger
+
+if TYPE_CHECKING:
+    from .ssl import SSLClient
+
+CERT_CACHE_ENV = "GCORE_CERT_CACHE"
+CERT_CACHE_NAME = "certificates.json"
+DEFAULT_SCAN_WORKERS = 16
+DEFAULT_EXPIRY_DAYS = 30
+
+# Fields of the certificate API holding the PEM, a fingerprint, the expiry and
+# the covered domains, in order of preference.
+PEM_FIELDS = ("certificate", "cert", "pem")
+FINGERPRINT_FIELDS = ("fingerprint", "sha256_fingerprint")
+EXPIRY_FIELDS = ("expires_at", "validity_not_after", "not_after")
+DOMAIN_FIELDS = ("domains", "sans", "subject_alternative_names")
+
+_PEM = re.compile(
+    r"-----BEGIN CERTIFICATE-----(.+?)-----END CERTIFICATE-----", re.DOTALL
+)
+_OID_COMMON_NAME = bytes.fromhex("550403")
+_OID_SUBJECT_ALT_NAME = bytes.fromhex("551d11")
+_TAG_SEQUENCE = 0x30
+_TAG_OID = 0x06
+_TAG_OCTET_STRING = 0x04
+_TAG_UTC_TIME = 0x17
+_TAG_GENERALIZED_TIME = 0x18
+_TAG_VERSION = 0xA0
+_TAG_EXTENSIONS = 0xA3
+_TAG_DNS_NAME = 0x82
+
+
+def _tlv(data: bytes, offset: int) -> Tuple[int, int, int]:
+    """Tag, value start and value end of the DER element at ``offset``."""
+    try:
+        tag, length = data[offset], data[offset + 1]
+        offset += 2
+        if length & 0x80:
+            size = length & 0x7F
+            length = int.from_bytes(data[offset : offset + size], "big")
+            offset += size
+    except IndexError:
+        raise ValueError("Truncated DER element") from None
+    if offset + length > len(data):
+        raise ValueError("Truncated DER element")
+    return tag, offset, offset + length
+
+
+def _children(data: bytes, start: int, end: int) -> Iterator[Tuple[int, int, int]]:
+    while start < end:
+        tag, value_start, value_end = _tlv(data, start)
+        yield tag, value_start, value_end
+        start = value_end
+
+
+def _parse_time(tag: int, value: bytes) -> datetime:
+    text = value.decode("ascii").rstrip("Z")
+    if tag == _TAG_UTC_TIME:
+        # RFC 5280: two-digit years 50-99 are 19xx, 00-49 are 20xx.
+        text = ("19" if int(text[:2]) >= 50 else "20") + text
+    return datetime.strptime(text[:14], "%Y%m%d%H%M%S").replace(tzinfo=timezone.utc)
+
+
+def _common_names(data: bytes, start: int, end: int) -> List[str]:
+    names = []
+    for _, set_start, set_end in _children(data, start, end):
+        for _, attr_start, attr_end in _children(data, set_start, set_end):
+            (_, oid_start, oid_end), (_, value_start, value_end) = _children(
+                data, attr_start, attr_end
+            )
+            if data[oid_start:oid_end] == _OID_COMMON_NAME:
+                names.append(data[value_start:value_end].decode("utf-8"))
+    return names
+
+
+def _dns_names(data: bytes, start: int, end: int) -> List[str]:
+    """DNS names in the subjectAltName extension of an extensions block."""
+    ((_, seq_start, seq_end),) = _children(data, start, end)
+    for _, ext_start, ext_end in _children(data, seq_start, seq_end):
+        fields = list(_children(data, ext_start, ext_end))
+        oid, value = fields[0], fields[-1]
+        if oid[0] != _TAG_OID or data[oid[1] : oid[2]] != _OID_SUBJECT_ALT_NAME:
+            continue
+        if value[0] != _TAG_OCTET_STRING:
+            raise ValueError("Malformed subjectAltName extension")
+        ((_, names_start, names_end),) = _children(data, value[1], value[2])
+        return [
+            data[name_start:name_end].decode("ascii")
+            for tag, name_start, name_end in _children(data, names_start, names_end)
+            if tag == _TAG_DNS_NAME
+        ]
+    return []
+
+
+def pem_to_der(pem: str) -> bytes:
+    """DER bytes of the first certificate in a PEM bundle.
+
+    Raises:
+        ValueError: If there is no PEM certificate.
+    """
+    match = _PEM.search(pem)
+    if not match:
+        raise ValueError("No PEM certificate found")
+    try:
+        return base64.b64decode("".join(match.group(1).split()), validate=True)
+    except binascii.Error as e:
+        raise ValueError(f"Invalid PEM certificate: {e}") from None
+
+
+def parse_certificate(der: bytes) -> Tuple[datetime, List[str]]:
+    """Expiry and DNS names of a DER-encoded X.509 certificate.
+
+    Only the fields needed for expiry tracking are decoded: ``notAfter`` and
+    the subjectAltName DNS names, falling back to the subject common name
+    for certificates without SANs.
+
+    Raises:
+        ValueError: If the certificate is malformed.
+    """
+    try:
+        tag, start, end = _tlv(der, 0)
+        tbs = next(_children(der, start, end))
+        fields = list(_children(der, tbs[1], tbs[2]))
+        if fields[0][0] == _TAG_VERSION:
+            fields = fields[1:]
+        # serial, signature algorithm, issuer, validity, subject, public key
+        validity, subject = fields[3], fields[4]
+        _, (time_tag, time_start, time_end) = _children(der, validity[1], validity[2])
+        if time_tag not in (_TAG_UTC_TIME, _TAG_GENERALIZED_TIME):
+            raise ValueError("Malformed validity")
+        not_after = _parse_time(time_tag, der[time_start:time_end])
+        names: List[str] = []
+        for ext_tag, ext_start, ext_end in fields[6:]:
+            if ext_tag == _TAG_EXTENSIONS:
+                names = _dns_names(der, ext_start, ext_end)
+        if not names:
+            names = _common_names(der, subject[1], subject[2])
+    except (IndexError, StopIteration, UnicodeDecodeError) as e:
+        raise ValueError(f"Malformed certificate: {e}") from None
+    if tag != _TAG_SEQUENCE:
+        raise ValueError("Malformed certificate")
+    return not_after, names
+
+
+def _parse_timestamp(value: Any) -> datetime:
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, timezone.utc)
+    parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _first(item: Mapping[str, Any], fields: Iterable[str]) -> Any:
+    return next((item[name] for name in fields if item.get(name)), None)
+
+
+@dataclass(frozen=True)
+class CertificateInfo:
+    """Expiry and covered domains of one certificate."""
+
+    id: Any
+    name: Optional[str]
+    fingerprint: str
+    not_after: datetime
+    domains: Tuple[str, ...]
+
+    def days_left(self, now: Optional[datetime] = None) -> float:
+        now = now or datetime.now(timezone.utc)
+        return (self.not_after - now).total_seconds() / 86400
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "fingerprint": self.fingerprint,
+            "not_after": self.not_after.isoformat(),
+            "days_left": round(self.days_left(), 1),
+            "domains": list(self.domains),
+        }
+
+
+class ExpiryIndex:
+    """Certificates sorted by expiry, with a domain lookup table.
+
+    Both queries are answered from precomputed structures: a bisect over the
+    sorted expiries and a dictionary of covered names.
+    """
+
+    def __init__(self, certificates: Iterable[CertificateInfo]):
+        self.certificates = sorted(certificates, key=lambda cert: cert.not_after)
+        self._expiries = [cert.not_after for cert in self.certificates]
+        self._by_domain: Dict[str, List[CertificateInfo]] = {}
+        for cert in self.certificates:
+            for name in {name.lower() for name in cert.domains}:
+                self._by_domain.setdefault(name, []).append(cert)
+
+    def __len__(self) -> int:
+        return len(self.certificates)
+
+    def __iter__(self) -> Iterator[CertificateInfo]:
+        return iter(self.certificates)
+
+    def expiring_within(
+        self, days: float, now: Optional[datetime] = None
+    ) -> List[CertificateInfo]:
+        """Certificates expiring in the next ``days``, soonest first.
+
+        Certificates that have already expired are included.
+        """
+        now = now or datetime.now(timezone.utc)
+        end = bisect.bisect_right(self._expiries, now + timedelta(days=days))
+        return self.certificates[:end]
+
+    def covering(self, domain: str) -> List[CertificateInfo]:
+        """Certificates covering ``domain``, longest-lived first."""
+        domain = domain.lower().rstrip(".")
+        matches = list(self._by_domain.get(domain, []))
+        if "." in domain:
+            matches += self._by_domain.get("*." + domain.split(".", 1)[1], [])
+        return sorted(set(matches), key=lambda cert: cert.not_after, reverse=True)
+
+
+def cert_cache_path() -> Path:
+    """Scan cache, from ``GCORE_CERT_CACHE`` or the config directory."""
+    default = Path.home() / ".config" / "gcore" / CERT_CACHE_NAME
+    return Path(os.environ.get(CERT_CACHE_ENV) or default)
+
+
+def _read_cache(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _index_from(
+    entries: Iterable[Tuple[Any, Optional[str], str]], parsed: Dict[str, Dict]
+) -> ExpiryIndex:
+    """Index ``(id, name, fingerprint)`` entries using cached parse results."""
+    return ExpiryIndex(
+        CertificateInfo(
+            cert_id,
+            name,
+            fingerprint,
+            datetime.fromisoformat(parsed[fingerprint]["not_after"]),
+            tuple(parsed[fingerprint]["domains"]),
+        )
+        for cert_id, name, fingerprint in entries
+        if fingerprint in parsed
+    )
+
+
+def load_last_index(cache_path: Union[str, Path, None] = None) -> Optional[ExpiryIndex]:
+    """The index built by the last scan, or ``None`` if there was none."""
+    cache = _read_cache(Path(cache_path) if cache_path else cert_cache_path())
+    if "certificates" not in cache:
+        return None
+    entries = [
+        (entry["id"], entry.get("name"), entry["fingerprint"])
+        for entry in cache["certificates"]
+    ]
+    return _index_from(entries, cache.get("parsed", {}))
+
+
+class CertificateScanner:
+    """Build an :class:`ExpiryIndex` of all certificates with few API calls.
+
+    Certificate details are fetched concurrently. Parsed expiry and domain
+    data is cached on disk by certificate fingerprint, so an unchanged
+    certificate is parsed once; when the listing itself carries a cached
+    fingerprint, its details are not fetched at all. The last index is kept
+    too, for answering queries offline with :func:`load_last_index`.
+    """
+
+    def __init__(
+        self,
+        client: "SSLClient",
+        cache_path: Union[str, Path, None] = None,
+        max_workers: int = DEFAULT_SCAN_WORKERS,
+    ):
+        """Initialize certificate scanner.
+
+        Args:
+            client: SSL client used to list and fetch certificates.
+            cache_path: Cache file. Defaults to :func:`cert_cache_path`.
+            max_workers: Number of certificate details fetched concurrently.
+        """
+        self.client = client
+        self.cache_path = Path(cache_path) if cache_path else cert_cache_path()
+        self.max_workers = max_workers
+        self.parsed: Dict[str, Dict[str, Any]] = _read_cache(self.cache_path).get(
+            "parsed", {}
+        )
+        # Details fetched by the last scan.
+        self.fetched = 0
+
+    def _save(self, index: ExpiryIndex) -> None:
+        certificates = [
+            {"id": cert.id, "name": cert.name, "fingerprint": cert.fingerprint}
+            for cert in index
+        ]
+        live = {cert.fingerprint for cert in index}
+        cache = {
+            "certificates": certificates,
+            "parsed": {fp: data for fp, data in self.parsed.items() if fp in live},
+        }
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(cache, f)
+            os.replace(tmp, self.cache_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _parse(self, detail: Dict) -> str:
+        """Fingerprint of a certificate's details, parsing them on a cache miss.
+
+        Raises:
+            ValueError: If the details hold neither a PEM nor an expiry.
+        """
+        pem = _first(detail, PEM_FIELDS)
+        if pem:
+            der = pem_to_der(pem)
+            fingerprint = hashlib.sha256(der).hexdigest()
+            if fingerprint not in self.parsed:
+                not_after, domains = parse_certificate(der)
+                self.parsed[fingerprint] = {
+                    "not_after": not_after.isoformat(),
+                    "domains": domains,
+                }
+            return fingerprint
+
+        expiry = _first(detail, EXPIRY_FIELDS)
+        if expiry is None:
+            raise ValueError(f"Certificate {detail.get('id')} has no expiry")
+        domains = list(_first(detail, DOMAIN_FIELDS) or [])
+        if not domains and detail.get("name"):
+            domains = [detail["name"]]
+        key = json.dumps([expiry, domains], sort_keys=True)
+        fingerprint = hashlib.sha256(key.encode()).hexdigest()
+        if fingerprint not in self.parsed:
+            self.parsed[fingerprint] = {
+                "not_after": _parse_timestamp(expiry).isoformat(),
+                "domains": domains,
+            }
+        return fingerprint
+
+    def _listed_fingerprint(self, item: Mapping[str, Any]) -> Optional[str]:
+        fingerprint = _first(item, FINGERPRINT_FIELDS)
+        if fingerprint is None:
+            return None
+        return str(fingerprint).replace(":", "").lower()
+
+    def scan(self, save: bool = True) -> ExpiryIndex:
+        """List certificates, fetch uncached details concurrently and index them.
+
+        Certificates whose details cannot be fetched or parsed are left out
+        of the index and logged.
+        """
+        certificates: Iterable[Mapping[str, Any]] = self.client.list_certificates()
+        known: Dict[Any, str] = {}
+        missing = []
+        for item in certificates:
+            fingerprint = self._listed_fingerprint(item)
+            if fingerprint is not None and fingerprint in self.parsed:
+                known[item["id"]] = fingerprint
+            else:
+                missing.append(item)
+
+        self.fetched = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self.client.get_certificate, item["id"])
+                for item in missing
+            ]
+            for item, future in zip(missing, futures):
+                try:
+                    fingerprint = self._parse(future.result())
+                except Exception as e:
+                    logger.warning(f"Skipping certificate {item['id']}: {e}")
+                    continue
+                self.fetched += 1
+                listed = self._listed_fingerprint(item)
+                if listed is not None and listed != fingerprint:
+                    self.parsed[listed] = self.parsed[fingerprint]
+                    fingerprint = listed
+                known[item["id"]] = fingerprint
+
+        index = _index_from(
+            (
+                (item["id"], item.get("name"), known[item["id"]])
+                for item in certificates
+                if item["id"] in known
+            ),
+            self.parsed,
+        )
+        if save:
+            self._save(index)
+        return index
@@ -1,11 +1,134 @@
 #!/usr/bin/env python3
+import importlib
+import json
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
 import click
 
-from .auth import GcoreAuth
-from .cdn import CDNClient
-from .config import Config
-from .dns import DNSClient
-from .loadbalancer import LoadBalancerClient
-from .logger import logger, setup_logger
-from .ssl import SSLClient
-from .storage import StorageClient
+from .logger import setup_logger
+
+if TYPE_CHECKING:
+    from .auth import GcoreAuth
+
+# Subcommands are imported only when invoked, so ``gcore --help`` and every
+# command avoid loading the service modules, ``requests`` and ``yaml`` they
+# do not use. Each entry maps a name to its ``module:attribute`` and the short
+# help shown in the command list.
+SUBCOMMANDS: Dict[str, Tuple[str, str]] = {
+    "batch": (
+        "gcore_api.commands.batch:batch",
+        "Run JSON Lines operations concurrently.",
+    ),
+    "cdn": ("gcore_api.commands.cdn:cdn", "Manage CDN resources."),
+    "daemon": (
+        "gcore_api.commands.daemon:daemon",
+        "Run commands in a warm background process.",
+    ),
+    "dns": ("gcore_api.commands.dns:dns", "Manage DNS zones and records."),
+    "inventory": (
+        "gcore_api.commands.inventory:inventory",
+        "Query a local snapshot of all resources offline.",
+    ),
+    "ssl": ("gcore_api.commands.ssl:ssl", "Manage SSL certificates."),
+    "storage": (
+        "gcore_api.commands.storage:storage",
+        "Manage storage buckets and objects.",
+    ),
+}
+
+
+class LazyGroup(click.Group):
+    """Click group whose subcommands are imported on first use."""
+
+    def __init__(
+        self,
+        *args: Any,
+        lazy_subcommands: Optional[Dict[str, Tuple[str, str]]] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted([*super().list_commands(ctx), *self.lazy_subcommands])
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name in self.lazy_subcommands:
+            return self._load(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load(self, cmd_name: str) -> click.Command:
+        import_path = self.lazy_subcommands[cmd_name][0]
+        module_name, _, attr = import_path.partition(":")
+        command = getattr(importlib.import_module(module_name), attr)
+        if not isinstance(command, click.Command):
+            raise ValueError(f"{import_path} is not a click command")
+        return command
+
+    def format_commands(
+        self, ctx: click.Context, formatter: click.HelpFormatter
+    ) -> None:
+        """List commands without importing the lazy ones."""
+        rows = [(name, help) for name, (_, help) in self.lazy_subcommands.items()]
+        for name in super().list_commands(ctx):
+            command = super().get_command(ctx, name)
+            if command is not None and not command.hidden:
+                rows.append((name, command.get_short_help_str(formatter.width)))
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(sorted(rows))
+
+
+# Set by the daemon so every command it runs reuses one warm auth and transport.
+shared_auth: Optional["GcoreAuth"] = None
+
+
+def get_auth() -> "GcoreAuth":
+    """Build auth from the configured or environment API token."""
+    if shared_auth is not None:
+        return shared_auth
+
+    from .auth import GcoreAuth
+    from .config import Config
+
+    try:
+        return GcoreAuth(Config().load_token())
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+
+stream_option = click.option(
+    "--stream",
+    is_flag=True,
+    help="Print items as JSON Lines as they arrive, in constant memory.",
+)
+
+
+def echo_json(items: Iterable[Any], stream: bool = False) -> None:
+    """Print items as a JSON array, or as JSON Lines as they arrive."""
+    if not stream:
+        click.echo(json.dumps(list(items), indent=2))
+        return
+    for item in items:
+        click.echo(json.dumps(item))
+
+
+@click.group(cls=LazyGroup, lazy_subcommands=SUBCOMMANDS)
+@click.option("--verbose", "-v", is_flag=True, help="Enable debug logging.")
+def main(verbose: bool) -> None:
+    """Command-line interface for the Gcore API."""
+    setup_logger(verbose)
+
+
+@main.command()
+@click.argument("token")
+def configure(token: str) -> None:
+    """Save the API token used by all commands."""
+    from .config import Config
+
+    Config().save_token(token)
+    click.echo("Configuration saved.")
+
+
+if __name__ == "__main__":
+    main()
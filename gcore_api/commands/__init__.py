@@ -0,0 +1,2 @@
+#!/usr/bin/env python3
+"""Click command groups of the ``gcore`` CLI, imported lazily by ``cli``."""
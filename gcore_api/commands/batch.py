@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+import json
+from typing import IO, Optional
+
+import click
+
+from ..batch import DEFAULT_BATCH_WORKERS, run_batch
+from ..cli import get_auth
+from ..ratelimit import parse_service_map
+
+
+@click.command()
+@click.argument("file", type=click.File("r"), default="-")
+@click.option(
+    "--workers",
+    default=DEFAULT_BATCH_WORKERS,
+    show_default=True,
+    help="Maximum operations in flight.",
+)
+@click.option("--limits", help="Concurrent operations per service, e.g. 'cdn=2,*=4'.")
+def batch(file: IO[str], workers: int, limits: Optional[str]) -> None:
+    """Run JSON Lines operations from FILE (default stdin) concurrently.
+
+    Each line is an object such as {"op": "dns.create_record", "args": {...}}
+    naming a client method and its arguments, with an optional "id". Results
+    are written to stdout as JSON Lines in completion order.
+    """
+    service_limits = None
+    if limits:
+        try:
+            service_limits = {
+                service: int(limit)
+                for service, limit in parse_service_map(limits).items()
+            }
+        except ValueError:
+            raise click.BadParameter(limits, param_hint="--limits")
+
+    operations = (line for line in file if line.strip())
+    total = failed = 0
+    for result in run_batch(
+        get_auth(), operations, max_workers=workers, service_limits=service_limits
+    ):
+        total += 1
+        failed += not result["ok"]
+        click.echo(json.dumps(result, default=str))
+    click.echo(f"{total - failed} succeeded, {failed} failed", err=True)
+    if failed:
+        raise SystemExit(1)
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+import click
+
+from ..cli import echo_json, get_auth, stream_option
+
+
+@click.group()
+def cdn() -> None:
+    """Manage CDN resources."""
+
+
+@cdn.command("list")
+@stream_option
+def cdn_list(stream: bool) -> None:
+    """List CDN resources as JSON."""
+    from ..cdn import CDNClient
+
+    client = CDNClient(get_auth())
+    if stream:
+        echo_json(client.stream_resources(), stream=True)
+    else:
+        echo_json(client.list_resources())
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+import click
+
+from ..daemon import DEFAULT_IDLE_TIMEOUT, request, socket_path, start
+
+
+@click.group()
+def daemon() -> None:
+    """Run commands in a warm background process.
+
+    Start the daemon and set GCORE_DAEMON=1 to have gcore forward commands to
+    it. Commands run one at a time, with the caller's working directory and
+    GCORE_* environment.
+    """
+
+
+@daemon.command("start")
+@click.option(
+    "--idle-timeout",
+    default=DEFAULT_IDLE_TIMEOUT,
+    show_default=True,
+    help="Exit after this many idle seconds; 0 to never exit.",
+)
+def daemon_start(idle_timeout: float) -> None:
+    """Start the daemon in the background."""
+    try:
+        status = request({"op": "ping"}, timeout=1.0)
+    except OSError:
+        pass
+    else:
+        click.echo(f"Daemon already running (pid {status['pid']})")
+        return
+    try:
+        pid = start(idle_timeout=idle_timeout or None)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Daemon started (pid {pid}) on {socket_path()}")
+
+
+@daemon.command("stop")
+def daemon_stop() -> None:
+    """Stop the daemon."""
+    try:
+        request({"op": "stop"}, timeout=5.0)
+    except OSError:
+        raise click.ClickException("Daemon is not running")
+    click.echo("Daemon stopped")
+
+
+@daemon.command("status")
+def daemon_status() -> None:
+    """Show whether the daemon is running."""
+    try:
+        status = request({"op": "ping"}, timeout=1.0)
+    except OSError:
+        raise click.ClickException("Daemon is not running")
+    click.echo(
+        f"Daemon running (pid {status['pid']}), up {status['uptime']:.0f}s, "
+        f"{status['commands']} commands served"
+    )
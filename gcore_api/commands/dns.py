@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+import sys
+from typing import Optional
+
+import click
+
+from ..cli import echo_json, get_auth, stream_option
+from ..logger import logger
+from ..zone import DEFAULT_ZONE_WORKERS, load_zone_spec
+
+
+@click.group()
+def dns() -> None:
+    """Manage DNS zones and records."""
+
+
+@dns.command("records")
+@click.argument("zone_id", type=int)
+@stream_option
+def dns_records(zone_id: int, stream: bool) -> None:
+    """List the records of ZONE_ID as JSON."""
+    from ..dns import DNSClient
+
+    client = DNSClient(get_auth())
+    if stream:
+        echo_json(client.stream_records(zone_id), stream=True)
+    else:
+        echo_json(client.list_records(zone_id))
+
+
+@dns.command("apply")
+@click.argument("zone_file", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--zone-id", type=int, help="Zone to apply to; overrides zone_id in the file."
+)
+@click.option(
+    "--no-delete", is_flag=True, help="Keep existing records missing from the file."
+)
+@click.option(
+    "--workers",
+    default=DEFAULT_ZONE_WORKERS,
+    show_default=True,
+    help="Number of concurrent record changes.",
+)
+@click.option("--dry-run", is_flag=True, help="Only show what would change.")
+def dns_apply(
+    zone_file: str,
+    zone_id: Optional[int],
+    no_delete: bool,
+    workers: int,
+    dry_run: bool,
+) -> None:
+    """Make a zone's records match ZONE_FILE (YAML)."""
+    try:
+        file_zone_id, records = load_zone_spec(zone_file)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    zone_id = zone_id or file_zone_id
+    if not zone_id:
+        raise click.UsageError("Set zone_id in the file or pass --zone-id.")
+
+    from ..dns import DNSClient
+
+    client = DNSClient(get_auth())
+    result = client.apply_zone(
+        zone_id, records, delete=not no_delete, max_workers=workers, dry_run=dry_run
+    )
+    plan = result.plan
+    if dry_run:
+        for record in plan.adds:
+            click.echo(f"+ {record['name']} {record['type']} {record['content']}")
+        for _, record in plan.updates:
+            click.echo(f"~ {record['name']} {record['type']} {record['content']}")
+        for current in plan.deletes:
+            click.echo(f"- {current['name']} {current['type']} {current['content']}")
+        click.echo(
+            f"{len(plan.adds)} to add, {len(plan.updates)} to update, "
+            f"{len(plan.deletes)} to delete, {plan.unchanged} unchanged"
+        )
+    else:
+        click.echo(
+            f"Added {result.added}, updated {result.updated}, "
+            f"deleted {result.deleted}, unchanged {plan.unchanged}"
+        )
+    for label, error in result.failed:
+        logger.error(f"Failed to apply {label}: {error}")
+    if result.failed:
+        raise click.ClickException(f"{len(result.failed)} record changes failed")
+
+
+@dns.command("import")
+@click.argument("zone_id", type=int)
+@click.argument("zone_file", type=click.Path(exists=True, dir_okay=False))
+@click.option("--origin", help="Origin for relative names if the file has none.")
+@click.option(
+    "--replace", is_flag=True, help="Delete existing records missing from the file."
+)
+@click.option(
+    "--workers",
+    default=DEFAULT_ZONE_WORKERS,
+    show_default=True,
+    help="Number of concurrent record changes.",
+)
+@click.option("--dry-run", is_flag=True, help="Only show what would change.")
+def dns_import(
+    zone_id: int,
+    zone_file: str,
+    origin: Optional[str],
+    replace: bool,
+    workers: int,
+    dry_run: bool,
+) -> None:
+    """Import a BIND ZONE_FILE into ZONE_ID."""
+    from ..dns import DNSClient
+
+    client = DNSClient(get_auth())
+    try:
+        result = client.import_zone_file(
+            zone_id,
+            zone_file,
+            origin=origin,
+            replace=replace,
+            max_workers=workers,
+            dry_run=dry_run,
+        )
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    plan = result.plan
+    if dry_run:
+        click.echo(
+            f"{len(plan.adds)} to add, {len(plan.updates)} to update, "
+            f"{len(plan.deletes)} to delete, {plan.unchanged} unchanged"
+        )
+    else:
+        click.echo(
+            f"Added {result.added}, updated {result.updated}, "
+            f"deleted {result.deleted}, unchanged {plan.unchanged}"
+        )
+    for label, error in result.failed:
+        logger.error(f"Failed to import {label}: {error}")
+    if result.failed:
+        raise click.ClickException(f"{len(result.failed)} record changes failed")
+
+
+@dns.command("export")
+@click.argument("zone_id", type=int)
+@click.argument("zone_file", type=click.Path(dir_okay=False, allow_dash=True))
+@click.option("--origin", help="Write an $ORIGIN line for this domain.")
+def dns_export(zone_id: int, zone_file: str, origin: Optional[str]) -> None:
+    """Export ZONE_ID as a BIND zone file to ZONE_FILE ('-' for stdout)."""
+    from ..dns import DNSClient
+
+    client = DNSClient(get_auth())
+    if zone_file == "-":
+        count = client.export_zone_file(zone_id, sys.stdout, origin)
+    else:
+        count = client.export_zone_file(zone_id, zone_file, origin)
+        click.echo(f"Exported {count} records to {zone_file}")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+from typing import Optional
+
+import click
+
+from ..cli import echo_json, get_auth
+from ..inventory import DEFAULT_INVENTORY_WORKERS, Inventory
+
+
+@click.group()
+def inventory() -> None:
+    """Query a local snapshot of all resources offline.
+
+    The snapshot is stored in GCORE_INVENTORY, by default
+    ~/.config/gcore/inventory.db.
+    """
+
+
+@inventory.command("sync")
+@click.option(
+    "--workers",
+    default=DEFAULT_INVENTORY_WORKERS,
+    show_default=True,
+    help="Number of listings fetched concurrently.",
+)
+@click.option("--full", is_flag=True, help="Refetch everything, not only changes.")
+def inventory_sync(workers: int, full: bool) -> None:
+    """Fetch all services and store what changed since the last sync."""
+    with Inventory() as store:
+        report = store.sync(get_auth(), max_workers=workers, full=full)
+    counts = ", ".join(f"{count} {table}" for table, count in report.counts.items())
+    click.echo(
+        f"{report.fetched} listings updated, {report.unchanged} unchanged "
+        f"in {report.elapsed:.1f}s: {counts}"
+    )
+    for url, error in report.failed:
+        click.echo(f"Failed {url}: {error}", err=True)
+    if report.failed:
+        raise SystemExit(1)
+
+
+@inventory.command("find")
+@click.option("--origin", help="CDN resources pulling from this origin.")
+@click.option("--cname", help="CDN resources served under this CNAME.")
+@click.option("--record-name", help="DNS records with this name.")
+@click.option("--content", help="DNS records pointing at this value, e.g. an IP.")
+@click.option("--domain", help="Certificates covering this domain.")
+@click.option("--object", "object_name", help="Storage objects with this key.")
+@click.option("--prefix", is_flag=True, help="Match --object as a key prefix.")
+def inventory_find(
+    origin: Optional[str],
+    cname: Optional[str],
+    record_name: Optional[str],
+    content: Optional[str],
+    domain: Optional[str],
+    object_name: Optional[str],
+    prefix: bool,
+) -> None:
+    """Look entities up in the local inventory and print them as JSON."""
+    criteria = {
+        "origin": origin,
+        "cname": cname,
+        "record_name": record_name,
+        "content": content,
+        "domain": domain,
+        "object": object_name,
+    }
+    given = {name: value for name, value in criteria.items() if value is not None}
+    if len(given) != 1:
+        raise click.UsageError(
+            "Pass exactly one of --origin, --cname, --record-name, --content, "
+            "--domain or --object."
+        )
+
+    ((name, value),) = given.items()
+    with Inventory() as store:
+        if name == "origin":
+            items = store.resources_by_origin(value)
+        elif name == "cname":
+            items = store.resources_by_cname(value)
+        elif name == "record_name":
+            items = store.records_by_name(value)
+        elif name == "content":
+            items = store.records_by_content(value)
+        elif name == "domain":
+            items = store.certificates_for_domain(value)
+        else:
+            items = store.find_objects(value, prefix=prefix)
+    echo_json(items)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+import json
+from typing import IO, TYPE_CHECKING, Iterable, Optional, Tuple
+
+import click
+
+from ..certscan import (
+    DEFAULT_EXPIRY_DAYS,
+    DEFAULT_SCAN_WORKERS,
+    ExpiryIndex,
+    load_last_index,
+)
+from ..cli import echo_json, get_auth
+from ..issuance import DEFAULT_ISSUE_RATE, DEFAULT_ISSUE_WORKERS
+
+if TYPE_CHECKING:
+    from ..issuance import IssueResult
+
+
+@click.group()
+def ssl() -> None:
+    """Manage SSL certificates."""
+
+
+offline_option = click.option(
+    "--offline", is_flag=True, help="Answer from the last scan without the API."
+)
+workers_option = click.option(
+    "--workers",
+    default=DEFAULT_SCAN_WORKERS,
+    show_default=True,
+    help="Number of certificate details fetched concurrently.",
+)
+
+
+def load_index(offline: bool, workers: int) -> ExpiryIndex:
+    """Scan certificates, or load the last scan if ``offline``."""
+    if offline:
+        index = load_last_index()
+        if index is None:
+            raise click.ClickException("No previous scan; run without --offline.")
+        return index
+
+    from ..ssl import SSLClient
+
+    return SSLClient(get_auth()).scan_certificates(max_workers=workers)
+
+
+@ssl.command("expiring")
+@click.option(
+    "--days",
+    default=DEFAULT_EXPIRY_DAYS,
+    show_default=True,
+    help="Report certificates expiring within this many days.",
+)
+@offline_option
+@workers_option
+def ssl_expiring(days: float, offline: bool, workers: int) -> None:
+    """List certificates expiring soon, soonest first, as JSON."""
+    index = load_index(offline, workers)
+    echo_json(cert.to_dict() for cert in index.expiring_within(days))
+
+
+@ssl.command("covers")
+@click.argument("domain")
+@offline_option
+@workers_option
+def ssl_covers(domain: str, offline: bool, workers: int) -> None:
+    """List certificates covering DOMAIN, longest-lived first, as JSON."""
+    index = load_index(offline, workers)
+    echo_json(cert.to_dict() for cert in index.covering(domain))
+
+
+def echo_results(results: Iterable["IssueResult"]) -> None:
+    """Print issuance results as JSON Lines and exit non-zero unless all are
+    valid."""
+    counts = {"valid": 0, "failed": 0, "pending": 0}
+    for result in results:
+        counts[result.status] += 1
+        click.echo(json.dumps(result.to_dict(), default=str))
+    click.echo(", ".join(f"{n} {status}" for status, n in counts.items()), err=True)
+    if counts["pending"]:
+        click.echo("Resume with 'gcore ssl track CERT_ID...'.", err=True)
+    if counts["failed"] or counts["pending"]:
+        raise SystemExit(1)
+
+
+timeout_option = click.option(
+    "--timeout", type=float, help="Stop waiting after this many seconds."
+)
+
+
+@ssl.command("issue")
+@click.argument("file", type=click.File("r"), default="-")
+@click.option(
+    "--method",
+    type=click.Choice(["dns", "http"]),
+    default="dns",
+    show_default=True,
+    help="Domain validation method.",
+)
+@click.option(
+    "--workers",
+    default=DEFAULT_ISSUE_WORKERS,
+    show_default=True,
+    help="Maximum API calls in flight.",
+)
+@click.option(
+    "--rate",
+    default=DEFAULT_ISSUE_RATE,
+    show_default=True,
+    help="Maximum certificate requests per second.",
+)
+@timeout_option
+def ssl_issue(
+    file: IO[str], method: str, workers: int, rate: float, timeout: Optional[float]
+) -> None:
+    """Request certificates for the domain sets in FILE (default stdin).
+
+    Each line holds the domains of one certificate, separated by spaces or
+    commas. Results are written to stdout as JSON Lines as each certificate
+    validates or fails. Certificates still validating at --timeout are
+    written with status "pending" and their cert_id.
+    """
+    from ..ssl import SSLClient
+
+    domain_sets = [line for line in file if line.strip()]
+    if not domain_sets:
+        raise click.ClickException("No domains given")
+    client = SSLClient(get_auth())
+    try:
+        results = client.issue_certificates(
+            domain_sets, method, max_workers=workers, rate=rate, timeout=timeout
+        )
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    echo_results(results)
+
+
+@ssl.command("track")
+@click.argument("cert_ids", nargs=-1, type=int, required=True)
+@timeout_option
+def ssl_track(cert_ids: Tuple[int, ...], timeout: Optional[float]) -> None:
+    """Wait for the validation of requested certificates CERT_IDS.
+
+    Results are written to stdout as JSON Lines as each certificate
+    validates or fails, as for 'gcore ssl issue'.
+    """
+    from ..ssl import SSLClient
+
+    echo_results(SSLClient(get_auth()).track_validations(cert_ids, timeout=timeout))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+import json
+from typing import Optional
+
+import click
+
+from ..cli import echo_json, get_auth, stream_option
+from ..logger import logger
+from ..sync import DEFAULT_SYNC_WORKERS, sync_directory
+
+
+@click.group()
+def storage() -> None:
+    """Manage storage buckets and objects."""
+
+
+@storage.command("ls")
+@click.argument("bucket")
+@click.option("--prefix", help="Only list objects under this prefix.")
+@stream_option
+def storage_ls(bucket: str, prefix: Optional[str], stream: bool) -> None:
+    """List the objects in BUCKET as JSON."""
+    from ..storage import StorageClient
+
+    client = StorageClient(get_auth())
+    if stream:
+        echo_json(client.stream_objects(bucket, prefix=prefix), stream=True)
+    else:
+        click.echo(json.dumps(client.list_objects(bucket, prefix=prefix), indent=2))
+
+
+@storage.command("sync")
+@click.argument(
+    "local_dir", type=click.Path(exists=True, file_okay=False, dir_okay=True)
+)
+@click.argument("bucket")
+@click.option("--prefix", default="", help="Object name prefix to sync under.")
+@click.option(
+    "--delete", is_flag=True, help="Delete remote objects not present locally."
+)
+@click.option(
+    "--checksum", is_flag=True, help="Compare same-sized files by MD5 instead of mtime."
+)
+@click.option(
+    "--workers",
+    default=DEFAULT_SYNC_WORKERS,
+    show_default=True,
+    help="Number of concurrent transfers.",
+)
+@click.option("--dry-run", is_flag=True, help="Only show what would change.")
+def storage_sync(
+    local_dir: str,
+    bucket: str,
+    prefix: str,
+    delete: bool,
+    checksum: bool,
+    workers: int,
+    dry_run: bool,
+) -> None:
+    """Upload changed files from LOCAL_DIR to BUCKET."""
+    from ..storage import StorageClient
+
+    client = StorageClient(get_auth())
+    report = sync_directory(
+        client,
+        local_dir,
+        bucket,
+        prefix=prefix,
+        delete=delete,
+        checksum=checksum,
+        max_workers=workers,
+        dry_run=dry_run,
+    )
+    action = "Would upload" if dry_run else "Uploaded"
+    click.echo(
+        f"{action} {report.uploaded} objects ({report.uploaded_bytes} bytes), "
+        f"deleted {report.deleted}, unchanged {report.unchanged}"
+    )
+    if not dry_run:
+        click.echo(
+            f"{report.objects_per_second:.1f} objects/s, "
+            f"{report.bytes_per_second / 1024 / 1024:.2f} MiB/s "
+            f"in {report.elapsed:.1f}s"
+        )
+    for name, error in report.failed:
+        logger.error(f"Failed to sync {name}: {error}")
+    if report.failed:
+        raise click.ClickException(f"{len(report.failed)} objects failed to sync")
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+import codecs
+import io
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, Union
+
+# Only the standard library is imported at load time, so forwarding a command
+# to the daemon costs little more than starting the interpreter.
+
+DAEMON_ENV = "GCORE_DAEMON"
+SOCKET_ENV = "GCORE_DAEMON_SOCKET"
+SOCKET_NAME = "daemon.sock"
+LOG_NAME = "daemon.log"
+DEFAULT_IDLE_TIMEOUT = 30 * 60.0
+START_TIMEOUT = 10.0
+CONNECT_TIMEOUT = 1.0
+REPLY_TIMEOUT = 5.0
+POLL_INTERVAL = 0.5
+# Variables forwarded with each command and applied while it runs.
+ENV_PREFIX = "GCORE_"
+# Commands that manage the daemon itself or read the caller's stdin always run
+# in the calling process.
+LOCAL_COMMANDS = frozenset({"batch", "daemon", "ssl issue"})
+
+
+def _config_dir() -> Path:
+    # Same location as Config.config_dir, without importing yaml.
+    return Path.home() / ".config" / "gcore"
+
+
+def socket_path() -> Path:
+    """Socket the daemon listens on, from ``GCORE_DAEMON_SOCKET`` or the
+    config directory."""
+    return Path(os.environ.get(SOCKET_ENV) or _config_dir() / SOCKET_NAME)
+
+
+def _connect(path: Optional[Union[str, Path]], timeout: float) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(str(path or socket_path()))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def request(
+    message: Dict[str, Any],
+    path: Optional[Union[str, Path]] = None,
+    timeout: float = REPLY_TIMEOUT,
+) -> Dict[str, Any]:
+    """Send one control message to the daemon and return its reply.
+
+    Raises:
+        OSError: If no daemon is listening on the socket or it does not reply
+            within ``timeout`` seconds.
+    """
+    with _connect(path, timeout) as sock, sock.makefile("rwb") as f:
+        f.write(json.dumps(message).encode() + b"\n")
+        f.flush()
+        reply = f.readline()
+    if not reply:
+        raise ConnectionError("Daemon closed the connection")
+    message = json.loads(reply)
+    return message
+
+
+def command_env() -> Dict[str, str]:
+    """The ``GCORE_*`` variables of this process, forwarded with a command."""
+    return {k: v for k, v in os.environ.items() if k.startswith(ENV_PREFIX)}
+
+
+def runs_locally(argv: List[str]) -> bool:
+    """Whether a command line names one of ``LOCAL_COMMANDS``.
+
+    Global and group options such as ``-v`` may come before a subcommand;
+    they are all flags, so the arguments not starting with ``-`` name it.
+    """
+    words = [arg for arg in argv if not arg.startswith("-")][:2]
+    return any(" ".join(words[:n]) in LOCAL_COMMANDS for n in (1, 2))
+
+
+def forward(argv: List[str], path: Optional[Union[str, Path]] = None) -> Optional[int]:
+    """Run a command in the daemon if daemon mode is enabled.
+
+    Daemon mode is enabled with ``GCORE_DAEMON=1``. The command runs with this
+    process's working directory and ``GCORE_*`` environment, and its output
+    is relayed as it is written, followed by its exit code.
+
+    Returns:
+        The command's exit code, or ``None`` if the command should run
+        locally because daemon mode is off or no daemon is listening.
+    """
+    if os.environ.get(DAEMON_ENV, "").lower() in ("", "0", "off", "false", "no"):
+        return None
+    if runs_locally(argv):
+        return None
+    message = {"op": "run", "argv": argv, "cwd": os.getcwd(), "env": command_env()}
+    streams = {"stdout": sys.stdout, "stderr": sys.stderr}
+    try:
+        sock = _connect(path, CONNECT_TIMEOUT)
+    except OSError:
+        return None
+    with sock, sock.makefile("rwb") as f:
+        try:
+            f.write(json.dumps(message).encode() + b"\n")
+            f.flush()
+            sock.settimeout(REPLY_TIMEOUT)
+            accepted = f.readline()
+        except socket.timeout:
+            # The command may still run later, so do not run it here as well.
+            sys.stderr.write(
+                "Error: gcore daemon is not responding; "
+                "stop it or unset GCORE_DAEMON\n"
+            )
+            return 1
+        except OSError:
+            return None
+        if not accepted:
+            return None
+        # The command itself may take as long as it needs.
+        sock.settimeout(None)
+        for line in f:
+            reply = json.loads(line)
+            if "exit_code" in reply:
+                return int(reply["exit_code"])
+            for name, stream in streams.items():
+                if name in reply:
+                    stream.write(reply[name])
+                    stream.flush()
+    streams["stderr"].write("Error: gcore daemon closed the connection\n")
+    return 1
+
+
+class _Relay(io.RawIOBase):
+    """Binary stream that sends everything written to it as text messages."""
+
+    def __init__(self, send: Callable[[Dict[str, Any]], None], name: str):
+        self.send = send
+        self.name = name
+        self.decoder = codecs.getincrementaldecoder("utf-8")("replace")
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        text = self.decoder.decode(bytes(data))
+        if text:
+            self.send({self.name: text})
+        return len(data)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "DaemonServer"
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        lock = threading.Lock()
+        gone = threading.Event()
+
+        def send(message: Dict[str, Any]) -> None:
+            # A caller that went away does not stop its command; the rest of
+            # the output is dropped.
+            with lock:
+                if gone.is_set():
+                    return
+                try:
+                    self.wfile.write(json.dumps(message).encode() + b"\n")
+                    self.wfile.flush()
+                except OSError:
+                    gone.set()
+
+        try:
+            message = json.loads(line)
+            if message.get("op") == "run":
+                send({"accepted": True})
+                exit_code = self.server.run_command(
+                    message["argv"], send, message.get("cwd"), message.get("env")
+                )
+                reply: Dict[str, Any] = {"exit_code": exit_code}
+            else:
+                reply = self.server.dispatch(message)
+        except ValueError as e:
+            reply = {"error": str(e)}
+        send(reply)
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server running forwarded ``gcore`` commands.
+
+    The server process keeps the parsed config, a warm ``GcoreAuth`` with its
+    pooled connections and response cache for each distinct ``GCORE_*``
+    environment it has seen, and every imported module alive between
+    commands.
+
+    Each connection is handled in its own thread, but commands run one at a
+    time: the working directory and environment they are given are process
+    wide. A caller waits for the commands ahead of it; status and stop
+    requests are answered right away. Each command may still fan out over
+    the shared transport's connection pool.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        idle_timeout: Optional[float] = DEFAULT_IDLE_TIMEOUT,
+    ):
+        """Initialize daemon server.
+
+        Args:
+            path: Socket path. A stale socket file is replaced.
+            idle_timeout: Seconds without requests after which the daemon
+                exits; ``None`` to run until stopped.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            self.path.unlink()
+        self.idle_timeout = idle_timeout
+        self.timeout = POLL_INTERVAL
+        self.started = time.time()
+        self.last_active = time.monotonic()
+        self.commands = 0
+        self.auths: Dict[FrozenSet[Tuple[str, str]], Any] = {}
+        self._run_lock = threading.Lock()
+        self._stopped = threading.Event()
+        old_umask = os.umask(0o077)
+        try:
+            super().__init__(str(self.path), _Handler)
+        finally:
+            os.umask(old_umask)
+
+    def preload(self) -> None:
+        """Import the CLI and every subcommand so commands start warm."""
+        import click
+
+        from . import cli
+
+        ctx = click.Context(cli.main)
+        for name in cli.SUBCOMMANDS:
+            cli.main.get_command(ctx, name)
+
+    def dispatch(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        op = message.get("op")
+        if op == "ping":
+            return {
+                "pid": os.getpid(),
+                "uptime": time.time() - self.started,
+                "commands": self.commands,
+            }
+        if op == "stop":
+            self._stopped.set()
+            return {"stopped": True}
+        raise ValueError(f"Unknown op: {op!r}")
+
+    def run_command(
+        self,
+        argv: List[str],
+        send: Callable[[Dict[str, Any]], None],
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+    ) -> int:
+        """Run a CLI command in this process, streaming its output.
+
+        Args:
+            argv: Command line, without the program name.
+            send: Called with ``{"stdout": text}`` and ``{"stderr": text}``
+                messages as the command writes output.
+            cwd: Working directory to run the command in.
+            env: ``GCORE_*`` variables to run the command with, replacing the
+                daemon's own for the duration of the command.
+
+        Returns:
+            The command's exit code.
+        """
+        from . import cli
+        from .logger import logger
+
+        def relay(name: str) -> io.TextIOWrapper:
+            return io.TextIOWrapper(
+                io.BufferedWriter(_Relay(send, name)),
+                encoding="utf-8",
+                line_buffering=True,
+            )
+
+        with self._run_lock:
+            stdout, stderr = relay("stdout"), relay("stderr")
+            handlers = [h for h in logger.handlers if hasattr(h, "setStream")]
+            previous = [
+                h.setStream(stderr) for h in handlers  # type: ignore[attr-defined]
+            ]
+            saved_env = command_env()
+            exit_code = 0
+            old_cwd = os.getcwd()
+            try:
+                if env is not None:
+                    _replace_env(env)
+                if cwd:
+                    os.chdir(cwd)
+                self.warm_auth()
+                with redirect_stdout(stdout), redirect_stderr(stderr):
+                    try:
+                        cli.main.main(args=argv, prog_name="gcore")
+                    except SystemExit as e:
+                        code = e.code
+                        exit_code = code if isinstance(code, int) else int(bool(code))
+                    except Exception:
+                        traceback.print_exc()
+                        exit_code = 1
+                    finally:
+                        for stream in (stdout, stderr):
+                            try:
+                                stream.flush()
+                            except OSError:
+                                pass
+            finally:
+                os.chdir(old_cwd)
+                _replace_env(saved_env)
+                for handler, stream in zip(handlers, previous):
+                    handler.setStream(stream)  # type: ignore[attr-defined]
+            self.last_active = time.monotonic()
+            if argv and argv[0] == "configure":
+                # Pick up the new token.
+                self.auths.clear()
+            self.commands += 1
+        return exit_code
+
+    def warm_auth(self) -> None:
+        """Share one auth between all commands run with the current
+        ``GCORE_*`` environment."""
+        from . import cli
+
+        key = frozenset(command_env().items())
+        if key not in self.auths:
+            cli.shared_auth = None
+            try:
+                self.auths[key] = cli.get_auth()
+            except Exception:
+                # No token yet; commands report the error themselves.
+                return
+        cli.shared_auth = self.auths[key]
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        self.last_active = time.monotonic()
+        super().process_request(request, client_address)
+
+    def handle_timeout(self) -> None:
+        if self.idle_timeout is None or self._run_lock.locked():
+            return
+        if time.monotonic() - self.last_active > self.idle_timeout:
+            self._stopped.set()
+
+    def serve(self) -> None:
+        """Handle requests until stopped or idle for ``idle_timeout``."""
+        self.warm_auth()
+        try:
+            while not self._stopped.is_set():
+                self.handle_request()
+        finally:
+            self.server_close()
+            if self.path.exists():
+                self.path.unlink()
+
+
+def _replace_env(env: Dict[str, str]) -> None:
+    for name in command_env():
+        if name not in env:
+            del os.environ[name]
+    os.environ.update(env)
+
+
+def start(
+    path: Optional[Union[str, Path]] = None,
+    idle_timeout: Optional[float] = DEFAULT_IDLE_TIMEOUT,
+) -> int:
+    """Start a detached daemon and wait until it accepts connections.
+
+    Returns:
+        The daemon's process id.
+
+    Raises:
+        RuntimeError: If the daemon does not come up in time.
+    """
+    path = Path(path or socket_path())
+    command = [sys.executable, "-m", "gcore_api.daemon", "--socket", str(path)]
+    if idle_timeout is not None:
+        command += ["--idle-timeout", str(idle_timeout)]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.parent / LOG_NAME, "ab") as log:
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+        )
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            return int(request({"op": "ping"}, path=path, timeout=1.0)["pid"])
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.05)
+    raise RuntimeError(f"Daemon did not start; see {path.parent / LOG_NAME}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the daemon in the foreground."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the gcore daemon.")
+    parser.add_argument("--socket", default=None, help="Socket path.")
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT,
+        help="Exit after this many idle seconds; 0 to never exit.",
+    )
+    args = parser.parse_args(argv)
+    server = DaemonServer(
+        args.socket or socket_path(), idle_timeout=args.idle_timeout or None
+    )
+    server.preload()
+    server.serve()
+
+
+if __name__ == "__main__":
+    main()
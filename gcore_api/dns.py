@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
-from typing import Dict, List, Union
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Union
 
-import requests
+from .jsonstream import stream_items
+from .models import Record, Zone
+from .pagination import DEFAULT_PAGE_SIZE, iter_items
+from .transport import AsyncTransport, Transport
+from .zone import DEFAULT_ZONE_WORKERS, ZoneApplyResult, apply_zone
+from .zonefile import export_zone_file, import_zone_file
 
 
 class DNSClient:
@@ -9,20 +14,35 @@ class DNSClient:
 
     BASE_URL = "https://api.gcore.com/dns/v2"
 
-    def __init__(self, auth):
+    def __init__(self, auth, transport: Optional[Transport] = None):
         self.auth = auth
+        self.transport = transport or auth.transport
 
-    def list_zones(self) -> List[Dict[str, str]]:
-        """List all DNS zones."""
-        response = requests.get(
+    def list_zones(
+        self, typed: bool = False
+    ) -> Union[List[Dict[str, str]], List[Zone]]:
+        """List all DNS zones, as ``Zone`` models if ``typed``."""
+        response = self.transport.get(
             f"{self.BASE_URL}/zones", headers=self.auth.get_headers()
         )
         response.raise_for_status()
-        return response.json()
+        items = response.json()
+        return Zone.from_json_list(items) if typed else items
+
+    def iter_zones(
+        self, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[Dict[str, str]]:
+        """Lazily iterate over all DNS zones, page by page."""
+        return iter_items(
+            self.transport,
+            f"{self.BASE_URL}/zones",
+            self.auth.get_headers,
+            page_size=page_size,
+        )
 
     def get_zone(self, zone_id: int) -> Dict[str, str]:
         """Get details of a specific DNS zone."""
-        response = requests.get(
+        response = self.transport.get(
             f"{self.BASE_URL}/zones/{zone_id}", headers=self.auth.get_headers()
         )
         response.raise_for_status()
@@ -31,7 +51,7 @@ class DNSClient:
     def create_zone(self, name: str) -> Dict[str, str]:
         """Create a new DNS zone."""
         data = {"name": name}
-        response = requests.post(
+        response = self.transport.post(
             f"{self.BASE_URL}/zones", headers=self.auth.get_headers(), json=data
         )
         response.raise_for_status()
@@ -39,18 +59,40 @@ class DNSClient:
 
     def delete_zone(self, zone_id: int) -> None:
         """Delete a DNS zone."""
-        response = requests.delete(
+        response = self.transport.delete(
             f"{self.BASE_URL}/zones/{zone_id}", headers=self.auth.get_headers()
         )
         response.raise_for_status()
 
-    def list_records(self, zone_id: int) -> List[Dict[str, str]]:
-        """List all records in a DNS zone."""
-        response = requests.get(
+    def list_records(
+        self, zone_id: int, typed: bool = False
+    ) -> Union[List[Dict[str, str]], List[Record]]:
+        """List all records in a DNS zone, as ``Record`` models if ``typed``."""
+        response = self.transport.get(
             f"{self.BASE_URL}/zones/{zone_id}/records", headers=self.auth.get_headers()
         )
         response.raise_for_status()
-        return response.json()
+        items = response.json()
+        return Record.from_json_list(items) if typed else items
+
+    def iter_records(
+        self, zone_id: int, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[Dict[str, str]]:
+        """Lazily iterate over all records in a DNS zone, page by page."""
+        return iter_items(
+            self.transport,
+            f"{self.BASE_URL}/zones/{zone_id}/records",
+            self.auth.get_headers,
+            page_size=page_size,
+        )
+
+    def stream_records(self, zone_id: int) -> Iterator[Dict[str, str]]:
+        """Stream all records in a DNS zone, parsing the response incrementally."""
+        return stream_items(
+            self.transport,
+            f"{self.BASE_URL}/zones/{zone_id}/records",
+            self.auth.get_headers,
+        )
 
     def create_record(
         self,
@@ -67,7 +109,7 @@ class DNSClient:
             "content": content,
             "ttl": ttl,
         }
-        response = requests.post(
+        response = self.transport.post(
             f"{self.BASE_URL}/zones/{zone_id}/records",
             headers=self.auth.get_headers(),
             json=data,
@@ -75,9 +117,183 @@ class DNSClient:
         response.raise_for_status()
         return response.json()
 
+    def update_record(
+        self,
+        zone_id: int,
+        record_id: int,
+        content: Union[str, List[str]],
+        ttl: int = 3600,
+    ) -> Dict[str, str]:
+        """Update the content and TTL of a DNS record."""
+        data = {"content": content, "ttl": ttl}
+        response = self.transport.put(
+            f"{self.BASE_URL}/zones/{zone_id}/records/{record_id}",
+            headers=self.auth.get_headers(),
+            json=data,
+        )
+        response.raise_for_status()
+        return response.json()
+
     def delete_record(self, zone_id: int, record_id: int) -> None:
         """Delete a DNS record."""
-        response = requests.delete(
+        response = self.transport.delete(
+            f"{self.BASE_URL}/zones/{zone_id}/records/{record_id}",
+            headers=self.auth.get_headers(),
+        )
+        response.raise_for_status()
+
+    def apply_zone(
+        self,
+        zone_id: int,
+        desired_records: Iterable[Dict],
+        delete: bool = True,
+        max_workers: int = DEFAULT_ZONE_WORKERS,
+        dry_run: bool = False,
+    ) -> ZoneApplyResult:
+        """Reconcile a zone's records with a desired record set.
+
+        See :func:`gcore_api.zone.apply_zone`.
+        """
+        return apply_zone(
+            self,
+            zone_id,
+            desired_records,
+            delete=delete,
+            max_workers=max_workers,
+            dry_run=dry_run,
+        )
+
+    def import_zone_file(
+        self,
+        zone_id: int,
+        path: str,
+        origin: Optional[str] = None,
+        replace: bool = False,
+        max_workers: int = DEFAULT_ZONE_WORKERS,
+        dry_run: bool = False,
+    ) -> ZoneApplyResult:
+        """Import a BIND zone file into a zone.
+
+        See :func:`gcore_api.zonefile.import_zone_file`.
+        """
+        return import_zone_file(
+            self,
+            zone_id,
+            path,
+            origin=origin,
+            replace=replace,
+            max_workers=max_workers,
+            dry_run=dry_run,
+        )
+
+    def export_zone_file(
+        self, zone_id: int, path: Union[str, IO[str]], origin: Optional[str] = None
+    ) -> int:
+        """Export a zone's records to a BIND zone file.
+
+        See :func:`gcore_api.zonefile.export_zone_file`.
+        """
+        return export_zone_file(self, zone_id, path, origin=origin)
+
+
+class AsyncDNSClient:
+    """Asyncio client for Gcore DNS API operations."""
+
+    BASE_URL = DNSClient.BASE_URL
+
+    def __init__(self, auth, transport: Optional[AsyncTransport] = None):
+        self.auth = auth
+        self.transport = transport or auth.async_transport
+
+    async def list_zones(
+        self, typed: bool = False
+    ) -> Union[List[Dict[str, str]], List[Zone]]:
+        """List all DNS zones, as ``Zone`` models if ``typed``."""
+        response = await self.transport.get(
+            f"{self.BASE_URL}/zones", headers=self.auth.get_headers()
+        )
+        response.raise_for_status()
+        items = response.json()
+        return Zone.from_json_list(items) if typed else items
+
+    async def get_zone(self, zone_id: int) -> Dict[str, str]:
+        """Get details of a specific DNS zone."""
+        response = await self.transport.get(
+            f"{self.BASE_URL}/zones/{zone_id}", headers=self.auth.get_headers()
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def create_zone(self, name: str) -> Dict[str, str]:
+        """Create a new DNS zone."""
+        data = {"name": name}
+        response = await self.transport.post(
+            f"{self.BASE_URL}/zones", headers=self.auth.get_headers(), json=data
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def delete_zone(self, zone_id: int) -> None:
+        """Delete a DNS zone."""
+        response = await self.transport.delete(
+            f"{self.BASE_URL}/zones/{zone_id}", headers=self.auth.get_headers()
+        )
+        response.raise_for_status()
+
+    async def list_records(
+        self, zone_id: int, typed: bool = False
+    ) -> Union[List[Dict[str, str]], List[Record]]:
+        """List all records in a DNS zone, as ``Record`` models if ``typed``."""
+        response = await self.transport.get(
+            f"{self.BASE_URL}/zones/{zone_id}/records", headers=self.auth.get_headers()
+        )
+        response.raise_for_status()
+        items = response.json()
+        return Record.from_json_list(items) if typed else items
+
+    async def create_record(
+        self,
+        zone_id: int,
+        name: str,
+        type: str,
+        content: Union[str, List[str]],
+        ttl: int = 3600,
+    ) -> Dict[str, str]:
+        """Create a new DNS record."""
+        data = {
+            "name": name,
+            "type": type.upper(),
+            "content": content,
+            "ttl": ttl,
+        }
+        response = await self.transport.post(
+            f"{self.BASE_URL}/zones/{zone_id}/records",
+            headers=self.auth.get_headers(),
+            json=data,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def update_record(
+        self,
+        zone_id: int,
+        record_id: int,
+        content: Union[str, List[str]],
+        ttl: int = 3600,
+    ) -> Dict[str, str]:
+        """Update the content and TTL of a DNS record."""
+        data = {"content": content, "ttl": ttl}
+        response = await self.transport.put(
+            f"{self.BASE_URL}/zones/{zone_id}/records/{record_id}",
+            headers=self.auth.get_headers(),
+            json=data,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def delete_record(self, zone_id: int, record_id: int) -> None:
+        """Delete a DNS record."""
+        response = await self.transport.delete(
             f"{self.BASE_URL}/zones/{zone_id}/records/{record_id}",
             headers=self.auth.get_headers(),
         )
@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+import atexit
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from .logger import logger
+from .ratelimit import service_for
+
+METRICS_ENV = "GCORE_METRICS"
+DEFAULT_LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+HOOK_EVENTS = ("request", "response", "error", "span")
+
+_VERSION = re.compile(r"v\d+")
+# Collections whose members are addressed by name rather than numeric id.
+_NAMED_COLLECTIONS = frozenset({"buckets", "objects"})
+
+
+@lru_cache(maxsize=4096)
+def endpoint_for(url: str) -> str:
+    """Endpoint template of ``url``, used to label metrics.
+
+    Ids and names are replaced with placeholders so every request to the same
+    endpoint shares one label, e.g. ``/dns/v2/zones/12/records`` becomes
+    ``/dns/v2/zones/{id}/records``. Object keys, which may contain slashes,
+    collapse into a single ``{name}``.
+    """
+    segments = urlsplit(url).path.strip("/").split("/")
+    template = []
+    previous = ""
+    for segment in segments:
+        if previous == "objects":
+            template.append("{name}")
+            break
+        if previous in _NAMED_COLLECTIONS:
+            template.append("{name}")
+        elif any(char.isdigit() for char in segment) and not _VERSION.fullmatch(
+            segment
+        ):
+            template.append("{id}")
+        else:
+            template.append(segment)
+        previous = segment
+    return "/" + "/".join(template)
+
+
+@dataclass
+class RequestEvent:
+    """One attempt of an HTTP request, passed to instrumentation hooks.
+
+    ``status``, ``bytes_received`` and ``reused`` are set once a response
+    arrives, ``error`` if the attempt fails without one. ``reused`` is
+    ``None`` when the transport cannot tell whether a pooled connection was
+    reused.
+
+    For ``Transport`` requests made with ``stream=True`` the body is read
+    after the event is reported, so ``bytes_received`` is the declared
+    ``Content-Length``, or 0 for a chunked body. ``AsyncTransport.stream``
+    reports its event once the body has been read, with the bytes actually
+    received and ``elapsed`` covering the whole transfer.
+    """
+
+    method: str
+    url: str
+    endpoint: str
+    attempt: int = 0
+    started: float = 0.0
+    start_time_ns: int = 0
+    elapsed: float = 0.0
+    status: Optional[int] = None
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    reused: Optional[bool] = None
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class Span:
+    """OpenTelemetry-style client span for one request attempt.
+
+    Attribute names follow the OpenTelemetry HTTP client semantic
+    conventions, so spans can be re-emitted through a real tracer with
+    ``tracer.start_span(span.name, start_time=span.start_time_ns, ...)``.
+    """
+
+    name: str
+    start_time_ns: int
+    end_time_ns: int
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "OK"
+
+
+class Histogram:
+    """Cumulative latency histogram with fixed bucket bounds."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """``(le, count)`` pairs as exported by Prometheus."""
+        pairs = []
+        total = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            pairs.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return pairs
+
+
+def _labels(**labels: Any) -> str:
+    escaped = (
+        str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        for value in labels.values()
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + "}"
+
+
+class Metrics:
+    """Aggregates request events into counters and latency histograms.
+
+    Tracks per-endpoint latency histograms, responses by status, errors,
+    retries, client-side throttling, bytes transferred and connection reuse,
+    and exports them in the Prometheus text format.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._counters: Dict[Tuple[Any, ...], float] = defaultdict(int)
+        self._connection_sources: List[Callable[[], Dict[str, int]]] = []
+        self._lock = threading.Lock()
+
+    def add_connection_source(self, source: Callable[[], Dict[str, int]]) -> None:
+        """Register a callable returning pooled ``requests``/``connections``
+        counts, for transports that cannot report reuse per request."""
+        with self._lock:
+            self._connection_sources.append(source)
+
+    def on_request(self, event: RequestEvent) -> None:
+        if event.attempt:
+            with self._lock:
+                self._counters[("retries", event.method, event.endpoint)] += 1
+
+    def on_response(self, event: RequestEvent) -> None:
+        key = (event.method, event.endpoint)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(event.elapsed)
+            method, endpoint = key
+            self._counters["responses", method, endpoint, event.status] += 1
+            self._counters["bytes_sent", method, endpoint] += event.bytes_sent
+            self._counters["bytes_received", method, endpoint] += event.bytes_received
+            if event.reused is not None:
+                self._counters[("connection_requests",)] += 1
+                self._counters[("connections_opened",)] += not event.reused
+
+    def on_error(self, event: RequestEvent) -> None:
+        with self._lock:
+            self._counters[
+                ("errors", event.method, event.endpoint, type(event.error).__name__)
+            ] += 1
+            self._counters[
+                ("bytes_sent", event.method, event.endpoint)
+            ] += event.bytes_sent
+
+    def on_throttle(self, url: str, wait: float) -> None:
+        service = service_for(url)
+        with self._lock:
+            self._counters[("throttled", service)] += 1
+            self._counters[("throttle_seconds", service)] += wait
+
+    def _connections(self) -> Tuple[int, int]:
+        requests = int(self._counters.get(("connection_requests",), 0))
+        opened = int(self._counters.get(("connections_opened",), 0))
+        for source in self._connection_sources:
+            stats = source()
+            requests += stats.get("requests", 0)
+            opened += stats.get("connections", 0)
+        return requests, opened
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current metrics as plain data.
+
+        Keys are ``latency`` (``{(method, endpoint): {count, sum, buckets}}``),
+        ``counters`` (``{(name, *labels): value}``) and ``connection_reuse``
+        (share of requests sent on a reused connection, or ``None`` before
+        any request).
+        """
+        with self._lock:
+            latency = {
+                key: {
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "buckets": dict(histogram.cumulative()),
+                }
+                for key, histogram in self._histograms.items()
+            }
+            counters = dict(self._counters)
+            requests, opened = self._connections()
+        return {
+            "latency": latency,
+            "counters": counters,
+            "connection_reuse": (requests - opened) / requests if requests else None,
+        }
+
+    def prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def header(name: str, kind: str, help: str) -> None:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items(), key=lambda item: repr(item[0]))
+            requests, opened = self._connections()
+
+        name = "gcore_request_duration_seconds"
+        header(name, "histogram", "Latency of API request attempts.")
+        for (method, endpoint), histogram in histograms:
+            for le, count in histogram.cumulative():
+                labels = _labels(method=method, endpoint=endpoint, le=le)
+                lines.append(f"{name}_bucket{labels} {count}")
+            labels = _labels(method=method, endpoint=endpoint)
+            lines.append(f"{name}_sum{labels} {histogram.sum}")
+            lines.append(f"{name}_count{labels} {histogram.count}")
+
+        families = {
+            "responses": (
+                "gcore_responses_total",
+                "API responses by status.",
+                ("method", "endpoint", "status"),
+            ),
+            "errors": (
+                "gcore_request_errors_total",
+                "Request attempts that failed without a response.",
+                ("method", "endpoint", "error"),
+            ),
+            "retries": (
+                "gcore_retries_total",
+                "Retried request attempts.",
+                ("method", "endpoint"),
+            ),
+            "throttled": (
+                "gcore_throttled_total",
+                "Requests delayed by the client-side rate limiter.",
+                ("service",),
+            ),
+            "throttle_seconds": (
+                "gcore_throttle_seconds_total",
+                "Time spent waiting for the client-side rate limiter.",
+                ("service",),
+            ),
+            "bytes_sent": (
+                "gcore_bytes_sent_total",
+                "Request body bytes sent.",
+                ("method", "endpoint"),
+            ),
+            "bytes_received": (
+                "gcore_bytes_received_total",
+                "Response body bytes received.",
+                ("method", "endpoint"),
+            ),
+        }
+        for family, (name, help, label_names) in families.items():
+            samples = [(key[1:], value) for key, value in counters if key[0] == family]
+            if not samples:
+                continue
+            header(name, "counter", help)
+            for label_values, value in samples:
+                labels = _labels(**dict(zip(label_names, label_values)))
+                lines.append(f"{name}{labels} {value}")
+
+        header("gcore_connection_requests_total", "counter", "Pooled requests sent.")
+        lines.append(f"gcore_connection_requests_total {requests}")
+        header("gcore_connections_opened_total", "counter", "Connections opened.")
+        lines.append(f"gcore_connections_opened_total {opened}")
+        header(
+            "gcore_connection_reuse_ratio",
+            "gauge",
+            "Share of requests sent on a reused connection.",
+        )
+        reuse = (requests - opened) / requests if requests else 0.0
+        lines.append(f"gcore_connection_reuse_ratio {reuse}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Write :meth:`prometheus` output to ``path`` atomically, e.g. for
+        the node_exporter textfile collector."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.prometheus())
+        os.replace(tmp_path, path)
+
+
+_env_instrumentation: Dict[str, "Instrumentation"] = {}
+
+
+class Instrumentation:
+    """Hooks called by the shared transports around every request attempt.
+
+    Hooks receive a :class:`RequestEvent`: ``request`` hooks before the
+    attempt is sent, ``response`` hooks once its response arrives and
+    ``error`` hooks if it fails without one. ``span`` hooks receive a
+    :class:`Span` after each attempt. Exceptions raised by hooks are logged
+    and never affect the request.
+
+    Transports without instrumentation skip all of this, so it costs nothing
+    unless enabled.
+    """
+
+    def __init__(
+        self,
+        metrics: Optional[Metrics] = None,
+        on_request: Optional[Callable[[RequestEvent], None]] = None,
+        on_response: Optional[Callable[[RequestEvent], None]] = None,
+        on_error: Optional[Callable[[RequestEvent], None]] = None,
+        on_span: Optional[Callable[[Span], None]] = None,
+    ):
+        """Initialize instrumentation.
+
+        Args:
+            metrics: Metrics aggregated from every attempt.
+            on_request: Hook called before each attempt.
+            on_response: Hook called when an attempt gets a response.
+            on_error: Hook called when an attempt fails without a response.
+            on_span: Callback receiving an OpenTelemetry-style span per
+                attempt.
+        """
+        self.metrics = metrics
+        self._hooks: Dict[str, List[Callable[[Any], None]]] = {
+            event: [] for event in HOOK_EVENTS
+        }
+        if metrics is not None:
+            self.add_hook("request", metrics.on_request)
+            self.add_hook("response", metrics.on_response)
+            self.add_hook("error", metrics.on_error)
+        for event, hook in (
+            ("request", on_request),
+            ("response", on_response),
+            ("error", on_error),
+            ("span", on_span),
+        ):
+            if hook is not None:
+                self.add_hook(event, hook)
+
+    @classmethod
+    def from_env(cls) -> Optional["Instrumentation"]:
+        """Build instrumentation from ``GCORE_METRICS``.
+
+        ``GCORE_METRICS`` names a file that Prometheus metrics are written to
+        when the process exits. Returns ``None`` (no instrumentation) if it is
+        not set.
+        """
+        path = os.environ.get(METRICS_ENV)
+        if not path:
+            return None
+        # Transports created in one process share one set of metrics.
+        if path not in _env_instrumentation:
+            metrics = Metrics()
+            atexit.register(metrics.write, path)
+            _env_instrumentation[path] = cls(metrics=metrics)
+        return _env_instrumentation[path]
+
+    def add_hook(self, event: str, hook: Callable[[Any], None]) -> None:
+        """Register ``hook`` for ``event`` (``request``, ``response``,
+        ``error`` or ``span``)."""
+        if event not in self._hooks:
+            raise ValueError(
+                f"Unknown instrumentation event {event!r}; "
+                f"expected one of {', '.join(HOOK_EVENTS)}"
+            )
+        self._hooks[event].append(hook)
+
+    def _emit(self, event: str, payload: Any) -> None:
+        for hook in self._hooks[event]:
+            try:
+                hook(payload)
+            except Exception as e:
+                logger.debug(f"Instrumentation {event} hook failed: {e!r}")
+
+    def attach(self, transport: Any) -> None:
+        """Report a transport's pooled connection counts to the metrics."""
+        if self.metrics is not None and hasattr(transport, "connection_stats"):
+            self.metrics.add_connection_source(transport.connection_stats)
+
+    def request_started(self, method: str, url: str, attempt: int) -> RequestEvent:
+        event = RequestEvent(
+            method=method.upper(),
+            url=url,
+            endpoint=endpoint_for(url),
+            attempt=attempt,
+            started=time.perf_counter(),
+            start_time_ns=time.time_ns(),
+        )
+        self._emit("request", event)
+        return event
+
+    def response_received(
+        self,
+        event: RequestEvent,
+        status: int,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+        reused: Optional[bool] = None,
+    ) -> None:
+        event.elapsed = time.perf_counter() - event.started
+        event.status = status
+        event.bytes_sent = bytes_sent
+        event.bytes_received = bytes_received
+        event.reused = reused
+        self._emit("response", event)
+        self._end_span(event)
+
+    def request_failed(
+        self, event: RequestEvent, error: BaseException, bytes_sent: int = 0
+    ) -> None:
+        event.elapsed = time.perf_counter() - event.started
+        event.error = error
+        event.bytes_sent = bytes_sent
+        self._emit("error", event)
+        self._end_span(event)
+
+    def throttled(self, url: str, wait: float) -> None:
+        if self.metrics is not None:
+            self.metrics.on_throttle(url, wait)
+
+    def _end_span(self, event: RequestEvent) -> None:
+        if not self._hooks["span"]:
+            return
+        url = urlsplit(event.url)
+        attributes: Dict[str, Any] = {
+            "http.request.method": event.method,
+            "url.full": event.url,
+            "url.template": event.endpoint,
+            "server.address": url.hostname,
+        }
+        if url.port:
+            attributes["server.port"] = url.port
+        if event.attempt:
+            attributes["http.request.resend_count"] = event.attempt
+        status = "OK"
+        if event.status is not None:
+            attributes["http.response.status_code"] = event.status
+            if event.status >= 400:
+                attributes["error.type"] = str(event.status)
+                status = "ERROR"
+        if event.error is not None:
+            attributes["error.type"] = type(event.error).__name__
+            status = "ERROR"
+        span = Span(
+            name=event.method,
+            start_time_ns=event.start_time_ns,
+            end_time_ns=event.start_time_ns + int(event.elapsed * 1e9),
+            attributes=attributes,
+            status=status,
+        )
+        self._emit("span", span)
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from urllib.parse import quote
+
+from .cdn import CDNClient
+from .dns import DNSClient
+from .loadbalancer import LoadBalancerClient
+from .ssl import SSLClient
+from .storage import StorageClient
+
+if TYPE_CHECKING:
+    from .auth import GcoreAuth
+    from .transport import Transport
+
+INVENTORY_ENV = "GCORE_INVENTORY"
+INVENTORY_NAME = "inventory.db"
+DEFAULT_INVENTORY_WORKERS = 8
+SCHEMA_VERSION = 1
+
+RESOURCES_URL = f"{CDNClient.BASE_URL}/resources"
+ZONES_URL = f"{DNSClient.BASE_URL}/zones"
+CERTIFICATES_URL = f"{SSLClient.BASE_URL}/certificates"
+BUCKETS_URL = f"{StorageClient.BASE_URL}/buckets"
+LOAD_BALANCERS_URL = f"{LoadBalancerClient.BASE_URL}/loadbalancers"
+
+TABLES = (
+    "sources",
+    "cdn_resources",
+    "dns_zones",
+    "dns_records",
+    "dns_record_values",
+    "certificates",
+    "certificate_domains",
+    "buckets",
+    "objects",
+    "load_balancers",
+)
+
+# Each entity keeps its full JSON in ``data``; the other columns exist only to
+# be indexed for lookups. ``sources`` remembers the validators and digest of
+# every listing so a resync can skip the ones that did not change.
+SCHEMA = """
+CREATE TABLE sources (
+    url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, digest TEXT, synced_at REAL
+);
+CREATE TABLE cdn_resources (
+    id INTEGER PRIMARY KEY,
+    cname TEXT COLLATE NOCASE,
+    origin TEXT COLLATE NOCASE,
+    data TEXT NOT NULL
+);
+CREATE INDEX cdn_resources_cname ON cdn_resources (cname);
+CREATE INDEX cdn_resources_origin ON cdn_resources (origin);
+CREATE TABLE dns_zones (id INTEGER PRIMARY KEY, name TEXT, data TEXT NOT NULL);
+CREATE TABLE dns_records (
+    zone_id INTEGER NOT NULL,
+    name TEXT COLLATE NOCASE,
+    type TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX dns_records_zone ON dns_records (zone_id);
+CREATE INDEX dns_records_name ON dns_records (name);
+CREATE TABLE dns_record_values (
+    record INTEGER NOT NULL, zone_id INTEGER NOT NULL, value TEXT COLLATE NOCASE
+);
+CREATE INDEX dns_record_values_value ON dns_record_values (value);
+CREATE INDEX dns_record_values_zone ON dns_record_values (zone_id);
+CREATE TABLE certificates (id INTEGER PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE certificate_domains (
+    certificate_id INTEGER NOT NULL, domain TEXT COLLATE NOCASE
+);
+CREATE INDEX certificate_domains_domain ON certificate_domains (domain);
+CREATE TABLE buckets (name TEXT PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE objects (bucket TEXT NOT NULL, name TEXT NOT NULL, data TEXT NOT NULL);
+CREATE INDEX objects_bucket ON objects (bucket);
+CREATE INDEX objects_name ON objects (name);
+CREATE TABLE load_balancers (id INTEGER PRIMARY KEY, data TEXT NOT NULL);
+"""
+
+Source = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+def inventory_path() -> Path:
+    """Inventory database, from ``GCORE_INVENTORY`` or the config directory."""
+    default = Path.home() / ".config" / "gcore" / INVENTORY_NAME
+    return Path(os.environ.get(INVENTORY_ENV) or default)
+
+
+def records_url(zone_id: int) -> str:
+    return f"{ZONES_URL}/{zone_id}/records"
+
+
+def objects_url(bucket: str) -> str:
+    return f"{BUCKETS_URL}/{quote(bucket, safe='')}/objects"
+
+
+@dataclass
+class Listing:
+    """A listing fetched by :func:`fetch_listing`, or ``None`` if unchanged."""
+
+    url: str
+    body: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    digest: str
+
+
+def fetch_listing(
+    transport: "Transport",
+    headers: Dict[str, str],
+    url: str,
+    source: Optional[Source] = None,
+) -> Optional[Listing]:
+    """GET a listing unless it matches what the inventory already holds.
+
+    The request is conditional on the stored ``ETag`` and ``Last-Modified``;
+    a body identical to the stored one, by SHA-256, also counts as unchanged
+    for servers that send neither.
+    """
+    etag, last_modified, digest = source or (None, None, None)
+    headers = dict(headers)
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    response = transport.get(url, headers=headers)
+    if response.status_code == 304:
+        return None
+    response.raise_for_status()
+    content = response.content
+    new_digest = hashlib.sha256(content).hexdigest()
+    if new_digest == digest:
+        return None
+    return Listing(
+        url,
+        json.loads(content),
+        response.headers.get("ETag"),
+        response.headers.get("Last-Modified"),
+        new_digest,
+    )
+
+
+@dataclass
+class SyncReport:
+    """Outcome of :meth:`Inventory.sync`.
+
+    ``fetched`` listings were downloaded and stored; ``unchanged`` ones were
+    skipped. Entities of a listing that failed keep their previous state.
+    """
+
+    fetched: int = 0
+    unchanged: int = 0
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+    counts: Dict[str, int] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+def _values(content: Any) -> List[str]:
+    values = content if isinstance(content, list) else [content]
+    return [str(value) for value in values if value is not None]
+
+
+class Inventory:
+    """Local SQLite snapshot of all CDN, DNS, SSL, storage and load balancer
+    entities, indexed for fast offline lookups.
+
+    :meth:`sync` pulls every listing concurrently and refreshes only the ones
+    that changed since the previous sync; the lookup methods never touch the
+    API.
+    """
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        """Open, and create if needed, the inventory database.
+
+        Args:
+            path: Database file. Defaults to :func:`inventory_path`; pass
+                ``":memory:"`` for a throwaway inventory.
+        """
+        self.path = str(path or inventory_path())
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._create()
+
+    def _create(self) -> None:
+        # The inventory is a cache of the API, so an outdated schema is simply
+        # dropped and filled again by the next sync.
+        with self.db:
+            for table in TABLES:
+                self.db.execute(f"DROP TABLE IF EXISTS {table}")
+            self.db.executescript(SCHEMA)
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "Inventory":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # Sync
+
+    def _sources(self) -> Dict[str, Source]:
+        rows = self.db.execute("SELECT url, etag, last_modified, digest FROM sources")
+        return {url: (etag, modified, digest) for url, etag, modified, digest in rows}
+
+    def _remember(self, listing: Listing) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?)",
+            (
+                listing.url,
+                listing.etag,
+                listing.last_modified,
+                listing.digest,
+                time.time(),
+            ),
+        )
+
+    def _forget(self, urls: Iterable[str]) -> None:
+        self.db.executemany("DELETE FROM sources WHERE url = ?", [(u,) for u in urls])
+
+    def sync(
+        self,
+        auth: "GcoreAuth",
+        max_workers: int = DEFAULT_INVENTORY_WORKERS,
+        full: bool = False,
+    ) -> SyncReport:
+        """Refresh the inventory from the API.
+
+        The five top-level listings are fetched concurrently, and each zone's
+        records and each bucket's objects are fetched as soon as the zones
+        and buckets are known. Only listings that changed are rewritten.
+
+        Args:
+            auth: Auth whose transport and token are used.
+            max_workers: Number of listings fetched concurrently.
+            full: Refetch every listing, ignoring stored validators.
+        """
+        started = time.monotonic()
+        report = SyncReport()
+        sources = {} if full else self._sources()
+        transport = auth.transport
+        headers = auth.get_headers()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending: Dict[Future, Tuple[str, Any]] = {}
+
+            def submit(url: str, key: Any = None) -> None:
+                future = executor.submit(
+                    fetch_listing, transport, headers, url, sources.get(url)
+                )
+                pending[future] = (url, key)
+
+            for url in (
+                RESOURCES_URL,
+                ZONES_URL,
+                CERTIFICATES_URL,
+                BUCKETS_URL,
+                LOAD_BALANCERS_URL,
+            ):
+                submit(url)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, key = pending.pop(future)
+                    try:
+                        listing = future.result()
+                    except Exception as e:
+                        report.failed.append((url, str(e)))
+                        continue
+                    with self.db:
+                        if listing is None:
+                            report.unchanged += 1
+                        else:
+                            report.fetched += 1
+                            self._store(listing, key)
+                            self._remember(listing)
+                    if url == ZONES_URL:
+                        for (zone_id,) in self.db.execute("SELECT id FROM dns_zones"):
+                            submit(records_url(zone_id), zone_id)
+                    elif url == BUCKETS_URL:
+                        for (name,) in self.db.execute("SELECT name FROM buckets"):
+                            submit(objects_url(name), name)
+
+        report.counts = self.counts()
+        report.elapsed = time.monotonic() - started
+        return report
+
+    def _store(self, listing: Listing, key: Any) -> None:
+        url, body = listing.url, listing.body
+        if url == RESOURCES_URL:
+            self._store_resources(body)
+        elif url == ZONES_URL:
+            self._store_zones(body)
+        elif url == CERTIFICATES_URL:
+            self._store_certificates(body)
+        elif url == BUCKETS_URL:
+            self._store_buckets(body)
+        elif url == LOAD_BALANCERS_URL:
+            self.db.execute("DELETE FROM load_balancers")
+            self.db.executemany(
+                "INSERT INTO load_balancers VALUES (?, ?)",
+                [(lb["id"], json.dumps(lb)) for lb in body],
+            )
+        elif url.startswith(ZONES_URL):
+            self._store_records(key, body)
+        else:
+            self._store_objects(key, body.get("objects", []))
+
+    def _store_resources(self, resources: List[Dict]) -> None:
+        self.db.execute("DELETE FROM cdn_resources")
+        self.db.executemany(
+            "INSERT INTO cdn_resources VALUES (?, ?, ?, ?)",
+            [
+                (r["id"], r.get("cname"), r.get("origin"), json.dumps(r))
+                for r in resources
+            ],
+        )
+
+    def _store_zones(self, zones: List[Dict]) -> None:
+        current = {
+            zone_id for (zone_id,) in self.db.execute("SELECT id FROM dns_zones")
+        }
+        self.db.execute("DELETE FROM dns_zones")
+        self.db.executemany(
+            "INSERT INTO dns_zones VALUES (?, ?, ?)",
+            [(z["id"], z.get("name"), json.dumps(z)) for z in zones],
+        )
+        removed = current - {zone["id"] for zone in zones}
+        for zone_id in removed:
+            self._store_records(zone_id, [])
+        self._forget(records_url(zone_id) for zone_id in removed)
+
+    def _store_records(self, zone_id: int, records: List[Dict]) -> None:
+        self.db.execute("DELETE FROM dns_records WHERE zone_id = ?", (zone_id,))
+        self.db.execute("DELETE FROM dns_record_values WHERE zone_id = ?", (zone_id,))
+        for record in records:
+            cursor = self.db.execute(
+                "INSERT INTO dns_records VALUES (?, ?, ?, ?)",
+                (zone_id, record.get("name"), record.get("type"), json.dumps(record)),
+            )
+            self.db.executemany(
+                "INSERT INTO dns_record_values VALUES (?, ?, ?)",
+                [
+                    (cursor.lastrowid, zone_id, value)
+                    for value in _values(record.get("content"))
+                ],
+            )
+
+    def _store_certificates(self, certificates: List[Dict]) -> None:
+        self.db.execute("DELETE FROM certificates")
+        self.db.execute("DELETE FROM certificate_domains")
+        for cert in certificates:
+            self.db.execute(
+                "INSERT INTO certificates VALUES (?, ?)", (cert["id"], json.dumps(cert))
+            )
+            domains = {*(cert.get("domains") or []), cert.get("name")} - {None}
+            self.db.executemany(
+                "INSERT INTO certificate_domains VALUES (?, ?)",
+                [(cert["id"], domain) for domain in domains],
+            )
+
+    def _store_buckets(self, buckets: List[Dict]) -> None:
+        current = {name for (name,) in self.db.execute("SELECT name FROM buckets")}
+        self.db.execute("DELETE FROM buckets")
+        self.db.executemany(
+            "INSERT INTO buckets VALUES (?, ?)",
+            [(b["name"], json.dumps(b)) for b in buckets],
+        )
+        removed = current - {bucket["name"] for bucket in buckets}
+        for name in removed:
+            self._store_objects(name, [])
+        self._forget(objects_url(name) for name in removed)
+
+    def _store_objects(self, bucket: str, objects: List[Dict]) -> None:
+        self.db.execute("DELETE FROM objects WHERE bucket = ?", (bucket,))
+        self.db.executemany(
+            "INSERT INTO objects VALUES (?, ?, ?)",
+            [(bucket, obj["name"], json.dumps(obj)) for obj in objects],
+        )
+
+    # Queries
+
+    def _select(self, sql: str, params: Sequence[Any] = ()) -> List[Dict]:
+        return [json.loads(data) for (data,) in self.db.execute(sql, params)]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of stored entities per table."""
+        return {
+            table: self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in TABLES
+            if table not in ("sources", "dns_record_values", "certificate_domains")
+        }
+
+    def resources_by_origin(self, origin: str) -> List[Dict]:
+        """CDN resources pulling from ``origin``."""
+        return self._select(
+            "SELECT data FROM cdn_resources WHERE origin = ? ORDER BY id", (origin,)
+        )
+
+    def resources_by_cname(self, cname: str) -> List[Dict]:
+        """CDN resources served under ``cname``."""
+        return self._select(
+            "SELECT data FROM cdn_resources WHERE cname = ? ORDER BY id", (cname,)
+        )
+
+    def _records(self, where: str, params: Sequence[Any]) -> List[Dict]:
+        rows = self.db.execute(
+            "SELECT r.zone_id, z.name, r.data FROM dns_records r "
+            f"LEFT JOIN dns_zones z ON z.id = r.zone_id WHERE {where} "
+            "ORDER BY r.zone_id, r.rowid",
+            params,
+        )
+        return [
+            {**json.loads(data), "zone_id": zone_id, "zone": zone}
+            for zone_id, zone, data in rows
+        ]
+
+    def records_by_name(self, name: str) -> List[Dict]:
+        """DNS records named ``name``, with their ``zone_id`` and ``zone``."""
+        return self._records("r.name = ?", (name,))
+
+    def records_by_content(self, value: str) -> List[Dict]:
+        """DNS records with ``value`` among their contents, e.g. an IP."""
+        return self._records(
+            "r.rowid IN (SELECT record FROM dns_record_values WHERE value = ?)",
+            (value,),
+        )
+
+    def certificates_for_domain(self, domain: str) -> List[Dict]:
+        """Certificates covering ``domain``, directly or through a wildcard."""
+        parent = domain.split(".", 1)[1] if "." in domain else domain
+        return self._select(
+            "SELECT data FROM certificates WHERE id IN (SELECT certificate_id "
+            "FROM certificate_domains WHERE domain IN (?, ?)) ORDER BY id",
+            (domain, f"*.{parent}"),
+        )
+
+    def find_objects(self, name: str, prefix: bool = False) -> List[Dict]:
+        """Objects named ``name``, or starting with it if ``prefix``, across all
+        buckets, with their ``bucket``."""
+        where = "name = ?"
+        params: Tuple[str, ...] = (name,)
+        if prefix:
+            # A range scan uses the index, unlike LIKE on a case-sensitive key.
+            where, params = "name >= ? AND name < ?", (name, name + "\U0010ffff")
+        rows = self.db.execute(
+            f"SELECT bucket, data FROM objects WHERE {where} ORDER BY bucket, name",
+            params,
+        )
+        return [{**json.loads(data), "bucket": bucket} for bucket, data in rows]
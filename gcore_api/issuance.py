@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+import heapq
+import re
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .purge import DEFAULT_MAX_POLL_ERRORS, PollBackoff
+
+if TYPE_CHECKING:
+    from .ssl import SSLClient
+
+DEFAULT_ISSUE_WORKERS = 8
+DEFAULT_ISSUE_RATE = 5.0
+DEFAULT_VALIDATION_INTERVAL = 5.0
+DEFAULT_MAX_VALIDATION_INTERVAL = 60.0
+VALID_STATUSES = {"valid", "validated", "issued", "active", "success", "completed"}
+INVALID_STATUSES = {"invalid", "failed", "error", "expired", "revoked", "cancelled"}
+
+DomainSet = Union[str, Sequence[str]]
+
+
+def normalize_domains(domains: DomainSet) -> Tuple[str, ...]:
+    """Turn one certificate's domains into a de-duplicated, lower-case tuple.
+
+    A string may hold several domains separated by commas or whitespace.
+
+    Raises:
+        ValueError: If no domain is given.
+    """
+    if isinstance(domains, str):
+        domains = re.split(r"[\s,]+", domains)
+    names = tuple(dict.fromkeys(d.strip().lower() for d in domains if d.strip()))
+    if not names:
+        raise ValueError("A certificate request needs at least one domain")
+    return names
+
+
+def validation_state(status: Dict) -> Optional[str]:
+    """``valid`` or ``failed`` once a validation has finished, else ``None``."""
+    state = str(status.get("status", "")).lower()
+    if state in VALID_STATUSES:
+        return "valid"
+    if state in INVALID_STATUSES:
+        return "failed"
+    return None
+
+
+def _progress(status: Dict) -> Any:
+    domains = status.get("domains")
+    if isinstance(domains, list) and all(isinstance(d, dict) for d in domains):
+        return sum(str(d.get("status", "")).lower() in VALID_STATUSES for d in domains)
+    return status.get("progress")
+
+
+@dataclass
+class IssueResult:
+    """Final outcome of one certificate request.
+
+    ``status`` is ``valid`` or ``failed``, or ``pending`` for a request still
+    validating when the batch timed out; its ``cert_id`` can be passed to
+    :meth:`CertificateIssuer.track` later. ``detail`` is the last validation
+    status, or ``{"error": ...}`` if the request or its polling failed.
+    """
+
+    domains: Tuple[str, ...]
+    cert_id: Optional[int]
+    status: str
+    detail: Dict = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "valid"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "domains": list(self.domains),
+            "cert_id": self.cert_id,
+            "status": self.status,
+            "detail": self.detail,
+        }
+
+
+class _Pending:
+    """A certificate request on its way to a final validation status."""
+
+    def __init__(self, domains: Tuple[str, ...], interval: float):
+        self.domains = domains
+        self.cert_id: Optional[int] = None
+        self.interval = interval
+        self.progress: Any = None
+        self.errors = 0
+
+
+class CertificateIssuer:
+    """Request many certificates and track all their validations at once.
+
+    A single scheduler submits the requests, paced to at most ``rate`` per
+    second, and polls every pending validation on its own adaptive schedule:
+    the interval is held while domains keep validating and backs off while
+    nothing changes. Results are yielded as each certificate becomes valid or
+    fails, so a batch takes about as long as its slowest validation.
+    """
+
+    def __init__(
+        self,
+        client: "SSLClient",
+        validation_method: str = "dns",
+        max_workers: int = DEFAULT_ISSUE_WORKERS,
+        rate: Optional[float] = DEFAULT_ISSUE_RATE,
+        initial_interval: float = DEFAULT_VALIDATION_INTERVAL,
+        max_interval: float = DEFAULT_MAX_VALIDATION_INTERVAL,
+    ):
+        """Initialize certificate issuer.
+
+        Args:
+            client: SSL client used for requests and validation polls.
+            validation_method: Validation method for new requests.
+            max_workers: Number of API calls in flight.
+            rate: Maximum certificate requests per second. ``None`` disables
+                pacing.
+            initial_interval: Delay before the first poll of each validation.
+            max_interval: Upper bound on the delay between polls.
+        """
+        self.client = client
+        self.validation_method = validation_method
+        self.max_workers = max_workers
+        self.request_interval = 1.0 / rate if rate else 0.0
+        self.backoff = PollBackoff(initial_interval, max_interval)
+
+    def issue(
+        self, domain_sets: Iterable[DomainSet], timeout: Optional[float] = None
+    ) -> Iterator[IssueResult]:
+        """Request a certificate for each domain set and yield the outcomes.
+
+        Args:
+            domain_sets: Domains of each certificate, as a sequence or a
+                comma- or whitespace-separated string.
+            timeout: Maximum seconds for the whole batch. When it runs out,
+                the remaining requests are yielded as ``pending``, or as
+                ``failed`` if they were never submitted.
+
+        Raises:
+            ValueError: If a domain set is empty or listed twice.
+        """
+        requests: List[_Pending] = []
+        seen = set()
+        for domains in domain_sets:
+            names = normalize_domains(domains)
+            if frozenset(names) in seen:
+                raise ValueError(f"Certificate for {', '.join(names)} is listed twice")
+            seen.add(frozenset(names))
+            requests.append(_Pending(names, self.backoff.initial_interval))
+        return self._run(requests, [], timeout)
+
+    def track(
+        self, cert_ids: Iterable[int], timeout: Optional[float] = None
+    ) -> Iterator[IssueResult]:
+        """Yield the outcomes of already submitted certificate requests.
+
+        Requests still validating after ``timeout`` seconds are yielded as
+        ``pending``.
+        """
+        tracked = []
+        for cert_id in dict.fromkeys(cert_ids):
+            pending = _Pending((), self.backoff.initial_interval)
+            pending.cert_id = cert_id
+            tracked.append(pending)
+        return self._run([], tracked, timeout)
+
+    def _run(
+        self,
+        requests: List[_Pending],
+        tracked: List[_Pending],
+        timeout: Optional[float],
+    ) -> Iterator[IssueResult]:
+        start = time.monotonic()
+        deadline = start + timeout if timeout is not None else None
+        waiting: Deque[_Pending] = deque(requests)
+        next_request_at = start
+        polls: List[Tuple[float, int, _Pending]] = []
+        sequence = 0
+        remaining = len(requests) + len(tracked)
+
+        def schedule(pending: _Pending) -> None:
+            nonlocal sequence
+            sequence += 1
+            due_at = time.monotonic() + self.backoff.delay(pending.interval)
+            heapq.heappush(polls, (due_at, sequence, pending))
+
+        for pending in tracked:
+            schedule(pending)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            in_flight: Dict[Future, Tuple[str, _Pending]] = {}
+            while remaining:
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    yield from self._timed_out(in_flight, polls, waiting)
+                    return
+
+                while len(in_flight) < self.max_workers:
+                    if polls and polls[0][0] <= now:
+                        pending = heapq.heappop(polls)[2]
+                        assert pending.cert_id is not None
+                        future = executor.submit(
+                            self.client.get_validation_status, pending.cert_id
+                        )
+                        in_flight[future] = ("poll", pending)
+                    elif waiting and next_request_at <= now:
+                        pending = waiting.popleft()
+                        future = executor.submit(
+                            self.client.request_certificate,
+                            list(pending.domains),
+                            self.validation_method,
+                        )
+                        in_flight[future] = ("request", pending)
+                        next_request_at = now + self.request_interval
+                    else:
+                        break
+
+                due = []
+                if len(in_flight) < self.max_workers:
+                    due += [polls[0][0]] if polls else []
+                    due += [next_request_at] if waiting else []
+                if deadline is not None:
+                    due.append(deadline)
+                wait_for = max(0.0, min(due) - now) if due else None
+                if not in_flight:
+                    time.sleep(wait_for or 0.0)
+                    continue
+
+                done, _ = wait(in_flight, timeout=wait_for, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, pending = in_flight.pop(future)
+                    result = self._observe(kind, pending, future)
+                    if result is None:
+                        schedule(pending)
+                    else:
+                        remaining -= 1
+                        yield result
+
+    def _timed_out(
+        self,
+        in_flight: Dict[Future, Tuple[str, _Pending]],
+        polls: List[Tuple[float, int, _Pending]],
+        waiting: Deque[_Pending],
+    ) -> Iterator[IssueResult]:
+        """Results for every request still open when the batch timed out.
+
+        Calls in flight are allowed to finish, so no submitted request loses
+        its certificate id.
+        """
+        open_requests = []
+        for future, (kind, pending) in in_flight.items():
+            result = self._observe(kind, pending, future)
+            if result is None:
+                open_requests.append(pending)
+            else:
+                yield result
+        open_requests += [pending for _, _, pending in sorted(polls)]
+        for pending in open_requests:
+            yield IssueResult(
+                pending.domains,
+                pending.cert_id,
+                "pending",
+                {"progress": pending.progress},
+            )
+        for pending in waiting:
+            yield IssueResult(
+                pending.domains,
+                None,
+                "failed",
+                {"error": "Not requested before the timeout"},
+            )
+
+    def _observe(
+        self, kind: str, pending: _Pending, future: Future
+    ) -> Optional[IssueResult]:
+        """Record a finished call, returning a result once the request is final."""
+        try:
+            response = future.result()
+        except Exception as e:
+            pending.errors += 1
+            if kind == "request" or pending.errors >= DEFAULT_MAX_POLL_ERRORS:
+                return IssueResult(
+                    pending.domains, pending.cert_id, "failed", {"error": str(e)}
+                )
+            pending.interval = self.backoff.next_interval(pending.interval, False)
+            return None
+
+        if kind == "request":
+            if response.get("id") is None:
+                return IssueResult(
+                    pending.domains,
+                    None,
+                    "failed",
+                    {"error": "Response has no certificate id"},
+                )
+            # Domains validated earlier may come back already issued.
+            pending.cert_id = response["id"]
+
+        pending.errors = 0
+        state = validation_state(response)
+        if state is not None:
+            return IssueResult(pending.domains, pending.cert_id, state, response)
+        if kind == "request":
+            return None
+        progress = _progress(response)
+        progressed = progress is not None and progress != pending.progress
+        pending.progress = progress
+        pending.interval = self.backoff.next_interval(pending.interval, progressed)
+        return None
+
+
+def issue_certificates(
+    client: "SSLClient",
+    domain_sets: Iterable[DomainSet],
+    validation_method: str = "dns",
+    max_workers: int = DEFAULT_ISSUE_WORKERS,
+    rate: Optional[float] = DEFAULT_ISSUE_RATE,
+    timeout: Optional[float] = None,
+) -> Iterator[IssueResult]:
+    """Request many certificates, yielding each as it validates or fails.
+
+    See :class:`CertificateIssuer`.
+    """
+    issuer = CertificateIssuer(
+        client, validation_method, max_workers=max_workers, rate=rate
+    )
+    return issuer.issue(domain_sets, timeout=timeout)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+import codecs
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from .transport import Transport
+
+DEFAULT_STREAM_CHUNK_SIZE = 64 * 1024
+DEFAULT_ITEMS_KEY = "results"
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",:]}"
+
+
+class _Reader:
+    """Text buffer over a stream of byte chunks, consumed from the front."""
+
+    def __init__(self, chunks: Iterable[bytes], encoding: str):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._json = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk to the buffer; ``False`` at end of stream."""
+        if self.eof:
+            return False
+        # Drop consumed text so the buffer only holds the current item.
+        self.buffer = self.buffer[self.pos :]
+        self.pos = 0
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self.buffer += text
+                return True
+        self.buffer += self._decoder.decode(b"", final=True)
+        self.eof = True
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or ``""`` at end of stream."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of JSON stream")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        wanted = 0
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # A number cut by a chunk boundary ("15" of "150", "1." of
+                # "1.5") decodes too, so only accept values followed by a
+                # delimiter.
+                if (end < len(self.buffer) and self.buffer[end] in _DELIMITERS) or (
+                    end == len(self.buffer) and self.eof
+                ):
+                    self.pos = end
+                    return value
+            # Read at least twice as much before retrying, so a large value
+            # split over many small chunks is not re-parsed once per chunk.
+            wanted = max(wanted * 2, len(self.buffer) - self.pos + 1)
+            while len(self.buffer) - self.pos < wanted and self.fill():
+                pass
+
+
+def _iter_array(reader: _Reader) -> Iterator[Any]:
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        char = reader.peek()
+        reader.pos += 1
+        if char == "]":
+            return
+        if char != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+
+
+def iter_json_items(
+    chunks: Iterable[bytes],
+    items_key: Optional[str] = None,
+    encoding: str = "utf-8",
+) -> Iterator[Any]:
+    """Incrementally parse the items of a JSON list from a byte stream.
+
+    Only the item being parsed is held in memory, so listings of any size are
+    processed in constant memory and the first item is available as soon as
+    its bytes arrive. The body may be a list or an object holding the list
+    under ``items_key``; other members of the object are skipped.
+
+    Args:
+        chunks: Response body as byte chunks.
+        items_key: Key of the list when the body is an object. Defaults to
+            ``results``.
+        encoding: Text encoding of the body.
+
+    Raises:
+        ValueError: If the body is not valid JSON of the expected shape.
+    """
+    reader = _Reader(chunks, encoding)
+    first = reader.peek()
+    if first == "[":
+        yield from _iter_array(reader)
+        return
+    if first != "{":
+        raise ValueError("Expected a JSON list or object")
+
+    key_wanted = items_key or DEFAULT_ITEMS_KEY
+    reader.pos += 1
+    while reader.peek() not in ("}", ""):
+        key = reader.value()
+        reader.expect(":")
+        if key == key_wanted and reader.peek() == "[":
+            yield from _iter_array(reader)
+            return
+        reader.value()
+        if reader.peek() == ",":
+            reader.pos += 1
+
+
+def stream_items(
+    transport: Transport,
+    url: str,
+    get_headers: Callable[[], Dict[str, str]],
+    params: Optional[Dict[str, Any]] = None,
+    items_key: Optional[str] = None,
+    chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+) -> Iterator[Dict]:
+    """Stream the items of a list endpoint without buffering the response.
+
+    Args:
+        transport: Transport used to send the request.
+        url: Endpoint URL.
+        get_headers: Callable returning request headers.
+        params: Query parameters.
+        items_key: Key holding the items when the endpoint returns an object.
+        chunk_size: Bytes read from the connection at a time.
+
+    Raises:
+        requests.HTTPError: If the response status is an error.
+    """
+    response = transport.get(url, headers=get_headers(), params=params, stream=True)
+    try:
+        response.raise_for_status()
+        yield from iter_json_items(
+            response.iter_content(chunk_size),
+            items_key=items_key,
+            encoding=response.encoding or "utf-8",
+        )
+    finally:
+        response.close()
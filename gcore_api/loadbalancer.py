@@ -1,6 +1,22 @@
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 
-import requests
+from .cache import NO_CACHE
+from .members import (
+    DEFAULT_MEMBER_WORKERS,
+    MemberApplyResult,
+    MemberSpec,
+    add_members,
+    set_members,
+)
+from .models import LoadBalancer, Member
+from .pagination import DEFAULT_PAGE_SIZE, iter_items
+from .topology import (
+    DEFAULT_ACTIVE_TIMEOUT,
+    DEFAULT_TOPOLOGY_WORKERS,
+    TopologyResult,
+    provision_topology,
+)
+from .transport import AsyncTransport, Transport
 
 
 class LoadBalancerClient:
@@ -8,21 +24,41 @@ class LoadBalancerClient:
 
     BASE_URL = "https://api.gcore.com/loadbalancer/v1"
 
-    def __init__(self, auth):
+    def __init__(self, auth, transport: Optional[Transport] = None):
         self.auth = auth
+        self.transport = transport or auth.transport
 
-    def list_load_balancers(self) -> List[Dict]:
-        """List all load balancers."""
-        response = requests.get(
+    def list_load_balancers(
+        self, typed: bool = False
+    ) -> Union[List[Dict], List[LoadBalancer]]:
+        """List all load balancers, as ``LoadBalancer`` models if ``typed``."""
+        response = self.transport.get(
             f"{self.BASE_URL}/loadbalancers", headers=self.auth.get_headers()
         )
         response.raise_for_status()
-        return response.json()
+        items = response.json()
+        return LoadBalancer.from_json_list(items) if typed else items
 
-    def get_load_balancer(self, lb_id: int) -> Dict:
-        """Get details of a specific load balancer."""
-        response = requests.get(
-            f"{self.BASE_URL}/loadbalancers/{lb_id}", headers=self.auth.get_headers()
+    def iter_load_balancers(self, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Dict]:
+        """Lazily iterate over all load balancers, page by page."""
+        return iter_items(
+            self.transport,
+            f"{self.BASE_URL}/loadbalancers",
+            self.auth.get_headers,
+            page_size=page_size,
+        )
+
+    def get_load_balancer(self, lb_id: int, fresh: bool = False) -> Dict:
+        """Get details of a specific load balancer.
+
+        Set ``fresh`` to bypass the response cache, e.g. when polling its
+        status.
+        """
+        headers = self.auth.get_headers()
+        if fresh:
+            headers = {**headers, **NO_CACHE}
+        response = self.transport.get(
+            f"{self.BASE_URL}/loadbalancers/{lb_id}", headers=headers
         )
         response.raise_for_status()
         return response.json()
@@ -32,7 +68,7 @@ class LoadBalancerClient:
     ) -> Dict:
         """Create a new load balancer."""
         data = {"name": name, "region": region, "type": type, "flavor": flavor}
-        response = requests.post(
+        response = self.transport.post(
             f"{self.BASE_URL}/loadbalancers", headers=self.auth.get_headers(), json=data
         )
         response.raise_for_status()
@@ -40,7 +76,7 @@ class LoadBalancerClient:
 
     def delete_load_balancer(self, lb_id: int) -> None:
         """Delete a load balancer."""
-        response = requests.delete(
+        response = self.transport.delete(
             f"{self.BASE_URL}/loadbalancers/{lb_id}", headers=self.auth.get_headers()
         )
         response.raise_for_status()
@@ -53,7 +89,7 @@ class LoadBalancerClient:
         if name:
             data["name"] = name
 
-        response = requests.post(
+        response = self.transport.post(
             f"{self.BASE_URL}/loadbalancers/{lb_id}/listeners",
             headers=self.auth.get_headers(),
             json=data,
@@ -78,7 +114,7 @@ class LoadBalancerClient:
         if name:
             data["name"] = name
 
-        response = requests.post(
+        response = self.transport.post(
             f"{self.BASE_URL}/loadbalancers/{lb_id}/pools",
             headers=self.auth.get_headers(),
             json=data,
@@ -91,10 +127,201 @@ class LoadBalancerClient:
     ) -> Dict:
         """Add a backend member to a pool."""
         data = {"address": address, "port": port, "weight": weight}
-        response = requests.post(
+        response = self.transport.post(
             f"{self.BASE_URL}/loadbalancers/{lb_id}/pools/{pool_id}/members",
             headers=self.auth.get_headers(),
             json=data,
         )
         response.raise_for_status()
         return response.json()
+
+    def list_members(
+        self, lb_id: int, pool_id: int, typed: bool = False
+    ) -> Union[List[Dict], List[Member]]:
+        """List the backend members of a pool, as ``Member`` models if ``typed``."""
+        response = self.transport.get(
+            f"{self.BASE_URL}/loadbalancers/{lb_id}/pools/{pool_id}/members",
+            headers=self.auth.get_headers(),
+        )
+        response.raise_for_status()
+        items = response.json()
+        return Member.from_json_list(items) if typed else items
+
+    def remove_member(self, lb_id: int, pool_id: int, member_id: int) -> None:
+        """Remove a backend member from a pool."""
+        response = self.transport.delete(
+            f"{self.BASE_URL}/loadbalancers/{lb_id}/pools/{pool_id}/members/"
+            f"{member_id}",
+            headers=self.auth.get_headers(),
+        )
+        response.raise_for_status()
+
+    def add_members(
+        self,
+        lb_id: int,
+        pool_id: int,
+        members: Iterable[MemberSpec],
+        max_workers: int = DEFAULT_MEMBER_WORKERS,
+    ) -> MemberApplyResult:
+        """Add many backend members to a pool concurrently.
+
+        See :func:`gcore_api.members.add_members`.
+        """
+        return add_members(self, lb_id, pool_id, members, max_workers=max_workers)
+
+    def set_members(
+        self,
+        lb_id: int,
+        pool_id: int,
+        members: Iterable[MemberSpec],
+        max_workers: int = DEFAULT_MEMBER_WORKERS,
+        dry_run: bool = False,
+    ) -> MemberApplyResult:
+        """Reconcile a pool's members with a desired membership.
+
+        See :func:`gcore_api.members.set_members`.
+        """
+        return set_members(
+            self, lb_id, pool_id, members, max_workers=max_workers, dry_run=dry_run
+        )
+
+    def provision_topology(
+        self,
+        spec: Dict,
+        max_workers: int = DEFAULT_TOPOLOGY_WORKERS,
+        timeout: float = DEFAULT_ACTIVE_TIMEOUT,
+    ) -> TopologyResult:
+        """Create a load balancer with its listeners, pools and members.
+
+        See :func:`gcore_api.topology.provision_topology`.
+        """
+        return provision_topology(self, spec, max_workers=max_workers, timeout=timeout)
+
+
+class AsyncLoadBalancerClient:
+    """Asyncio client for Gcore Load Balancer API operations."""
+
+    BASE_URL = LoadBalancerClient.BASE_URL
+
+    def __init__(self, auth, transport: Optional[AsyncTransport] = None):
+        self.auth = auth
+        self.transport = transport or auth.async_transport
+
+    async def list_load_balancers(
+        self, typed: bool = False
+    ) -> Union[List[Dict], List[LoadBalancer]]:
+        """List all load balancers, as ``LoadBalancer`` models if ``typed``."""
+        response = await self.transport.get(
+            f"{self.BASE_URL}/loadbalancers", headers=self.auth.get_headers()
+        )
+        response.raise_for_status()
+        items = response.json()
+        return LoadBalancer.from_json_list(items) if typed else items
+
+    async def get_load_balancer(self, lb_id: int, fresh: bool = False) -> Dict:
+        """Get details of a specific load balancer.
+
+        Set ``fresh`` to bypass the response cache, e.g. when polling its
+        status.
+        """
+        headers = self.auth.get_headers()
+        if fresh:
+            headers = {**headers, **NO_CACHE}
+        response = await self.transport.get(
+            f"{self.BASE_URL}/loadbalancers/{lb_id}", headers=headers
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def create_load_balancer(
+        self, name: str, region: str, type: str = "http", flavor: str = "lb1-1-1"
+    ) -> Dict:
+        """Create a new load balancer."""
+        data = {"name": name, "region": region, "type": type, "flavor": flavor}
+        response = await self.transport.post(
+            f"{self.BASE_URL}/loadbalancers", headers=self.auth.get_headers(), json=data
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def delete_load_balancer(self, lb_id: int) -> None:
+        """Delete a load balancer."""
+        response = await self.transport.delete(
+            f"{self.BASE_URL}/loadbalancers/{lb_id}", headers=self.auth.get_headers()
+        )
+        response.raise_for_status()
+
+    async def create_listener(
+        self, lb_id: int, protocol: str, port: int, name: Optional[str] = None
+    ) -> Dict:
+        """Create a new listener for a load balancer."""
+        data = {"protocol": protocol.upper(), "port": port}
+        if name:
+            data["name"] = name
+
+        response = await self.transport.post(
+            f"{self.BASE_URL}/loadbalancers/{lb_id}/listeners",
+            headers=self.auth.get_headers(),
+            json=data,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def create_pool(
+        self,
+        lb_id: int,
+        listener_id: int,
+        protocol: str,
+        method: str = "ROUND_ROBIN",
+        name: Optional[str] = None,
+    ) -> Dict:
+        """Create a new backend pool for a listener."""
+        data = {
+            "protocol": protocol.upper(),
+            "method": method,
+            "listener_id": listener_id,
+        }
+        if name:
+            data["name"] = name
+
+        response = await self.transport.post(
+            f"{self.BASE_URL}/loadbalancers/{lb_id}/pools",
+            headers=self.auth.get_headers(),
+            json=data,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def add_member(
+        self, lb_id: int, pool_id: int, address: str, port: int, weight: int = 1
+    ) -> Dict:
+        """Add a backend member to a pool."""
+        data = {"address": address, "port": port, "weight": weight}
+        response = await self.transport.post(
+            f"{self.BASE_URL}/loadbalancers/{lb_id}/pools/{pool_id}/members",
+            headers=self.auth.get_headers(),
+            json=data,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def list_members(
+        self, lb_id: int, pool_id: int, typed: bool = False
+    ) -> Union[List[Dict], List[Member]]:
+        """List the backend members of a pool, as ``Member`` models if ``typed``."""
+        response = await self.transport.get(
+            f"{self.BASE_URL}/loadbalancers/{lb_id}/pools/{pool_id}/members",
+            headers=self.auth.get_headers(),
+        )
+        response.raise_for_status()
+        items = response.json()
+        return Member.from_json_list(items) if typed else items
+
+    async def remove_member(self, lb_id: int, pool_id: int, member_id: int) -> None:
+        """Remove a backend member from a pool."""
+        response = await self.transport.delete(
+            f"{self.BASE_URL}/loadbalancers/{lb_id}/pools/{pool_id}/members/"
+            f"{member_id}",
+            headers=self.auth.get_headers(),
+        )
+        response.raise_for_status()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:
+    from .loadbalancer import LoadBalancerClient
+
+DEFAULT_MEMBER_WORKERS = 16
+DEFAULT_WEIGHT = 1
+
+MemberKey = Tuple[str, int]
+MemberSpec = Union[Mapping[str, Any], Sequence[Any]]
+
+
+def member_key(member: Mapping[str, Any]) -> MemberKey:
+    """Index key of a pool member: its address and port."""
+    return member["address"], int(member["port"])
+
+
+def member_label(member: Mapping[str, Any]) -> str:
+    """``address:port`` of a member, with IPv6 addresses in brackets."""
+    address, port = member_key(member)
+    return f"[{address}]:{port}" if ":" in address else f"{address}:{port}"
+
+
+def normalize_member(spec: MemberSpec) -> Dict:
+    """Turn an ``(address, port[, weight])`` tuple or a mapping into a member.
+
+    Raises:
+        ValueError: If the entry has no address or port, or a port or weight
+            that is not an integer.
+    """
+    if isinstance(spec, Mapping):
+        member = dict(spec)
+    else:
+        if (
+            isinstance(spec, str)
+            or not isinstance(spec, Sequence)
+            or not 2 <= len(spec) <= 3
+        ):
+            raise ValueError(f"Member {spec!r} is not (address, port[, weight])")
+        member = dict(zip(("address", "port", "weight"), spec))
+    missing = {"address", "port"} - set(member)
+    if missing:
+        raise ValueError(f"Member {spec!r} is missing {', '.join(sorted(missing))}")
+    try:
+        member["port"] = int(member["port"])
+        member["weight"] = int(member.get("weight", DEFAULT_WEIGHT))
+    except (TypeError, ValueError):
+        raise ValueError(f"Member {spec!r} has a non-integer port or weight")
+    return member
+
+
+@dataclass
+class MemberPlan:
+    """Members to add to and remove from a pool to reach its desired membership.
+
+    The API cannot update a member in place, so a member whose weight changes
+    is removed and added again as part of ``replaces``. If the re-add fails,
+    the member stays out of the pool and is reported in
+    :attr:`MemberApplyResult.lost`.
+    """
+
+    adds: List[Dict] = field(default_factory=list)
+    removes: List[Mapping[str, Any]] = field(default_factory=list)
+    replaces: List[Tuple[Mapping[str, Any], Dict]] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def empty(self) -> bool:
+        return not (self.adds or self.removes or self.replaces)
+
+
+@dataclass
+class MemberApplyResult:
+    """Outcome of applying a :class:`MemberPlan`.
+
+    ``added`` holds the members created by the API, including replacements;
+    ``failed`` pairs the ``address:port`` of each failed or skipped change
+    with its error. ``lost`` lists replaced members that were removed but
+    could not be added back.
+    """
+
+    plan: MemberPlan
+    added: List[Dict] = field(default_factory=list)
+    removed: int = 0
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+    lost: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+def plan_members(
+    current_members: Iterable[Mapping[str, Any]], desired_members: Iterable[MemberSpec]
+) -> MemberPlan:
+    """Diff a pool's current members against the desired ones.
+
+    Members are matched by ``(address, port)``; duplicates of a current
+    member are removed.
+
+    Raises:
+        ValueError: If a desired member is malformed or listed twice.
+    """
+    index: Dict[MemberKey, Mapping[str, Any]] = {}
+    plan = MemberPlan()
+    for member in current_members:
+        key = member_key(member)
+        if key in index:
+            plan.removes.append(member)
+        else:
+            index[key] = member
+
+    seen = set()
+    for spec in desired_members:
+        desired = normalize_member(spec)
+        key = member_key(desired)
+        if key in seen:
+            raise ValueError(f"Member {member_label(desired)} is listed twice")
+        seen.add(key)
+        current = index.pop(key, None)
+        if current is None:
+            plan.adds.append(desired)
+        elif int(current.get("weight", DEFAULT_WEIGHT)) == desired["weight"]:
+            plan.unchanged += 1
+        else:
+            plan.replaces.append((current, desired))
+    plan.removes.extend(index.values())
+    return plan
+
+
+def apply_member_plan(
+    client: "LoadBalancerClient",
+    lb_id: int,
+    pool_id: int,
+    plan: MemberPlan,
+    max_workers: int = DEFAULT_MEMBER_WORKERS,
+) -> MemberApplyResult:
+    """Execute a member plan with bounded parallelism.
+
+    Additions run first and must all succeed before any member is replaced
+    or removed, so the pool keeps serving while it is resized and a failed
+    rollout never empties it. If an addition fails, the replacements and
+    removals are skipped and reported as failed. Other failures are
+    collected in the result and do not stop the remaining changes.
+    """
+    result = MemberApplyResult(plan)
+
+    def add(member: Dict) -> Dict:
+        return client.add_member(
+            lb_id, pool_id, member["address"], member["port"], member["weight"]
+        )
+
+    def remove(member: Mapping[str, Any]) -> None:
+        client.remove_member(lb_id, pool_id, member["id"])
+
+    def replace(current: Mapping[str, Any], desired: Dict) -> Dict:
+        remove(current)
+        try:
+            return add(desired)
+        except Exception as e:
+            result.lost.append(member_label(desired))
+            raise RuntimeError(f"Removed, but adding it back failed: {e}") from e
+
+    adds = [("added", desired, partial(add, desired)) for desired in plan.adds]
+    changes: List[Tuple[str, Mapping[str, Any], Callable[[], Any]]] = []
+    for current, desired in plan.replaces:
+        changes.append(("added", desired, partial(replace, current, desired)))
+    for stale in plan.removes:
+        changes.append(("removed", stale, partial(remove, stale)))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for jobs in (adds, changes):
+            if result.failed:
+                for _, entry, _ in jobs:
+                    result.failed.append(
+                        (member_label(entry), "Skipped because an addition failed")
+                    )
+                break
+            futures = {executor.submit(job): (kind, entry) for kind, entry, job in jobs}
+            for future in as_completed(futures):
+                kind, entry = futures[future]
+                try:
+                    created = future.result()
+                except Exception as e:
+                    result.failed.append((member_label(entry), str(e)))
+                else:
+                    if kind == "added":
+                        result.added.append(created)
+                    else:
+                        result.removed += 1
+    return result
+
+
+def add_members(
+    client: "LoadBalancerClient",
+    lb_id: int,
+    pool_id: int,
+    members: Iterable[MemberSpec],
+    max_workers: int = DEFAULT_MEMBER_WORKERS,
+) -> MemberApplyResult:
+    """Register many backend members concurrently.
+
+    Entries that are not valid members are reported in ``failed`` and do not
+    stop the others from being registered.
+
+    Args:
+        client: Load balancer client to use.
+        lb_id: Load balancer owning the pool.
+        pool_id: Pool to add the members to.
+        members: ``(address, port[, weight])`` tuples or mappings with
+            ``address``, ``port`` and an optional ``weight``.
+        max_workers: Number of members registered concurrently.
+    """
+    plan = MemberPlan()
+    invalid: List[Tuple[str, str]] = []
+    for spec in members:
+        try:
+            plan.adds.append(normalize_member(spec))
+        except ValueError as e:
+            invalid.append((repr(spec), str(e)))
+    result = apply_member_plan(client, lb_id, pool_id, plan, max_workers=max_workers)
+    result.failed[:0] = invalid
+    return result
+
+
+def set_members(
+    client: "LoadBalancerClient",
+    lb_id: int,
+    pool_id: int,
+    members: Iterable[MemberSpec],
+    max_workers: int = DEFAULT_MEMBER_WORKERS,
+    dry_run: bool = False,
+) -> MemberApplyResult:
+    """Make a pool's membership match ``members``.
+
+    Fetches the pool's members once and only adds, removes or re-weights the
+    difference, concurrently. Setting an unchanged membership costs a single
+    list call.
+
+    Args:
+        client: Load balancer client to use.
+        lb_id: Load balancer owning the pool.
+        pool_id: Pool to reconcile.
+        members: The complete desired membership, as for :func:`add_members`.
+        max_workers: Number of changes applied concurrently.
+        dry_run: Only compute the plan.
+    """
+    plan = plan_members(client.list_members(lb_id, pool_id), members)
+    if dry_run or plan.empty:
+        return MemberApplyResult(plan)
+    return apply_member_plan(client, lb_id, pool_id, plan, max_workers=max_workers)
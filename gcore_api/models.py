@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+import sys
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+M = TypeVar("M", bound="Model")
+
+
+def _interning(setter: Callable[[Any, Any], None]) -> Callable[[Any, Any], None]:
+    def set_interned(obj: Any, value: Any) -> None:
+        setter(obj, sys.intern(value) if type(value) is str else value)
+
+    return set_interned
+
+
+class Model(Mapping[str, Any]):
+    """Compact, read-only API entity backed by ``__slots__``.
+
+    Subclasses list the fields worth a slot in ``__slots__``. Any other member
+    of the JSON payload is kept in a small side dict, created only when such
+    members exist, and read lazily through attribute or item access. String
+    values of the low-cardinality fields named in ``_interned`` (types,
+    statuses, regions) are interned, so large inventories share one copy of
+    each. Fields cannot be assigned once a model is built; use
+    :meth:`to_dict` for a mutable copy. Declared fields missing from the
+    payload read as ``None`` but are not reported as keys, so a model can
+    stand in for the dict it was built from::
+
+        record = Record.from_json({"id": 1, "name": "www", "type": "A"})
+        record.name, record["type"], record.get("ttl", 3600)
+    """
+
+    __slots__ = ("_extra",)
+
+    _fields: Tuple[str, ...] = ()
+    _interned: Tuple[str, ...] = ()
+    _setters: Dict[str, Callable[[Any, Any], None]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        fields: List[str] = []
+        for klass in reversed(cls.__mro__):
+            fields.extend(
+                name
+                for name in klass.__dict__.get("__slots__", ())
+                if not name.startswith("_")
+            )
+        cls._fields = tuple(fields)
+        # Slot descriptors' setters, so construction skips attribute lookup.
+        cls._setters = {name: getattr(cls, name).__set__ for name in fields}
+        for name in cls._interned:
+            cls._setters[name] = _interning(cls._setters[name])
+
+    _extra: Optional[Dict[str, Any]]
+
+    def __init__(self, **fields: Any):
+        _set_extra(self, None)
+        for key, value in fields.items():
+            self._set(key, value)
+
+    @classmethod
+    def from_json(cls: Type[M], data: Mapping[str, Any]) -> M:
+        """Build a model from a decoded JSON object."""
+        obj = cls.__new__(cls)
+        setters = cls._setters
+        extra = None
+        for key, value in data.items():
+            setter = setters.get(key)
+            if setter is not None:
+                setter(obj, value)
+            elif extra is None:
+                extra = {key: value}
+            else:
+                extra[key] = value
+        _set_extra(obj, extra)
+        return obj
+
+    @classmethod
+    def from_json_list(cls: Type[M], items: Iterable[Mapping[str, Any]]) -> List[M]:
+        """Build models from decoded JSON objects."""
+        from_json = cls.from_json
+        return [from_json(item) for item in items]
+
+    def _set(self, key: str, value: Any) -> None:
+        setter = self._setters.get(key)
+        if setter is not None:
+            setter(self, value)
+        elif self._extra is None:
+            _set_extra(self, {key: value})
+        else:
+            self._extra[key] = value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for unset slots and names without a slot.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        extra = self._extra
+        if extra is not None and name in extra:
+            return extra[name]
+        if name in self._fields:
+            return None
+        raise AttributeError(f"{type(self).__name__!r} has no field {name!r}")
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._setters:
+            try:
+                return object.__getattribute__(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self._fields:
+            try:
+                object.__getattribute__(self, name)
+            except AttributeError:
+                continue
+            yield name
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{key}={self[key]!r}" for key in self)
+        return f"{type(self).__name__}({fields})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return type(self).from_json, (self.to_dict(),)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The entity as a plain JSON-serializable dict."""
+        return dict(self.items())
+
+
+_set_extra = Model.__dict__["_extra"].__set__
+
+
+class Zone(Model):
+    """DNS zone."""
+
+    __slots__ = ("id", "name", "status")
+    _interned = ("status",)
+
+    id: int
+    name: str
+    status: str
+
+
+class Record(Model):
+    """DNS record."""
+
+    __slots__ = ("id", "name", "type", "content", "ttl")
+    _interned = ("type",)
+
+    id: int
+    name: str
+    type: str
+    content: Any
+    ttl: int
+
+
+class CDNResource(Model):
+    """CDN resource."""
+
+    __slots__ = ("id", "cname", "origin", "status", "active", "ssl")
+    _interned = ("status",)
+
+    id: int
+    cname: str
+    origin: str
+    status: str
+    active: bool
+    ssl: bool
+
+
+class Certificate(Model):
+    """SSL certificate."""
+
+    __slots__ = ("id", "name", "status", "domains", "expires_at")
+    _interned = ("status",)
+
+    id: int
+    name: str
+    status: str
+    domains: List[str]
+    expires_at: str
+
+
+class StorageObject(Model):
+    """Object in a storage bucket."""
+
+    __slots__ = ("name", "size", "etag", "last_modified")
+
+    name: str
+    size: int
+    etag: str
+    last_modified: str
+
+
+class LoadBalancer(Model):
+    """Load balancer."""
+
+    __slots__ = ("id", "name", "region", "type", "flavor", "status")
+    _interned = ("region", "type", "flavor", "status")
+
+    id: int
+    name: str
+    region: str
+    type: str
+    flavor: str
+    status: str
+
+
+class Pool(Model):
+    """Backend pool of a load balancer listener."""
+
+    __slots__ = ("id", "name", "listener_id", "protocol", "method")
+    _interned = ("protocol", "method")
+
+    id: int
+    name: str
+    listener_id: int
+    protocol: str
+    method: str
+
+
+class Member(Model):
+    """Backend member of a load balancer pool."""
+
+    __slots__ = ("id", "address", "port", "weight", "status")
+    _interned = ("status",)
+
+    id: int
+    address: str
+    port: int
+    weight: int
+    status: str
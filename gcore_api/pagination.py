@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .transport import Transport
+
+DEFAULT_PAGE_SIZE = 100
+
+
+def _page_items(payload: Any, items_key: Optional[str]) -> List[Dict]:
+    """Extract the list of items from a page payload."""
+    if isinstance(payload, list):
+        return payload
+    if items_key:
+        return payload.get(items_key) or []
+    return payload.get("results") or []
+
+
+def iter_pages(
+    transport: Transport,
+    url: str,
+    get_headers: Callable[[], Dict[str, str]],
+    params: Optional[Dict[str, Any]] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    items_key: Optional[str] = None,
+    prefetch: bool = True,
+) -> Iterator[List[Dict]]:
+    """Lazily fetch the pages of a ``limit``/``offset`` paginated endpoint.
+
+    While the caller consumes one page, the next one is fetched on a
+    background thread, so at most two pages are held in memory at a time.
+    A short page does not end the listing, since servers may cap ``limit``
+    below ``page_size``; iteration stops at the first empty page, or at a
+    page starting with the same item as the previous one, which means the
+    endpoint ignores ``offset``.
+
+    Args:
+        transport: Transport used to send the requests.
+        url: Endpoint URL.
+        get_headers: Callable returning request headers for each page.
+        params: Extra query parameters sent with every page.
+        page_size: Number of items requested per page.
+        items_key: Key holding the items when the endpoint returns an object
+            rather than a list. Defaults to ``results``.
+        prefetch: Fetch the next page in the background.
+
+    Yields:
+        Lists of items, one per page.
+    """
+
+    def fetch(offset: int) -> List[Dict]:
+        page_params = dict(params or {})
+        page_params.update({"limit": page_size, "offset": offset})
+        response = transport.get(url, headers=get_headers(), params=page_params)
+        response.raise_for_status()
+        return _page_items(response.json(), items_key)
+
+    def is_last(items: List[Dict], previous: Optional[List[Dict]]) -> bool:
+        return not items or (previous is not None and items[0] == previous[0])
+
+    offset = 0
+    previous: Optional[List[Dict]] = None
+    if not prefetch:
+        while True:
+            items = fetch(offset)
+            if is_last(items, previous):
+                return
+            offset += len(items)
+            previous = items
+            yield items
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        future = executor.submit(fetch, offset)
+        while True:
+            items = future.result()
+            if is_last(items, previous):
+                return
+            offset += len(items)
+            future = executor.submit(fetch, offset)
+            previous = items
+            yield items
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_items(
+    transport: Transport,
+    url: str,
+    get_headers: Callable[[], Dict[str, str]],
+    params: Optional[Dict[str, Any]] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    items_key: Optional[str] = None,
+    prefetch: bool = True,
+) -> Iterator[Dict]:
+    """Lazily iterate over every item of a paginated endpoint.
+
+    See :func:`iter_pages` for the arguments.
+    """
+    for page in iter_pages(
+        transport, url, get_headers, params, page_size, items_key, prefetch
+    ):
+        yield from page
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+import asyncio
+import heapq
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from .cdn import AsyncCDNClient, CDNClient
+
+DEFAULT_CHUNK_SIZE = 100
+DEFAULT_WILDCARD_THRESHOLD = 50
+DEFAULT_PURGE_WORKERS = 4
+DEFAULT_PURGE_RATE = 5.0
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_MAX_POLL_INTERVAL = 30.0
+DEFAULT_MAX_POLL_ERRORS = 5
+FINISHED_STATUSES = {"completed", "done", "success", "failed", "error", "cancelled"}
+
+PurgeTask = Tuple[int, str]
+
+
+@dataclass
+class PurgeBatch:
+    """Aggregate handle for the purge tasks submitted by :func:`batch_purge`."""
+
+    resource_id: int
+    task_ids: List[str] = field(default_factory=list)
+    url_count: int = 0
+    path_count: int = 0
+    failed: List[Tuple[List[str], str]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    @property
+    def tasks(self) -> List[Tuple[int, str]]:
+        """``(resource_id, task_id)`` pairs, e.g. for a purge waiter."""
+        return [(self.resource_id, task_id) for task_id in self.task_ids]
+
+
+def coalesce_urls(
+    urls: Iterable[str], wildcard_threshold: int = DEFAULT_WILDCARD_THRESHOLD
+) -> Tuple[List[str], List[str]]:
+    """De-duplicate URLs and collapse crowded directories into wildcards.
+
+    When at least ``wildcard_threshold`` distinct URLs share a parent
+    directory, they are replaced by a single ``/dir/*`` path purge. A
+    threshold of 0 disables wildcard collapsing.
+
+    Returns:
+        Remaining URLs to purge individually and wildcard paths to purge.
+    """
+    unique = list(dict.fromkeys(url.split("#", 1)[0] for url in urls))
+    if not wildcard_threshold:
+        return unique, []
+
+    by_directory: Dict[str, List[str]] = defaultdict(list)
+    for url in unique:
+        path = urlsplit(url).path or "/"
+        by_directory[path.rsplit("/", 1)[0] + "/"].append(url)
+
+    remaining: List[str] = []
+    paths: List[str] = []
+    for directory, members in by_directory.items():
+        if len(members) >= wildcard_threshold:
+            paths.append(f"{directory}*")
+        else:
+            remaining.extend(members)
+    return remaining, paths
+
+
+def chunk_evenly(items: List[str], max_size: int) -> List[List[str]]:
+    """Split items into the fewest chunks of at most ``max_size``, evenly sized."""
+    if not items:
+        return []
+    count = -(-len(items) // max_size)
+    size = -(-len(items) // count)
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+class _Pacer:
+    """Thread-safe spacing of calls to at most ``rate`` per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def batch_purge(
+    client: "CDNClient",
+    resource_id: int,
+    urls: Iterable[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    wildcard_threshold: int = DEFAULT_WILDCARD_THRESHOLD,
+    max_workers: int = DEFAULT_PURGE_WORKERS,
+    rate: Optional[float] = DEFAULT_PURGE_RATE,
+) -> PurgeBatch:
+    """Purge any number of URLs from a CDN resource.
+
+    URLs are de-duplicated, crowded directories are collapsed into wildcard
+    path purges, and the rest are split into evenly sized requests of at most
+    ``chunk_size`` URLs. Requests are submitted concurrently but paced to at
+    most ``rate`` per second. A failed chunk is recorded in the returned
+    batch and does not stop the others.
+
+    Args:
+        client: CDN client to use.
+        resource_id: CDN resource to purge.
+        urls: URLs to purge.
+        chunk_size: Maximum URLs or paths per purge request.
+        wildcard_threshold: Distinct URLs in one directory that trigger a
+            wildcard purge. 0 disables wildcards.
+        max_workers: Number of purge requests in flight.
+        rate: Maximum purge requests per second. ``None`` disables pacing.
+    """
+    remaining, paths = coalesce_urls(urls, wildcard_threshold)
+    batch = PurgeBatch(resource_id, url_count=len(remaining), path_count=len(paths))
+    pacer = _Pacer(rate or 0.0)
+
+    def submit(kind: str, items: List[str]) -> Dict:
+        pacer.wait()
+        if kind == "paths":
+            return client.purge_paths(resource_id, items)
+        return client.purge_url(resource_id, items)
+
+    jobs = [("urls", chunk) for chunk in chunk_evenly(remaining, chunk_size)]
+    jobs += [("paths", chunk) for chunk in chunk_evenly(paths, chunk_size)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(submit, *job): job[1] for job in jobs}
+        for future in as_completed(futures):
+            try:
+                batch.task_ids.append(future.result()["task_id"])
+            except Exception as e:
+                batch.failed.append((futures[future], str(e)))
+    return batch
+
+
+class PollBackoff:
+    """Per-task adaptive polling schedule with exponential backoff and jitter.
+
+    The interval grows by ``multiplier`` each poll that shows no progress and
+    is held while progress keeps moving, so slow tasks are polled rarely and
+    tasks that are nearly done are not delayed needlessly.
+    """
+
+    def __init__(
+        self,
+        initial_interval: float = DEFAULT_POLL_INTERVAL,
+        max_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+        multiplier: float = 2.0,
+        jitter: float = 0.5,
+    ):
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.multiplier = multiplier
+        self.jitter = jitter
+
+    def next_interval(self, interval: float, progressed: bool) -> float:
+        if progressed:
+            return interval
+        return min(self.max_interval, interval * self.multiplier)
+
+    def delay(self, interval: float) -> float:
+        return interval * (1 - self.jitter * random.random())
+
+
+def _is_finished(status: Dict) -> bool:
+    return str(status.get("status", "")).lower() in FINISHED_STATUSES
+
+
+class _PollState:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.progress: Optional[object] = None
+        self.errors = 0
+
+    def observe(self, status: Dict, backoff: PollBackoff) -> Optional[Dict]:
+        """Record a polled status, returning it if the task has finished."""
+        if _is_finished(status):
+            return status
+        progress = status.get("progress")
+        progressed = progress is not None and progress != self.progress
+        self.progress = progress
+        self.errors = 0
+        self.interval = backoff.next_interval(self.interval, progressed)
+        return None
+
+    def failed(self, error: Exception, backoff: PollBackoff) -> Optional[Dict]:
+        """Record a polling error, returning a final status once it persists."""
+        self.errors += 1
+        if self.errors >= DEFAULT_MAX_POLL_ERRORS:
+            return {"status": "error", "error": str(error)}
+        self.interval = backoff.next_interval(self.interval, False)
+        return None
+
+
+class PurgeWaiter:
+    """Wait on many purge tasks at once, yielding each as soon as it finishes.
+
+    Tasks are polled on their own adaptive schedules through the client's
+    shared connection pool, and a task stops being polled the moment it
+    reaches a final status. A task whose status cannot be fetched
+    ``DEFAULT_MAX_POLL_ERRORS`` times in a row finishes with status
+    ``error``.
+    """
+
+    def __init__(
+        self,
+        client: "CDNClient",
+        tasks: Iterable[PurgeTask],
+        initial_interval: float = DEFAULT_POLL_INTERVAL,
+        max_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+        max_workers: int = DEFAULT_PURGE_WORKERS,
+    ):
+        """Initialize purge waiter.
+
+        Args:
+            client: CDN client used to poll task status.
+            tasks: ``(resource_id, task_id)`` pairs, e.g. ``PurgeBatch.tasks``.
+            initial_interval: Delay before the first poll of each task.
+            max_interval: Upper bound on the delay between polls of a task.
+            max_workers: Number of status requests in flight.
+        """
+        self.client = client
+        self.tasks = list(dict.fromkeys(tasks))
+        self.backoff = PollBackoff(initial_interval, max_interval)
+        self.max_workers = max_workers
+
+    def iter_completed(
+        self, timeout: Optional[float] = None
+    ) -> Iterator[Tuple[PurgeTask, Dict]]:
+        """Yield ``(task, status)`` pairs in the order the tasks finish.
+
+        Raises:
+            TimeoutError: If tasks are still pending after ``timeout`` seconds.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        states = {
+            task: _PollState(self.backoff.initial_interval) for task in self.tasks
+        }
+        now = time.monotonic()
+        queue = [
+            (now + self.backoff.delay(state.interval), i, task)
+            for i, (task, state) in enumerate(states.items())
+        ]
+        heapq.heapify(queue)
+        sequence = len(queue)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while queue:
+                due_at = queue[0][0]
+                if deadline is not None and due_at > deadline:
+                    raise TimeoutError(f"{len(queue)} purge tasks still pending")
+                time.sleep(max(0.0, due_at - time.monotonic()))
+
+                now = time.monotonic()
+                due = []
+                while queue and queue[0][0] <= now:
+                    due.append(heapq.heappop(queue)[2])
+                futures = {
+                    executor.submit(self.client.get_purge_status, *task): task
+                    for task in due
+                }
+                for future in as_completed(futures):
+                    task = futures[future]
+                    state = states[task]
+                    try:
+                        final = state.observe(future.result(), self.backoff)
+                    except Exception as e:
+                        final = state.failed(e, self.backoff)
+                    if final is not None:
+                        yield task, final
+                        continue
+                    sequence += 1
+                    due_at = time.monotonic() + self.backoff.delay(state.interval)
+                    heapq.heappush(queue, (due_at, sequence, task))
+
+    def wait(
+        self,
+        callback: Optional[Callable[[PurgeTask, Dict], None]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[PurgeTask, Dict]:
+        """Block until every task finishes.
+
+        Args:
+            callback: Called with ``(task, status)`` as each task finishes.
+            timeout: Maximum seconds to wait.
+
+        Returns:
+            Final status of every task.
+        """
+        results = {}
+        for task, status in self.iter_completed(timeout):
+            results[task] = status
+            if callback:
+                callback(task, status)
+        return results
+
+
+class AsyncPurgeWaiter:
+    """Asyncio counterpart of :class:`PurgeWaiter`.
+
+    Iterate with ``async for task, status in waiter`` to receive tasks as
+    they finish.
+    """
+
+    def __init__(
+        self,
+        client: "AsyncCDNClient",
+        tasks: Iterable[PurgeTask],
+        initial_interval: float = DEFAULT_POLL_INTERVAL,
+        max_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+    ):
+        self.client = client
+        self.tasks = list(dict.fromkeys(tasks))
+        self.backoff = PollBackoff(initial_interval, max_interval)
+
+    async def _poll(self, task: PurgeTask, queue: asyncio.Queue) -> None:
+        state = _PollState(self.backoff.initial_interval)
+        while True:
+            await asyncio.sleep(self.backoff.delay(state.interval))
+            try:
+                status = await self.client.get_purge_status(*task)
+                final = state.observe(status, self.backoff)
+            except Exception as e:
+                final = state.failed(e, self.backoff)
+            if final is not None:
+                await queue.put((task, final))
+                return
+
+    async def iter_completed(
+        self, timeout: Optional[float] = None
+    ) -> AsyncIterator[Tuple[PurgeTask, Dict]]:
+        """Yield ``(task, status)`` pairs in the order the tasks finish.
+
+        Raises:
+            TimeoutError: If tasks are still pending after ``timeout`` seconds.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+        queue: asyncio.Queue = asyncio.Queue()
+        pollers = [asyncio.create_task(self._poll(task, queue)) for task in self.tasks]
+        try:
+            for remaining in range(len(pollers), 0, -1):
+                wait = deadline - loop.time() if deadline is not None else None
+                try:
+                    yield await asyncio.wait_for(queue.get(), wait)
+                except asyncio.TimeoutError:
+                    raise TimeoutError(f"{remaining} purge tasks still pending")
+        finally:
+            for poller in pollers:
+                poller.cancel()
+
+    def __aiter__(self) -> AsyncIterator[Tuple[PurgeTask, Dict]]:
+        return self.iter_completed()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+import os
+import struct
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+DEFAULT_SERVICE = "*"
+RATE_LIMIT_ENV = "GCORE_RATE_LIMIT"
+RATE_LIMIT_DIR_ENV = "GCORE_RATE_LIMIT_DIR"
+
+_STATE = struct.Struct("d")
+
+
+class TokenBucket:
+    """Thread-safe rate limit of ``rate`` requests per second with bursts.
+
+    Implemented as a generic cell rate algorithm: callers reserve a slot and
+    get back how long to wait for it, so the same bucket serves threads and
+    coroutines alike.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.interval = 1.0 / rate
+        self._tat = 0.0
+        self._lock = threading.Lock()
+
+    def _advance(self, tat: float, now: float) -> Tuple[float, float]:
+        tat = max(tat, now)
+        wait = max(0.0, tat - now - (self.burst - 1) * self.interval)
+        return tat + self.interval, wait
+
+    def reserve(self) -> float:
+        """Reserve the next slot, returning seconds to wait before using it."""
+        with self._lock:
+            self._tat, wait = self._advance(self._tat, time.monotonic())
+        return wait
+
+
+class FileTokenBucket(TokenBucket):
+    """Token bucket whose state is shared by all processes on one host.
+
+    State lives in a small file guarded by an exclusive ``flock``, so several
+    ``gcore`` workers draw from one budget. POSIX only.
+    """
+
+    def __init__(self, path: Union[str, Path], rate: float, burst: int = 1):
+        import fcntl  # noqa: F401 - fail early on platforms without flock
+
+        super().__init__(rate, burst)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch(exist_ok=True)
+
+    def reserve(self) -> float:
+        """Reserve the next slot, returning seconds to wait before using it."""
+        import fcntl
+
+        with self._lock, open(self.path, "r+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                data = f.read(_STATE.size)
+                tat = _STATE.unpack(data)[0] if len(data) == _STATE.size else 0.0
+                tat, wait = self._advance(tat, time.time())
+                f.seek(0)
+                f.write(_STATE.pack(tat))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return wait
+
+
+def service_for(url: str) -> str:
+    """Name of the API service a URL belongs to, e.g. ``cdn`` or ``dns``."""
+    path = urlsplit(url).path.lstrip("/")
+    return path.split("/", 1)[0] or DEFAULT_SERVICE
+
+
+def parse_service_map(spec: str) -> Dict[str, float]:
+    """Parse comma-separated ``service=value`` pairs, e.g. ``cdn=5,*=20``.
+
+    A bare value applies to every service (``*``).
+    """
+    values = {}
+    for item in spec.split(","):
+        service, _, value = item.strip().rpartition("=")
+        values[service.strip() or DEFAULT_SERVICE] = float(value)
+    return values
+
+
+class RateLimiter:
+    """Per-service rate limits applied in the shared request path.
+
+    Each service (``cdn``, ``dns``, ``ssl``, ``storage``, ``loadbalancer``,
+    ...) gets its own bucket; services without an explicit limit share the
+    ``*`` limit if one is set and are otherwise unlimited.
+    """
+
+    def __init__(
+        self,
+        limits: Mapping[str, float],
+        burst: int = 1,
+        lock_dir: Optional[Union[str, Path]] = None,
+    ):
+        """Initialize rate limiter.
+
+        Args:
+            limits: Requests per second by service name; ``*`` applies to
+                every other service.
+            burst: Requests allowed back to back before pacing starts.
+            lock_dir: Directory for shared bucket files. When set, limits are
+                coordinated across all processes using the same directory.
+        """
+        self.limits = dict(limits)
+        self.burst = burst
+        self.lock_dir = Path(lock_dir) if lock_dir else None
+        self._buckets: Dict[str, Optional[TokenBucket]] = {}
+        self._lock = threading.Lock()
+        self._counters: Counter = Counter()
+
+    @classmethod
+    def from_env(cls) -> Optional["RateLimiter"]:
+        """Build a limiter from ``GCORE_RATE_LIMIT``, if set.
+
+        The variable holds comma-separated ``service=rate`` pairs, e.g.
+        ``cdn=5,dns=10,*=20``; a bare number limits every service. Setting
+        ``GCORE_RATE_LIMIT_DIR`` shares the limits across processes.
+        """
+        spec = os.environ.get(RATE_LIMIT_ENV)
+        if not spec:
+            return None
+        return cls(parse_service_map(spec), lock_dir=os.environ.get(RATE_LIMIT_DIR_ENV))
+
+    def _bucket(self, service: str) -> Optional[TokenBucket]:
+        key = service if service in self.limits else DEFAULT_SERVICE
+        with self._lock:
+            if key not in self._buckets:
+                rate = self.limits.get(key)
+                if rate is None:
+                    self._buckets[key] = None
+                elif self.lock_dir:
+                    name = "default" if key == DEFAULT_SERVICE else key
+                    self._buckets[key] = FileTokenBucket(
+                        self.lock_dir / f"{name}.bucket", rate, self.burst
+                    )
+                else:
+                    self._buckets[key] = TokenBucket(rate, self.burst)
+            return self._buckets[key]
+
+    def reserve(self, url: str) -> float:
+        """Reserve a request slot for ``url``, returning seconds to wait."""
+        service = service_for(url)
+        bucket = self._bucket(service)
+        if bucket is None:
+            return 0.0
+        wait = bucket.reserve()
+        if wait > 0:
+            with self._lock:
+                self._counters[f"throttled.{service}"] += 1
+                self._counters[f"throttled_ms.{service}"] += int(wait * 1000)
+        return wait
+
+    def acquire(self, url: str) -> float:
+        """Block until a request to ``url`` may be sent.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    @property
+    def metrics(self) -> Dict[str, int]:
+        """Snapshot of throttle counters by service.
+
+        Keys are ``throttled.<service>`` (requests delayed) and
+        ``throttled_ms.<service>`` (total delay in milliseconds).
+        """
+        with self._lock:
+            return dict(self._counters)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class RetryBudget:
+    """Token bucket limiting retries to a fraction of recent requests.
+
+    Every request deposits ``ratio`` tokens and every retry withdraws one, so
+    when the API is failing broadly retries stop instead of multiplying the
+    load. ``min_tokens`` lets low-traffic clients still retry occasionally.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_tokens: float = 10.0):
+        self.ratio = ratio
+        self.min_tokens = min_tokens
+        self.max_tokens = max(min_tokens, 100.0)
+        self._tokens = min_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy:
+    """Decides which failed requests are retried and how long to wait.
+
+    Idempotent methods are retried on retryable statuses and connection
+    errors; any method is retried on 429, which the API returns before doing
+    any work. Delays use capped exponential backoff with full jitter unless
+    the response carries a ``Retry-After`` header.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        max_retry_after: float = 120.0,
+        retry_statuses: Iterable[int] = RETRY_STATUSES,
+        retry_methods: Iterable[str] = IDEMPOTENT_METHODS,
+        budget: Optional[RetryBudget] = None,
+    ):
+        """Initialize retry policy.
+
+        Args:
+            max_retries: Maximum retries per request.
+            backoff_factor: Base delay in seconds, doubled on every retry.
+            max_backoff: Upper bound on the computed backoff delay.
+            max_retry_after: Upper bound on a server-provided ``Retry-After``.
+            retry_statuses: Response statuses that trigger a retry.
+            retry_methods: Methods that are safe to retry after the request
+                may have reached the server.
+            budget: Shared retry budget. A default budget is created if not
+                provided.
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.retry_statuses: FrozenSet[int] = frozenset(retry_statuses)
+        self.retry_methods: FrozenSet[str] = frozenset(
+            method.upper() for method in retry_methods
+        )
+        self.budget = budget or RetryBudget()
+        self._counters: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] += 1
+
+    @property
+    def metrics(self) -> Dict[str, int]:
+        """Snapshot of retry counters.
+
+        Keys are ``requests``, ``retries``, ``retries.<status|error>``,
+        ``budget_exhausted`` and ``exhausted`` (gave up after
+        ``max_retries``).
+        """
+        with self._lock:
+            return dict(self._counters)
+
+    def start(self) -> None:
+        """Record a new request, funding the retry budget."""
+        self._count("requests")
+        self.budget.deposit()
+
+    def should_retry(
+        self,
+        method: str,
+        attempt: int,
+        status: Optional[int] = None,
+        error: Optional[BaseException] = None,
+    ) -> bool:
+        """Decide whether to retry after a failed attempt.
+
+        Args:
+            method: HTTP method of the request.
+            attempt: Number of retries already made.
+            status: Response status, if a response was received.
+            error: Connection error, if no response was received.
+        """
+        if error is not None:
+            retryable = method.upper() in self.retry_methods
+            reason = type(error).__name__
+        else:
+            retryable = status in self.retry_statuses and (
+                status == 429 or method.upper() in self.retry_methods
+            )
+            reason = str(status)
+        if not retryable:
+            return False
+        if attempt >= self.max_retries:
+            self._count("exhausted")
+            return False
+        if not self.budget.withdraw():
+            self._count("budget_exhausted")
+            return False
+        self._count("retries")
+        self._count(f"retries.{reason}")
+        return True
+
+    def delay(self, attempt: int, headers: Optional[Mapping[str, str]] = None) -> float:
+        """Seconds to wait before retry number ``attempt + 1``."""
+        retry_after = parse_retry_after((headers or {}).get("Retry-After"))
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        ceiling = min(self.max_backoff, self.backoff_factor * (2**attempt))
+        return random.uniform(0, ceiling)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def body_position(body: object) -> Optional[int]:
+    """Current position of a seekable file-like body, if any."""
+    try:
+        return body.tell() if hasattr(body, "tell") else None  # type: ignore
+    except OSError:
+        return None
+
+
+def is_resendable(body: object, position: Optional[int]) -> bool:
+    """Whether a request body can be sent again on retry.
+
+    Bytes-like and empty bodies always can, file-like bodies can if their
+    start ``position`` is known so they can be rewound, and one-shot
+    iterators cannot.
+    """
+    if body is None or isinstance(body, (bytes, bytearray, memoryview, str, dict)):
+        return True
+    return position is not None and hasattr(body, "seek")
@@ -1,7 +1,20 @@
 #!/usr/bin/env python3
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 
-import requests
+from .cache import NO_CACHE
+from .certscan import DEFAULT_SCAN_WORKERS, CertificateScanner, ExpiryIndex
+from .issuance import (
+    DEFAULT_ISSUE_RATE,
+    DEFAULT_ISSUE_WORKERS,
+    CertificateIssuer,
+    DomainSet,
+    IssueResult,
+    issue_certificates,
+)
+from .models import Certificate
+from .pagination import DEFAULT_PAGE_SIZE, iter_items
+from .transport import AsyncTransport, Transport
 
 
 class SSLClient:
@@ -9,20 +22,35 @@ class SSLClient:
 
     BASE_URL = "https://api.gcore.com/ssl/v1"
 
-    def __init__(self, auth):
+    def __init__(self, auth, transport: Optional[Transport] = None):
         self.auth = auth
+        self.transport = transport or auth.transport
 
-    def list_certificates(self) -> List[Dict[str, str]]:
-        """List all SSL certificates."""
-        response = requests.get(
+    def list_certificates(
+        self, typed: bool = False
+    ) -> Union[List[Dict[str, str]], List[Certificate]]:
+        """List all SSL certificates, as ``Certificate`` models if ``typed``."""
+        response = self.transport.get(
             f"{self.BASE_URL}/certificates", headers=self.auth.get_headers()
         )
         response.raise_for_status()
-        return response.json()
+        items = response.json()
+        return Certificate.from_json_list(items) if typed else items
+
+    def iter_certificates(
+        self, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[Dict[str, str]]:
+        """Lazily iterate over all SSL certificates, page by page."""
+        return iter_items(
+            self.transport,
+            f"{self.BASE_URL}/certificates",
+            self.auth.get_headers,
+            page_size=page_size,
+        )
 
     def get_certificate(self, cert_id: int) -> Dict[str, str]:
         """Get details of a specific SSL certificate."""
-        response = requests.get(
+        response = self.transport.get(
             f"{self.BASE_URL}/certificates/{cert_id}", headers=self.auth.get_headers()
         )
         response.raise_for_status()
@@ -40,7 +68,7 @@ class SSLClient:
         if chain:
             data["chain"] = chain
 
-        response = requests.post(
+        response = self.transport.post(
             f"{self.BASE_URL}/certificates",
             headers=self.auth.get_headers(),
             json=data,
@@ -50,7 +78,7 @@ class SSLClient:
 
     def delete_certificate(self, cert_id: int) -> None:
         """Delete an SSL certificate."""
-        response = requests.delete(
+        response = self.transport.delete(
             f"{self.BASE_URL}/certificates/{cert_id}", headers=self.auth.get_headers()
         )
         response.raise_for_status()
@@ -60,7 +88,7 @@ class SSLClient:
     ) -> Dict[str, str]:
         """Request a new SSL certificate through Gcore."""
         data = {"domains": domains, "validation_method": validation_method}
-        response = requests.post(
+        response = self.transport.post(
             f"{self.BASE_URL}/certificates/request",
             headers=self.auth.get_headers(),
             json=data,
@@ -70,9 +98,128 @@ class SSLClient:
 
     def get_validation_status(self, cert_id: int) -> Dict[str, str]:
         """Get domain validation status for a certificate request."""
-        response = requests.get(
+        response = self.transport.get(
             f"{self.BASE_URL}/certificates/{cert_id}/validation",
+            headers={**self.auth.get_headers(), **NO_CACHE},
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def issue_certificates(
+        self,
+        domain_sets: Iterable[DomainSet],
+        validation_method: str = "dns",
+        max_workers: int = DEFAULT_ISSUE_WORKERS,
+        rate: Optional[float] = DEFAULT_ISSUE_RATE,
+        timeout: Optional[float] = None,
+    ) -> Iterator[IssueResult]:
+        """Request many certificates, yielding each as it validates or fails.
+
+        See :func:`gcore_api.issuance.issue_certificates`.
+        """
+        return issue_certificates(
+            self, domain_sets, validation_method, max_workers, rate, timeout
+        )
+
+    def track_validations(
+        self,
+        cert_ids: Iterable[int],
+        max_workers: int = DEFAULT_ISSUE_WORKERS,
+        timeout: Optional[float] = None,
+    ) -> Iterator[IssueResult]:
+        """Yield requested certificates as their validations finish.
+
+        See :class:`gcore_api.issuance.CertificateIssuer`.
+        """
+        issuer = CertificateIssuer(self, max_workers=max_workers)
+        return issuer.track(cert_ids, timeout=timeout)
+
+    def scan_certificates(
+        self,
+        max_workers: int = DEFAULT_SCAN_WORKERS,
+        cache_path: Union[str, Path, None] = None,
+    ) -> ExpiryIndex:
+        """Index all certificates by expiry and covered domain.
+
+        See :class:`gcore_api.certscan.CertificateScanner`.
+        """
+        scanner = CertificateScanner(self, cache_path, max_workers=max_workers)
+        return scanner.scan()
+
+
+class AsyncSSLClient:
+    """Asyncio client for Gcore SSL Certificate API operations."""
+
+    BASE_URL = SSLClient.BASE_URL
+
+    def __init__(self, auth, transport: Optional[AsyncTransport] = None):
+        self.auth = auth
+        self.transport = transport or auth.async_transport
+
+    async def list_certificates(
+        self, typed: bool = False
+    ) -> Union[List[Dict[str, str]], List[Certificate]]:
+        """List all SSL certificates, as ``Certificate`` models if ``typed``."""
+        response = await self.transport.get(
+            f"{self.BASE_URL}/certificates", headers=self.auth.get_headers()
+        )
+        response.raise_for_status()
+        items = response.json()
+        return Certificate.from_json_list(items) if typed else items
+
+    async def get_certificate(self, cert_id: int) -> Dict[str, str]:
+        """Get details of a specific SSL certificate."""
+        response = await self.transport.get(
+            f"{self.BASE_URL}/certificates/{cert_id}", headers=self.auth.get_headers()
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def upload_certificate(
+        self, name: str, cert: str, private_key: str, chain: Optional[str] = None
+    ) -> Dict[str, str]:
+        """Upload a custom SSL certificate."""
+        data = {
+            "name": name,
+            "certificate": cert,
+            "private_key": private_key,
+        }
+        if chain:
+            data["chain"] = chain
+
+        response = await self.transport.post(
+            f"{self.BASE_URL}/certificates",
+            headers=self.auth.get_headers(),
+            json=data,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def delete_certificate(self, cert_id: int) -> None:
+        """Delete an SSL certificate."""
+        response = await self.transport.delete(
+            f"{self.BASE_URL}/certificates/{cert_id}", headers=self.auth.get_headers()
+        )
+        response.raise_for_status()
+
+    async def request_certificate(
+        self, domains: List[str], validation_method: str = "dns"
+    ) -> Dict[str, str]:
+        """Request a new SSL certificate through Gcore."""
+        data = {"domains": domains, "validation_method": validation_method}
+        response = await self.transport.post(
+            f"{self.BASE_URL}/certificates/request",
             headers=self.auth.get_headers(),
+            json=data,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def get_validation_status(self, cert_id: int) -> Dict[str, str]:
+        """Get domain validation status for a certificate request."""
+        response = await self.transport.get(
+            f"{self.BASE_URL}/certificates/{cert_id}/validation",
+            headers={**self.auth.get_headers(), **NO_CACHE},
         )
         response.raise_for_status()
         return response.json()
@@ -1,9 +1,23 @@
 #!/usr/bin/env python3
+import asyncio
+import contextlib
 import mimetypes
 import os
-from typing import Dict, List, Optional
+from typing import Any, AsyncIterator, BinaryIO, Dict, Iterator, List, Optional
 
-import requests
+from .jsonstream import stream_items
+from .models import StorageObject
+from .pagination import DEFAULT_PAGE_SIZE, iter_items
+from .transfer import (
+    DEFAULT_BUFFER_SIZE,
+    DEFAULT_MAX_WORKERS,
+    MultipartUpload,
+    RangedDownload,
+    verify_checksum,
+)
+from .transport import AsyncTransport, Transport
+
+ASYNC_CHUNK_SIZE = 1024 * 1024
 
 
 class StorageClient:
@@ -11,18 +25,30 @@ class StorageClient:
 
     BASE_URL = "https://api.gcore.com/storage/v1"
 
-    def __init__(self, auth):
+    def __init__(self, auth, transport: Optional[Transport] = None):
         self.auth = auth
+        self.transport = transport or auth.transport
 
     def list_buckets(self) -> List[Dict[str, str]]:
         """List all storage buckets."""
-        response = requests.get(
+        response = self.transport.get(
             f"{self.BASE_URL}/buckets",
             headers=self.auth.get_headers(),
         )
         response.raise_for_status()
         return response.json()
 
+    def iter_buckets(
+        self, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[Dict[str, str]]:
+        """Lazily iterate over all storage buckets, page by page."""
+        return iter_items(
+            self.transport,
+            f"{self.BASE_URL}/buckets",
+            self.auth.get_headers,
+            page_size=page_size,
+        )
+
     def create_bucket(
         self,
         name: str,
@@ -31,7 +57,7 @@ class StorageClient:
     ) -> Dict[str, str]:
         """Create a new storage bucket."""
         data = {"name": name, "location": location, "access": access}
-        response = requests.post(
+        response = self.transport.post(
             f"{self.BASE_URL}/buckets",
             headers=self.auth.get_headers(),
             json=data,
@@ -41,7 +67,7 @@ class StorageClient:
 
     def delete_bucket(self, bucket_name: str) -> None:
         """Delete a storage bucket."""
-        response = requests.delete(
+        response = self.transport.delete(
             f"{self.BASE_URL}/buckets/{bucket_name}",
             headers=self.auth.get_headers(),
         )
@@ -52,21 +78,76 @@ class StorageClient:
         bucket_name: str,
         prefix: Optional[str] = None,
         delimiter: Optional[str] = None,
-    ) -> Dict[str, List[Dict[str, str]]]:
-        """List objects in a bucket."""
+        typed: bool = False,
+    ) -> Dict[str, Any]:
+        """List objects in a bucket.
+
+        The ``objects`` list holds ``StorageObject`` models if ``typed``.
+        """
         params = {}
         if prefix:
             params["prefix"] = prefix
         if delimiter:
             params["delimiter"] = delimiter
 
-        response = requests.get(
+        response = self.transport.get(
             f"{self.BASE_URL}/buckets/{bucket_name}/objects",
             headers=self.auth.get_headers(),
             params=params,
         )
         response.raise_for_status()
-        return response.json()
+        body = response.json()
+        if typed:
+            body["objects"] = StorageObject.from_json_list(body.get("objects", []))
+        return body
+
+    def iter_objects(
+        self,
+        bucket_name: str,
+        prefix: Optional[str] = None,
+        delimiter: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[Dict[str, str]]:
+        """Lazily iterate over all objects in a bucket, page by page."""
+        params = {}
+        if prefix:
+            params["prefix"] = prefix
+        if delimiter:
+            params["delimiter"] = delimiter
+
+        return iter_items(
+            self.transport,
+            f"{self.BASE_URL}/buckets/{bucket_name}/objects",
+            self.auth.get_headers,
+            params=params,
+            page_size=page_size,
+            items_key="objects",
+        )
+
+    def stream_objects(
+        self,
+        bucket_name: str,
+        prefix: Optional[str] = None,
+        delimiter: Optional[str] = None,
+    ) -> Iterator[Dict[str, str]]:
+        """Stream objects in a bucket, parsing the response incrementally.
+
+        Unlike :meth:`list_objects`, the listing is never held in memory as a
+        whole, so buckets with millions of keys are listed in constant memory.
+        """
+        params = {}
+        if prefix:
+            params["prefix"] = prefix
+        if delimiter:
+            params["delimiter"] = delimiter
+
+        return stream_items(
+            self.transport,
+            f"{self.BASE_URL}/buckets/{bucket_name}/objects",
+            self.auth.get_headers,
+            params=params,
+            items_key="objects",
+        )
 
     def upload_object(
         self,
@@ -74,20 +155,44 @@ class StorageClient:
         object_name: str,
         file_path: str,
         content_type: Optional[str] = None,
+        part_size: Optional[int] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
     ) -> Dict[str, str]:
-        """Upload an object to a bucket."""
+        """Upload an object to a bucket.
+
+        Files larger than ``part_size`` are sent as a parallel, resumable
+        multipart upload; see :class:`~gcore_api.transfer.MultipartUpload`.
+
+        Args:
+            bucket_name: Target bucket.
+            object_name: Target object name.
+            file_path: Local file to upload.
+            content_type: Content type. Guessed from ``file_path`` if not set.
+            part_size: Enable multipart upload with parts of this many bytes.
+            max_workers: Number of parts uploaded concurrently.
+        """
         if not content_type:
-            content_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+            content_type = (
+                mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+            )
+        object_url = f"{self.BASE_URL}/buckets/{bucket_name}/objects/{object_name}"
+
+        if part_size and os.path.getsize(file_path) > part_size:
+            return MultipartUpload(
+                self.transport,
+                self.auth.get_headers,
+                object_url,
+                file_path,
+                content_type,
+                part_size=part_size,
+                max_workers=max_workers,
+            ).run()
 
         headers = self.auth.get_headers()
         headers["Content-Type"] = content_type
 
         with open(file_path, "rb") as f:
-            response = requests.put(
-                f"{self.BASE_URL}/buckets/{bucket_name}/objects/{object_name}",
-                headers=headers,
-                data=f,
-            )
+            response = self.transport.put(object_url, headers=headers, data=f)
         response.raise_for_status()
         return response.json()
 
@@ -96,25 +201,203 @@ class StorageClient:
         bucket_name: str,
         object_name: str,
         file_path: Optional[str] = None,
+        segment_size: Optional[int] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        checksum: Optional[str] = None,
     ) -> None:
-        """Download an object from a bucket."""
-        response = requests.get(
+        """Download an object from a bucket.
+
+        With ``segment_size`` set, the object is fetched as concurrent HTTP
+        Range segments and interrupted downloads resume; see
+        :class:`~gcore_api.transfer.RangedDownload`.
+
+        Args:
+            bucket_name: Source bucket.
+            object_name: Source object name.
+            file_path: Local target file. Defaults to the object's base name.
+            segment_size: Enable ranged download with segments of this many
+                bytes.
+            max_workers: Number of segments fetched concurrently.
+            checksum: Expected MD5 hex digest of the object, verified once the
+                download completes.
+        """
+        if not file_path:
+            file_path = os.path.basename(object_name)
+        object_url = f"{self.BASE_URL}/buckets/{bucket_name}/objects/{object_name}"
+
+        if segment_size:
+            RangedDownload(
+                self.transport,
+                self.auth.get_headers,
+                object_url,
+                file_path,
+                segment_size=segment_size,
+                max_workers=max_workers,
+                checksum=checksum,
+            ).run()
+            return
+
+        response = self.transport.get(
+            object_url, headers=self.auth.get_headers(), stream=True
+        )
+        response.raise_for_status()
+
+        with open(file_path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=DEFAULT_BUFFER_SIZE):
+                f.write(chunk)
+
+        if checksum:
+            verify_checksum(file_path, checksum)
+
+    def delete_object(self, bucket_name: str, object_name: str) -> None:
+        """Delete an object from a bucket."""
+        response = self.transport.delete(
             f"{self.BASE_URL}/buckets/{bucket_name}/objects/{object_name}",
             headers=self.auth.get_headers(),
-            stream=True,
         )
         response.raise_for_status()
 
+
+async def _aiter_file(
+    f: BinaryIO, chunk_size: int = ASYNC_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """Yield a file's contents in chunks, reading off the event loop."""
+    while True:
+        chunk = await asyncio.to_thread(f.read, chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+class AsyncStorageClient:
+    """Asyncio client for Gcore Storage API operations."""
+
+    BASE_URL = StorageClient.BASE_URL
+
+    def __init__(self, auth, transport: Optional[AsyncTransport] = None):
+        self.auth = auth
+        self.transport = transport or auth.async_transport
+
+    async def list_buckets(self) -> List[Dict[str, str]]:
+        """List all storage buckets."""
+        response = await self.transport.get(
+            f"{self.BASE_URL}/buckets",
+            headers=self.auth.get_headers(),
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def create_bucket(
+        self,
+        name: str,
+        location: str = "eu-north-1",
+        access: str = "private",
+    ) -> Dict[str, str]:
+        """Create a new storage bucket."""
+        data = {"name": name, "location": location, "access": access}
+        response = await self.transport.post(
+            f"{self.BASE_URL}/buckets",
+            headers=self.auth.get_headers(),
+            json=data,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def delete_bucket(self, bucket_name: str) -> None:
+        """Delete a storage bucket."""
+        response = await self.transport.delete(
+            f"{self.BASE_URL}/buckets/{bucket_name}",
+            headers=self.auth.get_headers(),
+        )
+        response.raise_for_status()
+
+    async def list_objects(
+        self,
+        bucket_name: str,
+        prefix: Optional[str] = None,
+        delimiter: Optional[str] = None,
+        typed: bool = False,
+    ) -> Dict[str, Any]:
+        """List objects in a bucket.
+
+        The ``objects`` list holds ``StorageObject`` models if ``typed``.
+        """
+        params = {}
+        if prefix:
+            params["prefix"] = prefix
+        if delimiter:
+            params["delimiter"] = delimiter
+
+        response = await self.transport.get(
+            f"{self.BASE_URL}/buckets/{bucket_name}/objects",
+            headers=self.auth.get_headers(),
+            params=params,
+        )
+        response.raise_for_status()
+        body = response.json()
+        if typed:
+            body["objects"] = StorageObject.from_json_list(body.get("objects", []))
+        return body
+
+    async def upload_object(
+        self,
+        bucket_name: str,
+        object_name: str,
+        file_path: str,
+        content_type: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """Upload an object to a bucket."""
+        if not content_type:
+            content_type = (
+                mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+            )
+
+        headers = self.auth.get_headers()
+        headers["Content-Type"] = content_type
+        headers["Content-Length"] = str(os.path.getsize(file_path))
+
+        with open(file_path, "rb") as f:
+            response = await self.transport.put(
+                f"{self.BASE_URL}/buckets/{bucket_name}/objects/{object_name}",
+                headers=headers,
+                content=_aiter_file(f),
+            )
+        response.raise_for_status()
+        return response.json()
+
+    async def download_object(
+        self,
+        bucket_name: str,
+        object_name: str,
+        file_path: Optional[str] = None,
+    ) -> None:
+        """Download an object from a bucket.
+
+        The object is written to a temporary file next to ``file_path`` and
+        moved into place once complete, so a failed download leaves an
+        existing file untouched.
+        """
         if not file_path:
             file_path = os.path.basename(object_name)
 
-        with open(file_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        tmp_path = f"{file_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                async for chunk in self.transport.stream(
+                    "GET",
+                    f"{self.BASE_URL}/buckets/{bucket_name}/objects/{object_name}",
+                    headers=self.auth.get_headers(),
+                ):
+                    await asyncio.to_thread(f.write, chunk)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_path)
+            raise
 
-    def delete_object(self, bucket_name: str, object_name: str) -> None:
+    async def delete_object(self, bucket_name: str, object_name: str) -> None:
         """Delete an object from a bucket."""
-        response = requests.delete(
+        response = await self.transport.delete(
             f"{self.BASE_URL}/buckets/{bucket_name}/objects/{object_name}",
             headers=self.auth.get_headers(),
         )
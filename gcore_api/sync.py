@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .storage import StorageClient
+from .transfer import file_checksum
+
+DEFAULT_SYNC_WORKERS = 8
+MTIME_TOLERANCE = 1.0
+
+
+@dataclass
+class LocalFile:
+    """A file in the local tree being synced."""
+
+    path: str
+    name: str
+    size: int
+    mtime: float
+
+
+@dataclass
+class SyncPlan:
+    """Changes needed to make a bucket prefix match a local tree."""
+
+    uploads: List[LocalFile] = field(default_factory=list)
+    deletes: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def upload_bytes(self) -> int:
+        return sum(f.size for f in self.uploads)
+
+
+@dataclass
+class SyncReport:
+    """Outcome of a sync run."""
+
+    uploaded: int = 0
+    uploaded_bytes: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def objects_per_second(self) -> float:
+        return (self.uploaded + self.deleted) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.uploaded_bytes / self.elapsed if self.elapsed else 0.0
+
+
+def _object_name(prefix: str, rel_path: str) -> str:
+    return f"{prefix.rstrip('/')}/{rel_path}" if prefix else rel_path
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def scan_local(local_dir: str, prefix: str = "") -> Iterator[LocalFile]:
+    """Walk a directory tree, yielding every regular file with its stat data."""
+    stack = [local_dir]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    stat = entry.stat()
+                    rel_path = os.path.relpath(entry.path, local_dir)
+                    yield LocalFile(
+                        path=entry.path,
+                        name=_object_name(prefix, rel_path.replace(os.sep, "/")),
+                        size=stat.st_size,
+                        mtime=stat.st_mtime,
+                    )
+
+
+def _is_changed(local: LocalFile, remote: Dict, checksum: bool) -> bool:
+    if int(remote.get("size", -1)) != local.size:
+        return True
+    etag = (remote.get("etag") or "").strip('"').lower()
+    if checksum and etag and "-" not in etag:
+        # Multipart ETags are not a plain MD5 of the content.
+        return file_checksum(local.path) != etag
+    remote_mtime = _parse_timestamp(remote.get("last_modified"))
+    return remote_mtime is None or local.mtime > remote_mtime + MTIME_TOLERANCE
+
+
+def plan_sync(
+    local_files: Iterable[LocalFile],
+    remote_objects: Iterable[Dict],
+    delete: bool = False,
+    checksum: bool = False,
+) -> SyncPlan:
+    """Diff a local tree against a bucket listing.
+
+    A file is uploaded when it is missing remotely, its size differs, or it
+    is newer than the remote object. With ``checksum``, same-sized files are
+    compared by MD5 against the remote ETag instead of by modification time.
+
+    Args:
+        local_files: Files from :func:`scan_local`.
+        remote_objects: Objects from :meth:`StorageClient.iter_objects`.
+        delete: Also plan deletion of remote objects with no local file.
+        checksum: Compare same-sized files by content hash.
+    """
+    remote = {obj["name"]: obj for obj in remote_objects}
+    plan = SyncPlan()
+    for local in local_files:
+        remote_obj = remote.pop(local.name, None)
+        if remote_obj is None or _is_changed(local, remote_obj, checksum):
+            plan.uploads.append(local)
+        else:
+            plan.unchanged += 1
+    if delete:
+        plan.deletes = sorted(remote)
+    return plan
+
+
+def sync_directory(
+    client: StorageClient,
+    local_dir: str,
+    bucket_name: str,
+    prefix: str = "",
+    delete: bool = False,
+    checksum: bool = False,
+    max_workers: int = DEFAULT_SYNC_WORKERS,
+    dry_run: bool = False,
+) -> SyncReport:
+    """Make a bucket prefix match a local directory tree.
+
+    Only changed files are uploaded, through a pool of ``max_workers``
+    threads sharing the client's pooled transport. A failed file is recorded
+    in the report and does not stop the rest of the sync.
+
+    Args:
+        client: Storage client to use.
+        local_dir: Local directory to upload.
+        bucket_name: Target bucket.
+        prefix: Object name prefix the tree is synced under.
+        delete: Delete remote objects under ``prefix`` with no local file.
+        checksum: Compare same-sized files by MD5 against the remote ETag.
+        max_workers: Number of concurrent uploads and deletes.
+        dry_run: Only compute the plan; report what would change.
+    """
+    started = time.monotonic()
+    plan = plan_sync(
+        scan_local(local_dir, prefix),
+        client.iter_objects(bucket_name, prefix=_object_name(prefix, "") or None),
+        delete=delete,
+        checksum=checksum,
+    )
+    report = SyncReport(unchanged=plan.unchanged)
+
+    if dry_run:
+        report.uploaded = len(plan.uploads)
+        report.uploaded_bytes = plan.upload_bytes
+        report.deleted = len(plan.deletes)
+        report.elapsed = time.monotonic() - started
+        return report
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        uploads = {
+            executor.submit(
+                client.upload_object, bucket_name, local.name, local.path
+            ): local
+            for local in plan.uploads
+        }
+        deletes = {
+            executor.submit(client.delete_object, bucket_name, name): name
+            for name in plan.deletes
+        }
+        for future in as_completed(uploads):
+            local = uploads[future]
+            try:
+                future.result()
+            except Exception as e:
+                report.failed.append((local.name, str(e)))
+            else:
+                report.uploaded += 1
+                report.uploaded_bytes += local.size
+        for deleted in as_completed(deletes):
+            try:
+                deleted.result()
+            except Exception as e:
+                report.failed.append((deletes[deleted], str(e)))
+            else:
+                report.deleted += 1
+
+    report.elapsed = time.monotonic() - started
+    return report
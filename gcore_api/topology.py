@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+import heapq
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .members import member_label, normalize_member
+
+if TYPE_CHECKING:
+    from .loadbalancer import LoadBalancerClient
+
+DEFAULT_TOPOLOGY_WORKERS = 8
+DEFAULT_ACTIVE_TIMEOUT = 600.0
+DEFAULT_ACTIVE_POLL_INTERVAL = 2.0
+DEFAULT_MAX_ACTIVE_POLL_INTERVAL = 15.0
+ACTIVE_STATUSES = {"active", "online"}
+ERROR_STATUSES = {"error", "failed", "deleted"}
+
+
+@dataclass
+class Task:
+    """Node of a :class:`TaskGraph`.
+
+    ``run`` is called with the results of the tasks it ``requires``, keyed by
+    their names.
+    """
+
+    name: str
+    run: Callable[[Dict[str, Any]], Any]
+    requires: Tuple[str, ...] = ()
+
+
+@dataclass
+class GraphResult:
+    """Outcome of running a :class:`TaskGraph`.
+
+    Tasks that depend, directly or not, on a failed task are never run and
+    are listed in ``skipped``.
+    """
+
+    results: Dict[str, Any] = field(default_factory=dict)
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not (self.failed or self.skipped)
+
+
+class TaskGraph:
+    """Tasks run in parallel as soon as everything they require has finished.
+
+    Tasks must be added after their requirements, so the graph is acyclic by
+    construction. When more tasks are ready than there are workers, the ones
+    heading the longest remaining chain of dependents start first, which keeps
+    the total time close to that of the critical path.
+    """
+
+    def __init__(self) -> None:
+        self.tasks: Dict[str, Task] = {}
+
+    def add(
+        self,
+        name: str,
+        run: Callable[[Dict[str, Any]], Any],
+        requires: Iterable[str] = (),
+    ) -> str:
+        """Add a task and return its name.
+
+        Raises:
+            ValueError: If the name is taken or a requirement is unknown.
+        """
+        if name in self.tasks:
+            raise ValueError(f"Task {name!r} already exists")
+        requires = tuple(requires)
+        unknown = [requirement for requirement in requires if requirement not in self]
+        if unknown:
+            raise ValueError(f"Task {name!r} requires unknown {', '.join(unknown)}")
+        self.tasks[name] = Task(name, run, requires)
+        return name
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.tasks
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def _depths(self, dependents: Dict[str, List[str]]) -> Dict[str, int]:
+        """Length of the longest chain of dependents below each task."""
+        depths: Dict[str, int] = {}
+        for name in reversed(list(self.tasks)):
+            depths[name] = 1 + max(
+                (depths[child] for child in dependents[name]), default=0
+            )
+        return depths
+
+    def run(self, max_workers: int = DEFAULT_TOPOLOGY_WORKERS) -> GraphResult:
+        """Run every task with at most ``max_workers`` in flight.
+
+        A failed task does not stop independent branches.
+        """
+        started = time.monotonic()
+        result = GraphResult()
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        waiting: Dict[str, int] = {}
+        for name, task in self.tasks.items():
+            waiting[name] = len(task.requires)
+            for requirement in task.requires:
+                dependents[requirement].append(name)
+        depths = self._depths(dependents)
+        order = {name: i for i, name in enumerate(self.tasks)}
+        ready = [
+            (-depths[name], order[name], name) for name, n in waiting.items() if not n
+        ]
+        heapq.heapify(ready)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running: Dict[Future, str] = {}
+            while ready or running:
+                while ready and len(running) < max_workers:
+                    task = self.tasks[heapq.heappop(ready)[2]]
+                    inputs = {name: result.results[name] for name in task.requires}
+                    running[executor.submit(task.run, inputs)] = task.name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        result.results[name] = future.result()
+                    except Exception as e:
+                        result.failed.append((name, str(e)))
+                        continue
+                    for child in dependents[name]:
+                        waiting[child] -= 1
+                        if not waiting[child]:
+                            heapq.heappush(ready, (-depths[child], order[child], child))
+
+        failed = {name for name, _ in result.failed}
+        result.skipped = [
+            name
+            for name in self.tasks
+            if name not in result.results and name not in failed
+        ]
+        result.elapsed = time.monotonic() - started
+        return result
+
+
+def wait_until_active(
+    client: "LoadBalancerClient",
+    lb_id: int,
+    timeout: float = DEFAULT_ACTIVE_TIMEOUT,
+    interval: float = DEFAULT_ACTIVE_POLL_INTERVAL,
+    max_interval: float = DEFAULT_MAX_ACTIVE_POLL_INTERVAL,
+) -> Dict:
+    """Poll a load balancer until it is active, backing off between polls.
+
+    Returns:
+        The load balancer as last fetched.
+
+    Raises:
+        RuntimeError: If provisioning ends in an error status.
+        TimeoutError: If it is not active after ``timeout`` seconds.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        lb = client.get_load_balancer(lb_id, fresh=True)
+        status = str(lb.get("status", "")).lower()
+        if status in ACTIVE_STATUSES:
+            return lb
+        if status in ERROR_STATUSES:
+            raise RuntimeError(f"Load balancer {lb_id} is {status}")
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"Load balancer {lb_id} is still {status or 'pending'}")
+        time.sleep(min(interval, remaining))
+        interval = min(max_interval, interval * 2)
+
+
+def _require(spec: Dict, keys: Iterable[str], what: str) -> None:
+    missing = [key for key in keys if spec.get(key) in (None, "")]
+    if missing:
+        raise ValueError(f"{what} is missing {', '.join(missing)}")
+
+
+def parse_topology(spec: Dict) -> Dict:
+    """Validate a topology spec and fill in its defaults.
+
+    A spec describes one load balancer (``name``, ``region`` and optional
+    ``type`` and ``flavor``) and its ``listeners``, each with ``protocol``,
+    ``port``, an optional ``name`` and ``pools``. Pools take an optional
+    ``name``, ``protocol`` (defaulting to the listener's) and ``method``, and
+    ``members`` as ``[address, port, weight]`` lists or mappings.
+
+    Raises:
+        ValueError: If a required field is missing or a name is repeated.
+    """
+    _require(spec, ("name", "region"), "Load balancer")
+    listeners: List[Dict] = []
+    for listener in spec.get("listeners") or []:
+        _require(listener, ("protocol", "port"), f"Listener {listener}")
+        key = listener.get("name") or f"{listener['protocol']}-{listener['port']}"
+        if any(other["key"] == key for other in listeners):
+            raise ValueError(f"Listener {key!r} is listed twice")
+        pools: List[Dict] = []
+        for i, pool in enumerate(listener.get("pools") or []):
+            pool_key = pool.get("name") or f"pool-{i}"
+            if any(other["key"] == pool_key for other in pools):
+                raise ValueError(f"Pool {key}/{pool_key} is listed twice")
+            members = [normalize_member(member) for member in pool.get("members") or []]
+            protocol = pool.get("protocol") or listener["protocol"]
+            pools.append(
+                {**pool, "key": pool_key, "protocol": protocol, "members": members}
+            )
+        listeners.append({**listener, "key": key, "pools": pools})
+    return {**spec, "listeners": listeners}
+
+
+def load_topology_spec(path: str) -> Dict:
+    """Load and validate a YAML topology spec; see :func:`parse_topology`."""
+    import yaml
+
+    with open(path) as f:
+        return parse_topology(yaml.safe_load(f) or {})
+
+
+@dataclass
+class TopologyResult:
+    """Entities created by :func:`provision_topology`, keyed by task name.
+
+    Listeners are keyed by their name, pools by ``listener/pool`` and members
+    by ``listener/pool/address:port``.
+    """
+
+    load_balancer: Optional[Dict] = None
+    listeners: Dict[str, Dict] = field(default_factory=dict)
+    pools: Dict[str, Dict] = field(default_factory=dict)
+    members: Dict[str, Dict] = field(default_factory=dict)
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not (self.failed or self.skipped)
+
+
+def build_topology_graph(
+    client: "LoadBalancerClient",
+    topology: Dict,
+    timeout: float = DEFAULT_ACTIVE_TIMEOUT,
+    poll_interval: float = DEFAULT_ACTIVE_POLL_INTERVAL,
+) -> TaskGraph:
+    """Dependency graph that provisions a parsed topology.
+
+    Listeners wait for the load balancer to become active; pools only need
+    their listener's id and members their pool's id, so those are created as
+    soon as the parent exists.
+    """
+    graph = TaskGraph()
+
+    def create_load_balancer(inputs: Dict[str, Any]) -> Dict:
+        return client.create_load_balancer(
+            topology["name"],
+            topology["region"],
+            type=topology.get("type", "http"),
+            flavor=topology.get("flavor", "lb1-1-1"),
+        )
+
+    def await_active(inputs: Dict[str, Any]) -> Dict:
+        lb = inputs["loadbalancer"]
+        if str(lb.get("status", "")).lower() in ACTIVE_STATUSES:
+            return lb
+        return wait_until_active(client, lb["id"], timeout, poll_interval)
+
+    def create_listener(listener: Dict, inputs: Dict[str, Any]) -> Dict:
+        return client.create_listener(
+            inputs["loadbalancer:active"]["id"],
+            listener["protocol"],
+            listener["port"],
+            name=listener.get("name"),
+        )
+
+    def create_pool(
+        lb_task: str, listener_task: str, pool: Dict, inputs: Dict[str, Any]
+    ) -> Dict:
+        return client.create_pool(
+            inputs[lb_task]["id"],
+            inputs[listener_task]["id"],
+            pool["protocol"],
+            method=pool.get("method", "ROUND_ROBIN"),
+            name=pool.get("name"),
+        )
+
+    def add_member(
+        lb_task: str, pool_task: str, member: Dict, inputs: Dict[str, Any]
+    ) -> Dict:
+        return client.add_member(
+            inputs[lb_task]["id"],
+            inputs[pool_task]["id"],
+            member["address"],
+            member["port"],
+            member["weight"],
+        )
+
+    lb_task = graph.add("loadbalancer", create_load_balancer)
+    active_task = lb_task
+    if topology["listeners"]:
+        active_task = graph.add("loadbalancer:active", await_active, [lb_task])
+    for listener in topology["listeners"]:
+        listener_task = graph.add(
+            f"listener:{listener['key']}",
+            partial(create_listener, listener),
+            [active_task],
+        )
+        for pool in listener["pools"]:
+            pool_path = f"{listener['key']}/{pool['key']}"
+            pool_task = graph.add(
+                f"pool:{pool_path}",
+                partial(create_pool, active_task, listener_task, pool),
+                [active_task, listener_task],
+            )
+            for member in pool["members"]:
+                graph.add(
+                    f"member:{pool_path}/{member_label(member)}",
+                    partial(add_member, active_task, pool_task, member),
+                    [active_task, pool_task],
+                )
+    return graph
+
+
+def provision_topology(
+    client: "LoadBalancerClient",
+    spec: Dict,
+    max_workers: int = DEFAULT_TOPOLOGY_WORKERS,
+    timeout: float = DEFAULT_ACTIVE_TIMEOUT,
+    poll_interval: float = DEFAULT_ACTIVE_POLL_INTERVAL,
+) -> TopologyResult:
+    """Create a load balancer with its listeners, pools and members.
+
+    Independent branches, such as several listeners and their pools, are
+    created in parallel, so provisioning takes about as long as the longest
+    chain of dependent calls rather than the sum of all of them. A failure
+    skips only the entities below it.
+
+    Args:
+        client: Load balancer client to use.
+        spec: Topology spec; see :func:`parse_topology`.
+        max_workers: Number of API calls in flight.
+        timeout: Seconds to wait for the load balancer to become active.
+        poll_interval: Initial delay between load balancer status polls.
+
+    Raises:
+        ValueError: If the spec is invalid; nothing is created then.
+    """
+    graph = build_topology_graph(client, parse_topology(spec), timeout, poll_interval)
+    outcome = graph.run(max_workers=max_workers)
+    result = TopologyResult(
+        failed=outcome.failed, skipped=outcome.skipped, elapsed=outcome.elapsed
+    )
+    for name, created in outcome.results.items():
+        kind, _, key = name.partition(":")
+        if kind == "loadbalancer":
+            # The active load balancer, once polled, supersedes the created one.
+            result.load_balancer = outcome.results.get("loadbalancer:active", created)
+        elif kind == "listener":
+            result.listeners[key] = created
+        elif kind == "pool":
+            result.pools[key] = created
+        elif kind == "member":
+            result.members[key] = created
+    return result
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import mmap
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from .transport import Transport
+
+DEFAULT_PART_SIZE = 64 * 1024 * 1024
+DEFAULT_MAX_WORKERS = 4
+UPLOAD_STATE_SUFFIX = ".gcore-upload"
+DEFAULT_SEGMENT_SIZE = 32 * 1024 * 1024
+DEFAULT_BUFFER_SIZE = 4 * 1024 * 1024
+DOWNLOAD_STATE_SUFFIX = ".gcore-download"
+
+
+def _pwrite(fd: int, data: memoryview, offset: int) -> None:
+    """Write all of ``data`` at ``offset`` without moving the file position."""
+    while data:
+        written = os.pwrite(fd, data, offset)
+        data = data[written:]
+        offset += written
+
+
+def file_checksum(
+    file_path: str, algorithm: str = "md5", buffer_size: int = DEFAULT_BUFFER_SIZE
+) -> str:
+    """Compute the hex digest of a file, reading it in large blocks."""
+    digest = hashlib.new(algorithm)
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(file_path, "rb", buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            digest.update(view[:read])
+    return digest.hexdigest()
+
+
+def verify_checksum(
+    file_path: str,
+    checksum: str,
+    algorithm: str = "md5",
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> None:
+    """Check a file against an expected hex digest.
+
+    Raises:
+        ValueError: If the digest does not match.
+    """
+    actual = file_checksum(file_path, algorithm, buffer_size)
+    if actual.lower() != checksum.lower():
+        raise ValueError(
+            f"Checksum mismatch for {file_path}: expected {checksum}, got {actual}"
+        )
+
+
+class MultipartUpload:
+    """Parallel, resumable multipart upload of a local file to a bucket.
+
+    The file is memory-mapped and each part is sent straight from the mapping,
+    so resident memory stays bounded by the pages in flight rather than the
+    file size. Completed parts are recorded in a JSON state file next to the
+    source; an interrupted upload started again with the same file, object and
+    part size continues from the parts that were already committed.
+    """
+
+    def __init__(
+        self,
+        transport: Transport,
+        get_headers: Callable[[], Dict[str, str]],
+        object_url: str,
+        file_path: str,
+        content_type: str,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        state_file: Optional[str] = None,
+    ):
+        """Initialize multipart upload.
+
+        Args:
+            transport: Transport used to send the requests. Its connection
+                pool should hold at least ``max_workers`` connections.
+            get_headers: Callable returning auth headers for each request.
+            object_url: URL of the target object.
+            file_path: Local file to upload.
+            content_type: Content type of the final object.
+            part_size: Size of each part in bytes.
+            max_workers: Number of parts uploaded concurrently.
+            state_file: Path of the resume state file. Defaults to
+                ``file_path`` with a ``.gcore-upload`` suffix.
+        """
+        if part_size <= 0:
+            raise ValueError("part_size must be positive")
+        self.transport = transport
+        self.get_headers = get_headers
+        self.object_url = object_url
+        self.file_path = file_path
+        self.content_type = content_type
+        self.part_size = part_size
+        self.max_workers = max_workers
+        self.state_file = state_file or file_path + UPLOAD_STATE_SUFFIX
+        self._lock = threading.Lock()
+        self._state: Dict[str, Any] = {}
+
+    def _fingerprint(self) -> Dict[str, Any]:
+        stat = os.stat(self.file_path)
+        return {
+            "object_url": self.object_url,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "part_size": self.part_size,
+        }
+
+    def _load_state(self) -> Optional[Dict[str, Any]]:
+        """Load saved state if it belongs to this exact upload."""
+        try:
+            with open(self.state_file) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        fingerprint = self._fingerprint()
+        if any(state.get(key) != value for key, value in fingerprint.items()):
+            return None
+        return state
+
+    def _save_state(self) -> None:
+        tmp_path = self.state_file + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._state, f)
+        os.replace(tmp_path, self.state_file)
+
+    def _initiate(self) -> str:
+        response = self.transport.post(
+            f"{self.object_url}/uploads",
+            headers=self.get_headers(),
+            json={"content_type": self.content_type},
+        )
+        response.raise_for_status()
+        return response.json()["upload_id"]
+
+    def _upload_part(self, mapped: mmap.mmap, part_number: int, size: int) -> None:
+        start = (part_number - 1) * self.part_size
+        end = min(start + self.part_size, size)
+        headers = self.get_headers()
+        headers["Content-Type"] = "application/octet-stream"
+        with memoryview(mapped)[start:end] as body:
+            response = self.transport.put(
+                f"{self.object_url}/uploads/{self._state['upload_id']}"
+                f"/parts/{part_number}",
+                headers=headers,
+                data=body,
+            )
+        response.raise_for_status()
+        etag = response.headers.get("ETag") or response.json().get("etag")
+        with self._lock:
+            self._state["parts"][str(part_number)] = etag
+            self._save_state()
+
+    def _complete(self) -> Dict[str, str]:
+        parts: List[Dict[str, Any]] = [
+            {"part_number": int(number), "etag": etag}
+            for number, etag in sorted(
+                self._state["parts"].items(), key=lambda item: int(item[0])
+            )
+        ]
+        response = self.transport.post(
+            f"{self.object_url}/uploads/{self._state['upload_id']}/complete",
+            headers=self.get_headers(),
+            json={"parts": parts},
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def abort(self) -> None:
+        """Abort the upload on the server and discard the resume state."""
+        state = self._state or self._load_state()
+        if state and state.get("upload_id"):
+            response = self.transport.delete(
+                f"{self.object_url}/uploads/{state['upload_id']}",
+                headers=self.get_headers(),
+            )
+            response.raise_for_status()
+        if os.path.exists(self.state_file):
+            os.remove(self.state_file)
+
+    def run(self) -> Dict[str, str]:
+        """Upload all missing parts and complete the upload.
+
+        Returns:
+            The completed object as returned by the API.
+
+        Raises:
+            ValueError: If the file is empty.
+        """
+        fingerprint = self._fingerprint()
+        size = fingerprint["size"]
+        if size == 0:
+            raise ValueError("Multipart upload requires a non-empty file")
+        self._state = self._load_state() or {
+            **fingerprint,
+            "upload_id": self._initiate(),
+            "parts": {},
+        }
+        self._save_state()
+
+        part_count = -(-size // self.part_size)
+        pending = [
+            number
+            for number in range(1, part_count + 1)
+            if str(number) not in self._state["parts"]
+        ]
+
+        with open(self.file_path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    futures = [
+                        executor.submit(self._upload_part, mapped, number, size)
+                        for number in pending
+                    ]
+                    try:
+                        for future in futures:
+                            future.result()
+                    except BaseException:
+                        for future in futures:
+                            future.cancel()
+                        raise
+
+        result = self._complete()
+        os.remove(self.state_file)
+        return result
+
+
+class RangedDownload:
+    """Parallel, resumable download of an object using HTTP Range requests.
+
+    The object is split into fixed-size segments fetched concurrently. Each
+    worker reads its segment into a reusable buffer and writes it straight to
+    its offset in a preallocated file with ``os.pwrite``. Completed segments
+    are recorded in a JSON state file next to the target, so an interrupted
+    download of an unchanged object only fetches the missing segments.
+    Objects whose size the server does not report are fetched in a single
+    stream instead.
+    """
+
+    def __init__(
+        self,
+        transport: Transport,
+        get_headers: Callable[[], Dict[str, str]],
+        object_url: str,
+        file_path: str,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        checksum: Optional[str] = None,
+        checksum_algorithm: str = "md5",
+        state_file: Optional[str] = None,
+    ):
+        """Initialize ranged download.
+
+        Args:
+            transport: Transport used to send the requests. Its connection
+                pool should hold at least ``max_workers`` connections.
+            get_headers: Callable returning auth headers for each request.
+            object_url: URL of the object to download.
+            file_path: Local target file.
+            segment_size: Size of each Range request in bytes.
+            max_workers: Number of segments fetched concurrently.
+            buffer_size: Size of each worker's reusable read buffer.
+            checksum: Expected hex digest of the whole object. Verified once
+                the download completes.
+            checksum_algorithm: ``hashlib`` algorithm used for ``checksum``.
+            state_file: Path of the resume state file. Defaults to
+                ``file_path`` with a ``.gcore-download`` suffix.
+        """
+        if segment_size <= 0:
+            raise ValueError("segment_size must be positive")
+        self.transport = transport
+        self.get_headers = get_headers
+        self.object_url = object_url
+        self.file_path = file_path
+        self.segment_size = segment_size
+        self.max_workers = max_workers
+        self.buffer_size = buffer_size
+        self.checksum = checksum
+        self.checksum_algorithm = checksum_algorithm
+        self.state_file = state_file or file_path + DOWNLOAD_STATE_SUFFIX
+        self._lock = threading.Lock()
+        self._buffers = threading.local()
+        self._state: Dict[str, Any] = {}
+
+    def _probe(self) -> Dict[str, Any]:
+        """Fetch the size and version of the object.
+
+        The size is ``None`` if the response has no ``Content-Length``.
+        """
+        response = self.transport.head(self.object_url, headers=self.get_headers())
+        response.raise_for_status()
+        length = response.headers.get("Content-Length")
+        return {
+            "object_url": self.object_url,
+            "size": int(length) if length is not None else None,
+            "etag": response.headers.get("ETag"),
+            "segment_size": self.segment_size,
+        }
+
+    def _load_state(self, fingerprint: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Load saved state if it belongs to this exact object version."""
+        if not os.path.exists(self.file_path):
+            return None
+        try:
+            with open(self.state_file) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if any(state.get(key) != value for key, value in fingerprint.items()):
+            return None
+        return state
+
+    def _save_state(self) -> None:
+        tmp_path = self.state_file + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._state, f)
+        os.replace(tmp_path, self.state_file)
+
+    def _buffer(self) -> memoryview:
+        """Get this worker thread's reusable read buffer."""
+        view = getattr(self._buffers, "view", None)
+        if view is None:
+            view = memoryview(bytearray(self.buffer_size))
+            self._buffers.view = view
+        return view
+
+    def _fetch_segment(self, fd: int, index: int, size: int) -> None:
+        start = index * self.segment_size
+        end = min(start + self.segment_size, size) - 1
+        headers = self.get_headers()
+        headers["Range"] = f"bytes={start}-{end}"
+        response = self.transport.get(self.object_url, headers=headers, stream=True)
+        try:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise ValueError("Server ignored the Range request")
+            buffer = self._buffer()
+            offset = start
+            while offset <= end:
+                read = response.raw.readinto(buffer[: end - offset + 1])
+                if not read:
+                    raise ValueError(
+                        f"Segment {index} ended early at byte {offset} of {end + 1}"
+                    )
+                _pwrite(fd, buffer[:read], offset)
+                offset += read
+        finally:
+            response.close()
+        with self._lock:
+            self._state["segments"].append(index)
+            self._save_state()
+
+    def run(self) -> None:
+        """Fetch all missing segments and optionally verify the checksum.
+
+        Raises:
+            ValueError: If the server does not honor Range requests, a segment
+                is truncated, or the checksum does not match.
+        """
+        fingerprint = self._probe()
+        if fingerprint["size"] is None:
+            self._fetch_whole()
+        else:
+            self._fetch_segments(fingerprint)
+        if self.checksum:
+            verify_checksum(
+                self.file_path, self.checksum, self.checksum_algorithm, self.buffer_size
+            )
+
+    def _fetch_whole(self) -> None:
+        """Download the object in one stream when its size is unknown."""
+        response = self.transport.get(
+            self.object_url, headers=self.get_headers(), stream=True
+        )
+        try:
+            response.raise_for_status()
+            with open(self.file_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=self.buffer_size):
+                    f.write(chunk)
+        finally:
+            response.close()
+
+    def _fetch_segments(self, fingerprint: Dict[str, Any]) -> None:
+        size = fingerprint["size"]
+        self._state = self._load_state(fingerprint) or {
+            **fingerprint,
+            "segments": [],
+        }
+        self._save_state()
+
+        segment_count = -(-size // self.segment_size)
+        done = set(self._state["segments"])
+        pending = [index for index in range(segment_count) if index not in done]
+
+        fd = os.open(self.file_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size != size:
+                os.ftruncate(fd, size)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [
+                    executor.submit(self._fetch_segment, fd, index, size)
+                    for index in pending
+                ]
+                try:
+                    for future in futures:
+                        future.result()
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+        finally:
+            os.close(fd)
+
+        os.remove(self.state_file)
@@ -0,0 +1,596 @@
+#!/usr/bin/env python3
+import asyncio
+import os
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .cache import UNSAFE_METHODS, CacheEntry, ResponseCache, bypasses_cache
+from .instrumentation import Instrumentation
+from .logger import logger
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy, body_position, is_resendable
+
+if TYPE_CHECKING:
+    import httpx
+
+DEFAULT_BASE_URL = "https://api.gcore.com"
+BASE_URL_ENV = "GCORE_BASE_URL"
+DEFAULT_RETRY = object()
+DEFAULT_RATE_LIMITER = object()
+DEFAULT_CACHE = object()
+DEFAULT_INSTRUMENTATION = object()
+# httpcore trace events marking a new connection.
+_CONNECT_EVENTS = frozenset(
+    {"connection.connect_tcp.started", "connection.connect_unix_socket.started"}
+)
+
+
+def _resolve_url(base_url: Optional[str], url: str) -> str:
+    """Rewrite an API URL onto ``base_url`` if one is configured."""
+    if base_url and url.startswith(DEFAULT_BASE_URL):
+        return base_url + url[len(DEFAULT_BASE_URL) :]
+    return url
+
+
+def _with_validators(kwargs: Dict[str, Any], entry: CacheEntry) -> Dict[str, Any]:
+    return {**kwargs, "headers": {**(kwargs.get("headers") or {}), **entry.validators}}
+
+
+def _content_length(headers: Any) -> int:
+    try:
+        return int(headers.get("Content-Length") or 0)
+    except ValueError:
+        return 0
+
+
+def _cached_response(entry: CacheEntry) -> requests.Response:
+    response = requests.Response()
+    response.status_code = entry.status
+    response.headers = CaseInsensitiveDict(entry.headers)
+    response._content = entry.content
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = entry.url
+    return response
+
+
+class Transport:
+    """Pooled HTTP transport shared by all Gcore API clients.
+
+    A single ``requests.Session`` keeps TCP/TLS connections to the API alive
+    between calls, so clients pay the handshake once per pooled connection
+    instead of once per request.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        timeout: Optional[float] = 60.0,
+        base_url: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        retry: Any = DEFAULT_RETRY,
+        rate_limiter: Any = DEFAULT_RATE_LIMITER,
+        cache: Any = DEFAULT_CACHE,
+        instrumentation: Any = DEFAULT_INSTRUMENTATION,
+    ):
+        """Initialize transport.
+
+        Args:
+            pool_connections: Number of host pools to cache.
+            pool_maxsize: Maximum number of kept-alive connections per host.
+                Should be at least the number of threads issuing requests.
+            timeout: Default request timeout in seconds.
+            base_url: Override for ``https://api.gcore.com``, e.g. a local
+                stub server used in tests or benchmarks. Defaults to
+                ``GCORE_BASE_URL``, if set.
+            session: Pre-configured session to use instead of a new one.
+            retry: Retry policy for failed requests. Defaults to a standard
+                :class:`~gcore_api.retry.RetryPolicy`; ``None`` disables
+                retries.
+            rate_limiter: Client-side rate limiter applied to every attempt.
+                Defaults to :meth:`RateLimiter.from_env`, which is disabled
+                unless ``GCORE_RATE_LIMIT`` is set.
+            cache: Response cache for GET requests. Defaults to
+                :meth:`ResponseCache.from_env`, which is disabled unless
+                ``GCORE_CACHE`` is set.
+            instrumentation: Hooks and metrics called around every request
+                attempt. Defaults to :meth:`Instrumentation.from_env`, which
+                is disabled unless ``GCORE_METRICS`` is set.
+        """
+        self.retry: Optional[RetryPolicy] = (
+            RetryPolicy() if retry is DEFAULT_RETRY else retry
+        )
+        self.rate_limiter: Optional[RateLimiter] = (
+            RateLimiter.from_env()
+            if rate_limiter is DEFAULT_RATE_LIMITER
+            else rate_limiter
+        )
+        self.cache: Optional[ResponseCache] = (
+            ResponseCache.from_env() if cache is DEFAULT_CACHE else cache
+        )
+        self.instrumentation: Optional[Instrumentation] = (
+            Instrumentation.from_env()
+            if instrumentation is DEFAULT_INSTRUMENTATION
+            else instrumentation
+        )
+        self.timeout = timeout
+        base_url = base_url or os.environ.get(BASE_URL_ENV)
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if self.instrumentation is not None:
+            self.instrumentation.attach(self)
+
+    def resolve_url(self, url: str) -> str:
+        """Rewrite an API URL onto the configured base URL."""
+        return _resolve_url(self.base_url, url)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send a request through the pooled session.
+
+        GET responses are served from and stored in the cache, if one is
+        configured, unless sent with ``Cache-Control: no-cache``; unsafe
+        methods invalidate the entries they affect.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        url = self.resolve_url(url)
+        if self.cache is None:
+            return self._send(method, url, **kwargs)
+        if method.upper() in UNSAFE_METHODS:
+            try:
+                return self._send(method, url, **kwargs)
+            finally:
+                self.cache.invalidate(url)
+        if method.upper() != "GET" or kwargs.get("stream"):
+            return self._send(method, url, **kwargs)
+
+        headers = kwargs.get("headers")
+        key = self.cache.key(url, kwargs.get("params"), headers)
+        no_cache = bypasses_cache(headers)
+        entry = self.cache.get(key, url, no_cache=no_cache)
+        if entry is not None and entry.fresh and not no_cache:
+            return _cached_response(entry)
+        if entry is not None:
+            response = self._send(method, url, **_with_validators(kwargs, entry))
+            if response.status_code == 304:
+                response.close()
+                return _cached_response(
+                    self.cache.revalidated(key, entry, response.headers)
+                )
+        else:
+            response = self._send(method, url, **kwargs)
+        self.cache.store(
+            key, url, response.status_code, response.headers, response.content
+        )
+        return response
+
+    def _send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send a request, retrying per policy."""
+        if self.retry is None:
+            return self._attempt(method, url, 0, **kwargs)
+
+        body = kwargs.get("data")
+        position = body_position(body)
+        resendable = is_resendable(body, position)
+        # File-like bodies are rewound to where they started before a resend.
+        rewind: Optional[Callable[[], Any]] = None
+        if position is not None:
+            rewind = partial(getattr(body, "seek"), position)
+        self.retry.start()
+        attempt = 0
+        while True:
+            try:
+                response = self._attempt(method, url, attempt, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not (
+                    resendable and self.retry.should_retry(method, attempt, error=e)
+                ):
+                    raise
+                delay = self.retry.delay(attempt)
+                reason = type(e).__name__
+            else:
+                if response.status_code not in self.retry.retry_statuses or not (
+                    resendable
+                    and self.retry.should_retry(
+                        method, attempt, status=response.status_code
+                    )
+                ):
+                    return response
+                delay = self.retry.delay(attempt, response.headers)
+                reason = str(response.status_code)
+                response.close()
+            logger.debug(f"Retrying {method} {url} after {reason} in {delay:.2f}s")
+            time.sleep(delay)
+            if rewind is not None:
+                rewind()
+            attempt += 1
+
+    def _attempt(
+        self, method: str, url: str, attempt: int, **kwargs: Any
+    ) -> requests.Response:
+        """Send one attempt of a request, after the rate limiter allows it."""
+        instrumentation = self.instrumentation
+        if self.rate_limiter:
+            wait = self.rate_limiter.acquire(url)
+            if instrumentation is not None and wait > 0:
+                instrumentation.throttled(url, wait)
+        if instrumentation is None:
+            return self.session.request(method, url, **kwargs)
+
+        event = instrumentation.request_started(method, url, attempt)
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception as e:
+            instrumentation.request_failed(event, e)
+            raise
+        # The body of a streamed response is read by the caller after this
+        # returns, so only its declared Content-Length can be reported.
+        instrumentation.response_received(
+            event,
+            response.status_code,
+            bytes_sent=_content_length(response.request.headers),
+            bytes_received=(
+                _content_length(response.headers)
+                if kwargs.get("stream")
+                else len(response.content)
+            ),
+        )
+        return response
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Requests sent and connections opened by the pooled connections."""
+        stats = {"requests": 0, "connections": 0}
+        adapters = {id(a): a for a in self.session.adapters.values()}.values()
+        for adapter in adapters:
+            pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+            if pools is None:
+                continue
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    stats["requests"] += pool.num_requests
+                    stats["connections"] += pool.num_connections
+        return stats
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a GET request."""
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a HEAD request."""
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a POST request."""
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a PUT request."""
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a DELETE request."""
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class AsyncTransport:
+    """Pooled asyncio HTTP transport shared by the async Gcore API clients.
+
+    Wraps a single ``httpx.AsyncClient`` so every async client reuses the same
+    keep-alive connections, and bounds the number of requests in flight with a
+    semaphore so hundreds of coroutines can be fanned out safely.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 100,
+        max_keepalive_connections: int = 20,
+        timeout: Optional[float] = 60.0,
+        base_url: Optional[str] = None,
+        client: Optional["httpx.AsyncClient"] = None,
+        retry: Any = DEFAULT_RETRY,
+        rate_limiter: Any = DEFAULT_RATE_LIMITER,
+        cache: Any = DEFAULT_CACHE,
+        instrumentation: Any = DEFAULT_INSTRUMENTATION,
+    ):
+        """Initialize async transport.
+
+        Args:
+            max_concurrency: Maximum number of requests in flight at once. Also
+                caps the number of open connections.
+            max_keepalive_connections: Number of idle connections kept alive.
+            timeout: Default request timeout in seconds.
+            base_url: Override for ``https://api.gcore.com``, e.g. a local
+                stub server used in tests or benchmarks. Defaults to
+                ``GCORE_BASE_URL``, if set.
+            client: Pre-configured ``httpx.AsyncClient`` to use instead of a
+                new one.
+            retry: Retry policy for failed requests. Defaults to a standard
+                :class:`~gcore_api.retry.RetryPolicy`; ``None`` disables
+                retries.
+            rate_limiter: Client-side rate limiter applied to every attempt.
+                Defaults to :meth:`RateLimiter.from_env`, which is disabled
+                unless ``GCORE_RATE_LIMIT`` is set.
+            cache: Response cache for GET requests. Defaults to
+                :meth:`ResponseCache.from_env`, which is disabled unless
+                ``GCORE_CACHE`` is set.
+            instrumentation: Hooks and metrics called around every request
+                attempt. Defaults to :meth:`Instrumentation.from_env`, which
+                is disabled unless ``GCORE_METRICS`` is set.
+        """
+        import httpx
+
+        self.retry: Optional[RetryPolicy] = (
+            RetryPolicy() if retry is DEFAULT_RETRY else retry
+        )
+        self.rate_limiter: Optional[RateLimiter] = (
+            RateLimiter.from_env()
+            if rate_limiter is DEFAULT_RATE_LIMITER
+            else rate_limiter
+        )
+        self.cache: Optional[ResponseCache] = (
+            ResponseCache.from_env() if cache is DEFAULT_CACHE else cache
+        )
+        self.instrumentation: Optional[Instrumentation] = (
+            Instrumentation.from_env()
+            if instrumentation is DEFAULT_INSTRUMENTATION
+            else instrumentation
+        )
+
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        base_url = base_url or os.environ.get(BASE_URL_ENV)
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.client = client or httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            timeout=timeout,
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore bounding concurrent requests.
+
+        Created lazily so it binds to the running event loop.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def resolve_url(self, url: str) -> str:
+        """Rewrite an API URL onto the configured base URL."""
+        return _resolve_url(self.base_url, url)
+
+    async def _throttle(self, url: str) -> None:
+        if self.rate_limiter:
+            wait = self.rate_limiter.reserve(url)
+            if wait > 0:
+                if self.instrumentation is not None:
+                    self.instrumentation.throttled(url, wait)
+                await asyncio.sleep(wait)
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> "httpx.Response":
+        """Send a request through the pooled client.
+
+        GET responses are served from and stored in the cache, if one is
+        configured, unless sent with ``Cache-Control: no-cache``; unsafe
+        methods invalidate the entries they affect.
+        """
+        url = self.resolve_url(url)
+        if self.cache is None:
+            return await self._send(method, url, **kwargs)
+        if method.upper() in UNSAFE_METHODS:
+            try:
+                return await self._send(method, url, **kwargs)
+            finally:
+                self.cache.invalidate(url)
+        if method.upper() != "GET":
+            return await self._send(method, url, **kwargs)
+
+        headers = kwargs.get("headers")
+        key = self.cache.key(url, kwargs.get("params"), headers)
+        no_cache = bypasses_cache(headers)
+        entry = self.cache.get(key, url, no_cache=no_cache)
+        if entry is not None and entry.fresh and not no_cache:
+            return self._cached_response(entry)
+        if entry is not None:
+            response = await self._send(method, url, **_with_validators(kwargs, entry))
+            if response.status_code == 304:
+                await response.aclose()
+                return self._cached_response(
+                    self.cache.revalidated(key, entry, response.headers)
+                )
+        else:
+            response = await self._send(method, url, **kwargs)
+        self.cache.store(
+            key, url, response.status_code, response.headers, response.content
+        )
+        return response
+
+    @staticmethod
+    def _cached_response(entry: CacheEntry) -> "httpx.Response":
+        import httpx
+
+        return httpx.Response(
+            entry.status,
+            headers=entry.headers,
+            content=entry.content,
+            request=httpx.Request("GET", entry.url),
+        )
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> "httpx.Response":
+        """Send a request, retrying per policy."""
+        import httpx
+
+        if self.retry is None:
+            return await self._attempt(method, url, 0, **kwargs)
+
+        resendable = is_resendable(kwargs.get("content"), None)
+        self.retry.start()
+        attempt = 0
+        while True:
+            try:
+                response = await self._attempt(method, url, attempt, **kwargs)
+            except httpx.TransportError as e:
+                if not (
+                    resendable and self.retry.should_retry(method, attempt, error=e)
+                ):
+                    raise
+                delay = self.retry.delay(attempt)
+                reason = type(e).__name__
+            else:
+                if response.status_code not in self.retry.retry_statuses or not (
+                    resendable
+                    and self.retry.should_retry(
+                        method, attempt, status=response.status_code
+                    )
+                ):
+                    return response
+                delay = self.retry.delay(attempt, response.headers)
+                reason = str(response.status_code)
+                await response.aclose()
+            logger.debug(f"Retrying {method} {url} after {reason} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _attempt(
+        self, method: str, url: str, attempt: int, **kwargs: Any
+    ) -> "httpx.Response":
+        """Send one attempt of a request, after the rate limiter allows it."""
+        await self._throttle(url)
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            async with self.semaphore:
+                return await self.client.request(method, url, **kwargs)
+
+        connected = []
+
+        async def trace(name: str, info: Dict[str, Any]) -> None:
+            if name in _CONNECT_EVENTS:
+                connected.append(name)
+
+        extensions = {**(kwargs.pop("extensions", None) or {}), "trace": trace}
+        async with self.semaphore:
+            event = instrumentation.request_started(method, url, attempt)
+            try:
+                response = await self.client.request(
+                    method, url, extensions=extensions, **kwargs
+                )
+            except Exception as e:
+                instrumentation.request_failed(event, e)
+                raise
+        instrumentation.response_received(
+            event,
+            response.status_code,
+            bytes_sent=_content_length(response.request.headers),
+            bytes_received=len(response.content),
+            reused=not connected,
+        )
+        return response
+
+    async def get(self, url: str, **kwargs: Any) -> "httpx.Response":
+        """Send a GET request."""
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> "httpx.Response":
+        """Send a POST request."""
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> "httpx.Response":
+        """Send a PUT request."""
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> "httpx.Response":
+        """Send a DELETE request."""
+        return await self.request("DELETE", url, **kwargs)
+
+    async def stream(
+        self, method: str, url: str, chunk_size: int = 1024 * 1024, **kwargs: Any
+    ) -> AsyncIterator[bytes]:
+        """Send a request and yield the response body in chunks.
+
+        Responses are never cached; unsafe methods invalidate the entries
+        they affect.
+
+        Raises:
+            httpx.HTTPStatusError: If the response status is an error.
+        """
+        await self._throttle(url)
+        url = self.resolve_url(url)
+        instrumentation = self.instrumentation
+        try:
+            async with self.semaphore:
+                if instrumentation is None:
+                    async with self.client.stream(method, url, **kwargs) as response:
+                        response.raise_for_status()
+                        async for chunk in response.aiter_bytes(chunk_size):
+                            yield chunk
+                    return
+
+                # Reported once the body is read, with the bytes actually received.
+                event = instrumentation.request_started(method, url, 0)
+                received = 0
+                try:
+                    async with self.client.stream(method, url, **kwargs) as response:
+                        if response.is_error:
+                            await response.aread()
+                            received = len(response.content)
+                        else:
+                            async for chunk in response.aiter_bytes(chunk_size):
+                                received += len(chunk)
+                                yield chunk
+                except GeneratorExit:
+                    # The caller stopped reading early.
+                    instrumentation.response_received(
+                        event,
+                        response.status_code,
+                        bytes_sent=_content_length(response.request.headers),
+                        bytes_received=received,
+                    )
+                    raise
+                except Exception as e:
+                    instrumentation.request_failed(event, e)
+                    raise
+                instrumentation.response_received(
+                    event,
+                    response.status_code,
+                    bytes_sent=_content_length(response.request.headers),
+                    bytes_received=received,
+                )
+                response.raise_for_status()
+        finally:
+            if self.cache is not None and method.upper() in UNSAFE_METHODS:
+                self.cache.invalidate(url)
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncTransport":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
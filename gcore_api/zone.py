@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:
+    from .dns import DNSClient
+
+DEFAULT_ZONE_WORKERS = 8
+DEFAULT_TTL = 3600
+PROTECTED_TYPES = frozenset({"SOA", "NS"})
+
+RecordKey = Tuple[str, str]
+
+
+def record_key(record: Mapping[str, Any]) -> RecordKey:
+    """Index key of a record: its name and upper-cased type."""
+    return record["name"], record["type"].upper()
+
+
+def _content_values(content: Union[str, List[str]]) -> List[str]:
+    return list(content) if isinstance(content, list) else [content]
+
+
+def _normalize_content(content: Union[str, List[str]]) -> Tuple[str, ...]:
+    return tuple(sorted(str(value) for value in _content_values(content)))
+
+
+def _group_desired(records: Iterable[Mapping[str, Any]]) -> Dict[RecordKey, Dict]:
+    """Merge desired records sharing a name and type into one RRset each.
+
+    Contents are combined into a list in order of appearance and the lowest
+    TTL wins, as in :func:`gcore_api.zonefile.group_rrsets`.
+    """
+    rrsets: Dict[RecordKey, Dict] = {}
+    for record in records:
+        record = {**record, "type": record["type"].upper()}
+        key = record_key(record)
+        rrset = rrsets.get(key)
+        if rrset is None:
+            rrsets[key] = record
+            continue
+        values = _content_values(rrset["content"]) + _content_values(record["content"])
+        rrset["content"] = list(dict.fromkeys(values))
+        if "ttl" in rrset or "ttl" in record:
+            rrset["ttl"] = min(
+                int(rrset.get("ttl", DEFAULT_TTL)), int(record.get("ttl", DEFAULT_TTL))
+            )
+    return rrsets
+
+
+def _same_record(current: Mapping[str, Any], desired: Mapping[str, Any]) -> bool:
+    return _normalize_content(current["content"]) == _normalize_content(
+        desired["content"]
+    ) and int(current.get("ttl", DEFAULT_TTL)) == int(desired.get("ttl", DEFAULT_TTL))
+
+
+@dataclass
+class ZonePlan:
+    """Minimal set of changes that makes a zone match its desired records."""
+
+    adds: List[Dict] = field(default_factory=list)
+    updates: List[Tuple[int, Dict]] = field(default_factory=list)
+    deletes: List[Mapping[str, Any]] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def empty(self) -> bool:
+        return not (self.adds or self.updates or self.deletes)
+
+
+@dataclass
+class ZoneApplyResult:
+    """Outcome of applying a :class:`ZonePlan`."""
+
+    plan: ZonePlan
+    added: int = 0
+    updated: int = 0
+    deleted: int = 0
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+
+
+def plan_zone(
+    current_records: Iterable[Mapping[str, Any]],
+    desired_records: Iterable[Mapping[str, Any]],
+    delete: bool = True,
+    protected_types: Iterable[str] = PROTECTED_TYPES,
+) -> ZonePlan:
+    """Diff the current records of a zone against the desired ones.
+
+    Records are matched by ``(name, type)`` through a hash index, so the diff
+    is linear in the size of the zone. Desired records sharing a key are
+    merged into one RRset first. A matched record is updated only if its
+    content or TTL differs; extra records sharing a key are deleted.
+
+    Args:
+        current_records: Records as returned by :meth:`DNSClient.list_records`.
+        desired_records: Records with ``name``, ``type``, ``content`` and an
+            optional ``ttl``.
+        delete: Delete current records that are not desired.
+        protected_types: Record types never deleted, e.g. provider-managed
+            SOA and NS records.
+    """
+    protected = {record_type.upper() for record_type in protected_types}
+    index: Dict[RecordKey, Mapping[str, Any]] = {}
+    extra: List[Mapping[str, Any]] = []
+    for record in current_records:
+        key = record_key(record)
+        if key in index:
+            extra.append(record)
+        else:
+            index[key] = record
+
+    plan = ZonePlan()
+    for key, desired in _group_desired(desired_records).items():
+        current = index.pop(key, None)
+        if current is None:
+            plan.adds.append(desired)
+        elif _same_record(current, desired):
+            plan.unchanged += 1
+        else:
+            plan.updates.append((current["id"], desired))
+
+    if delete:
+        extra.extend(index.values())
+        plan.deletes = [r for r in extra if r["type"].upper() not in protected]
+    return plan
+
+
+def apply_plan(
+    client: "DNSClient",
+    zone_id: int,
+    plan: ZonePlan,
+    max_workers: int = DEFAULT_ZONE_WORKERS,
+) -> ZoneApplyResult:
+    """Execute a zone plan with bounded parallelism.
+
+    Failed changes are collected in the result and do not stop the others.
+    """
+    result = ZoneApplyResult(plan)
+    jobs: List[Tuple[str, Mapping[str, Any], Callable[[], Any]]] = []
+    for record in plan.adds:
+        ttl = record.get("ttl", DEFAULT_TTL)
+        create = partial(
+            client.create_record,
+            zone_id,
+            record["name"],
+            record["type"],
+            record["content"],
+            ttl=ttl,
+        )
+        jobs.append(("added", record, create))
+    for record_id, record in plan.updates:
+        ttl = record.get("ttl", DEFAULT_TTL)
+        update = partial(
+            client.update_record, zone_id, record_id, record["content"], ttl=ttl
+        )
+        jobs.append(("updated", record, update))
+    for current in plan.deletes:
+        delete = partial(client.delete_record, zone_id, current["id"])
+        jobs.append(("deleted", current, delete))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(job): (kind, target) for kind, target, job in jobs}
+        for future in as_completed(futures):
+            kind, target = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                result.failed.append((f"{target['name']} {target['type']}", str(e)))
+            else:
+                setattr(result, kind, getattr(result, kind) + 1)
+    return result
+
+
+def apply_zone(
+    client: "DNSClient",
+    zone_id: int,
+    desired_records: Iterable[Dict],
+    delete: bool = True,
+    protected_types: Iterable[str] = PROTECTED_TYPES,
+    max_workers: int = DEFAULT_ZONE_WORKERS,
+    dry_run: bool = False,
+) -> ZoneApplyResult:
+    """Make a zone's records match ``desired_records``.
+
+    Fetches the zone's records once, computes the minimal add, update and
+    delete set, and applies it concurrently. Applying an unchanged zone costs
+    a single list call.
+
+    Args:
+        client: DNS client to use.
+        zone_id: Zone to reconcile.
+        desired_records: Records with ``name``, ``type``, ``content`` and an
+            optional ``ttl``.
+        delete: Delete records that are not desired.
+        protected_types: Record types never deleted.
+        max_workers: Number of changes applied concurrently.
+        dry_run: Only compute the plan.
+    """
+    plan = plan_zone(
+        client.list_records(zone_id),
+        desired_records,
+        delete=delete,
+        protected_types=protected_types,
+    )
+    if dry_run or plan.empty:
+        return ZoneApplyResult(plan)
+    return apply_plan(client, zone_id, plan, max_workers=max_workers)
+
+
+def load_zone_spec(path: str) -> Tuple[Optional[int], List[Dict]]:
+    """Load a YAML zone spec.
+
+    The file holds an optional ``zone_id`` and a ``records`` list of
+    ``name``/``type``/``content``/``ttl`` mappings.
+
+    Returns:
+        The zone id, if given, and the desired records.
+
+    Raises:
+        ValueError: If the spec is not a mapping or a record is malformed.
+    """
+    import yaml
+
+    with open(path) as f:
+        spec = yaml.safe_load(f) or {}
+    if not isinstance(spec, dict):
+        raise ValueError(f"{path} must be a mapping with a records list")
+    records = spec.get("records") or []
+    if not isinstance(records, list):
+        raise ValueError(f"records in {path} must be a list")
+    for record in records:
+        if not isinstance(record, dict):
+            raise ValueError(f"Record {record!r} must be a mapping")
+        missing = {"name", "type", "content"} - set(record)
+        if missing:
+            raise ValueError(f"Record {record} is missing {', '.join(sorted(missing))}")
+    return spec.get("zone_id"), records
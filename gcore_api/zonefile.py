@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+import re
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .zone import (
+    DEFAULT_TTL,
+    DEFAULT_ZONE_WORKERS,
+    PROTECTED_TYPES,
+    ZoneApplyResult,
+    apply_zone,
+    record_key,
+)
+
+if TYPE_CHECKING:
+    from .dns import DNSClient
+
+CLASSES = frozenset({"IN", "CH", "HS", "CS"})
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[()]|;|[^\s();"]+')
+_TTL = re.compile(r"(\d+)([smhdw]?)", re.IGNORECASE)
+_TTL_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_ttl(value: str) -> int:
+    """Parse a TTL given in seconds or BIND units, e.g. ``3600`` or ``1h30m``.
+
+    Raises:
+        ValueError: If ``value`` is not a TTL.
+    """
+    pos, total = 0, 0
+    for match in _TTL.finditer(value):
+        if match.start() != pos:
+            break
+        total += int(match.group(1)) * _TTL_UNITS[match.group(2).lower()]
+        pos = match.end()
+    if not value or pos != len(value):
+        raise ValueError(f"Invalid TTL: {value!r}")
+    return total
+
+
+def _safe_ttl(token: str) -> Optional[int]:
+    if not token[:1].isdigit():
+        return None
+    try:
+        return parse_ttl(token)
+    except ValueError:
+        return None
+
+
+def _entries(lines: Iterable[str]) -> Iterator[Tuple[int, bool, List[str]]]:
+    """Split zone file lines into logical entries.
+
+    Yields the line number an entry starts on, whether it starts with
+    whitespace (and so inherits the previous owner), and its tokens, with
+    comments removed and parenthesized continuations joined.
+    """
+    tokens: List[str] = []
+    depth = 0
+    start, blank_owner = 0, False
+    for lineno, line in enumerate(lines, 1):
+        if depth == 0:
+            start, blank_owner = lineno, line[:1] in (" ", "\t")
+        for token in _TOKEN.findall(line):
+            if token == ";":
+                break
+            if token == "(":
+                depth += 1
+            elif token == ")":
+                if depth == 0:
+                    raise ValueError(f"Line {lineno}: unbalanced ')'")
+                depth -= 1
+            else:
+                tokens.append(token)
+        if depth == 0 and tokens:
+            yield start, blank_owner, tokens
+            tokens = []
+    if depth:
+        raise ValueError(f"Line {start}: unbalanced '('")
+
+
+def _absolute(name: str, origin: Optional[str]) -> str:
+    if name == "@":
+        if origin is None:
+            raise ValueError("'@' used without $ORIGIN")
+        return origin
+    if name.endswith(".") or origin is None:
+        return name
+    return f"{name}.{origin}" if origin != "." else f"{name}."
+
+
+def _relative(name: str, origin: Optional[str]) -> str:
+    if origin is None:
+        return name
+    if name.lower() == origin.lower():
+        return "@"
+    suffix = f".{origin}"
+    if name.lower().endswith(suffix.lower()):
+        return name[: -len(suffix)]
+    return name
+
+
+def _normalize_origin(origin: Optional[str]) -> Optional[str]:
+    if not origin:
+        return None
+    return origin if origin.endswith(".") else f"{origin}."
+
+
+def parse_zone_file(
+    lines: Iterable[str],
+    origin: Optional[str] = None,
+    default_ttl: int = DEFAULT_TTL,
+) -> Iterator[Dict]:
+    """Parse an RFC 1035 master file into records, one entry at a time.
+
+    ``lines`` is consumed lazily, so a zone file of any size is parsed in
+    constant memory. ``$ORIGIN`` and ``$TTL`` directives, omitted owners,
+    TTLs and classes, ``@``, BIND TTL units and parenthesized multi-line
+    entries are supported; ``$INCLUDE`` is not.
+
+    Owner names are returned relative to the origin (``@`` for the apex).
+    Record data is kept as written, with tokens separated by single spaces.
+
+    Args:
+        lines: Zone file lines, e.g. an open file.
+        origin: Initial origin, overridden by ``$ORIGIN``.
+        default_ttl: TTL of records before any ``$TTL`` or explicit TTL.
+
+    Yields:
+        Records with ``name``, ``type``, ``ttl`` and ``content``.
+
+    Raises:
+        ValueError: On malformed entries, with the offending line number.
+    """
+    origin = _normalize_origin(origin)
+    ttl = default_ttl
+    owner: Optional[str] = None
+    for lineno, blank_owner, tokens in _entries(lines):
+        try:
+            directive = tokens[0].upper()
+            if directive == "$ORIGIN":
+                origin = _normalize_origin(_absolute(tokens[1], origin))
+                continue
+            if directive == "$TTL":
+                ttl = parse_ttl(tokens[1])
+                continue
+            if directive.startswith("$"):
+                raise ValueError(f"unsupported directive {tokens[0]}")
+
+            if not blank_owner:
+                owner = _absolute(tokens.pop(0), origin)
+            elif owner is None:
+                raise ValueError("no owner name")
+            record_ttl = None
+            while tokens and (
+                tokens[0].upper() in CLASSES
+                or (record_ttl is None and _safe_ttl(tokens[0]) is not None)
+            ):
+                token = tokens.pop(0)
+                if token.upper() not in CLASSES:
+                    record_ttl = parse_ttl(token)
+            if len(tokens) < 2:
+                raise ValueError("missing record type or data")
+        except (IndexError, ValueError) as e:
+            raise ValueError(f"Line {lineno}: {e}") from None
+
+        yield {
+            "name": _relative(owner, origin),
+            "type": tokens[0].upper(),
+            "ttl": record_ttl if record_ttl is not None else ttl,
+            "content": " ".join(tokens[1:]),
+        }
+
+
+def group_rrsets(records: Iterable[Dict]) -> List[Dict]:
+    """Group records sharing a name and type into RRsets.
+
+    RRsets with several values get a ``content`` list, as accepted by
+    :meth:`DNSClient.create_record`; an RRset's TTL is the lowest TTL of its
+    records. Order of first appearance is preserved.
+    """
+    rrsets: Dict[Tuple[str, str], Dict] = {}
+    for record in records:
+        key = record_key(record)
+        rrset = rrsets.get(key)
+        if rrset is None:
+            rrsets[key] = {**record, "content": [record["content"]]}
+        else:
+            rrset["content"].append(record["content"])
+            rrset["ttl"] = min(rrset["ttl"], record["ttl"])
+    for rrset in rrsets.values():
+        if len(rrset["content"]) == 1:
+            rrset["content"] = rrset["content"][0]
+    return list(rrsets.values())
+
+
+def import_zone_file(
+    client: "DNSClient",
+    zone_id: int,
+    path: str,
+    origin: Optional[str] = None,
+    replace: bool = False,
+    max_workers: int = DEFAULT_ZONE_WORKERS,
+    dry_run: bool = False,
+) -> ZoneApplyResult:
+    """Import a BIND zone file into a zone.
+
+    The file is parsed as a stream and grouped into RRsets, which are then
+    reconciled against the zone with :func:`gcore_api.zone.apply_zone`: new
+    RRsets are created and changed ones updated concurrently, and an already
+    imported file costs a single list call. Apex SOA and NS records are
+    skipped since the provider manages them.
+
+    Args:
+        client: DNS client to use.
+        zone_id: Zone to import into.
+        path: Zone file path.
+        origin: Origin for relative names, if the file has no ``$ORIGIN``.
+        replace: Also delete records that are not in the file.
+        max_workers: Number of records submitted concurrently.
+        dry_run: Only compute the changes.
+
+    Raises:
+        ValueError: If the zone file is malformed.
+    """
+    with open(path) as f:
+        rrsets = group_rrsets(
+            record
+            for record in parse_zone_file(f, origin=origin)
+            if not (record["name"] == "@" and record["type"] in PROTECTED_TYPES)
+        )
+    return apply_zone(
+        client,
+        zone_id,
+        rrsets,
+        delete=replace,
+        max_workers=max_workers,
+        dry_run=dry_run,
+    )
+
+
+def format_record(record: Dict) -> Iterator[str]:
+    """Render a record as zone file lines, one per value."""
+    content = record["content"]
+    values = content if isinstance(content, list) else [content]
+    ttl = record.get("ttl", DEFAULT_TTL)
+    for value in values:
+        yield f"{record['name']}\t{ttl}\tIN\t{record['type']}\t{value}\n"
+
+
+def write_zone_file(
+    records: Iterable[Dict], f: IO[str], origin: Optional[str] = None
+) -> int:
+    """Write records to an open file in zone file format.
+
+    Returns:
+        Number of records written.
+    """
+    origin = _normalize_origin(origin)
+    if origin:
+        f.write(f"$ORIGIN {origin}\n")
+    count = 0
+    for record in records:
+        f.writelines(format_record(record))
+        count += 1
+    return count
+
+
+def export_zone_file(
+    client: "DNSClient",
+    zone_id: int,
+    path: Union[str, IO[str]],
+    origin: Optional[str] = None,
+) -> int:
+    """Export a zone's records to a BIND zone file.
+
+    Records are streamed from :meth:`DNSClient.iter_records` straight to disk
+    page by page, so the whole zone is never held in memory.
+
+    Args:
+        client: DNS client to use.
+        zone_id: Zone to export.
+        path: Output path or an open text file.
+        origin: Written as ``$ORIGIN`` when given.
+
+    Returns:
+        Number of records written.
+    """
+    if not isinstance(path, str):
+        return write_zone_file(client.iter_records(zone_id), path, origin)
+    with open(path, "w", buffering=WRITE_BUFFER_SIZE) as f:
+        return write_zone_file(client.iter_records(zone_id), f, origin)
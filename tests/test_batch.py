@@ -0,0 +1,142 @@
+import json
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from click.testing import CliRunner
+
+from gcore_api.auth import GcoreAuth
+from gcore_api.batch import run_batch
+from gcore_api.cli import main
+from gcore_api.transport import Transport
+
+
+@pytest.fixture
+def auth():
+    return GcoreAuth(api_token="test-token", transport=Transport())
+
+
+def test_run_batch_dispatches_to_client_methods(auth):
+    operations = [
+        '{"id": "a", "op": "dns.create_record", "args": '
+        '{"zone_id": 7, "name": "www", "type": "A", "content": "192.0.2.1"}}',
+        {"id": "b", "op": "loadbalancer.add_member", "args": [1, 2, "10.0.0.1", 80]},
+    ]
+    with (
+        patch("gcore_api.dns.DNSClient.create_record") as create,
+        patch("gcore_api.loadbalancer.LoadBalancerClient.add_member") as add,
+    ):
+        create.return_value = {"id": 10}
+        add.return_value = {"id": 20}
+        results = {r["id"]: r for r in run_batch(auth, operations)}
+
+    create.assert_called_once_with(zone_id=7, name="www", type="A", content="192.0.2.1")
+    add.assert_called_once_with(1, 2, "10.0.0.1", 80)
+    assert results["a"]["ok"] and results["a"]["result"] == {"id": 10}
+    assert results["b"]["index"] == 2 and results["b"]["result"] == {"id": 20}
+
+
+def test_run_batch_reports_bad_operations(auth):
+    operations = [
+        "not json",
+        '{"op": "nope.create"}',
+        '{"op": "dns._private"}',
+        '{"op": "dns.create_record", "args": 5}',
+        '{"op": "cdn.purge_url", "args": {"resource_id": 1, "urls": ["/a"]}}',
+        '{"op": "dns.stream_records", "args": [7]}',
+    ]
+    with patch("gcore_api.cdn.CDNClient.purge_url") as purge:
+        purge.side_effect = RuntimeError("boom")
+        results = sorted(run_batch(auth, operations), key=lambda r: r["index"])
+
+    assert [r["ok"] for r in results] == [False] * 6
+    assert "Invalid JSON" in results[0]["error"]
+    assert "Unknown service" in results[1]["error"]
+    assert "Unsupported op" in results[2]["error"]
+    assert '"args"' in results[3]["error"]
+    assert results[4]["error"] == "boom"
+    assert "Unsupported op" in results[5]["error"]
+
+
+def test_run_batch_consumes_iterator_results(auth):
+    operations = ['{"op": "ssl.issue_certificates", "args": [["example.com"]]}']
+    with patch("gcore_api.ssl.SSLClient.issue_certificates") as issue:
+        issue.return_value = iter([{"status": "valid"}])
+        results = list(run_batch(auth, operations))
+    assert results[0]["result"] == [{"status": "valid"}]
+
+
+@pytest.mark.parametrize("service_limits", [{"cdn": 1}, {"*": 1, "dns": 4}])
+def test_run_batch_bounds_concurrency(auth, service_limits):
+    lock = threading.Lock()
+    running = {"cdn": 0, "dns": 0}
+    peaks = {"cdn": 0, "dns": 0, "total": 0}
+
+    def work(service):
+        def call(*args, **kwargs):
+            with lock:
+                running[service] += 1
+                peaks[service] = max(peaks[service], running[service])
+                peaks["total"] = max(peaks["total"], sum(running.values()))
+            time.sleep(0.01)
+            with lock:
+                running[service] -= 1
+
+        return call
+
+    consumed = 0
+
+    def operations():
+        nonlocal consumed
+        for n in range(40):
+            consumed += 1
+            service = "cdn" if n % 2 else "dns"
+            op = "cdn.purge_all" if service == "cdn" else "dns.delete_zone"
+            yield {"op": op, "args": [n]}
+
+    with (
+        patch("gcore_api.cdn.CDNClient.purge_all", new=Mock(side_effect=work("cdn"))),
+        patch("gcore_api.dns.DNSClient.delete_zone", new=Mock(side_effect=work("dns"))),
+    ):
+        stream = run_batch(
+            auth, operations(), max_workers=4, service_limits=service_limits
+        )
+        next(stream)
+        assert consumed <= 6
+        results = [next(stream)] + list(stream)
+
+    assert len(results) == 39
+    assert peaks["total"] <= 4
+    assert peaks["cdn"] == 1
+
+
+def test_batch_command_streams_json_lines(monkeypatch, tmp_path):
+    monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+    monkeypatch.setenv("GCORE_API_TOKEN", "test-token")
+    lines = "\n".join(
+        [
+            '{"id": 1, "op": "ssl.get_certificate", "args": {"cert_id": 3}}',
+            "",
+            '{"id": 2, "op": "ssl.unknown"}',
+        ]
+    )
+    with patch("gcore_api.ssl.SSLClient.get_certificate") as get_cert:
+        get_cert.return_value = {"id": 3}
+        result = CliRunner().invoke(main, ["batch", "--limits", "ssl=2"], input=lines)
+
+    assert result.exit_code == 1
+    lines = result.output.splitlines()
+    results = {r["id"]: r for r in map(json.loads, lines[:2])}
+    assert results[1]["result"] == {"id": 3}
+    assert not results[2]["ok"]
+    assert lines[2] == "1 succeeded, 1 failed"
+
+
+def test_typed_results_are_serialized(auth):
+    operations = [{"op": "dns.list_records", "args": {"zone_id": 1, "typed": True}}]
+    with patch("gcore_api.transport.Transport.get") as mock_get:
+        mock_get.return_value.json.return_value = [{"id": 1, "name": "www"}]
+        (result,) = run_batch(auth, operations)
+    assert result["result"] == [{"id": 1, "name": "www"}]
+    assert type(result["result"][0]) is dict
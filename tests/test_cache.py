@@ -0,0 +1,245 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+import pytest
+import requests
+
+from gcore_api.cache import ResponseCache
+from gcore_api.cdn import CDNClient
+from gcore_api.loadbalancer import LoadBalancerClient
+from gcore_api.purge import PurgeWaiter
+from gcore_api.transport import AsyncTransport, Transport
+
+API = "https://api.gcore.com"
+HEADERS = {"Authorization": "Bearer token"}
+
+
+def make_response(status=200, body=b'{"id": 1}', headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response._content_consumed = True
+    response.headers.update(headers or {"ETag": '"v1"'})
+    return response
+
+
+@pytest.fixture
+def transport():
+    return Transport(retry=None, rate_limiter=None, cache=ResponseCache())
+
+
+def test_fresh_entry_is_served_from_cache(transport):
+    with patch.object(transport.session, "request") as mock_request:
+        mock_request.return_value = make_response()
+        first = transport.get(f"{API}/cdn/resources/1", headers=HEADERS)
+        second = transport.get(f"{API}/cdn/resources/1", headers=HEADERS)
+    assert mock_request.call_count == 1
+    assert first.json() == second.json() == {"id": 1}
+    assert transport.cache.metrics["hits"] == 1
+
+
+def test_status_polls_bypass_fresh_entries(transport):
+    auth = Mock()
+    auth.get_headers.side_effect = lambda: dict(HEADERS)
+    client = CDNClient(auth, transport)
+    with patch.object(transport.session, "request") as mock_request:
+        mock_request.side_effect = [
+            make_response(body=b'{"status": "pending"}'),
+            make_response(body=b'{"status": "completed"}'),
+        ]
+        waiter = PurgeWaiter(client, [(1, "task")], initial_interval=0.001)
+        finished = list(waiter.iter_completed(timeout=5))
+
+    assert finished == [((1, "task"), {"status": "completed"})]
+    assert mock_request.call_count == 2
+    sent = mock_request.call_args.kwargs["headers"]
+    assert sent["Cache-Control"] == "no-cache"
+    assert sent["If-None-Match"] == '"v1"'
+    assert transport.cache.metrics.get("hits", 0) == 0
+
+
+def test_fresh_load_balancer_reads_bypass_cache(transport):
+    auth = Mock()
+    auth.get_headers.side_effect = lambda: dict(HEADERS)
+    client = LoadBalancerClient(auth, transport)
+    with patch.object(transport.session, "request") as mock_request:
+        mock_request.side_effect = lambda *args, **kwargs: make_response()
+        client.get_load_balancer(1)
+        client.get_load_balancer(1)
+        client.get_load_balancer(1, fresh=True)
+    assert mock_request.call_count == 2
+
+
+def test_key_includes_params_and_token():
+    cache = ResponseCache()
+    url = f"{API}/cdn/resources"
+    assert cache.key(url, {"limit": 1, "offset": 0}) == cache.key(
+        url, {"offset": 0, "limit": 1}
+    )
+    assert cache.key(url, {"limit": 1}) != cache.key(url, {"limit": 2})
+    assert cache.key(url, headers=HEADERS) != cache.key(
+        url, headers={"Authorization": "Bearer other"}
+    )
+
+
+def test_stale_entry_is_revalidated(transport):
+    transport.cache.ttls = {"ssl": 0.01}
+    url = f"{API}/ssl/certificates/1"
+    with patch.object(transport.session, "request") as mock_request:
+        mock_request.return_value = make_response()
+        transport.get(url, headers=HEADERS)
+        time.sleep(0.02)
+        mock_request.return_value = make_response(304, b"")
+        response = transport.get(url, headers=HEADERS)
+
+    sent = mock_request.call_args.kwargs["headers"]
+    assert sent["If-None-Match"] == '"v1"'
+    assert sent["Authorization"] == "Bearer token"
+    assert response.status_code == 200
+    assert response.json() == {"id": 1}
+    assert transport.cache.metrics["revalidated"] == 1
+
+
+def test_ttl_longest_prefix():
+    cache = ResponseCache({"dns": 300, "dns/v2/zones": 30, "*": 5})
+    assert cache.ttl_for(f"{API}/dns/v2/zones/1") == 30
+    assert cache.ttl_for(f"{API}/dns/v2/other") == 300
+    assert cache.ttl_for(f"{API}/cdn/resources") == 5
+
+
+def test_mutation_invalidates_related_entries(transport):
+    urls = [
+        f"{API}/cdn/resources",
+        f"{API}/cdn/resources/1",
+        f"{API}/cdn/resources/2",
+    ]
+    with patch.object(transport.session, "request") as mock_request:
+        mock_request.return_value = make_response()
+        for url in urls:
+            transport.get(url)
+        transport.post(f"{API}/cdn/resources/1/purge", json={"paths": ["/"]})
+        for url in urls:
+            transport.get(url)
+    fetched = [c.args[1] for c in mock_request.call_args_list[4:]]
+    assert fetched == urls[:2]
+
+
+def test_streamed_mutation_invalidates_entries(transport):
+    url = f"{API}/storage/v1/buckets/b/objects/a.txt"
+    with patch.object(transport.session, "request") as mock_request:
+        mock_request.return_value = make_response()
+        transport.get(url)
+        transport.put(url, data=b"new", stream=True)
+        transport.get(url)
+    assert [c.args[0] for c in mock_request.call_args_list] == ["GET", "PUT", "GET"]
+
+
+def test_safe_methods_keep_cached_entries(transport):
+    url = f"{API}/storage/objects/1"
+    with patch.object(transport.session, "request") as mock_request:
+        mock_request.return_value = make_response()
+        transport.get(url)
+        transport.request("HEAD", url)
+        transport.request("OPTIONS", url)
+        transport.get(url)
+    assert [c.args[0] for c in mock_request.call_args_list] == [
+        "GET",
+        "HEAD",
+        "OPTIONS",
+    ]
+
+
+def test_uncacheable_responses_are_not_stored(transport):
+    with patch.object(transport.session, "request") as mock_request:
+        mock_request.return_value = make_response(404)
+        transport.get(f"{API}/cdn/resources/9")
+        mock_request.return_value = make_response(headers={"Cache-Control": "no-store"})
+        transport.get(f"{API}/cdn/resources/9")
+        transport.get(f"{API}/cdn/resources/9")
+    assert mock_request.call_count == 3
+
+
+def test_lru_size_cap():
+    cache = ResponseCache(max_size=10)
+    for n in range(3):
+        url = f"{API}/cdn/resources/{n}"
+        cache.store(cache.key(url), url, 200, {}, b"12345")
+    assert (
+        cache.get(cache.key(f"{API}/cdn/resources/0"), f"{API}/cdn/resources/0") is None
+    )
+    assert cache.get(cache.key(f"{API}/cdn/resources/2"), f"{API}/cdn/resources/2")
+
+
+def test_disk_store_is_shared_and_invalidated(tmp_path):
+    url = f"{API}/dns/v2/zones/1"
+    writer = ResponseCache(directory=tmp_path)
+    writer.store(writer.key(url), url, 200, {"ETag": '"a"'}, b"zone")
+
+    reader = ResponseCache(directory=tmp_path)
+    entry = reader.get(reader.key(url), url)
+    assert entry.content == b"zone"
+    assert entry.headers == {"ETag": '"a"'}
+
+    ResponseCache(directory=tmp_path).invalidate(f"{API}/dns/v2/zones")
+    assert ResponseCache(directory=tmp_path).get(reader.key(url), url) is None
+
+
+def test_from_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("GCORE_CACHE", raising=False)
+    assert ResponseCache.from_env() is None
+
+    monkeypatch.setenv("GCORE_CACHE", "memory")
+    monkeypatch.setenv("GCORE_CACHE_TTL", "ssl=600,*=30")
+    cache = ResponseCache.from_env()
+    assert cache.directory is None
+    assert cache.ttls == {"ssl": 600.0}
+    assert cache.default_ttl == 30.0
+
+    monkeypatch.setenv("GCORE_CACHE", "disk")
+    monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+    assert ResponseCache.from_env().directory == tmp_path / ".config/gcore/cache"
+
+
+def test_async_transport_uses_cache():
+    transport = AsyncTransport(retry=None, rate_limiter=None, cache=ResponseCache())
+    url = f"{API}/cdn/resources"
+    transport.client.request = AsyncMock(
+        return_value=httpx.Response(200, json=[{"id": 1}], headers={"ETag": '"x"'})
+    )
+
+    async def run():
+        first = await transport.get(url)
+        second = await transport.get(url)
+        await transport.request("HEAD", url)
+        await transport.get(url)
+        await transport.delete(f"{url}/1")
+        await transport.get(url)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert second.json() == first.json() == [{"id": 1}]
+    methods = [c.args[0] for c in transport.client.request.call_args_list]
+    assert methods == ["GET", "HEAD", "DELETE", "GET"]
+
+
+def test_async_streamed_mutation_invalidates_entries():
+    url = f"{API}/storage/v1/buckets/b/objects/a.txt"
+    methods = []
+
+    def handler(request):
+        methods.append(request.method)
+        return httpx.Response(200, content=b"{}", headers={"ETag": '"x"'})
+
+    async def run():
+        transport = AsyncTransport(retry=None, rate_limiter=None, cache=ResponseCache())
+        transport.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await transport.get(url)
+        async for _ in transport.stream("DELETE", url):
+            pass
+        await transport.get(url)
+        await transport.close()
+
+    asyncio.run(run())
+    assert methods == ["GET", "DELETE", "GET"]
@@ -1,9 +1,11 @@
-from unittest.mock import Mock, patch
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
 from gcore_api.auth import GcoreAuth
-from gcore_api.cdn import CDNClient
+from gcore_api.cdn import AsyncCDNClient, CDNClient
+from gcore_api.transport import AsyncTransport, Transport
 
 
 @pytest.fixture
@@ -15,11 +17,16 @@ def mock_auth():
 
 @pytest.fixture
 def cdn_client(mock_auth):
-    return CDNClient(mock_auth)
+    return CDNClient(mock_auth, transport=Transport())
+
+
+@pytest.fixture
+def async_cdn_client(mock_auth):
+    return AsyncCDNClient(mock_auth, transport=AsyncTransport())
 
 
 def test_list_resources(cdn_client):
-    with patch("requests.get") as mock_get:
+    with patch("gcore_api.transport.Transport.get") as mock_get:
         mock_get.return_value.json.return_value = [
             {"id": 1, "origin": "example.com", "ssl": True}
         ]
@@ -30,7 +37,7 @@ def test_list_resources(cdn_client):
 
 
 def test_get_resource(cdn_client):
-    with patch("requests.get") as mock_get:
+    with patch("gcore_api.transport.Transport.get") as mock_get:
         mock_get.return_value.json.return_value = {
             "id": 1,
             "origin": "example.com",
@@ -42,7 +49,7 @@ def test_get_resource(cdn_client):
 
 
 def test_create_resource(cdn_client):
-    with patch("requests.post") as mock_post:
+    with patch("gcore_api.transport.Transport.post") as mock_post:
         mock_post.return_value.json.return_value = {
             "id": 1,
             "origin": "example.com",
@@ -58,7 +65,7 @@ def test_create_resource(cdn_client):
 
 
 def test_purge_url(cdn_client):
-    with patch("requests.post") as mock_post:
+    with patch("gcore_api.transport.Transport.post") as mock_post:
         mock_post.return_value.json.return_value = {
             "task_id": "task-123",
             "status": "pending",
@@ -68,8 +75,16 @@ def test_purge_url(cdn_client):
         assert result["status"] == "pending"
 
 
+def test_purge_paths(cdn_client):
+    with patch("gcore_api.transport.Transport.post") as mock_post:
+        mock_post.return_value.json.return_value = {"task_id": "task-124"}
+        result = cdn_client.purge_paths(1, ["/images/*"])
+        assert result["task_id"] == "task-124"
+        assert mock_post.call_args.kwargs["json"] == {"paths": ["/images/*"]}
+
+
 def test_purge_all(cdn_client):
-    with patch("requests.post") as mock_post:
+    with patch("gcore_api.transport.Transport.post") as mock_post:
         mock_post.return_value.json.return_value = {
             "task_id": "task-123",
             "status": "pending",
@@ -80,7 +95,7 @@ def test_purge_all(cdn_client):
 
 
 def test_get_purge_status(cdn_client):
-    with patch("requests.get") as mock_get:
+    with patch("gcore_api.transport.Transport.get") as mock_get:
         mock_get.return_value.json.return_value = {
             "task_id": "task-123",
             "status": "completed",
@@ -89,3 +104,30 @@ def test_get_purge_status(cdn_client):
         status = cdn_client.get_purge_status(1, "task-123")
         assert status["status"] == "completed"
         assert status["progress"] == 100
+
+
+def test_async_list_resources(async_cdn_client):
+    with patch(
+        "gcore_api.transport.AsyncTransport.get", new_callable=AsyncMock
+    ) as mock_get:
+        mock_get.return_value = Mock()
+        mock_get.return_value.json.return_value = [
+            {"id": 1, "origin": "example.com", "ssl": True}
+        ]
+        resources = asyncio.run(async_cdn_client.list_resources())
+        assert resources[0]["id"] == 1
+
+
+def test_async_purge_url(async_cdn_client):
+    with patch(
+        "gcore_api.transport.AsyncTransport.post", new_callable=AsyncMock
+    ) as mock_post:
+        mock_post.return_value = Mock()
+        mock_post.return_value.json.return_value = {"task_id": "task-123"}
+        result = asyncio.run(
+            async_cdn_client.purge_url(1, ["https://example.com/image.jpg"])
+        )
+        assert result["task_id"] == "task-123"
+        assert mock_post.call_args.kwargs["json"] == {
+            "urls": ["https://example.com/image.jpg"]
+        }
@@ -0,0 +1,148 @@
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+import pytest
+from click.testing import CliRunner
+
+from gcore_api.certscan import (
+    CertificateInfo,
+    CertificateScanner,
+    ExpiryIndex,
+    load_last_index,
+    parse_certificate,
+    pem_to_der,
+)
+from gcore_api.cli import main
+from gcore_api.ssl import SSLClient
+
+# Self-signed, CN=example.com, SANs example.com, *.example.com and 192.0.2.1.
+PEM = """-----BEGIN CERTIFICATE-----
+MIIBsDCCAVWgAwIBAgIURg1c89pcK7f4tdVsIBy/hDR0w1IwCgYIKoZIzj0EAwIw
+FjEUMBIGA1UEAwwLZXhhbXBsZS5jb20wHhcNMjYxMDE4MDI1MjQ4WhcNMjYxMTE3
+MDI1MjQ4WjAWMRQwEgYDVQQDDAtleGFtcGxlLmNvbTBZMBMGByqGSM49AgEGCCqG
+SM49AwEHA0IABK56Jq3RRz3hgRHjy2KuVUxgS7kvWVPjtAtbtmfBNVVLaAOzmhDK
+iRoMMznajnPAanROqHR2j0Xn4x3XhoZ2YkujgYAwfjAdBgNVHQ4EFgQU9DDLq4WG
+aeNDIOEQF/D5DWr8TacwHwYDVR0jBBgwFoAU9DDLq4WGaeNDIOEQF/D5DWr8Tacw
+DwYDVR0TAQH/BAUwAwEB/zArBgNVHREEJDAiggtleGFtcGxlLmNvbYINKi5leGFt
+cGxlLmNvbYcEwAACATAKBggqhkjOPQQDAgNJADBGAiEAkdA/r5dohsoHbs81t9zc
+3KmaJdNxMRiHLH3rnaMbEpECIQCSlFwypKreq56ceemJ3+blfK/LZkkA8NP2IIb4
+fOjq2w==
+-----END CERTIFICATE-----
+"""
+FINGERPRINT = "e52224e83f267732cde780b4e5c5954a8a950f081527b3ebd635b2d44b87b131"
+NOW = datetime(2026, 11, 1, tzinfo=timezone.utc)
+
+
+def info(cert_id, days, *domains):
+    return CertificateInfo(
+        cert_id, None, str(cert_id), NOW + timedelta(days=days), domains
+    )
+
+
+def test_parse_certificate():
+    not_after, names = parse_certificate(pem_to_der(PEM))
+    assert not_after == datetime(2026, 11, 17, 2, 52, 48, tzinfo=timezone.utc)
+    assert names == ["example.com", "*.example.com"]
+    with pytest.raises(ValueError):
+        pem_to_der("not a certificate")
+    with pytest.raises(ValueError):
+        parse_certificate(pem_to_der(PEM)[:100])
+
+
+def test_expiry_index():
+    index = ExpiryIndex(
+        [
+            info(1, 90, "example.com", "*.example.com"),
+            info(2, -1, "old.example.org"),
+            info(3, 10, "shop.example.com"),
+        ]
+    )
+    assert [c.id for c in index.expiring_within(30, now=NOW)] == [2, 3]
+    assert [c.id for c in index.covering("SHOP.example.com")] == [1, 3]
+    assert [c.id for c in index.covering("example.com")] == [1]
+    assert index.covering("a.b.example.com") == []
+
+
+@pytest.fixture
+def client():
+    client = Mock(spec=SSLClient)
+    client.list_certificates.return_value = [
+        {"id": 1, "name": "pem"},
+        {"id": 2, "name": "api", "expires_at": "2026-11-05T00:00:00Z"},
+    ]
+    details = {
+        1: {"id": 1, "certificate": PEM},
+        2: {
+            "id": 2,
+            "expires_at": "2026-11-05T00:00:00Z",
+            "domains": ["api.example.net"],
+        },
+    }
+    client.get_certificate.side_effect = details.__getitem__
+    return client
+
+
+def test_scan_fetches_concurrently_and_caches(client, tmp_path):
+    barrier = threading.Barrier(2, timeout=5)
+    details = client.get_certificate.side_effect
+
+    def get_certificate(cert_id):
+        barrier.wait()
+        return details(cert_id)
+
+    client.get_certificate.side_effect = get_certificate
+    cache = tmp_path / "certificates.json"
+    index = CertificateScanner(client, cache).scan()
+
+    assert [c.id for c in index.expiring_within(10, now=NOW)] == [2]
+    assert index.covering("www.example.com")[0].fingerprint == FINGERPRINT
+    assert json.loads(cache.read_text())["parsed"][FINGERPRINT]["domains"] == [
+        "example.com",
+        "*.example.com",
+    ]
+    last = load_last_index(cache)
+    assert [c.id for c in last] == [c.id for c in index]
+
+
+def test_cached_fingerprints_skip_fetch_and_parse(client, tmp_path, monkeypatch):
+    cache = tmp_path / "certificates.json"
+    CertificateScanner(client, cache).scan()
+
+    client.list_certificates.return_value[0]["fingerprint"] = FINGERPRINT.upper()
+    parse = Mock(side_effect=AssertionError("re-parsed"))
+    monkeypatch.setattr("gcore_api.certscan.parse_certificate", parse)
+    client.get_certificate.reset_mock()
+
+    scanner = CertificateScanner(client, cache)
+    index = scanner.scan()
+    assert scanner.fetched == 1
+    client.get_certificate.assert_called_once_with(2)
+    assert len(index) == 2
+
+
+def test_unparsable_certificate_is_skipped(client, tmp_path):
+    client.get_certificate.side_effect = lambda cert_id: {"id": cert_id}
+    index = CertificateScanner(client, tmp_path / "c.json").scan()
+    assert len(index) == 0
+
+
+def test_cli_expiring_and_offline_covers(client, tmp_path, monkeypatch):
+    monkeypatch.setenv("GCORE_CERT_CACHE", str(tmp_path / "certificates.json"))
+    monkeypatch.setenv("GCORE_API_TOKEN", "test-token")
+    monkeypatch.setattr(
+        "gcore_api.ssl.SSLClient.list_certificates", client.list_certificates
+    )
+    monkeypatch.setattr(
+        "gcore_api.ssl.SSLClient.get_certificate", client.get_certificate
+    )
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["ssl", "expiring", "--days", "36500"])
+    assert result.exit_code == 0, result.output
+    assert [c["id"] for c in json.loads(result.output)] == [2, 1]
+
+    result = runner.invoke(main, ["ssl", "covers", "www.example.com", "--offline"])
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output)[0]["fingerprint"] == FINGERPRINT
@@ -0,0 +1,54 @@
+import json
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from gcore_api.cli import main
+
+
+@pytest.fixture(autouse=True)
+def isolated_config(monkeypatch, tmp_path):
+    monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+    monkeypatch.setenv("GCORE_API_TOKEN", "test-token")
+
+
+def test_help_lists_lazy_commands_without_importing_them():
+    code = (
+        "import sys\n"
+        "from click.testing import CliRunner\n"
+        "from gcore_api.cli import main\n"
+        "result = CliRunner().invoke(main, ['--help'])\n"
+        "assert 'Manage CDN resources.' in result.output, result.output\n"
+        "heavy = ['requests', 'yaml', 'httpx', 'gcore_api.commands.cdn']\n"
+        "print([name for name in heavy if name in sys.modules])\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[]"
+
+
+def test_subcommand_is_loaded_on_use():
+    with patch("gcore_api.cdn.CDNClient.list_resources") as mock_list:
+        mock_list.return_value = [{"id": 1}]
+        result = CliRunner().invoke(main, ["cdn", "list"])
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output) == [{"id": 1}]
+
+
+def test_unknown_command():
+    result = CliRunner().invoke(main, ["nope"])
+    assert result.exit_code == 2
+    assert "No such command" in result.output
+
+
+def test_dns_export_to_stdout():
+    records = [{"name": "www", "type": "A", "ttl": 300, "content": "192.0.2.1"}]
+    with patch("gcore_api.dns.DNSClient.iter_records") as mock_iter:
+        mock_iter.return_value = iter(records)
+        result = CliRunner().invoke(main, ["dns", "export", "7", "-"])
+    assert result.exit_code == 0, result.output
+    assert "192.0.2.1" in result.output
@@ -0,0 +1,161 @@
+import io
+import json
+import os
+import socket
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from gcore_api import cli
+from gcore_api import daemon as daemon_module
+from gcore_api.daemon import DaemonServer, forward, request, runs_locally
+
+
+@pytest.fixture
+def daemon(monkeypatch, tmp_path):
+    monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+    monkeypatch.setenv("GCORE_API_TOKEN", "test-token")
+    monkeypatch.setenv("GCORE_DAEMON", "1")
+    server = DaemonServer(tmp_path / "d.sock", idle_timeout=10)
+    thread = threading.Thread(target=server.serve)
+    thread.start()
+    yield server
+    request({"op": "stop"}, path=server.path)
+    thread.join(5)
+    cli.shared_auth = None
+
+
+def test_forward_disabled(monkeypatch, tmp_path):
+    monkeypatch.delenv("GCORE_DAEMON", raising=False)
+    assert forward(["cdn", "list"], path=tmp_path / "d.sock") is None
+
+
+def test_forward_without_daemon_runs_locally(monkeypatch, tmp_path):
+    monkeypatch.setenv("GCORE_DAEMON", "1")
+    assert forward(["cdn", "list"], path=tmp_path / "missing.sock") is None
+
+
+def test_forward_runs_command_in_daemon(daemon, capsys):
+    with patch("gcore_api.cdn.CDNClient.list_resources", autospec=True) as mock_list:
+        mock_list.return_value = [{"id": 1}]
+        assert forward(["cdn", "list"], path=daemon.path) == 0
+        assert forward(["cdn", "list"], path=daemon.path) == 0
+
+    output = capsys.readouterr().out
+    assert json.loads(output.split("\n]\n")[0] + "\n]") == [{"id": 1}]
+    first, second = (c.args[0] for c in mock_list.call_args_list)
+    assert first.auth is second.auth is cli.shared_auth
+    assert first.transport is second.transport
+
+
+def test_forward_relays_errors(daemon, capsys):
+    assert forward(["nope"], path=daemon.path) == 2
+    assert "No such command" in capsys.readouterr().err
+
+
+def test_daemon_commands_run_locally(daemon):
+    assert forward(["daemon", "status"], path=daemon.path) is None
+    assert forward(["-v", "batch"], path=daemon.path) is None
+    assert daemon.commands == 0
+
+
+def test_runs_locally_skips_global_options():
+    assert runs_locally(["--verbose", "batch", "ops.jsonl"])
+    assert runs_locally(["-v", "daemon", "start"])
+    assert not runs_locally(["-v", "cdn", "list"])
+    assert not runs_locally(["--help"])
+
+
+def test_ping(daemon):
+    forward(["--help"], path=daemon.path)
+    status = request({"op": "ping"}, path=daemon.path)
+    assert status["commands"] == 1
+    assert status["uptime"] >= 0
+
+
+def run_raw(server, argv, env):
+    """Send a run message with an explicit environment; return its replies."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(server.path))
+        with sock.makefile("rwb") as f:
+            message = {"op": "run", "argv": argv, "cwd": os.getcwd(), "env": env}
+            f.write(json.dumps(message).encode() + b"\n")
+            f.flush()
+            return [json.loads(line) for line in f]
+
+
+def test_commands_run_with_the_callers_environment(daemon):
+    seen = []
+
+    def list_resources(self):
+        seen.append((os.environ.get("GCORE_BASE_URL"), self.auth))
+        return []
+
+    with patch("gcore_api.cdn.CDNClient.list_resources", list_resources):
+        env = {"GCORE_API_TOKEN": "other", "GCORE_BASE_URL": "http://stub"}
+        replies = run_raw(daemon, ["cdn", "list"], env)
+        run_raw(daemon, ["cdn", "list"], {"GCORE_API_TOKEN": "test-token"})
+        run_raw(daemon, ["cdn", "list"], env)
+
+    assert replies[0] == {"accepted": True}
+    assert replies[-1] == {"exit_code": 0}
+    assert [url for url, _ in seen] == ["http://stub", None, "http://stub"]
+    assert seen[0][1].api_token == "other"
+    assert seen[1][1].api_token == "test-token"
+    assert seen[0][1] is seen[2][1]
+    assert os.environ["GCORE_API_TOKEN"] == "test-token"
+    assert "GCORE_BASE_URL" not in os.environ
+
+
+def test_output_is_streamed_while_the_command_runs(daemon, monkeypatch):
+    first_line_seen = threading.Event()
+    streamed = []
+
+    class Stdout(io.StringIO):
+        def write(self, text):
+            first_line_seen.set()
+            return super().write(text)
+
+    def stream_resources(self):
+        yield {"id": 1}
+        streamed.append(first_line_seen.wait(5))
+        yield {"id": 2}
+
+    stdout = Stdout()
+    monkeypatch.setattr("sys.stdout", stdout)
+    with patch("gcore_api.cdn.CDNClient.stream_resources", stream_resources):
+        assert forward(["cdn", "list", "--stream"], path=daemon.path) == 0
+    assert streamed == [True]
+    assert stdout.getvalue() == '{"id": 1}\n{"id": 2}\n'
+
+
+def test_status_is_answered_while_a_command_runs(daemon):
+    release = threading.Event()
+
+    def list_resources(self):
+        release.wait(5)
+        return []
+
+    with patch("gcore_api.cdn.CDNClient.list_resources", list_resources):
+        caller = threading.Thread(
+            target=forward, args=(["cdn", "list"],), kwargs={"path": daemon.path}
+        )
+        caller.start()
+        try:
+            assert request({"op": "ping"}, path=daemon.path, timeout=2)["pid"]
+        finally:
+            release.set()
+            caller.join(5)
+    assert daemon.commands == 1
+
+
+def test_unresponsive_daemon_does_not_hang(monkeypatch, tmp_path, capsys):
+    monkeypatch.setenv("GCORE_DAEMON", "1")
+    monkeypatch.setattr(daemon_module, "REPLY_TIMEOUT", 0.1)
+    path = tmp_path / "hung.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(str(path))
+        listener.listen()
+        assert forward(["cdn", "list"], path=path) == 1
+    assert "not responding" in capsys.readouterr().err
@@ -1,9 +1,11 @@
-from unittest.mock import Mock, patch
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
 from gcore_api.auth import GcoreAuth
-from gcore_api.dns import DNSClient
+from gcore_api.dns import AsyncDNSClient, DNSClient
+from gcore_api.transport import AsyncTransport, Transport
 
 
 @pytest.fixture
@@ -15,11 +17,16 @@ def mock_auth():
 
 @pytest.fixture
 def dns_client(mock_auth):
-    return DNSClient(mock_auth)
+    return DNSClient(mock_auth, transport=Transport())
+
+
+@pytest.fixture
+def async_dns_client(mock_auth):
+    return AsyncDNSClient(mock_auth, transport=AsyncTransport())
 
 
 def test_list_zones(dns_client):
-    with patch("requests.get") as mock_get:
+    with patch("gcore_api.transport.Transport.get") as mock_get:
         mock_get.return_value.json.return_value = [
             {"id": 1, "name": "example.com", "status": "active"}
         ]
@@ -30,7 +37,7 @@ def test_list_zones(dns_client):
 
 
 def test_create_zone(dns_client):
-    with patch("requests.post") as mock_post:
+    with patch("gcore_api.transport.Transport.post") as mock_post:
         mock_post.return_value.json.return_value = {
             "id": 1,
             "name": "example.com",
@@ -42,7 +49,7 @@ def test_create_zone(dns_client):
 
 
 def test_list_records(dns_client):
-    with patch("requests.get") as mock_get:
+    with patch("gcore_api.transport.Transport.get") as mock_get:
         mock_get.return_value.json.return_value = [
             {"id": 1, "name": "www", "type": "A", "content": "192.0.2.1", "ttl": 3600}
         ]
@@ -53,8 +60,21 @@ def test_list_records(dns_client):
         assert records[0]["content"] == "192.0.2.1"
 
 
+def test_iter_records(dns_client):
+    with patch("gcore_api.transport.Transport.get") as mock_get:
+        mock_get.return_value.json.return_value = [
+            {"id": 1, "name": "www", "type": "A", "content": "192.0.2.1", "ttl": 3600}
+        ]
+        records = list(dns_client.iter_records(1))
+        assert records[0]["name"] == "www"
+        assert mock_get.call_args_list[0].kwargs["params"] == {
+            "limit": 100,
+            "offset": 0,
+        }
+
+
 def test_create_record(dns_client):
-    with patch("requests.post") as mock_post:
+    with patch("gcore_api.transport.Transport.post") as mock_post:
         mock_post.return_value.json.return_value = {
             "id": 1,
             "name": "www",
@@ -69,3 +89,46 @@ def test_create_record(dns_client):
         assert record["name"] == "www"
         assert record["type"] == "A"
         assert record["content"] == "192.0.2.1"
+
+
+def test_update_record(dns_client):
+    with patch("gcore_api.transport.Transport.put") as mock_put:
+        mock_put.return_value.json.return_value = {"id": 1, "content": "192.0.2.2"}
+        record = dns_client.update_record(1, 1, "192.0.2.2", ttl=300)
+        assert record["content"] == "192.0.2.2"
+        assert mock_put.call_args.kwargs["json"] == {
+            "content": "192.0.2.2",
+            "ttl": 300,
+        }
+
+
+def test_async_list_zones(async_dns_client):
+    with patch(
+        "gcore_api.transport.AsyncTransport.get", new_callable=AsyncMock
+    ) as mock_get:
+        mock_get.return_value = Mock()
+        mock_get.return_value.json.return_value = [
+            {"id": 1, "name": "example.com", "status": "active"}
+        ]
+        zones = asyncio.run(async_dns_client.list_zones())
+        assert zones[0]["name"] == "example.com"
+
+
+def test_async_create_records_concurrently(async_dns_client):
+    async def create_all():
+        return await asyncio.gather(
+            *(
+                async_dns_client.create_record(1, f"host{i}", "a", "192.0.2.1")
+                for i in range(10)
+            )
+        )
+
+    with patch(
+        "gcore_api.transport.AsyncTransport.post", new_callable=AsyncMock
+    ) as mock_post:
+        mock_post.return_value = Mock()
+        mock_post.return_value.json.return_value = {"id": 1}
+        results = asyncio.run(create_all())
+        assert len(results) == 10
+        assert mock_post.call_count == 10
+        assert mock_post.call_args.kwargs["json"]["type"] == "A"
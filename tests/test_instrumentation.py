@@ -0,0 +1,237 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from gcore_api.instrumentation import (
+    Instrumentation,
+    Metrics,
+    RequestEvent,
+    endpoint_for,
+)
+from gcore_api.ratelimit import RateLimiter
+from gcore_api.retry import RetryPolicy
+from gcore_api.transport import AsyncTransport, Transport
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    failures = 0
+
+    def do_GET(self) -> None:
+        if self.path.endswith("/chunked"):
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in (b"a" * 1000, b"b" * 500):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+            return
+        if Handler.failures:
+            Handler.failures -= 1
+            status, body = 503, b""
+        else:
+            status, body = 200, b'[{"id": 1}]'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(201)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    ).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_endpoint_for():
+    assert endpoint_for("https://api.gcore.com/dns/v2/zones/12/records") == (
+        "/dns/v2/zones/{id}/records"
+    )
+    assert (
+        endpoint_for("https://api.gcore.com/storage/v1/buckets/site/objects/a/b")
+        == "/storage/v1/buckets/{name}/objects/{name}"
+    )
+    assert endpoint_for("https://api.gcore.com/ssl/v1/certificates/request") == (
+        "/ssl/v1/certificates/request"
+    )
+
+
+def test_metrics_prometheus_export():
+    metrics = Metrics(buckets=(0.1, 1.0))
+    for elapsed in (0.05, 0.5, 2.0):
+        metrics.on_response(
+            RequestEvent(
+                "GET",
+                "u",
+                "/cdn/v1/resources",
+                elapsed=elapsed,
+                status=200,
+                bytes_received=10,
+                reused=elapsed > 0.1,
+            )
+        )
+    metrics.on_throttle("https://api.gcore.com/cdn/v1/resources", 0.25)
+
+    text = metrics.prometheus()
+    labels = 'method="GET",endpoint="/cdn/v1/resources"'
+    assert f'gcore_request_duration_seconds_bucket{{{labels},le="0.1"}} 1' in text
+    assert f'gcore_request_duration_seconds_bucket{{{labels},le="1.0"}} 2' in text
+    assert f'gcore_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+    assert f"gcore_request_duration_seconds_count{{{labels}}} 3" in text
+    assert f'gcore_responses_total{{{labels},status="200"}} 3' in text
+    assert f"gcore_bytes_received_total{{{labels}}} 30" in text
+    assert 'gcore_throttle_seconds_total{service="cdn"} 0.25' in text
+    assert "gcore_connections_opened_total 1" in text
+    assert metrics.snapshot()["connection_reuse"] == pytest.approx(2 / 3)
+
+
+def test_transport_is_uninstrumented_by_default(monkeypatch):
+    monkeypatch.delenv("GCORE_METRICS", raising=False)
+    assert Transport().instrumentation is None
+
+
+def test_from_env_shares_metrics(monkeypatch, tmp_path):
+    monkeypatch.setenv("GCORE_METRICS", str(tmp_path / "metrics.prom"))
+    assert Instrumentation.from_env() is Instrumentation.from_env()
+
+
+def test_transport_hooks_metrics_and_spans(base_url):
+    events, spans = [], []
+    metrics = Metrics()
+    instrumentation = Instrumentation(
+        metrics=metrics, on_response=events.append, on_span=spans.append
+    )
+    transport = Transport(
+        base_url=base_url,
+        cache=None,
+        rate_limiter=None,
+        instrumentation=instrumentation,
+    )
+    for _ in range(3):
+        transport.get("https://api.gcore.com/dns/v2/zones/7/records")
+    transport.post("https://api.gcore.com/dns/v2/zones", json={"name": "a.com"})
+
+    assert [event.status for event in events] == [200, 200, 200, 201]
+    assert events[0].endpoint == "/dns/v2/zones/{id}/records"
+    assert events[0].bytes_received == len(b'[{"id": 1}]')
+    assert events[3].bytes_sent == len(b'{"name": "a.com"}')
+    assert spans[0].attributes["http.request.method"] == "GET"
+    assert spans[0].attributes["http.response.status_code"] == 200
+    assert spans[0].status == "OK"
+    assert spans[0].end_time_ns >= spans[0].start_time_ns
+
+    assert transport.connection_stats() == {"requests": 4, "connections": 1}
+    assert metrics.snapshot()["connection_reuse"] == pytest.approx(3 / 4)
+
+
+def test_transport_counts_retries_and_throttling(base_url):
+    metrics = Metrics()
+    transport = Transport(
+        base_url=base_url,
+        cache=None,
+        retry=RetryPolicy(backoff_factor=0),
+        rate_limiter=RateLimiter({"dns": 20}),
+        instrumentation=Instrumentation(metrics=metrics),
+    )
+    Handler.failures = 1
+    transport.get("https://api.gcore.com/dns/v2/zones")
+    transport.get("https://api.gcore.com/dns/v2/zones")
+
+    counters = metrics.snapshot()["counters"]
+    assert counters["retries", "GET", "/dns/v2/zones"] == 1
+    assert counters["responses", "GET", "/dns/v2/zones", 503] == 1
+    assert counters["responses", "GET", "/dns/v2/zones", 200] == 2
+    assert counters["throttled", "dns"] >= 1
+
+
+def test_hook_errors_do_not_fail_requests(base_url):
+    def broken(event):
+        raise RuntimeError("boom")
+
+    transport = Transport(
+        base_url=base_url,
+        cache=None,
+        instrumentation=Instrumentation(on_request=broken, on_response=broken),
+    )
+    assert transport.get("https://api.gcore.com/cdn/v1/resources").status_code == 200
+
+
+def test_error_hook_and_span():
+    errors, spans = [], []
+    transport = Transport(
+        base_url="http://127.0.0.1:1",
+        cache=None,
+        retry=None,
+        instrumentation=Instrumentation(on_error=errors.append, on_span=spans.append),
+    )
+    with pytest.raises(Exception):
+        transport.get("https://api.gcore.com/cdn/v1/resources")
+    assert errors[0].error is not None
+    assert spans[0].status == "ERROR"
+    assert spans[0].attributes["error.type"] == errors[0].error.__class__.__name__
+
+
+def test_async_transport_reports_connection_reuse(base_url):
+    events = []
+
+    async def run():
+        async with AsyncTransport(
+            base_url=base_url,
+            cache=None,
+            rate_limiter=None,
+            instrumentation=Instrumentation(on_response=events.append),
+        ) as transport:
+            for _ in range(3):
+                await transport.get("https://api.gcore.com/cdn/v1/resources")
+
+    asyncio.run(run())
+    assert [event.reused for event in events] == [False, True, True]
+    assert all(event.bytes_received == len(b'[{"id": 1}]') for event in events)
+
+
+def test_async_stream_is_instrumented(base_url):
+    responses, errors = [], []
+    metrics = Metrics()
+
+    async def run():
+        async with AsyncTransport(
+            base_url=base_url,
+            retry=None,
+            cache=None,
+            rate_limiter=None,
+            instrumentation=Instrumentation(
+                metrics=metrics, on_response=responses.append, on_error=errors.append
+            ),
+        ) as transport:
+            url = "https://api.gcore.com/storage/v1/objects/chunked"
+            body = b"".join([chunk async for chunk in transport.stream("GET", url)])
+            Handler.failures = 1
+            with pytest.raises(Exception):
+                async for _ in transport.stream("GET", url.replace("/chunked", "")):
+                    pass
+            return body
+
+    assert len(asyncio.run(run())) == 1500
+    assert [(e.status, e.bytes_received) for e in responses] == [(200, 1500), (503, 0)]
+    assert responses[0].elapsed > 0
+    assert errors == []
+    counters = metrics.snapshot()["counters"]
+    assert counters["bytes_received", "GET", "/storage/v1/objects/{name}"] == 1500
@@ -0,0 +1,148 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+from click.testing import CliRunner
+
+from gcore_api.auth import GcoreAuth
+from gcore_api.cli import main
+from gcore_api.inventory import (
+    BUCKETS_URL,
+    CERTIFICATES_URL,
+    LOAD_BALANCERS_URL,
+    RESOURCES_URL,
+    ZONES_URL,
+    Inventory,
+    objects_url,
+    records_url,
+)
+
+
+class FakeAPI:
+    """Serves listings by URL, answering 304 to a matching If-None-Match."""
+
+    def __init__(self):
+        self.listings = {
+            RESOURCES_URL: [
+                {"id": 1, "cname": "cdn.example.com", "origin": "origin.example.com"},
+                {"id": 2, "cname": "img.example.com", "origin": "s3.example.net"},
+            ],
+            ZONES_URL: [{"id": 7, "name": "example.com"}],
+            records_url(7): [
+                {"name": "www", "type": "A", "content": ["192.0.2.1", "192.0.2.2"]},
+                {"name": "api", "type": "A", "content": "192.0.2.2"},
+            ],
+            CERTIFICATES_URL: [
+                {"id": 3, "name": "example.com", "domains": ["*.example.com"]}
+            ],
+            BUCKETS_URL: [{"name": "site"}],
+            objects_url("site"): {
+                "objects": [{"name": "logs/a.gz"}, {"name": "logs/b.gz"}]
+            },
+            LOAD_BALANCERS_URL: [{"id": 9, "name": "edge"}],
+        }
+        self.fetched = []
+
+    def get(self, url, headers):
+        body = json.dumps(self.listings[url]).encode()
+        etag = f'"{hash(body)}"'
+        response = Mock(headers={"ETag": etag}, content=body)
+        if headers.get("If-None-Match") == etag:
+            response.status_code = 304
+        else:
+            response.status_code = 200
+            self.fetched.append(url)
+        return response
+
+
+@pytest.fixture
+def api():
+    return FakeAPI()
+
+
+@pytest.fixture
+def auth(api):
+    auth = Mock(spec=GcoreAuth)
+    auth.get_headers.return_value = {"Authorization": "Bearer test-token"}
+    auth.transport = api
+    return auth
+
+
+@pytest.fixture
+def store(tmp_path):
+    with Inventory(tmp_path / "inventory.db") as store:
+        yield store
+
+
+def test_sync_and_query(store, auth):
+    report = store.sync(auth)
+    assert report.ok
+    assert report.fetched == 7
+    assert report.counts["dns_records"] == 2
+
+    assert [r["id"] for r in store.resources_by_origin("ORIGIN.example.com")] == [1]
+    assert [r["id"] for r in store.resources_by_cname("img.example.com")] == [2]
+    www = store.records_by_name("www")
+    assert www[0]["zone"] == "example.com" and www[0]["zone_id"] == 7
+    assert [r["name"] for r in store.records_by_content("192.0.2.2")] == ["www", "api"]
+    assert [c["id"] for c in store.certificates_for_domain("shop.example.com")] == [3]
+    assert store.certificates_for_domain("example.org") == []
+    objects = store.find_objects("logs/", prefix=True)
+    assert [(o["bucket"], o["name"]) for o in objects] == [
+        ("site", "logs/a.gz"),
+        ("site", "logs/b.gz"),
+    ]
+    assert store.find_objects("logs/") == []
+
+
+def test_resync_fetches_only_changes(store, auth, api):
+    store.sync(auth)
+    api.fetched.clear()
+    api.listings[records_url(7)] = [
+        {"name": "www", "type": "A", "content": "192.0.2.9"}
+    ]
+
+    report = store.sync(auth)
+    assert api.fetched == [records_url(7)]
+    assert (report.fetched, report.unchanged) == (1, 6)
+    assert store.records_by_content("192.0.2.2") == []
+    assert store.records_by_content("192.0.2.9")[0]["name"] == "www"
+
+    api.fetched.clear()
+    store.sync(auth, full=True)
+    assert len(api.fetched) == 7
+
+
+def test_removed_zones_and_buckets_are_dropped(store, auth, api):
+    store.sync(auth)
+    api.listings[ZONES_URL] = []
+    api.listings[BUCKETS_URL] = []
+    store.sync(auth)
+    assert store.records_by_name("www") == []
+    assert store.find_objects("logs/a.gz") == []
+    assert store.counts()["dns_zones"] == 0
+
+
+def test_failed_listing_keeps_previous_state(store, auth, api):
+    store.sync(auth)
+    del api.listings[RESOURCES_URL]
+    report = store.sync(auth)
+    assert report.failed[0][0] == RESOURCES_URL
+    assert len(store.resources_by_origin("origin.example.com")) == 1
+
+
+def test_cli_sync_and_find(monkeypatch, tmp_path, auth):
+    monkeypatch.setenv("GCORE_INVENTORY", str(tmp_path / "inventory.db"))
+    monkeypatch.setattr("gcore_api.commands.inventory.get_auth", lambda: auth)
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["inventory", "sync"])
+    assert result.exit_code == 0, result.output
+    assert "7 listings updated" in result.output
+
+    result = runner.invoke(main, ["inventory", "find", "--content", "192.0.2.1"])
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output)[0]["name"] == "www"
+
+    result = runner.invoke(main, ["inventory", "find"])
+    assert result.exit_code == 2
@@ -0,0 +1,189 @@
+import json
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+from click.testing import CliRunner
+
+from gcore_api.cli import main
+from gcore_api.daemon import runs_locally
+from gcore_api.issuance import (
+    CertificateIssuer,
+    normalize_domains,
+    validation_state,
+)
+from gcore_api.purge import DEFAULT_MAX_POLL_ERRORS
+from gcore_api.ssl import SSLClient
+
+
+class FakeCA:
+    """Validates each certificate after a number of polls set per domain."""
+
+    def __init__(self, polls):
+        self.polls = polls
+        self.lock = threading.Lock()
+        self.certs = {}
+        self.requested_at = []
+
+    def request_certificate(self, domains, validation_method="dns"):
+        with self.lock:
+            self.requested_at.append(time.monotonic())
+            cert_id = len(self.certs) + 1
+            self.certs[cert_id] = [domains[0], 0]
+        if self.polls[domains[0]] is None:
+            raise RuntimeError("quota exceeded")
+        return {"id": cert_id, "status": "pending"}
+
+    def get_validation_status(self, cert_id):
+        with self.lock:
+            cert = self.certs[cert_id]
+            cert[1] += 1
+            needed = self.polls[cert[0]]
+        if needed < 0:
+            raise ConnectionError("unreachable")
+        if needed == 0:
+            return {"status": "failed"}
+        return {"status": "valid" if cert[1] >= needed else "pending"}
+
+
+def make_issuer(ca, **kwargs):
+    client = Mock(spec=SSLClient)
+    client.request_certificate.side_effect = ca.request_certificate
+    client.get_validation_status.side_effect = ca.get_validation_status
+    kwargs.setdefault("rate", None)
+    return client, CertificateIssuer(
+        client, initial_interval=0.01, max_interval=0.02, **kwargs
+    )
+
+
+def test_normalize_domains_and_validation_state():
+    assert normalize_domains("Example.com, www.example.com example.com") == (
+        "example.com",
+        "www.example.com",
+    )
+    with pytest.raises(ValueError):
+        normalize_domains(" , ")
+    assert validation_state({"status": "ISSUED"}) == "valid"
+    assert validation_state({"status": "invalid"}) == "failed"
+    assert validation_state({"status": "pending"}) is None
+
+
+def test_results_yield_in_completion_order():
+    ca = FakeCA({"slow.example": 8, "fast.example": 1, "mid.example": 3})
+    _, issuer = make_issuer(ca)
+    results = list(issuer.issue(["slow.example", "fast.example", "mid.example"]))
+    assert [r.domains[0] for r in results] == [
+        "fast.example",
+        "mid.example",
+        "slow.example",
+    ]
+    assert all(r.ok and r.cert_id for r in results)
+
+
+def test_failures_do_not_stop_the_batch():
+    ca = FakeCA({"ok.example": 1, "quota.example": None, "bad.example": 0})
+    ca.polls["down.example"] = -1
+    _, issuer = make_issuer(ca)
+    results = {
+        r.domains[0]: r
+        for r in issuer.issue(
+            ["ok.example", "quota.example", "bad.example", "down.example"]
+        )
+    }
+    assert results["ok.example"].ok
+    assert results["quota.example"].detail == {"error": "quota exceeded"}
+    assert results["quota.example"].cert_id is None
+    assert results["bad.example"].status == "failed"
+    assert results["down.example"].detail == {"error": "unreachable"}
+    assert ca.certs[4][1] == DEFAULT_MAX_POLL_ERRORS
+
+
+def test_requests_are_paced():
+    ca = FakeCA({f"{i}.example": 1 for i in range(4)})
+    _, issuer = make_issuer(ca, rate=50)
+    list(issuer.issue([f"{i}.example" for i in range(4)]))
+    gaps = [b - a for a, b in zip(ca.requested_at, ca.requested_at[1:])]
+    assert min(gaps) >= 0.015
+
+
+def test_duplicate_domain_set_is_rejected():
+    _, issuer = make_issuer(FakeCA({}))
+    with pytest.raises(ValueError):
+        issuer.issue(["a.example b.example", "b.example,a.example"])
+
+
+def test_track_and_timeout():
+    ca = FakeCA({"a.example": 2, "never.example": 10**6})
+    ca.certs = {7: ["a.example", 0], 8: ["never.example", 0]}
+    client, issuer = make_issuer(ca)
+    results = list(issuer.track([7, 8, 7], timeout=0.3))
+    assert [(r.cert_id, r.status) for r in results] == [(7, "valid"), (8, "pending")]
+    client.request_certificate.assert_not_called()
+
+
+def test_timeout_reports_submitted_requests_as_pending():
+    ca = FakeCA({"fast.example": 1, "slow.example": 10**6, "stuck.example": 10**6})
+    _, issuer = make_issuer(ca, rate=10)
+    domains = ["fast.example", "slow.example", "stuck.example", "late.example"]
+    results = {r.domains[0]: r for r in issuer.issue(domains, timeout=0.25)}
+
+    assert results["fast.example"].ok
+    assert (results["slow.example"].status, results["slow.example"].cert_id) == (
+        "pending",
+        2,
+    )
+    assert (results["stuck.example"].status, results["stuck.example"].cert_id) == (
+        "pending",
+        3,
+    )
+    assert results["late.example"].status == "failed"
+    assert results["late.example"].cert_id is None
+
+
+def test_cli_issue(monkeypatch):
+    monkeypatch.setenv("GCORE_API_TOKEN", "test-token")
+    monkeypatch.setattr(
+        "gcore_api.ssl.SSLClient.request_certificate",
+        lambda self, domains, method: {
+            "id": len(domains),
+            "status": "failed" if "bad.example" in domains else "issued",
+        },
+    )
+    result = CliRunner().invoke(
+        main, ["ssl", "issue", "-"], input="a.example www.a.example\n\nbad.example\n"
+    )
+    assert result.exit_code == 1
+    lines = [json.loads(line) for line in result.stdout.splitlines()]
+    assert {(r["cert_id"], r["status"]) for r in lines} == {(2, "valid"), (1, "failed")}
+    assert "1 valid, 1 failed" in result.stderr
+
+
+def test_cli_issue_rejects_empty_input(monkeypatch):
+    monkeypatch.setenv("GCORE_API_TOKEN", "test-token")
+    result = CliRunner().invoke(main, ["ssl", "issue"], input="\n")
+    assert result.exit_code == 1
+    assert "No domains given" in result.output
+
+
+def test_cli_track_reports_pending(monkeypatch):
+    monkeypatch.setenv("GCORE_API_TOKEN", "test-token")
+    monkeypatch.setattr(
+        "gcore_api.ssl.SSLClient.get_validation_status",
+        lambda self, cert_id: {"status": "pending"},
+    )
+    result = CliRunner().invoke(main, ["ssl", "track", "101", "--timeout", "0"])
+    assert result.exit_code == 1
+    assert json.loads(result.stdout) == {
+        "domains": [],
+        "cert_id": 101,
+        "status": "pending",
+        "detail": {"progress": None},
+    }
+    assert "gcore ssl track" in result.stderr
+
+
+def test_issue_runs_outside_the_daemon():
+    assert runs_locally(["ssl", "issue"])
+    assert runs_locally(["-v", "ssl", "issue", "domains.txt"])
+    assert not runs_locally(["ssl", "expiring"])
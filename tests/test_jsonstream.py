@@ -0,0 +1,88 @@
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+from click.testing import CliRunner
+
+from gcore_api.cli import main
+from gcore_api.jsonstream import iter_json_items, stream_items
+
+
+def chunked(data, size=1):
+    raw = data.encode() if isinstance(data, str) else data
+    return [raw[i : i + size] for i in range(0, len(raw), size)]
+
+
+@pytest.mark.parametrize("size", [1, 3, 1024])
+def test_iter_json_items_list(size):
+    items = [{"name": "a", "tags": [1, 2]}, 12345, "x,]", None, 1.5e3, []]
+    assert list(iter_json_items(chunked(json.dumps(items), size))) == items
+
+
+def test_iter_json_items_object_skips_other_members():
+    body = json.dumps(
+        {"count": 2, "meta": {"objects": [0]}, "objects": [{"n": 1}, {"n": 2}], "x": 1}
+    )
+    assert list(iter_json_items(chunked(body, 2), items_key="objects")) == [
+        {"n": 1},
+        {"n": 2},
+    ]
+
+
+def test_iter_json_items_defaults_to_results_key():
+    assert list(iter_json_items([b'{"results": [1, 2]}'])) == [1, 2]
+    assert list(iter_json_items([b'{"other": []}'])) == []
+
+
+def test_iter_json_items_multibyte_split():
+    body = json.dumps(["héllo", "日本"], ensure_ascii=False).encode()
+    assert list(iter_json_items(chunked(body))) == ["héllo", "日本"]
+
+
+def test_iter_json_items_is_incremental():
+    consumed = []
+
+    def chunks():
+        for chunk in [b'[{"a": 1},', b' {"a": 2}', b"]"]:
+            consumed.append(chunk)
+            yield chunk
+
+    items = iter_json_items(chunks())
+    assert next(items) == {"a": 1}
+    assert len(consumed) == 1
+    assert list(items) == [{"a": 2}]
+
+
+@pytest.mark.parametrize("body", [b"[1, 2", b"[1 2]", b"42", b'{"results": [1,}'])
+def test_iter_json_items_invalid(body):
+    with pytest.raises(ValueError):
+        list(iter_json_items(chunked(body)))
+
+
+def test_stream_items_uses_streaming_response():
+    transport = Mock()
+    response = transport.get.return_value
+    response.encoding = None
+    response.iter_content.return_value = iter(chunked('[{"id": 1}, {"id": 2}]', 4))
+
+    items = stream_items(transport, "https://api.gcore.com/cdn/resources", dict)
+
+    assert list(items) == [{"id": 1}, {"id": 2}]
+    assert transport.get.call_args.kwargs["stream"] is True
+    response.close.assert_called_once()
+
+
+def test_storage_ls_stream_prints_json_lines(monkeypatch, tmp_path):
+    monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+    monkeypatch.setenv("GCORE_API_TOKEN", "test-token")
+    with patch("gcore_api.transport.Transport.get") as mock_get:
+        response = mock_get.return_value
+        response.encoding = "utf-8"
+        response.iter_content.return_value = iter(
+            chunked('{"objects": [{"name": "a"}, {"name": "b"}]}', 7)
+        )
+        result = CliRunner().invoke(main, ["storage", "ls", "bucket", "--stream"])
+
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines() == ['{"name": "a"}', '{"name": "b"}']
+    assert mock_get.call_args.kwargs["params"] == {}
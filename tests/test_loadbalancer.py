@@ -1,9 +1,11 @@
-from unittest.mock import Mock, patch
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
 from gcore_api.auth import GcoreAuth
-from gcore_api.loadbalancer import LoadBalancerClient
+from gcore_api.loadbalancer import AsyncLoadBalancerClient, LoadBalancerClient
+from gcore_api.transport import AsyncTransport, Transport
 
 
 @pytest.fixture
@@ -15,11 +17,16 @@ def mock_auth():
 
 @pytest.fixture
 def lb_client(mock_auth):
-    return LoadBalancerClient(mock_auth)
+    return LoadBalancerClient(mock_auth, transport=Transport())
+
+
+@pytest.fixture
+def async_lb_client(mock_auth):
+    return AsyncLoadBalancerClient(mock_auth, transport=AsyncTransport())
 
 
 def test_list_load_balancers(lb_client):
-    with patch("requests.get") as mock_get:
+    with patch("gcore_api.transport.Transport.get") as mock_get:
         mock_get.return_value.json.return_value = [
             {
                 "id": 1,
@@ -37,7 +44,7 @@ def test_list_load_balancers(lb_client):
 
 
 def test_create_load_balancer(lb_client):
-    with patch("requests.post") as mock_post:
+    with patch("gcore_api.transport.Transport.post") as mock_post:
         mock_post.return_value.json.return_value = {
             "id": 1,
             "name": "new-lb",
@@ -52,7 +59,7 @@ def test_create_load_balancer(lb_client):
 
 
 def test_create_listener(lb_client):
-    with patch("requests.post") as mock_post:
+    with patch("gcore_api.transport.Transport.post") as mock_post:
         mock_post.return_value.json.return_value = {
             "id": 1,
             "protocol": "HTTP",
@@ -65,7 +72,7 @@ def test_create_listener(lb_client):
 
 
 def test_create_pool(lb_client):
-    with patch("requests.post") as mock_post:
+    with patch("gcore_api.transport.Transport.post") as mock_post:
         mock_post.return_value.json.return_value = {
             "id": 1,
             "protocol": "HTTP",
@@ -78,7 +85,7 @@ def test_create_pool(lb_client):
 
 
 def test_add_member(lb_client):
-    with patch("requests.post") as mock_post:
+    with patch("gcore_api.transport.Transport.post") as mock_post:
         mock_post.return_value.json.return_value = {
             "id": 1,
             "address": "192.0.2.1",
@@ -91,3 +98,29 @@ def test_add_member(lb_client):
         assert member["id"] == 1
         assert member["address"] == "192.0.2.1"
         assert member["port"] == 8080
+
+
+def test_async_add_member(async_lb_client):
+    with patch(
+        "gcore_api.transport.AsyncTransport.post", new_callable=AsyncMock
+    ) as mock_post:
+        mock_post.return_value = Mock()
+        mock_post.return_value.json.return_value = {"id": 1, "address": "192.0.2.1"}
+        member = asyncio.run(async_lb_client.add_member(1, 1, "192.0.2.1", 80))
+        assert member["address"] == "192.0.2.1"
+
+
+def test_list_members_typed(lb_client):
+    with patch("gcore_api.transport.Transport.get") as mock_get:
+        mock_get.return_value.json.return_value = [
+            {"id": 5, "address": "192.0.2.1", "port": 80, "weight": 1}
+        ]
+        members = lb_client.list_members(1, 2, typed=True)
+        assert members[0].address == "192.0.2.1"
+        assert mock_get.call_args.args[0].endswith("/loadbalancers/1/pools/2/members")
+
+
+def test_remove_member(lb_client):
+    with patch("gcore_api.transport.Transport.delete") as mock_delete:
+        lb_client.remove_member(1, 2, 5)
+        assert mock_delete.call_args.args[0].endswith("/pools/2/members/5")
@@ -0,0 +1,168 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from gcore_api.loadbalancer import LoadBalancerClient
+from gcore_api.members import (
+    add_members,
+    normalize_member,
+    plan_members,
+    set_members,
+)
+from gcore_api.models import Member
+
+CURRENT = [
+    {"id": 1, "address": "192.0.2.1", "port": 80, "weight": 1},
+    {"id": 2, "address": "192.0.2.2", "port": 80, "weight": 1},
+    {"id": 3, "address": "192.0.2.3", "port": 80, "weight": 1},
+    {"id": 4, "address": "192.0.2.1", "port": 80, "weight": 1},
+]
+
+
+def test_normalize_member():
+    assert normalize_member(("192.0.2.1", "80")) == {
+        "address": "192.0.2.1",
+        "port": 80,
+        "weight": 1,
+    }
+    assert (
+        normalize_member({"address": "192.0.2.1", "port": 80, "weight": 5})["weight"]
+        == 5
+    )
+    with pytest.raises(ValueError):
+        normalize_member(("192.0.2.1",))
+    with pytest.raises(ValueError):
+        normalize_member({"address": "192.0.2.1"})
+    with pytest.raises(ValueError, match="non-integer"):
+        normalize_member(("192.0.2.1", "http"))
+    with pytest.raises(ValueError):
+        normalize_member(80)
+    member = Member.from_json({"id": 7, "address": "192.0.2.1", "port": 80})
+    assert normalize_member(member)["weight"] == 1
+
+
+def test_plan_members_minimal_diff():
+    desired = [("192.0.2.1", 80), ("192.0.2.2", 80, 3), ("192.0.2.9", 80)]
+    plan = plan_members(CURRENT, desired)
+    assert plan.unchanged == 1
+    assert [m["address"] for m in plan.adds] == ["192.0.2.9"]
+    assert [(c["id"], d["weight"]) for c, d in plan.replaces] == [(2, 3)]
+    assert sorted(m["id"] for m in plan.removes) == [3, 4]
+
+
+def test_plan_members_rejects_duplicates():
+    with pytest.raises(ValueError, match="listed twice"):
+        plan_members([], [("192.0.2.1", 80), ("192.0.2.1", 80, 2)])
+
+
+def test_add_members_is_concurrent_and_reports_failures():
+    client = Mock(spec=LoadBalancerClient)
+    barrier = threading.Barrier(4, timeout=5)
+
+    def add_member(lb_id, pool_id, address, port, weight):
+        barrier.wait()
+        if address == "192.0.2.3":
+            raise RuntimeError("quota exceeded")
+        return {"id": port, "address": address, "port": port, "weight": weight}
+
+    client.add_member.side_effect = add_member
+    members = [(f"192.0.2.{i}", 8000 + i) for i in range(4)]
+    result = add_members(client, 1, 2, members, max_workers=4)
+
+    assert not result.ok
+    assert result.failed == [("192.0.2.3:8003", "quota exceeded")]
+    assert sorted(m["port"] for m in result.added) == [8000, 8001, 8002]
+
+
+def test_add_members_reports_invalid_entries_and_adds_the_rest():
+    client = Mock(spec=LoadBalancerClient)
+    client.add_member.side_effect = lambda lb_id, pool_id, address, port, weight: {
+        "address": address,
+        "port": port,
+    }
+    members = [("192.0.2.1", 80), ("192.0.2.2",), ("192.0.2.3", "http"), None]
+    result = add_members(client, 1, 2, members)
+
+    assert [m["address"] for m in result.added] == ["192.0.2.1"]
+    assert [label for label, _ in result.failed] == [
+        "('192.0.2.2',)",
+        "('192.0.2.3', 'http')",
+        "None",
+    ]
+    assert "non-integer" in result.failed[1][1]
+
+
+def test_set_members_applies_only_the_delta():
+    client = Mock(spec=LoadBalancerClient)
+    client.list_members.return_value = CURRENT
+    client.add_member.side_effect = lambda *args: {"id": 10}
+    desired = [("192.0.2.1", 80), ("192.0.2.2", 80, 3), ("2001:db8::1", 80)]
+
+    result = set_members(client, 1, 2, desired)
+
+    assert result.ok
+    assert len(result.added) == 2
+    assert result.removed == 2
+    assert sorted(call.args[2] for call in client.remove_member.call_args_list) == [
+        2,
+        3,
+        4,
+    ]
+    client.add_member.assert_any_call(1, 2, "2001:db8::1", 80, 1)
+
+
+def test_set_members_unchanged_costs_one_call():
+    client = Mock(spec=LoadBalancerClient)
+    client.list_members.return_value = CURRENT[:3]
+    desired = [(m["address"], m["port"]) for m in CURRENT[:3]]
+    result = set_members(client, 1, 2, desired)
+    assert result.plan.empty
+    client.add_member.assert_not_called()
+    client.remove_member.assert_not_called()
+
+
+def test_set_members_keeps_pool_when_additions_fail():
+    client = Mock(spec=LoadBalancerClient)
+    client.list_members.return_value = CURRENT[:3]
+    client.add_member.side_effect = RuntimeError("quota exceeded")
+    desired = [("192.0.2.8", 80), ("192.0.2.9", 80), ("192.0.2.2", 80, 3)]
+
+    result = set_members(client, 1, 2, desired)
+
+    client.remove_member.assert_not_called()
+    assert result.removed == 0
+    assert sorted(result.failed) == [
+        ("192.0.2.1:80", "Skipped because an addition failed"),
+        ("192.0.2.2:80", "Skipped because an addition failed"),
+        ("192.0.2.3:80", "Skipped because an addition failed"),
+        ("192.0.2.8:80", "quota exceeded"),
+        ("192.0.2.9:80", "quota exceeded"),
+    ]
+
+
+def test_removals_wait_for_additions():
+    client = Mock(spec=LoadBalancerClient)
+    client.list_members.return_value = CURRENT[:1]
+    calls = []
+    client.add_member.side_effect = lambda *args: calls.append("add") or {"id": 9}
+    client.remove_member.side_effect = lambda *args: calls.append("remove")
+
+    result = set_members(client, 1, 2, [("192.0.2.9", 80)])
+
+    assert result.ok
+    assert calls == ["add", "remove"]
+
+
+def test_failed_replacement_is_reported_as_lost():
+    client = Mock(spec=LoadBalancerClient)
+    client.list_members.return_value = CURRENT[:1]
+    client.add_member.side_effect = RuntimeError("backend rejected")
+
+    result = set_members(client, 1, 2, [("192.0.2.1", 80, 5)])
+
+    client.remove_member.assert_called_once_with(1, 2, 1)
+    assert result.lost == ["192.0.2.1:80"]
+    assert result.failed == [
+        ("192.0.2.1:80", "Removed, but adding it back failed: backend rejected")
+    ]
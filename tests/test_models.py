@@ -0,0 +1,127 @@
+import copy
+import json
+import pickle
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+from gcore_api.auth import GcoreAuth
+from gcore_api.dns import DNSClient
+from gcore_api.models import LoadBalancer, Record, StorageObject
+from gcore_api.storage import StorageClient
+from gcore_api.transport import Transport
+from gcore_api.zone import plan_zone
+
+
+@pytest.fixture
+def mock_auth():
+    auth = Mock(spec=GcoreAuth)
+    auth.get_headers.return_value = {"Authorization": "Bearer test-token"}
+    return auth
+
+
+def test_from_json_fields():
+    record = Record.from_json(
+        {"id": 1, "name": "www", "type": "A", "content": "192.0.2.1", "ttl": 300}
+    )
+    assert (record.id, record.name, record.type, record.ttl) == (1, "www", "A", 300)
+    assert not hasattr(record, "__dict__")
+
+
+def test_missing_field_is_none_but_not_a_key():
+    record = Record.from_json({"id": 1, "name": "www", "type": "A"})
+    assert record.ttl is None
+    assert "ttl" not in record
+    assert record.get("ttl", 3600) == 3600
+    with pytest.raises(KeyError):
+        record["ttl"]
+
+
+def test_extra_fields_are_kept_lazily():
+    record = Record.from_json({"id": 1, "name": "www", "type": "A"})
+    assert record._extra is None
+
+    record = Record.from_json({"id": 1, "name": "www", "meta": {"note": "x"}})
+    assert record.meta == {"note": "x"}
+    assert record["meta"] == {"note": "x"}
+    assert list(record) == ["id", "name", "meta"]
+    with pytest.raises(AttributeError):
+        record.unknown
+
+
+def test_round_trip_and_equality():
+    data = {"id": 7, "name": "www", "type": "AAAA", "content": ["2001:db8::1"]}
+    record = Record.from_json(json.loads(json.dumps(data)))
+    assert record.to_dict() == data
+    assert record == data
+    assert json.dumps(record.to_dict()) == json.dumps(data)
+    assert pickle.loads(pickle.dumps(record)) == record
+    assert copy.deepcopy(record) == record
+
+
+def test_keyword_construction():
+    lb = LoadBalancer(id=1, name="edge", region="ed-1", tier="gold")
+    assert lb.region == "ed-1"
+    assert lb.status is None
+    assert lb.tier == "gold"
+
+
+def test_low_cardinality_values_are_interned():
+    records = Record.from_json_list(
+        json.loads('[{"type": "CNAME"}, {"type": "CNAME"}]')
+    )
+    assert records[0].type is records[1].type
+
+
+def test_models_are_read_only():
+    record = Record.from_json({"id": 1, "name": "www", "meta": {"note": "x"}})
+    with pytest.raises(AttributeError, match="read-only"):
+        record.name = "other"
+    with pytest.raises(AttributeError, match="read-only"):
+        record.meta = None
+    with pytest.raises(AttributeError, match="read-only"):
+        del record.id
+    assert record.to_dict() == {"id": 1, "name": "www", "meta": {"note": "x"}}
+
+
+def test_smaller_than_dict():
+    data = {"name": "a/b.txt", "size": 1, "etag": "abc", "last_modified": "x"}
+    assert sys.getsizeof(StorageObject.from_json(data)) < sys.getsizeof(data) / 2
+
+
+def test_plan_zone_accepts_models():
+    current = Record.from_json_list(
+        [
+            {"id": 1, "name": "www", "type": "A", "content": "192.0.2.1", "ttl": 300},
+            {"id": 2, "name": "old", "type": "A", "content": "192.0.2.9", "ttl": 300},
+        ]
+    )
+    desired = [{"name": "www", "type": "A", "content": "192.0.2.2", "ttl": 300}]
+    plan = plan_zone(current, desired)
+    assert [record_id for record_id, _ in plan.updates] == [1]
+    assert [record["id"] for record in plan.deletes] == [2]
+
+
+def test_list_records_typed(mock_auth):
+    client = DNSClient(mock_auth, transport=Transport())
+    with patch("gcore_api.transport.Transport.get") as mock_get:
+        mock_get.return_value.json.return_value = [
+            {"id": 1, "name": "www", "type": "A", "content": "192.0.2.1"}
+        ]
+        records = client.list_records(1, typed=True)
+    assert isinstance(records[0], Record)
+    assert records[0].content == "192.0.2.1"
+
+
+def test_list_objects_typed(mock_auth):
+    client = StorageClient(mock_auth, transport=Transport())
+    with patch("gcore_api.transport.Transport.get") as mock_get:
+        mock_get.return_value.json.return_value = {
+            "objects": [{"name": "a.txt", "size": 3}],
+            "truncated": False,
+        }
+        body = client.list_objects("bucket", typed=True)
+    assert body["truncated"] is False
+    assert isinstance(body["objects"][0], StorageObject)
+    assert body["objects"][0].size == 3
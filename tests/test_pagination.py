@@ -0,0 +1,77 @@
+from unittest.mock import Mock
+
+import pytest
+
+from gcore_api.pagination import iter_items, iter_pages
+
+
+def make_transport(total, items_key=None, max_limit=None):
+    transport = Mock()
+
+    def get(url, headers=None, params=None):
+        offset, limit = params["offset"], min(params["limit"], max_limit or total)
+        items = [{"id": i} for i in range(offset, min(offset + limit, total))]
+        response = Mock()
+        response.json.return_value = {items_key: items} if items_key else items
+        return response
+
+    transport.get.side_effect = get
+    return transport
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_iter_items_follows_offsets(prefetch):
+    transport = make_transport(25)
+    items = list(iter_items(transport, "url", dict, page_size=10, prefetch=prefetch))
+    assert [item["id"] for item in items] == list(range(25))
+    offsets = [c.kwargs["params"]["offset"] for c in transport.get.call_args_list]
+    assert offsets == [0, 10, 20, 25]
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_iter_items_continues_past_capped_pages(prefetch):
+    transport = make_transport(25, max_limit=7)
+    items = list(iter_items(transport, "url", dict, page_size=10, prefetch=prefetch))
+    assert [item["id"] for item in items] == list(range(25))
+    offsets = [c.kwargs["params"]["offset"] for c in transport.get.call_args_list]
+    assert offsets == [0, 7, 14, 21, 25]
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_iter_pages_stops_when_offset_is_ignored(prefetch):
+    transport = Mock()
+    transport.get.return_value.json.return_value = [{"id": 1}, {"id": 2}]
+    pages = list(iter_pages(transport, "url", dict, page_size=10, prefetch=prefetch))
+    assert pages == [[{"id": 1}, {"id": 2}]]
+    assert transport.get.call_count == 2
+
+
+def test_iter_pages_items_key_and_extra_params():
+    transport = make_transport(4, items_key="objects")
+    pages = list(
+        iter_pages(
+            transport,
+            "url",
+            dict,
+            params={"prefix": "logs/"},
+            page_size=2,
+            items_key="objects",
+        )
+    )
+    assert [len(page) for page in pages] == [2, 2]
+    assert transport.get.call_args.kwargs["params"]["prefix"] == "logs/"
+
+
+def test_iter_items_is_lazy():
+    transport = make_transport(1000)
+    iterator = iter_items(transport, "url", dict, page_size=10, prefetch=False)
+    assert transport.get.call_count == 0
+    next(iterator)
+    assert transport.get.call_count == 1
+    iterator.close()
+
+
+def test_iter_items_default_results_key():
+    transport = Mock()
+    transport.get.return_value.json.return_value = {"count": 1, "results": [{"id": 1}]}
+    assert list(iter_items(transport, "url", dict)) == [{"id": 1}]
@@ -0,0 +1,151 @@
+import asyncio
+import threading
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from gcore_api.cdn import CDNClient
+from gcore_api.purge import (
+    AsyncPurgeWaiter,
+    PurgeWaiter,
+    batch_purge,
+    chunk_evenly,
+    coalesce_urls,
+)
+
+
+def test_coalesce_urls_dedupes_and_collapses_directories():
+    urls = [f"https://example.com/img/{i}.jpg" for i in range(3)]
+    urls += ["https://example.com/img/0.jpg", "https://example.com/index.html#top"]
+    urls += ["https://example.com/index.html"]
+
+    remaining, paths = coalesce_urls(urls, wildcard_threshold=3)
+    assert remaining == ["https://example.com/index.html"]
+    assert paths == ["/img/*"]
+
+
+def test_coalesce_urls_without_wildcards():
+    urls = ["https://example.com/a", "https://example.com/a", "https://example.com/b"]
+    assert coalesce_urls(urls, wildcard_threshold=0) == (
+        ["https://example.com/a", "https://example.com/b"],
+        [],
+    )
+
+
+def test_chunk_evenly():
+    chunks = chunk_evenly([str(i) for i in range(201)], 100)
+    assert [len(c) for c in chunks] == [67, 67, 67]
+    assert chunk_evenly([], 100) == []
+
+
+def test_batch_purge_aggregates_tasks():
+    client = Mock(spec=CDNClient)
+    counter = iter(range(1000))
+    lock = threading.Lock()
+
+    def purge(resource_id, items):
+        with lock:
+            return {"task_id": f"task-{next(counter)}"}
+
+    client.purge_url.side_effect = purge
+    client.purge_paths.side_effect = purge
+    urls = [f"https://example.com/a/{i}" for i in range(250)]
+    urls += [f"https://example.com/b{i}/x" for i in range(150)]
+
+    batch = batch_purge(
+        client, 1, urls, chunk_size=100, wildcard_threshold=200, rate=None
+    )
+
+    assert batch.ok
+    assert (batch.url_count, batch.path_count) == (150, 1)
+    assert client.purge_url.call_count == 2
+    client.purge_paths.assert_called_once_with(1, ["/a/*"])
+    assert len(batch.tasks) == 3
+    assert all(resource_id == 1 for resource_id, _ in batch.tasks)
+
+
+def test_batch_purge_records_failed_chunks():
+    client = Mock(spec=CDNClient)
+    client.purge_url.side_effect = [{"task_id": "t1"}, RuntimeError("429")]
+    urls = [f"https://example.com/{i}" for i in range(4)]
+
+    batch = batch_purge(client, 1, urls, chunk_size=2, max_workers=1, rate=None)
+
+    assert batch.task_ids == ["t1"]
+    assert not batch.ok
+    assert batch.failed[0][1] == "429"
+
+
+def make_status_client(sequences):
+    client = Mock(spec=CDNClient)
+    iterators = {task: iter(statuses) for task, statuses in sequences.items()}
+    lock = threading.Lock()
+
+    def get_purge_status(resource_id, task_id):
+        with lock:
+            status = next(iterators[(resource_id, task_id)])
+        if isinstance(status, Exception):
+            raise status
+        return status
+
+    client.get_purge_status.side_effect = get_purge_status
+    return client
+
+
+def test_purge_waiter_yields_tasks_as_they_finish():
+    client = make_status_client(
+        {
+            (1, "slow"): [{"status": "pending", "progress": p} for p in (10, 50, 90)]
+            + [{"status": "completed"}],
+            (1, "fast"): [{"status": "completed"}],
+        }
+    )
+    waiter = PurgeWaiter(
+        client, [(1, "slow"), (1, "fast"), (1, "fast")], initial_interval=0.001
+    )
+    order = [task for task, _ in waiter.iter_completed(timeout=5)]
+
+    assert order == [(1, "fast"), (1, "slow")]
+    assert client.get_purge_status.call_count == 5
+
+
+def test_purge_waiter_wait_with_callback_and_errors():
+    client = make_status_client(
+        {(1, "t"): [RuntimeError("502"), {"status": "failed", "reason": "x"}]}
+    )
+    seen = []
+    results = PurgeWaiter(client, [(1, "t")], initial_interval=0.001).wait(
+        callback=lambda task, status: seen.append(task)
+    )
+    assert results == {(1, "t"): {"status": "failed", "reason": "x"}}
+    assert seen == [(1, "t")]
+
+
+def test_purge_waiter_gives_up_after_repeated_errors():
+    client = make_status_client({(1, "t"): [RuntimeError("502")] * 10})
+    results = PurgeWaiter(client, [(1, "t")], initial_interval=0.001).wait()
+    assert results[(1, "t")] == {"status": "error", "error": "502"}
+
+
+def test_purge_waiter_timeout():
+    client = make_status_client({(1, "t"): [{"status": "pending"}] * 100})
+    waiter = PurgeWaiter(client, [(1, "t")], initial_interval=0.05)
+    with pytest.raises(TimeoutError):
+        waiter.wait(timeout=0.01)
+
+
+def test_async_purge_waiter():
+    client = Mock()
+    statuses = {
+        "a": iter([{"status": "pending"}, {"status": "completed"}]),
+        "b": iter([{"status": "completed"}]),
+    }
+    client.get_purge_status = AsyncMock(
+        side_effect=lambda resource_id, task_id: next(statuses[task_id])
+    )
+
+    async def collect():
+        waiter = AsyncPurgeWaiter(client, [(1, "a"), (1, "b")], initial_interval=0.001)
+        return [task async for task, _ in waiter]
+
+    assert asyncio.run(collect()) == [(1, "b"), (1, "a")]
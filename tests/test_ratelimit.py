@@ -0,0 +1,86 @@
+import multiprocessing
+from unittest.mock import Mock, patch
+
+import pytest
+
+from gcore_api.ratelimit import (
+    FileTokenBucket,
+    RateLimiter,
+    TokenBucket,
+    service_for,
+)
+from gcore_api.transport import Transport
+
+
+def test_token_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=10, burst=3)
+    waits = [bucket.reserve() for _ in range(5)]
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(0.1, abs=0.01)
+    assert waits[4] == pytest.approx(0.2, abs=0.01)
+
+
+def test_service_for():
+    assert service_for("https://api.gcore.com/cdn/v1/resources") == "cdn"
+    assert service_for("https://api.gcore.com/dns/v2/zones/1") == "dns"
+    assert service_for("https://api.gcore.com/") == "*"
+
+
+def test_rate_limiter_uses_per_service_buckets():
+    limiter = RateLimiter({"cdn": 1, "*": 1})
+    assert limiter.reserve("https://api.gcore.com/cdn/v1/a") == 0.0
+    assert limiter.reserve("https://api.gcore.com/dns/v2/a") == 0.0
+    assert limiter.reserve("https://api.gcore.com/cdn/v1/b") > 0.9
+    assert limiter.reserve("https://api.gcore.com/ssl/v1/a") > 0.9
+    assert limiter.metrics["throttled.cdn"] == 1
+    assert limiter.metrics["throttled.ssl"] == 1
+
+
+def test_rate_limiter_unlimited_services():
+    limiter = RateLimiter({"cdn": 1})
+    assert all(
+        limiter.reserve("https://api.gcore.com/dns/v2/a") == 0.0 for _ in range(10)
+    )
+
+
+def test_rate_limiter_from_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("GCORE_RATE_LIMIT", raising=False)
+    assert RateLimiter.from_env() is None
+
+    monkeypatch.setenv("GCORE_RATE_LIMIT", "cdn=5, dns=10")
+    monkeypatch.setenv("GCORE_RATE_LIMIT_DIR", str(tmp_path))
+    limiter = RateLimiter.from_env()
+    assert limiter.limits == {"cdn": 5.0, "dns": 10.0}
+    assert limiter.lock_dir == tmp_path
+
+    monkeypatch.setenv("GCORE_RATE_LIMIT", "20")
+    assert RateLimiter.from_env().limits == {"*": 20.0}
+
+
+def _reserve_many(path, count, queue):
+    bucket = FileTokenBucket(path, rate=1)
+    queue.put([bucket.reserve() for _ in range(count)])
+
+
+def test_file_token_bucket_shared_across_processes(tmp_path):
+    path = tmp_path / "cdn.bucket"
+    queue = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=_reserve_many, args=(path, 5, queue))
+        for _ in range(2)
+    ]
+    for worker in workers:
+        worker.start()
+    waits = sorted(queue.get(timeout=10) + queue.get(timeout=10))
+    for worker in workers:
+        worker.join()
+    # Ten reservations at 1/s get one slot each, whichever process made them.
+    assert waits == pytest.approx(list(range(10)), abs=0.5)
+
+
+def test_transport_applies_rate_limiter():
+    limiter = Mock(spec=RateLimiter)
+    transport = Transport(rate_limiter=limiter)
+    with patch.object(transport.session, "request"):
+        transport.get("https://api.gcore.com/cdn/v1/resources")
+    limiter.acquire.assert_called_once_with("https://api.gcore.com/cdn/v1/resources")
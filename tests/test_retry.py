@@ -0,0 +1,126 @@
+import asyncio
+import io
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+import requests
+
+from gcore_api.retry import RetryBudget, RetryPolicy, is_resendable, parse_retry_after
+from gcore_api.transport import AsyncTransport, Transport
+
+
+def response(status, headers=None):
+    resp = Mock()
+    resp.status_code = status
+    resp.headers = headers or {}
+    return resp
+
+
+@pytest.fixture
+def no_sleep():
+    with patch("gcore_api.transport.time.sleep") as mock_sleep:
+        yield mock_sleep
+
+
+def test_should_retry_idempotent_statuses():
+    policy = RetryPolicy()
+    assert policy.should_retry("GET", 0, status=503)
+    assert not policy.should_retry("POST", 0, status=503)
+    assert policy.should_retry("POST", 0, status=429)
+    assert not policy.should_retry("GET", 0, status=404)
+    assert not policy.should_retry("GET", 3, status=503)
+    assert policy.metrics["retries.503"] == 1
+    assert policy.metrics["exhausted"] == 1
+
+
+def test_retry_budget_caps_retries():
+    policy = RetryPolicy(budget=RetryBudget(ratio=0.0, min_tokens=2))
+    results = [policy.should_retry("GET", 0, status=502) for _ in range(4)]
+    assert results == [True, True, False, False]
+    assert policy.metrics["budget_exhausted"] == 2
+
+
+def test_delay_honors_retry_after_and_caps_backoff():
+    policy = RetryPolicy(backoff_factor=1.0, max_backoff=4.0, max_retry_after=10)
+    assert policy.delay(0, {"Retry-After": "7"}) == 7
+    assert policy.delay(0, {"Retry-After": "3600"}) == 10
+    assert all(0 <= policy.delay(10) <= 4.0 for _ in range(20))
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_is_resendable():
+    assert is_resendable(None, None)
+    assert is_resendable(b"data", None)
+    assert is_resendable(io.BytesIO(b"data"), 0)
+    assert not is_resendable(iter([b"data"]), None)
+
+
+def test_transport_retries_then_succeeds(no_sleep):
+    transport = Transport()
+    with patch.object(transport.session, "request") as mock_request:
+        mock_request.side_effect = [
+            response(503),
+            requests.ConnectionError("reset"),
+            response(200),
+        ]
+        result = transport.get("https://api.gcore.com/cdn/v1/resources")
+    assert result.status_code == 200
+    assert mock_request.call_count == 3
+    assert no_sleep.call_count == 2
+    assert transport.retry.metrics["retries"] == 2
+
+
+def test_transport_honors_retry_after(no_sleep):
+    transport = Transport()
+    with patch.object(transport.session, "request") as mock_request:
+        mock_request.side_effect = [response(429, {"Retry-After": "5"}), response(201)]
+        result = transport.post("https://api.gcore.com/dns/v2/zones", json={})
+    assert result.status_code == 201
+    no_sleep.assert_called_once_with(5.0)
+
+
+def test_transport_rewinds_file_body(no_sleep):
+    transport = Transport()
+    body = io.BytesIO(b"payload")
+    sent = []
+
+    def fake_request(method, url, **kwargs):
+        sent.append(kwargs["data"].read())
+        return response(502 if len(sent) == 1 else 200)
+
+    with patch.object(transport.session, "request", side_effect=fake_request):
+        transport.put("https://api.gcore.com/storage/v1/x", data=body)
+    assert sent == [b"payload", b"payload"]
+
+
+def test_transport_without_retry_returns_failure(no_sleep):
+    transport = Transport(retry=None)
+    with patch.object(transport.session, "request", return_value=response(503)):
+        assert transport.get("https://api.gcore.com/x").status_code == 503
+    no_sleep.assert_not_called()
+
+
+def test_async_transport_retries():
+    transport = AsyncTransport()
+
+    async def run():
+        with (
+            patch.object(
+                transport.client, "request", new_callable=AsyncMock
+            ) as mock_request,
+            patch("gcore_api.transport.asyncio.sleep", new=AsyncMock()),
+        ):
+            failed = response(500)
+            failed.aclose = AsyncMock()
+            mock_request.side_effect = [failed, response(200)]
+            result = await transport.get("https://api.gcore.com/x")
+            assert mock_request.call_count == 2
+            return result
+
+    assert asyncio.run(run()).status_code == 200
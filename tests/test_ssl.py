@@ -1,9 +1,11 @@
-from unittest.mock import Mock, patch
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
 from gcore_api.auth import GcoreAuth
-from gcore_api.ssl import SSLClient
+from gcore_api.ssl import AsyncSSLClient, SSLClient
+from gcore_api.transport import AsyncTransport, Transport
 
 
 @pytest.fixture
@@ -15,11 +17,16 @@ def mock_auth():
 
 @pytest.fixture
 def ssl_client(mock_auth):
-    return SSLClient(mock_auth)
+    return SSLClient(mock_auth, transport=Transport())
+
+
+@pytest.fixture
+def async_ssl_client(mock_auth):
+    return AsyncSSLClient(mock_auth, transport=AsyncTransport())
 
 
 def test_list_certificates(ssl_client):
-    with patch("requests.get") as mock_get:
+    with patch("gcore_api.transport.Transport.get") as mock_get:
         mock_get.return_value.json.return_value = [
             {
                 "id": 1,
@@ -36,7 +43,7 @@ def test_list_certificates(ssl_client):
 
 
 def test_upload_certificate(ssl_client):
-    with patch("requests.post") as mock_post:
+    with patch("gcore_api.transport.Transport.post") as mock_post:
         mock_post.return_value.json.return_value = {
             "id": 1,
             "name": "custom-cert",
@@ -51,7 +58,7 @@ def test_upload_certificate(ssl_client):
 
 
 def test_request_certificate(ssl_client):
-    with patch("requests.post") as mock_post:
+    with patch("gcore_api.transport.Transport.post") as mock_post:
         mock_post.return_value.json.return_value = {
             "id": 1,
             "status": "pending_validation",
@@ -66,7 +73,7 @@ def test_request_certificate(ssl_client):
 
 
 def test_get_validation_status(ssl_client):
-    with patch("requests.get") as mock_get:
+    with patch("gcore_api.transport.Transport.get") as mock_get:
         mock_get.return_value.json.return_value = {
             "status": "pending",
             "domains": [
@@ -87,3 +94,13 @@ def test_get_validation_status(ssl_client):
         assert status["status"] == "pending"
         assert len(status["domains"]) == 1
         assert status["domains"][0]["name"] == "example.com"
+
+
+def test_async_get_validation_status(async_ssl_client):
+    with patch(
+        "gcore_api.transport.AsyncTransport.get", new_callable=AsyncMock
+    ) as mock_get:
+        mock_get.return_value = Mock()
+        mock_get.return_value.json.return_value = {"status": "pending"}
+        status = asyncio.run(async_ssl_client.get_validation_status(1))
+        assert status["status"] == "pending"
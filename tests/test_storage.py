@@ -1,9 +1,11 @@
-from unittest.mock import Mock, patch
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
 from gcore_api.auth import GcoreAuth
-from gcore_api.storage import StorageClient
+from gcore_api.storage import AsyncStorageClient, StorageClient
+from gcore_api.transport import AsyncTransport, Transport
 
 
 @pytest.fixture
@@ -15,11 +17,16 @@ def mock_auth():
 
 @pytest.fixture
 def storage_client(mock_auth):
-    return StorageClient(mock_auth)
+    return StorageClient(mock_auth, transport=Transport())
+
+
+@pytest.fixture
+def async_storage_client(mock_auth):
+    return AsyncStorageClient(mock_auth, transport=AsyncTransport())
 
 
 def test_list_buckets(storage_client):
-    with patch("requests.get") as mock_get:
+    with patch("gcore_api.transport.Transport.get") as mock_get:
         mock_get.return_value.json.return_value = [
             {"name": "test-bucket", "location": "eu-north-1", "access": "private"}
         ]
@@ -30,7 +37,7 @@ def test_list_buckets(storage_client):
 
 
 def test_create_bucket(storage_client):
-    with patch("requests.post") as mock_post:
+    with patch("gcore_api.transport.Transport.post") as mock_post:
         mock_post.return_value.json.return_value = {
             "name": "new-bucket",
             "location": "eu-north-1",
@@ -42,7 +49,7 @@ def test_create_bucket(storage_client):
 
 
 def test_list_objects(storage_client):
-    with patch("requests.get") as mock_get:
+    with patch("gcore_api.transport.Transport.get") as mock_get:
         mock_get.return_value.json.return_value = {
             "objects": [
                 {
@@ -58,12 +65,113 @@ def test_list_objects(storage_client):
         assert result["objects"][0]["size"] == 1024
 
 
-@patch("builtins.open")
+def test_iter_objects(storage_client):
+    pages = [
+        {"objects": [{"name": "a.txt"}, {"name": "b.txt"}]},
+        {"objects": [{"name": "c.txt"}]},
+        {"objects": []},
+    ]
+    with patch("gcore_api.transport.Transport.get") as mock_get:
+        mock_get.return_value.json.side_effect = pages
+        objects = storage_client.iter_objects("test-bucket", prefix="a", page_size=2)
+        assert [o["name"] for o in objects] == ["a.txt", "b.txt", "c.txt"]
+        assert mock_get.call_count == 3
+        assert mock_get.call_args.kwargs["params"] == {
+            "prefix": "a",
+            "limit": 2,
+            "offset": 3,
+        }
+
+
+@patch("gcore_api.storage.open", create=True)
 def test_upload_object(mock_open, storage_client):
-    with patch("requests.put") as mock_put:
+    with patch("gcore_api.transport.Transport.put") as mock_put:
         mock_put.return_value.json.return_value = {"name": "test.txt", "size": 1024}
         result = storage_client.upload_object(
             "test-bucket", "test.txt", "local/test.txt"
         )
         assert result["name"] == "test.txt"
         assert result["size"] == 1024
+
+
+def test_async_list_buckets(async_storage_client):
+    with patch(
+        "gcore_api.transport.AsyncTransport.get", new_callable=AsyncMock
+    ) as mock_get:
+        mock_get.return_value = Mock()
+        mock_get.return_value.json.return_value = [{"name": "test-bucket"}]
+        buckets = asyncio.run(async_storage_client.list_buckets())
+        assert buckets[0]["name"] == "test-bucket"
+
+
+def test_async_download_object(async_storage_client, tmp_path):
+    async def fake_stream(*args, **kwargs):
+        for chunk in (b"hello ", b"world"):
+            yield chunk
+
+    target = tmp_path / "test.txt"
+    with patch("gcore_api.transport.AsyncTransport.stream", fake_stream):
+        asyncio.run(
+            async_storage_client.download_object("test-bucket", "test.txt", str(target))
+        )
+    assert target.read_bytes() == b"hello world"
+
+
+def test_async_download_object_failure_keeps_file(async_storage_client, tmp_path):
+    async def failing_stream(*args, **kwargs):
+        yield b"partial"
+        raise RuntimeError("404")
+
+    target = tmp_path / "test.txt"
+    target.write_bytes(b"previous")
+    with patch("gcore_api.transport.AsyncTransport.stream", failing_stream):
+        with pytest.raises(RuntimeError):
+            asyncio.run(
+                async_storage_client.download_object(
+                    "test-bucket", "test.txt", str(target)
+                )
+            )
+    assert target.read_bytes() == b"previous"
+    assert [p.name for p in tmp_path.iterdir()] == ["test.txt"]
+
+
+def test_async_download_object_error_survives_missing_temp_file(
+    async_storage_client, tmp_path
+):
+    async def failing_stream(*args, **kwargs):
+        for tmp in tmp_path.glob("*.tmp"):
+            tmp.unlink()
+        raise RuntimeError("404")
+        yield b""
+
+    target = tmp_path / "test.txt"
+    with patch("gcore_api.transport.AsyncTransport.stream", failing_stream):
+        with pytest.raises(RuntimeError, match="404"):
+            asyncio.run(
+                async_storage_client.download_object(
+                    "test-bucket", "test.txt", str(target)
+                )
+            )
+
+
+def test_upload_object_multipart(storage_client, tmp_path):
+    source = tmp_path / "big.bin"
+    source.write_bytes(b"x" * 2500)
+    with patch("gcore_api.storage.MultipartUpload") as mock_upload:
+        mock_upload.return_value.run.return_value = {"name": "big.bin"}
+        result = storage_client.upload_object(
+            "test-bucket", "big.bin", str(source), part_size=1000, max_workers=8
+        )
+        assert result["name"] == "big.bin"
+        assert mock_upload.call_args.kwargs == {"part_size": 1000, "max_workers": 8}
+
+
+def test_download_object_ranged(storage_client, tmp_path):
+    target = tmp_path / "big.bin"
+    with patch("gcore_api.storage.RangedDownload") as mock_download:
+        storage_client.download_object(
+            "test-bucket", "big.bin", str(target), segment_size=1000, checksum="abc"
+        )
+        mock_download.return_value.run.assert_called_once_with()
+        assert mock_download.call_args.kwargs["segment_size"] == 1000
+        assert mock_download.call_args.kwargs["checksum"] == "abc"
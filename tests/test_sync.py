@@ -0,0 +1,100 @@
+import os
+from unittest.mock import Mock
+
+import pytest
+
+from gcore_api.storage import StorageClient
+from gcore_api.sync import LocalFile, plan_sync, scan_local, sync_directory
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / "css").mkdir()
+    (tmp_path / "index.html").write_bytes(b"<html></html>")
+    (tmp_path / "css" / "site.css").write_bytes(b"body {}")
+    return tmp_path
+
+
+def remote(name, size, last_modified="2100-01-01T00:00:00Z", **extra):
+    return {"name": name, "size": size, "last_modified": last_modified, **extra}
+
+
+def test_scan_local_names_under_prefix(tree):
+    files = sorted(scan_local(str(tree), prefix="site/"), key=lambda f: f.name)
+    assert [f.name for f in files] == ["site/css/site.css", "site/index.html"]
+    assert files[1].size == 13
+
+
+def test_plan_sync_uploads_only_changes():
+    local = [
+        LocalFile("/a", "same.txt", 3, 0.0),
+        LocalFile("/b", "resized.txt", 5, 0.0),
+        LocalFile("/c", "new.txt", 1, 0.0),
+        LocalFile("/d", "newer.txt", 3, 4102444800.0 + 60),
+    ]
+    objects = [
+        remote("same.txt", 3),
+        remote("resized.txt", 4),
+        remote("newer.txt", 3),
+        remote("orphan.txt", 1),
+    ]
+    plan = plan_sync(local, objects, delete=True)
+    assert sorted(f.name for f in plan.uploads) == [
+        "new.txt",
+        "newer.txt",
+        "resized.txt",
+    ]
+    assert plan.unchanged == 1
+    assert plan.deletes == ["orphan.txt"]
+
+
+def test_plan_sync_checksum_compares_etag(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"abc")
+    local = [LocalFile(str(path), "a.txt", 3, 4102444800.0 + 60)]
+    md5 = "900150983cd24fb0d6963f7d28e17f72"
+    assert (
+        plan_sync(local, [remote("a.txt", 3, etag=f'"{md5}"')], checksum=True).unchanged
+        == 1
+    )
+    assert (
+        len(
+            plan_sync(local, [remote("a.txt", 3, etag="0" * 32)], checksum=True).uploads
+        )
+        == 1
+    )
+
+
+def test_sync_directory(tree):
+    client = Mock(spec=StorageClient)
+    client.iter_objects.return_value = [
+        remote("site/index.html", 13),
+        remote("site/old.js", 10),
+    ]
+    report = sync_directory(client, str(tree), "bucket", prefix="site", delete=True)
+
+    client.iter_objects.assert_called_once_with("bucket", prefix="site/")
+    client.upload_object.assert_called_once_with(
+        "bucket", "site/css/site.css", os.path.join(str(tree), "css", "site.css")
+    )
+    client.delete_object.assert_called_once_with("bucket", "site/old.js")
+    assert (report.uploaded, report.uploaded_bytes, report.deleted) == (1, 7, 1)
+    assert report.unchanged == 1
+    assert report.elapsed > 0
+
+
+def test_sync_directory_records_failures(tree):
+    client = Mock(spec=StorageClient)
+    client.iter_objects.return_value = []
+    client.upload_object.side_effect = OSError("boom")
+    report = sync_directory(client, str(tree), "bucket")
+    assert report.uploaded == 0
+    assert sorted(name for name, _ in report.failed) == ["css/site.css", "index.html"]
+
+
+def test_sync_directory_dry_run(tree):
+    client = Mock(spec=StorageClient)
+    client.iter_objects.return_value = []
+    report = sync_directory(client, str(tree), "bucket", dry_run=True)
+    assert report.uploaded == 2
+    client.upload_object.assert_not_called()
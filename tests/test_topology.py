@@ -0,0 +1,180 @@
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from gcore_api.loadbalancer import LoadBalancerClient
+from gcore_api.topology import (
+    TaskGraph,
+    load_topology_spec,
+    parse_topology,
+    provision_topology,
+    wait_until_active,
+)
+
+SPEC = {
+    "name": "edge",
+    "region": "ed-1",
+    "listeners": [
+        {
+            "protocol": "HTTP",
+            "port": 80,
+            "pools": [
+                {"name": "web", "members": [["10.0.0.1", 8080], ["10.0.0.2", 8080]]}
+            ],
+        },
+        {
+            "name": "tls",
+            "protocol": "HTTPS",
+            "port": 443,
+            "pools": [
+                {"name": "web", "members": [{"address": "10.0.0.3", "port": 8443}]}
+            ],
+        },
+    ],
+}
+
+DELAY = 0.05
+
+
+def fake_client(lb_status="creating", fail_pool=None):
+    client = Mock(spec=LoadBalancerClient)
+    ids = iter(range(100, 1000))
+    lock = threading.Lock()
+
+    def created(**fields):
+        time.sleep(DELAY)
+        with lock:
+            return {"id": next(ids), **fields}
+
+    client.create_load_balancer.side_effect = lambda name, region, **kw: created(
+        name=name, status=lb_status
+    )
+    client.get_load_balancer.side_effect = lambda lb_id, fresh: {
+        "id": lb_id,
+        "status": "ACTIVE",
+    }
+    client.create_listener.side_effect = lambda lb_id, protocol, port, name: created(
+        lb_id=lb_id, port=port
+    )
+
+    def create_pool(lb_id, listener_id, protocol, method, name):
+        if name == fail_pool and protocol == "HTTPS":
+            raise RuntimeError("quota exceeded")
+        return created(listener_id=listener_id, protocol=protocol)
+
+    client.create_pool.side_effect = create_pool
+    client.add_member.side_effect = lambda lb_id, pool_id, address, port, weight: (
+        created(pool_id=pool_id, address=address)
+    )
+    return client
+
+
+def test_task_graph_runs_branches_in_parallel_and_skips_failures():
+    graph = TaskGraph()
+    graph.add("root", lambda inputs: 1)
+    for branch in "abc":
+        graph.add(branch, lambda inputs: time.sleep(DELAY) or inputs["root"], ["root"])
+        graph.add(f"{branch}.leaf", lambda inputs: time.sleep(DELAY), [branch])
+    graph.add("bad", lambda inputs: 1 / 0, ["root"])
+    graph.add("bad.leaf", lambda inputs: None, ["bad"])
+
+    result = graph.run(max_workers=4)
+    assert result.results["a"] == 1
+    assert result.failed == [("bad", "division by zero")]
+    assert result.skipped == ["bad.leaf"]
+    assert result.elapsed < 4 * DELAY
+
+
+def test_task_graph_rejects_unknown_requirements():
+    graph = TaskGraph()
+    graph.add("a", lambda inputs: None)
+    with pytest.raises(ValueError):
+        graph.add("a", lambda inputs: None)
+    with pytest.raises(ValueError):
+        graph.add("b", lambda inputs: None, ["missing"])
+
+
+def test_task_graph_starts_critical_path_first():
+    started = []
+    graph = TaskGraph()
+    for i in range(3):
+        graph.add(f"short{i}", lambda inputs, i=i: started.append(f"short{i}"))
+    graph.add("long", lambda inputs: started.append("long"))
+    graph.add("long.leaf", lambda inputs: None, ["long"])
+    graph.run(max_workers=1)
+    assert started[0] == "long"
+
+
+def test_parse_topology_defaults_and_validation():
+    topology = parse_topology(SPEC)
+    listener = topology["listeners"][0]
+    assert listener["key"] == "HTTP-80"
+    assert listener["pools"][0]["protocol"] == "HTTP"
+    assert listener["pools"][0]["members"][0] == {
+        "address": "10.0.0.1",
+        "port": 8080,
+        "weight": 1,
+    }
+    with pytest.raises(ValueError, match="region"):
+        parse_topology({"name": "edge"})
+    with pytest.raises(ValueError, match="listed twice"):
+        parse_topology({**SPEC, "listeners": SPEC["listeners"][:1] * 2})
+
+
+def test_load_topology_spec(tmp_path):
+    path = tmp_path / "lb.yaml"
+    path.write_text(
+        "name: edge\nregion: ed-1\nlisteners:\n  - {protocol: TCP, port: 22}\n"
+    )
+    assert load_topology_spec(str(path))["listeners"][0]["key"] == "TCP-22"
+
+
+def test_provision_topology_follows_the_critical_path():
+    client = fake_client()
+    result = provision_topology(client, SPEC, poll_interval=0)
+
+    assert result.ok
+    assert result.load_balancer["status"] == "ACTIVE"
+    assert sorted(result.listeners) == ["HTTP-80", "tls"]
+    assert result.pools["tls/web"]["protocol"] == "HTTPS"
+    assert sorted(result.members) == [
+        "HTTP-80/web/10.0.0.1:8080",
+        "HTTP-80/web/10.0.0.2:8080",
+        "tls/web/10.0.0.3:8443",
+    ]
+    assert result.members["tls/web/10.0.0.3:8443"]["pool_id"] == (
+        result.pools["tls/web"]["id"]
+    )
+    # load balancer, listener, pool and member: four calls on the critical
+    # path instead of the nine made in sequence.
+    assert result.elapsed < 7 * DELAY
+
+
+def test_provision_topology_skips_below_a_failure():
+    client = fake_client(lb_status="active", fail_pool="web")
+    result = provision_topology(client, SPEC)
+
+    client.get_load_balancer.assert_not_called()
+    assert result.failed == [("pool:tls/web", "quota exceeded")]
+    assert result.skipped == ["member:tls/web/10.0.0.3:8443"]
+    assert len(result.members) == 2
+
+
+def test_wait_until_active():
+    client = Mock(spec=LoadBalancerClient)
+    client.get_load_balancer.side_effect = [
+        {"status": "creating"},
+        {"status": "active"},
+    ]
+    assert wait_until_active(client, 1, interval=0)["status"] == "active"
+
+    client.get_load_balancer.side_effect = None
+    client.get_load_balancer.return_value = {"status": "ERROR"}
+    with pytest.raises(RuntimeError):
+        wait_until_active(client, 1, interval=0)
+
+    client.get_load_balancer.return_value = {"status": "creating"}
+    with pytest.raises(TimeoutError):
+        wait_until_active(client, 1, timeout=0)
@@ -0,0 +1,193 @@
+import hashlib
+import io
+import json
+import os
+from unittest.mock import Mock
+
+import pytest
+
+from gcore_api.transfer import MultipartUpload, RangedDownload
+
+OBJECT_URL = "https://api.gcore.com/storage/v1/buckets/b/objects/big.bin"
+
+
+@pytest.fixture
+def transport():
+    transport = Mock()
+    transport.post.return_value.json.side_effect = lambda: {"upload_id": "up-1"}
+    uploaded = {}
+
+    def put(url, headers=None, data=None):
+        uploaded[int(url.rsplit("/", 1)[1])] = bytes(data)
+        response = Mock()
+        response.headers = {"ETag": f"etag-{url.rsplit('/', 1)[1]}"}
+        return response
+
+    transport.put.side_effect = put
+    transport.uploaded = uploaded
+    return transport
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "big.bin"
+    path.write_bytes(bytes(range(256)) * 10)
+    return str(path)
+
+
+def make_upload(transport, source, **kwargs):
+    return MultipartUpload(
+        transport, dict, OBJECT_URL, source, "application/octet-stream", **kwargs
+    )
+
+
+def test_multipart_upload_sends_all_parts(transport, source):
+    make_upload(transport, source, part_size=1000, max_workers=3).run()
+
+    assert sorted(transport.uploaded) == [1, 2, 3]
+    data = b"".join(transport.uploaded[n] for n in (1, 2, 3))
+    assert data == open(source, "rb").read()
+    complete_call = transport.post.call_args_list[-1]
+    assert complete_call.args[0] == f"{OBJECT_URL}/uploads/up-1/complete"
+    assert [p["etag"] for p in complete_call.kwargs["json"]["parts"]] == [
+        "etag-1",
+        "etag-2",
+        "etag-3",
+    ]
+
+
+def test_multipart_upload_removes_state_on_success(transport, source):
+    upload = make_upload(transport, source, part_size=1000)
+    upload.run()
+    assert not os.path.exists(upload.state_file)
+
+
+def test_multipart_upload_resumes_from_state(transport, source):
+    upload = make_upload(transport, source, part_size=1000)
+    state = {
+        **upload._fingerprint(),
+        "upload_id": "up-0",
+        "parts": {"1": "etag-old-1", "2": "etag-old-2"},
+    }
+    with open(upload.state_file, "w") as f:
+        json.dump(state, f)
+
+    upload.run()
+
+    assert sorted(transport.uploaded) == [3]
+    complete_call = transport.post.call_args_list[-1]
+    assert complete_call.args[0] == f"{OBJECT_URL}/uploads/up-0/complete"
+    assert transport.post.call_count == 1
+
+
+def test_multipart_upload_keeps_state_on_failure(transport, source):
+    transport.put.side_effect = OSError("connection reset")
+    upload = make_upload(transport, source, part_size=1000)
+    with pytest.raises(OSError):
+        upload.run()
+    with open(upload.state_file) as f:
+        assert json.load(f)["upload_id"] == "up-1"
+
+
+def test_multipart_upload_ignores_stale_state(transport, source):
+    upload = make_upload(transport, source, part_size=1000)
+    with open(upload.state_file, "w") as f:
+        json.dump({"upload_id": "up-0", "size": 1, "parts": {"1": "x"}}, f)
+    upload.run()
+    assert sorted(transport.uploaded) == [1, 2, 3]
+
+
+PAYLOAD = bytes(range(256)) * 10
+
+
+@pytest.fixture
+def download_transport():
+    transport = Mock()
+    transport.head.return_value.headers = {
+        "Content-Length": str(len(PAYLOAD)),
+        "ETag": '"v1"',
+    }
+    transport.ranges = []
+
+    def get(url, headers=None, stream=False):
+        start, end = map(int, headers["Range"][len("bytes=") :].split("-"))
+        transport.ranges.append(start)
+        response = Mock()
+        response.status_code = 206
+        response.raw = io.BytesIO(PAYLOAD[start : end + 1])
+        return response
+
+    transport.get.side_effect = get
+    return transport
+
+
+def make_download(transport, target, **kwargs):
+    return RangedDownload(transport, dict, OBJECT_URL, str(target), **kwargs)
+
+
+def test_ranged_download_writes_segments_at_offsets(download_transport, tmp_path):
+    target = tmp_path / "big.bin"
+    download = make_download(
+        download_transport, target, segment_size=1000, max_workers=3, buffer_size=64
+    )
+    download.run()
+
+    assert target.read_bytes() == PAYLOAD
+    assert sorted(download_transport.ranges) == [0, 1000, 2000]
+    assert not os.path.exists(download.state_file)
+
+
+def test_ranged_download_resumes_from_state(download_transport, tmp_path):
+    target = tmp_path / "big.bin"
+    target.write_bytes(PAYLOAD[:2000] + b"\0" * (len(PAYLOAD) - 2000))
+    download = make_download(download_transport, target, segment_size=1000)
+    with open(download.state_file, "w") as f:
+        json.dump({**download._probe(), "segments": [0, 1]}, f)
+
+    download.run()
+
+    assert download_transport.ranges == [2000]
+    assert target.read_bytes() == PAYLOAD
+
+
+def test_ranged_download_verifies_checksum(download_transport, tmp_path):
+    target = tmp_path / "big.bin"
+    make_download(
+        download_transport,
+        target,
+        segment_size=1000,
+        checksum=hashlib.md5(PAYLOAD).hexdigest(),
+    ).run()
+
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        make_download(
+            download_transport, target, segment_size=1000, checksum="0" * 32
+        ).run()
+
+
+def test_ranged_download_requires_range_support(download_transport, tmp_path):
+    download_transport.get.side_effect = None
+    download_transport.get.return_value.status_code = 200
+    with pytest.raises(ValueError, match="Range"):
+        make_download(download_transport, tmp_path / "big.bin").run()
+
+
+def test_ranged_download_without_size_uses_one_stream(download_transport, tmp_path):
+    download_transport.head.return_value.headers = {"ETag": '"v1"'}
+    download_transport.get.side_effect = None
+    download_transport.get.return_value.iter_content.return_value = [
+        PAYLOAD[:1000],
+        PAYLOAD[1000:],
+    ]
+    target = tmp_path / "big.bin"
+    download = make_download(
+        download_transport,
+        target,
+        segment_size=1000,
+        checksum=hashlib.md5(PAYLOAD).hexdigest(),
+    )
+    download.run()
+
+    assert target.read_bytes() == PAYLOAD
+    assert "Range" not in download_transport.get.call_args.kwargs["headers"]
+    assert not os.path.exists(download.state_file)
@@ -0,0 +1,76 @@
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+
+from gcore_api.auth import GcoreAuth
+from gcore_api.cdn import AsyncCDNClient, CDNClient
+from gcore_api.dns import DNSClient
+from gcore_api.transport import AsyncTransport, Transport
+
+
+@pytest.fixture
+def transport():
+    return Transport(base_url="http://127.0.0.1:8080/")
+
+
+def test_resolve_url_rewrites_base(transport):
+    assert (
+        transport.resolve_url("https://api.gcore.com/cdn/v1/resources")
+        == "http://127.0.0.1:8080/cdn/v1/resources"
+    )
+
+
+def test_resolve_url_keeps_foreign_urls(transport):
+    url = "https://example.com/file.bin"
+    assert transport.resolve_url(url) == url
+
+
+def test_request_uses_session_and_default_timeout(transport):
+    with patch.object(transport.session, "request") as mock_request:
+        transport.get("https://api.gcore.com/dns/v2/zones")
+        mock_request.assert_called_once_with(
+            "GET", "http://127.0.0.1:8080/dns/v2/zones", timeout=60.0
+        )
+
+
+def test_clients_share_auth_transport():
+    auth = GcoreAuth(api_token="test-token")
+    cdn = CDNClient(auth)
+    dns = DNSClient(auth)
+    assert cdn.transport is dns.transport is auth.transport
+
+
+def test_client_transport_override():
+    auth = Mock(spec=GcoreAuth)
+    transport = Transport()
+    assert CDNClient(auth, transport=transport).transport is transport
+
+
+def test_async_transport_bounds_concurrency():
+    transport = AsyncTransport(max_concurrency=2)
+    in_flight = 0
+    peak = 0
+
+    async def fake_request(method, url, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return Mock()
+
+    async def run():
+        with patch.object(transport.client, "request", fake_request):
+            await asyncio.gather(
+                *(transport.get("https://api.gcore.com/x") for _ in range(10))
+            )
+        await transport.close()
+
+    asyncio.run(run())
+    assert peak == 2
+
+
+def test_async_clients_share_auth_transport():
+    auth = GcoreAuth(api_token="test-token")
+    assert AsyncCDNClient(auth).transport is auth.async_transport
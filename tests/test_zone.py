@@ -0,0 +1,122 @@
+from unittest.mock import Mock
+
+import pytest
+
+from gcore_api.dns import DNSClient
+from gcore_api.zone import apply_zone, load_zone_spec, plan_zone
+
+CURRENT = [
+    {"id": 1, "name": "@", "type": "SOA", "content": "ns1 admin 1", "ttl": 3600},
+    {
+        "id": 2,
+        "name": "www",
+        "type": "A",
+        "content": ["192.0.2.1", "192.0.2.2"],
+        "ttl": 300,
+    },
+    {"id": 3, "name": "api", "type": "A", "content": "192.0.2.3", "ttl": 300},
+    {"id": 4, "name": "old", "type": "CNAME", "content": "www", "ttl": 300},
+    {"id": 5, "name": "api", "type": "A", "content": "192.0.2.9", "ttl": 300},
+]
+
+DESIRED = [
+    {"name": "www", "type": "a", "content": ["192.0.2.2", "192.0.2.1"], "ttl": 300},
+    {"name": "api", "type": "A", "content": "192.0.2.4", "ttl": 300},
+    {"name": "mail", "type": "MX", "content": "10 mx.example.com", "ttl": 300},
+]
+
+
+def test_plan_zone_minimal_diff():
+    plan = plan_zone(CURRENT, DESIRED)
+    assert plan.unchanged == 1
+    assert [r["name"] for r in plan.adds] == ["mail"]
+    assert plan.updates == [(3, DESIRED[1])]
+    assert sorted(r["id"] for r in plan.deletes) == [4, 5]
+
+
+def test_plan_zone_without_delete():
+    plan = plan_zone(CURRENT, DESIRED, delete=False)
+    assert plan.deletes == []
+
+
+def test_plan_zone_ttl_change_is_update():
+    current = [{"id": 1, "name": "a", "type": "A", "content": "192.0.2.1", "ttl": 60}]
+    desired = [{"name": "a", "type": "A", "content": "192.0.2.1", "ttl": 120}]
+    assert plan_zone(current, desired).updates == [(1, {**desired[0]})]
+
+
+def test_plan_zone_merges_desired_rrsets():
+    desired = [
+        {"name": "www", "type": "A", "content": "192.0.2.1", "ttl": 300},
+        {"name": "mail", "type": "MX", "content": "10 mx.example.com"},
+        {"name": "www", "type": "a", "content": "192.0.2.2", "ttl": 60},
+    ]
+    plan = plan_zone(CURRENT, desired, delete=False)
+    assert plan.updates == [
+        (
+            2,
+            {
+                "name": "www",
+                "type": "A",
+                "content": ["192.0.2.1", "192.0.2.2"],
+                "ttl": 60,
+            },
+        )
+    ]
+    assert plan.adds == [desired[1]]
+
+    desired[2]["ttl"] = 300
+    assert plan_zone(CURRENT, desired, delete=False).unchanged == 1
+
+
+def test_apply_zone_executes_plan():
+    client = Mock(spec=DNSClient)
+    client.list_records.return_value = CURRENT
+    result = apply_zone(client, 7, DESIRED, max_workers=2)
+
+    client.list_records.assert_called_once_with(7)
+    client.create_record.assert_called_once_with(
+        7, "mail", "MX", "10 mx.example.com", ttl=300
+    )
+    client.update_record.assert_called_once_with(7, 3, "192.0.2.4", ttl=300)
+    assert sorted(c.args for c in client.delete_record.call_args_list) == [
+        (7, 4),
+        (7, 5),
+    ]
+    assert (result.added, result.updated, result.deleted) == (1, 1, 2)
+
+
+def test_apply_unchanged_zone_costs_one_list_call():
+    client = Mock(spec=DNSClient)
+    client.list_records.return_value = [r for r in CURRENT if r["id"] in (1, 2)]
+    result = apply_zone(client, 7, DESIRED[:1])
+    assert result.plan.empty
+    assert client.mock_calls == [("list_records", (7,), {})]
+
+
+def test_apply_zone_records_failures():
+    client = Mock(spec=DNSClient)
+    client.list_records.return_value = []
+    client.create_record.side_effect = RuntimeError("400")
+    result = apply_zone(client, 7, DESIRED[2:])
+    assert result.failed == [("mail MX", "400")]
+
+
+def test_load_zone_spec(tmp_path):
+    path = tmp_path / "zone.yaml"
+    path.write_text(
+        "zone_id: 7\nrecords:\n  - {name: www, type: A, content: 192.0.2.1}\n"
+    )
+    assert load_zone_spec(str(path)) == (
+        7,
+        [{"name": "www", "type": "A", "content": "192.0.2.1"}],
+    )
+    path.write_text("records:\n  - {name: www, type: A}\n")
+    with pytest.raises(ValueError, match="content"):
+        load_zone_spec(str(path))
+    path.write_text("- {name: www, type: A, content: 192.0.2.1}\n")
+    with pytest.raises(ValueError, match="mapping"):
+        load_zone_spec(str(path))
+    path.write_text("records:\n  - www\n")
+    with pytest.raises(ValueError, match="mapping"):
+        load_zone_spec(str(path))
@@ -0,0 +1,133 @@
+import io
+from typing import Iterator
+from unittest.mock import Mock
+
+import pytest
+
+from gcore_api.dns import DNSClient
+from gcore_api.zonefile import (
+    export_zone_file,
+    group_rrsets,
+    import_zone_file,
+    parse_ttl,
+    parse_zone_file,
+)
+
+ZONE = """$ORIGIN example.com.
+$TTL 1h
+@       IN SOA ns1 admin ( 2024010101 ; serial
+                3600 600 86400 300 )
+        IN NS  ns1.gcore.
+www 300 IN A   192.0.2.1
+        IN 300 A 192.0.2.2
+txt     TXT "hello; world" "x"
+ext.example.org. MX 10 mx
+"""
+
+
+def test_parse_ttl():
+    assert parse_ttl("3600") == 3600
+    assert parse_ttl("1h30m") == 5400
+    assert parse_ttl("1W") == 604800
+    with pytest.raises(ValueError):
+        parse_ttl("1x")
+
+
+def test_parse_zone_file():
+    records = list(parse_zone_file(io.StringIO(ZONE)))
+    assert records[0] == {
+        "name": "@",
+        "type": "SOA",
+        "ttl": 3600,
+        "content": "ns1 admin 2024010101 3600 600 86400 300",
+    }
+    assert records[1]["name"] == "@"
+    assert records[2:4] == [
+        {"name": "www", "type": "A", "ttl": 300, "content": "192.0.2.1"},
+        {"name": "www", "type": "A", "ttl": 300, "content": "192.0.2.2"},
+    ]
+    assert records[4]["content"] == '"hello; world" "x"'
+    assert records[5]["name"] == "ext.example.org."
+
+
+def test_parse_zone_file_is_lazy():
+    lines = iter(["www A 192.0.2.1\n", "$INCLUDE other.zone\n"])
+    records = parse_zone_file(lines, origin="example.com")
+    assert next(records)["name"] == "www"
+    with pytest.raises(ValueError, match="Line 2"):
+        next(records)
+
+
+def test_parse_zone_file_unbalanced():
+    with pytest.raises(ValueError, match="unbalanced"):
+        list(parse_zone_file(["@ SOA ns1 admin ( 1\n"], origin="example.com"))
+
+
+def test_group_rrsets():
+    rrsets = group_rrsets(parse_zone_file(io.StringIO(ZONE)))
+    www = [r for r in rrsets if r["name"] == "www"]
+    assert www == [
+        {"name": "www", "type": "A", "ttl": 300, "content": ["192.0.2.1", "192.0.2.2"]}
+    ]
+    assert len(rrsets) == 5
+
+
+def test_import_zone_file(tmp_path):
+    path = tmp_path / "example.com.zone"
+    path.write_text(ZONE)
+    client = Mock(spec=DNSClient)
+    client.list_records.return_value = []
+
+    result = import_zone_file(client, 7, str(path))
+
+    created = sorted(c.args[1:3] for c in client.create_record.call_args_list)
+    assert created == [
+        ("ext.example.org.", "MX"),
+        ("txt", "TXT"),
+        ("www", "A"),
+    ]
+    client.create_record.assert_any_call(
+        7, "www", "A", ["192.0.2.1", "192.0.2.2"], ttl=300
+    )
+    assert result.added == 3
+
+
+def test_import_zone_file_streams_records(tmp_path, monkeypatch):
+    path = tmp_path / "example.com.zone"
+    path.write_text(ZONE)
+    client = Mock(spec=DNSClient)
+    client.list_records.return_value = []
+    received = []
+
+    def spy(records):
+        received.append(records)
+        return group_rrsets(records)
+
+    monkeypatch.setattr("gcore_api.zonefile.group_rrsets", spy)
+    import_zone_file(client, 7, str(path), dry_run=True)
+    assert isinstance(received[0], Iterator)
+
+
+def test_export_zone_file_round_trip(tmp_path):
+    client = Mock(spec=DNSClient)
+    client.iter_records.return_value = iter(
+        [
+            {
+                "name": "www",
+                "type": "A",
+                "ttl": 300,
+                "content": ["192.0.2.1", "192.0.2.2"],
+            },
+            {"name": "@", "type": "MX", "ttl": 3600, "content": "10 mx"},
+        ]
+    )
+    path = tmp_path / "out.zone"
+
+    assert export_zone_file(client, 7, str(path), origin="example.com") == 2
+
+    with open(path) as f:
+        records = group_rrsets(parse_zone_file(f))
+    assert records == [
+        {"name": "www", "type": "A", "ttl": 300, "content": ["192.0.2.1", "192.0.2.2"]},
+        {"name": "@", "type": "MX", "ttl": 3600, "content": "10 mx"},
+    ]